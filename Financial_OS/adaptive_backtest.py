@@ -29,13 +29,9 @@ def run_simulation(scenario_name, symbol, assets_data, use_filter):
 
         engine.set_regime_filter(use_filter, 252)
 
-        opens = assets_data['opens']
-        highs = assets_data['highs']
-        lows = assets_data['lows']
         closes = assets_data['closes']
-
-        for i in range(len(closes)):
-            engine.on_market_data(symbol, i, opens[i], highs[i], lows[i], closes[i])
+        engine.run_bars(symbol, list(range(len(closes))), assets_data['opens'],
+                        assets_data['highs'], assets_data['lows'], closes)
 
         equity = engine.get_total_equity()
         mdd = engine.get_max_drawdown()
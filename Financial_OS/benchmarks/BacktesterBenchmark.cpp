@@ -8,9 +8,17 @@
 #include <benchmark/benchmark.h>
 
 #include <cmath>
+#include <map>
+#include <string>
 #include <vector>
 
 #include "Backtester.h"
+#include "Indicators.h"
+#include "KalmanBank.h"
+#include "KalmanFilter.h"
+#include "PCAArbitrage.h"
+#include "PairSelector.h"
+#include "VectorBacktest.h"
 
 namespace {
 
@@ -49,8 +57,272 @@ void RunStrategy(benchmark::State& state, const char* strategy) {
     state.SetItemsProcessed(state.iterations() * n);  // -> ticks/sec
 }
 
+// check_risk_limits walks every open position on every tick, so its cost scales
+// with the number of holdings. Hold `n` symbols and time 200 bars of each.
+void RunRiskUniverse(benchmark::State& state) {
+    const int n_symbols = static_cast<int>(state.range(0));
+    const int n_bars = 200;
+    const std::vector<double> closes = MakeSeries(n_bars);
+    std::vector<std::string> symbols;
+    for (int j = 0; j < n_symbols; ++j) symbols.push_back("S" + std::to_string(j));
+
+    for (auto _ : state) {
+        Backtester engine(1e9, "VOL", 1.0);
+        engine.set_quiet(true);
+        engine.set_risk_params(1.0, 1e9);  // measure the check, never trip it
+        for (const auto& sym : symbols) engine.send_order(sym, "BUY", 1.0, closes[0], 0.0);
+        for (int t = 0; t < n_bars; ++t) {
+            for (const auto& sym : symbols) {
+                const double c = closes[t];
+                engine.on_market_data(sym, static_cast<double>(t), c, c, c, c);
+            }
+        }
+        benchmark::DoNotOptimize(engine.get_total_equity());
+    }
+
+    state.SetItemsProcessed(state.iterations() * n_bars * n_symbols);
+}
+
+// A strategy trading a whole universe: n symbols x 200 bars through EMA, the
+// per-tick path of a cross-sectional backtest.
+void RunEmaUniverse(benchmark::State& state) {
+    const int n_symbols = static_cast<int>(state.range(0));
+    const int n_bars = 200;
+    std::vector<std::vector<double>> closes;
+    std::vector<std::string> symbols;
+    for (int j = 0; j < n_symbols; ++j) {
+        symbols.push_back("S" + std::to_string(j));
+        std::vector<double> series = MakeSeries(n_bars + j % 17);
+        closes.emplace_back(series.begin() + j % 17, series.end());
+    }
+
+    for (auto _ : state) {
+        Backtester engine(1e9, "EMA", 1.0);
+        engine.set_quiet(true);
+        engine.set_risk_params(1.0, 1e9);
+        for (int t = 0; t < n_bars; ++t) {
+            for (int j = 0; j < n_symbols; ++j) {
+                const double c = closes[j][t];
+                engine.on_market_data(symbols[j], static_cast<double>(t), c, c, c, c);
+            }
+        }
+        benchmark::DoNotOptimize(engine.get_total_equity());
+    }
+
+    state.SetItemsProcessed(state.iterations() * n_bars * n_symbols);
+}
+
+// Per-tick cost against indicator window length. The indicators are
+// incremental, so time per tick should stay flat as the window grows. PAIRS
+// trades KO/PEP and counts one item per timestamp.
+template <typename Configure>
+void RunWindowed(benchmark::State& state, const char* strategy, Configure configure) {
+    const int window = static_cast<int>(state.range(0));
+    const int n = 20000;
+    const std::vector<double> closes = MakeSeries(n);
+    const bool pairs = std::string(strategy) == "PAIRS";
+
+    for (auto _ : state) {
+        Backtester engine(100000.0, strategy, 1.0);
+        engine.set_quiet(true);
+        engine.set_risk_params(1.0, 1e9);  // keep trading to the end
+        configure(engine, window);
+        for (int t = 0; t < n; ++t) {
+            const double c = closes[t];
+            if (pairs) {
+                engine.on_market_data("KO", static_cast<double>(t), c, c, c, c);
+                const double p = c * (1.0 + 0.01 * std::sin(t * 0.05));
+                engine.on_market_data("PEP", static_cast<double>(t), p, p, p, p);
+            } else {
+                engine.on_market_data("TEST", static_cast<double>(t), c, c, c, c);
+            }
+        }
+        benchmark::DoNotOptimize(engine.get_total_equity());
+    }
+
+    state.SetItemsProcessed(state.iterations() * n);
+}
+
+// Batch RSI over a 2000-bar x n-symbol panel: the screening path, one item per
+// panel cell. Real time, since the work runs on the worker pool.
+void RunIndicatorPanel(benchmark::State& state) {
+    const auto cols = static_cast<std::size_t>(state.range(0));
+    const std::size_t rows = 2000;
+    const std::vector<double> series = MakeSeries(static_cast<int>(rows + cols));
+    std::vector<double> panel(rows * cols);
+    for (std::size_t t = 0; t < rows; ++t) {
+        for (std::size_t j = 0; j < cols; ++j) panel[t * cols + j] = series[t + j];
+    }
+    std::vector<double> out(panel.size());
+
+    for (auto _ : state) {
+        Indicators::RSI({panel.data(), rows, cols}, 14, out.data());
+        benchmark::DoNotOptimize(out.data());
+    }
+
+    state.SetItemsProcessed(state.iterations() * static_cast<std::int64_t>(rows * cols));
+}
+
+// The vector fast path on the same kind of panel: n independent RSI
+// backtests of 2000 bars, one item per bar. Compare with RunWindowed/rsi.
+void RunVectorScreen(benchmark::State& state) {
+    const auto cols = static_cast<std::size_t>(state.range(0));
+    const std::size_t rows = 2000;
+    const std::vector<double> series = MakeSeries(static_cast<int>(rows + cols));
+    std::vector<double> panel(rows * cols);
+    for (std::size_t t = 0; t < rows; ++t) {
+        for (std::size_t j = 0; j < cols; ++j) panel[t * cols + j] = series[t + j];
+    }
+    VectorBacktestConfig config;
+    config.strategy = "RSI";
+
+    for (auto _ : state) {
+        VectorBacktestResult result = RunVectorBacktest({panel.data(), rows, cols}, config);
+        benchmark::DoNotOptimize(result.final_equity.data());
+    }
+
+    state.SetItemsProcessed(state.iterations() * static_cast<std::int64_t>(rows * cols));
+}
+
+// Top-10 pair screen over a year (252 bars) of n symbols, one item per pair
+// scored. Real time, since the tiles run on the worker pool.
+void RunPairScreen(benchmark::State& state, bool single_precision) {
+    const auto cols = static_cast<std::size_t>(state.range(0));
+    const std::size_t rows = 252;
+    const std::vector<double> series = MakeSeries(static_cast<int>(rows + cols));
+    std::vector<double> panel(rows * cols);
+    std::vector<std::string> symbols;
+    for (std::size_t j = 0; j < cols; ++j) symbols.push_back("S" + std::to_string(j));
+    for (std::size_t t = 0; t < rows; ++t) {
+        for (std::size_t j = 0; j < cols; ++j) panel[t * cols + j] = series[t + j];
+    }
+
+    for (auto _ : state) {
+        auto pairs = PairSelector::FindTopPairs({panel.data(), rows, cols}, symbols, 10, single_precision);
+        benchmark::DoNotOptimize(pairs.data());
+    }
+
+    state.SetItemsProcessed(state.iterations() * static_cast<std::int64_t>(cols * (cols - 1) / 2));
+}
+
+// Full cointegration funnel over two years (504 bars) of n overlapping
+// windows of one series -- highly correlated, so up to the default 5000
+// candidates reach the ADF stage. One item per pair screened.
+void RunCointegrationScreen(benchmark::State& state) {
+    const auto cols = static_cast<std::size_t>(state.range(0));
+    const std::size_t rows = 504;
+    const std::vector<double> series = MakeSeries(static_cast<int>(rows + cols));
+    std::vector<double> panel(rows * cols);
+    std::vector<std::string> symbols;
+    for (std::size_t j = 0; j < cols; ++j) symbols.push_back("S" + std::to_string(j));
+    for (std::size_t t = 0; t < rows; ++t) {
+        for (std::size_t j = 0; j < cols; ++j) panel[t * cols + j] = series[t + j];
+    }
+
+    std::size_t tested = 0;
+    for (auto _ : state) {
+        const CointegrationReport report = PairSelector::ScreenCointegration({panel.data(), rows, cols}, symbols);
+        tested = report.correlated;
+        benchmark::DoNotOptimize(report.pairs.data());
+    }
+
+    state.counters["candidates"] = static_cast<double>(tested);
+    state.SetItemsProcessed(state.iterations() * static_cast<std::int64_t>(cols * (cols - 1) / 2));
+}
+
+// One step of n pair filters per timestamp over 1000 timestamps: the SoA
+// bank, against n KalmanFilter objects each with its RollingMoments window
+// (what n PAIRS engines hold). One item per pair update.
+void RunKalmanBank(benchmark::State& state, bool bank) {
+    const auto n = static_cast<std::size_t>(state.range(0));
+    const std::size_t steps = 1000;
+    const std::vector<double> series = MakeSeries(static_cast<int>(steps + n + 1));
+    std::vector<double> x(n);
+    std::vector<double> y(n);
+
+    for (auto _ : state) {
+        KalmanBank filters(bank ? n : 0, 30);
+        std::vector<KalmanFilter> single(bank ? 0 : n);
+        std::vector<RollingMoments> spreads(bank ? 0 : n, RollingMoments(30));
+        for (std::size_t t = 0; t < steps; ++t) {
+            for (std::size_t k = 0; k < n; ++k) {
+                x[k] = series[t + k];
+                y[k] = series[t + k + 1];
+            }
+            if (bank) {
+                filters.update(x.data(), y.data());
+            } else {
+                for (std::size_t k = 0; k < n; ++k) {
+                    single[k].update(x[k], y[k]);
+                    spreads[k].push(single[k].get_spread(x[k], y[k]));
+                }
+            }
+        }
+        benchmark::DoNotOptimize(bank ? filters.z_score(0) : spreads[0].mean());
+    }
+
+    state.SetItemsProcessed(state.iterations() * static_cast<std::int64_t>(n * steps));
+}
+
+// PCA z-scores for n names on each of 250 bars over the PCA strategy's
+// 60-bar window: StreamingPCA advanced a row per bar, against
+// CalculateSignals rebuilt from the window on every bar. One item per bar.
+void RunRollingPCA(benchmark::State& state, bool streaming) {
+    const auto n = static_cast<std::size_t>(state.range(0));
+    const std::size_t rows = 250;
+    const int window = 60;
+    const std::vector<double> series = MakeSeries(static_cast<int>(rows));
+    std::vector<double> panel(rows * n);
+    for (std::size_t t = 0; t < rows; ++t) {
+        for (std::size_t j = 0; j < n; ++j) {
+            const double beta = 0.5 + 0.1 * static_cast<double>(j % 11);
+            panel[t * n + j] = std::exp(beta * std::log(series[t]) + 0.01 * std::sin(0.9 * t * (j % 17 + 1) + j));
+        }
+    }
+    std::vector<double> z(rows * n);
+    std::vector<std::string> symbols;
+    for (std::size_t j = 0; j < n; ++j) symbols.push_back("S" + std::to_string(j));
+
+    for (auto _ : state) {
+        if (streaming) {
+            PCAArbitrage::RollingSignals({panel.data(), rows, n}, window, z.data());
+        } else {
+            for (std::size_t t = window - 1; t < rows; ++t) {
+                std::map<std::string, std::vector<double>> prices;
+                for (std::size_t j = 0; j < n; ++j) {
+                    auto& closes = prices[symbols[j]];
+                    for (std::size_t i = t + 1 - window; i <= t; ++i) closes.push_back(panel[i * n + j]);
+                }
+                benchmark::DoNotOptimize(PCAArbitrage::CalculateSignals(prices, 1).z_scores.size());
+            }
+        }
+        benchmark::DoNotOptimize(z.data());
+    }
+
+    state.SetItemsProcessed(state.iterations() * static_cast<std::int64_t>(rows - window + 1));
+}
+
 }  // namespace
 
+BENCHMARK_CAPTURE(RunRollingPCA, streaming, true)->Arg(50)->Arg(300)->Unit(benchmark::kMillisecond);
+BENCHMARK_CAPTURE(RunRollingPCA, rebuild, false)->Arg(50)->Arg(300)->Unit(benchmark::kMillisecond);
+BENCHMARK_CAPTURE(RunPairScreen, f64, false)->Arg(500)->Arg(3000)->UseRealTime()->Unit(benchmark::kMillisecond);
+BENCHMARK_CAPTURE(RunPairScreen, f32, true)->Arg(500)->Arg(3000)->UseRealTime()->Unit(benchmark::kMillisecond);
+BENCHMARK_CAPTURE(RunKalmanBank, bank, true)->Arg(500)->Unit(benchmark::kMillisecond);
+BENCHMARK_CAPTURE(RunKalmanBank, filters, false)->Arg(500)->Unit(benchmark::kMillisecond);
+BENCHMARK(RunCointegrationScreen)->Arg(500)->Arg(3000)->UseRealTime()->Unit(benchmark::kMillisecond);
+BENCHMARK_CAPTURE(RunWindowed, rsi, "RSI", [](Backtester& e, int w) { e.set_rsi_parameters(w); })
+    ->Arg(10)->Arg(100)->Arg(1000)->Unit(benchmark::kMillisecond);
+BENCHMARK_CAPTURE(RunWindowed, bb, "BB", [](Backtester& e, int w) { e.set_bollinger_parameters(w); })
+    ->Arg(10)->Arg(100)->Arg(1000)->Unit(benchmark::kMillisecond);
+BENCHMARK_CAPTURE(RunWindowed, ou, "OU", [](Backtester& e, int w) { e.set_ou_parameters(w); })
+    ->Arg(10)->Arg(100)->Arg(1000)->Unit(benchmark::kMillisecond);
+BENCHMARK_CAPTURE(RunWindowed, pairs, "PAIRS", [](Backtester& e, int w) { e.set_pairs_parameters(w, 2.0); })
+    ->Arg(10)->Arg(100)->Arg(1000)->Unit(benchmark::kMillisecond);
+BENCHMARK(RunIndicatorPanel)->Arg(1)->Arg(500)->UseRealTime()->Unit(benchmark::kMillisecond);
+BENCHMARK(RunVectorScreen)->Arg(1)->Arg(500)->UseRealTime()->Unit(benchmark::kMillisecond);
+BENCHMARK(RunEmaUniverse)->Arg(500)->Unit(benchmark::kMillisecond);
+BENCHMARK(RunRiskUniverse)->Arg(10)->Arg(100)->Arg(500)->Unit(benchmark::kMillisecond);
 BENCHMARK_CAPTURE(RunStrategy, ema, "EMA")->Arg(1000)->Arg(10000)->Unit(benchmark::kMicrosecond);
 BENCHMARK_CAPTURE(RunStrategy, macd, "MACD")->Arg(1000)->Arg(10000)->Unit(benchmark::kMicrosecond);
 
@@ -22,7 +22,7 @@ Optimizer MakeOptimizer(int n_assets, int n_periods) {
 
 void RunOptimize(benchmark::State& state, unsigned int num_threads) {
     const int num_simulations = static_cast<int>(state.range(0));
-    Optimizer opt = MakeOptimizer(10, 252);
+    Optimizer opt = MakeOptimizer(static_cast<int>(state.range(1)), 252);
 
     for (auto _ : state) {
         auto result = opt.optimize_sharpe_ratio(num_simulations, 0.02, num_threads);
@@ -34,5 +34,7 @@ void RunOptimize(benchmark::State& state, unsigned int num_threads) {
 
 } // namespace
 
-BENCHMARK_CAPTURE(RunOptimize, serial_1_thread, 1u)->Arg(10000)->Arg(100000)->Unit(benchmark::kMillisecond);
-BENCHMARK_CAPTURE(RunOptimize, parallel_auto, 0u)->Arg(10000)->Arg(100000)->Unit(benchmark::kMillisecond);
\ No newline at end of file
+BENCHMARK_CAPTURE(RunOptimize, serial_1_thread, 1u)
+    ->Args({10000, 10})->Args({100000, 10})->Args({100000, 50})->Unit(benchmark::kMillisecond);
+BENCHMARK_CAPTURE(RunOptimize, parallel_auto, 0u)
+    ->Args({10000, 10})->Args({100000, 10})->Args({100000, 50})->UseRealTime()->Unit(benchmark::kMillisecond);
@@ -45,5 +45,13 @@ try:
     else:
         print("\n  ❌ FAIL: Calculation Mismatch.")
 
+    spread = (log_y - res.alpha - res.beta * log_x).tolist()
+    adf = fe.Analytics.adf_statistic(spread)
+    critical = fe.Analytics.engle_granger_critical_value(len(spread))
+    print(f"  [C++ Engine]   ADF: {adf:.3f} (5% critical {critical:.3f}), "
+          f"half-life: {fe.Analytics.half_life(spread):.1f} bars, "
+          f"Hurst: {fe.Analytics.hurst_exponent(spread):.3f}")
+    print("  Cointegrated at 5%." if adf < critical else "  Not cointegrated at 5%.")
+
 except ImportError:
     print("\n  [Error] Could not load FinancialEngine module. Did you build it?")
\ No newline at end of file
@@ -2,6 +2,7 @@
 
 import sys
 import os
+import numpy as np
 import yfinance as yf
 import pandas as pd
 
@@ -34,18 +35,19 @@ def main():
 
     print(f"-> Successfully fetched {len(data)} trading days. Streaming to C++ Core...")
 
-    # 3. Stream Data to C++ Engine
-    for index, row in data.iterrows():
-        timestamp = index.timestamp()
+    # 3. Stream Data to C++ Engine (one native call for the whole series)
+    # yfinance returns multi-index columns in recent versions, handle it gracefully
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)
 
-        # yfinance returns multi-index columns in recent versions, handle it gracefully
-        open_p = float(row['Open'].iloc[0]) if isinstance(row['Open'], pd.Series) else float(row['Open'])
-        high_p = float(row['High'].iloc[0]) if isinstance(row['High'], pd.Series) else float(row['High'])
-        low_p = float(row['Low'].iloc[0]) if isinstance(row['Low'], pd.Series) else float(row['Low'])
-        close_p = float(row['Close'].iloc[0]) if isinstance(row['Close'], pd.Series) else float(row['Close'])
-
-        # Inject into C++
-        engine.on_market_data(ticker, timestamp, open_p, high_p, low_p, close_p)
+    timestamps = np.array([index.timestamp() for index in data.index], dtype=np.float64)
+    engine.run_bars(
+        ticker, timestamps,
+        data['Open'].to_numpy(dtype=np.float64),
+        data['High'].to_numpy(dtype=np.float64),
+        data['Low'].to_numpy(dtype=np.float64),
+        data['Close'].to_numpy(dtype=np.float64),
+    )
 
     # 4. Extract Real Backtest Results
     print("\n==================================================")
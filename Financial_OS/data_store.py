@@ -1,6 +1,7 @@
 # data_store.py
 
 import duckdb
+import numpy as np
 import yfinance as yf
 import pandas as pd
 
@@ -55,17 +56,20 @@ def ingest(con, symbol, period="5y", interval="1d"):
     con.unregister("tidy_df")
     return len(tidy)
 
-def get_ohlc(con, symbol, start=None, end=None):
+def _ohlc_query(symbol, start, end):
     query = "SELECT date, open, high, low, close FROM ohlc WHERE symbol = ?"
     params = [symbol]
     if start is not None:
         query += " AND date >= ?"
         params.append(start)
     if end is not None:
-        query += "AND date <= ?"
+        query += " AND date <= ?"
         params.append(end)
     query += " ORDER BY date"
+    return query, params
 
+def get_ohlc(con, symbol, start=None, end=None):
+    query, params = _ohlc_query(symbol, start, end)
     df = con.execute(query, params).fetchdf()
     return {
         "dates":  df["date"].tolist(),
@@ -75,6 +79,61 @@ def get_ohlc(con, symbol, start=None, end=None):
         "closes": df["close"].tolist(),
     }
 
+def _float64(col):
+    # fetchnumpy() hands back a MaskedArray when a column has NULLs; the engine
+    # wants a plain contiguous float64 buffer, so NULL becomes NaN.
+    if isinstance(col, np.ma.MaskedArray):
+        col = col.filled(np.nan)
+    return np.ascontiguousarray(col, dtype=np.float64)
+
+def get_ohlc_arrays(con, symbol, start=None, end=None):
+    # Columnar twin of get_ohlc: same keys, but each value is a NumPy array
+    # straight out of DuckDB (dates as datetime64, prices as float64) -- no
+    # per-element Python objects on the way to the engine.
+    query, params = _ohlc_query(symbol, start, end)
+    cols = con.execute(query, params).fetchnumpy()
+    return {
+        "dates":  cols["date"],
+        "opens":  _float64(cols["open"]),
+        "highs":  _float64(cols["high"]),
+        "lows":   _float64(cols["low"]),
+        "closes": _float64(cols["close"]),
+    }
+
+def get_ohlc_arrow(con, symbol, start=None, end=None):
+    query, params = _ohlc_query(symbol, start, end)
+    res = con.execute(query, params)
+    if hasattr(res, "to_arrow_table"):
+        return res.to_arrow_table()
+    return res.fetch_arrow_table()
+
+def get_ohlc_panel(con, symbols, start=None, end=None):
+    # Date-aligned (T, N, 4) open/high/low/close panel over the union of dates,
+    # NaN where a symbol has no bar -- the layout Backtester.run_panel expects.
+    # Repeated symbols keep their first position; use the returned "symbols".
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        raise ValueError("get_ohlc_panel needs at least one symbol")
+    placeholders = ", ".join(["?"] * len(symbols))
+    query = f"SELECT date, symbol, open, high, low, close FROM ohlc WHERE symbol IN ({placeholders})"
+    params = list(symbols)
+    if start is not None:
+        query += " AND date >= ?"
+        params.append(start)
+    if end is not None:
+        query += " AND date <= ?"
+        params.append(end)
+
+    cols = con.execute(query, params).fetchnumpy()
+    dates, t_idx = np.unique(cols["date"], return_inverse=True)
+    position = {sym: j for j, sym in enumerate(symbols)}
+    j_idx = np.fromiter((position[s] for s in cols["symbol"]), dtype=np.intp, count=len(t_idx))
+
+    panel = np.full((len(dates), len(symbols), 4), np.nan)
+    for f, name in enumerate(("open", "high", "low", "close")):
+        panel[t_idx, j_idx, f] = _float64(cols[name])
+    return {"dates": dates, "symbols": symbols, "ohlc": panel}
+
 def symbols(con):
     return con.execute("""
         SELECT symbol, COUNT(*) AS bars, MIN(date) AS first, MAX(date) AS last
@@ -1,5 +1,7 @@
 # data_store_demo.py
 
+import numpy as np
+
 import FinancialEngine
 import data_store
 
@@ -16,15 +18,14 @@ def main():
     print(data_store.symbols(con).to_string(index=False))
 
     sym = "AAPL"
-    bars = data_store.get_ohlc(con, sym, start="2020-01-01", end="2024-12-31")
+    bars = data_store.get_ohlc_arrays(con, sym, start="2020-01-01", end="2024-12-31")
     print(f"\n-> Sliced {len(bars['closes'])} bars of {sym}; streaming to C++ core...")
 
     engine = FinancialEngine.Backtester(100000.0, "MACD", 1.0)
-    for i in range(len(bars["closes"])):
-        engine.on_market_data(
-            sym, float(i),
-            bars["opens"][i], bars["highs"][i], bars["lows"][i], bars["closes"][i],
-        )
+    engine.run_bars(
+        sym, np.arange(len(bars["closes"]), dtype=np.float64),
+        bars["opens"], bars["highs"], bars["lows"], bars["closes"],
+    )
 
     print(f"   Final equity: ${engine.get_total_equity():.2f}")
     print(f"   Max drawdown: {engine.get_max_drawdown() * 100:.2f}%")
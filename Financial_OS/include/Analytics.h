@@ -27,6 +27,33 @@ public:
     static double CalculateStdDev(const std::vector<double>& data, int period);
     static double CalculateCorrelation(const std::vector<double>& series_a, const std::vector<double>& series_b);
     static LinearRegressionResult FitLinearRegression(const std::vector<double>& x, const std::vector<double>& y);
+
+    // Mean-reversion tests for a spread (e.g. Engle-Granger residuals).
+    // The augmented Dickey-Fuller statistic is the t-ratio of gamma in
+    //   de_t = gamma * e_{t-1} + sum_{i=1..lags} phi_i * de_{t-i} + u_t,
+    // with no deterministic terms, as suits regression residuals; NaN if the
+    // series is too short or flat. Negative lags throw std::invalid_argument.
+    static double CalculateADFStatistic(const std::vector<double>& series, int lags = 1);
+    // MacKinnon (2010) critical value of that statistic for a two-variable
+    // Engle-Granger test (cointegrating regression with a constant) over
+    // n_obs observations, at significance 0.01, 0.05 or 0.10.
+    static double EngleGrangerCriticalValue(std::size_t n_obs, double significance = 0.05);
+    // Bars for a deviation to halve, from the AR(1) fit de_t = c + lambda * e_{t-1}:
+    // -ln 2 / ln|1 + lambda|, infinity unless |1 + lambda| < 1.
+    static double CalculateHalfLife(const std::vector<double>& spread);
+    // Hurst exponent from how std(x_{t+tau} - x_t) scales over tau = 2..max_lag
+    // (capped at half the series): below 0.5 mean reverting, 0.5 a random
+    // walk, above 0.5 trending. NaN if the series is too short or flat.
+    static double CalculateHurstExponent(const std::vector<double>& series, int max_lag = 20);
+
+    // Curve decimation for display. Both return ascending indices into
+    // `series`, always including the first and last point, at most
+    // `max_points` of them (everything if the series is already that short).
+    // LTTB (largest-triangle-three-buckets) keeps the visually dominant point
+    // of each bucket; MinMax keeps each bucket's lowest and highest point, so
+    // every peak and trough survives. max_points must be at least 3.
+    static std::vector<std::size_t> DownsampleLTTB(const std::vector<double>& series, std::size_t max_points);
+    static std::vector<std::size_t> DownsampleMinMax(const std::vector<double>& series, std::size_t max_points);
 };
 
 #endif
\ No newline at end of file
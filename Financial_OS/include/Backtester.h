@@ -20,25 +20,88 @@ class Backtester {
 public:
     Backtester(double initial_capital, std::string strategy_type = "EMA", double leverage = 1.0);
 
+    // Dense id for symbol (registered on first use). The id overloads below
+    // skip the name lookup; the string overloads are thin wrappers over them.
+    // They are unchecked: pass only ids returned by register_symbol() (the
+    // Python bindings check, and raise IndexError).
+    SymbolId register_symbol(const std::string& symbol) { return data_.intern(symbol); }
+    const std::string& symbol_name(SymbolId id) const { return data_.symbols().name(id); }
+    const SymbolTable& get_symbols() const { return data_.symbols(); }
+
+    void on_market_data(SymbolId id, double timestamp, double open, double high, double low, double close);
     void on_market_data(const std::string& symbol, double timestamp, double open, double high, double low, double close);
+    // Replays n bars of one symbol in order. Identical to calling on_market_data
+    // once per bar; it just keeps the whole loop on the C++ side.
+    void run_bars(const std::string& symbol, const double* timestamps, const double* open,
+                  const double* high, const double* low, const double* close, std::size_t n);
+    // Replays a [n_times x symbols.size() x 4] row-major OHLC panel. Each
+    // timestamp feeds every symbol in the given order -- the same interleaving
+    // as a Python `for t: for sym:` loop. A bar with any NaN field is treated as
+    // missing for that symbol/timestamp and skipped.
+    void run_panel(const std::vector<std::string>& symbols, const double* timestamps,
+                   const double* ohlc, std::size_t n_times);
     void on_order_book_update(const OrderBook& book, double timestamp);
+    void send_order(SymbolId id, Side side, double quantity, double price, double timestamp);
     void send_order(const std::string& symbol, const std::string& side, double quantity, double price, double timestamp);
     void send_event(const Event& event);
     void set_macd_parameters(int fast, int slow, int signal);
     void set_volatility_k(double k);
     void set_risk_params(double max_drawdown_limit = 0.05, double var_limit = 0.02);
+    // Run the drawdown/VaR check on every `ticks`-th bar instead of every bar
+    // (useful for intraday data). 1 = every bar, the default.
+    void set_risk_cadence(int ticks);
     void set_pairs_parameters(int window, double threshold);
-    void set_regime_filter(bool use_filter, int lookback = 252);
+    // The (x, y) pairs PAIRS_BASKET trades; set before the run, as it
+    // restarts the basket. Throws std::invalid_argument for other strategies.
+    void set_pairs_basket(const std::vector<std::pair<std::string, std::string>>& pairs);
+    void set_rsi_parameters(int period, double buy_thresh = 30.0, double sell_thresh = 70.0);
+    void set_bollinger_parameters(int period, double std_dev_mult = 2.0);
+    void set_ou_parameters(int window, double z_thresh = 2.0);
+    void set_ema_parameters(int short_window, int long_window);
+    // The strategy's tunable parameters by name (Strategy::parameters()).
+    // set_parameters() overrides any subset of them through the typed setters
+    // above; a name the strategy does not have, or a fractional value for a
+    // period/window, throws std::invalid_argument.
+    std::map<std::string, double> get_parameters() const;
+    void set_parameters(const std::map<std::string, double>& params);
+    void set_parameter(const std::string& name, double value);
+    // Skips strategy signals while a symbol's streaming k-means regime is Bear.
+    // The clustering is warm-started and re-run every `recluster_every` bars.
+    void set_regime_filter(bool use_filter, int lookback = 252, int recluster_every = 1);
+    // Bound memory for long-running/live sessions: keep only the last `bars`
+    // bars per symbol in the bar store, and the last `bars` equity points.
+    // Never goes below the strategy's declared lookback(). 0 = keep full
+    // history (the default, which backtests and the history getters expect).
+    void set_bar_retention(std::size_t bars);
+    std::size_t get_bar_retention() const { return data_.retention(); }
+    // Equity points per bar (EVERY_TICK, the default), per distinct timestamp,
+    // or per `interval` of timestamp -- the latter two keep the curve's length
+    // independent of how many symbols trade. A bucket's point is recorded once
+    // the next bucket starts; run_bars/run_panel flush the last one on return,
+    // a streaming caller uses flush_equity().
+    void set_equity_sampling(EquitySampling sampling, double interval = 0.0) { equity_curve_.set_sampling(sampling, interval); }
+    EquitySampling get_equity_sampling() const { return equity_curve_.sampling(); }
+    void flush_equity() { equity_curve_.flush(); }
     void update_custom_pnl(double pnl) { portfolio_.set_custom_pnl(pnl); }
     void set_quiet(bool quiet) { quiet_ = quiet; }
 
+    // Full engine state (portfolio, equity curve, bar history, strategy
+    // indicators, risk flags) as an opaque byte string, and back. A copy of the
+    // engine (copy constructor) is the in-memory equivalent of the two.
+    std::string snapshot() const;
+    void restore(const std::string& bytes);
+    const std::string& get_strategy_type() const { return strategy_type_; }
+
     double get_total_equity() const;
     double get_cash_balance() const { return portfolio_.cash(); }
 
+    double get_holdings(SymbolId id) const { return portfolio_.holding(id); }
     double get_holdings(const std::string& symbol) const;
     double get_leverage() const { return leverage_; }
 
-    std::vector<Trade> get_trade_history() const { return portfolio_.trades(); }
+    std::vector<Trade> get_trade_history() const { return portfolio_.trades().rows(); }
+    const TradeLedger& get_trade_ledger() const { return portfolio_.trades(); }
+    std::size_t get_trade_count() const { return portfolio_.trades().size(); }
     double get_max_drawdown() const;
     std::vector<double> get_equity_curve() const { return equity_curve_.history(); }
     std::vector<double> get_equity_history() const;
@@ -47,6 +110,19 @@ public:
     const std::vector<double>& get_highs(const std::string& symbol) const;
     const std::vector<double>& get_lows(const std::string& symbol) const;
     const std::vector<double>& get_closes(const std::string& symbol) const;
+    const std::vector<double>& get_opens(SymbolId id) const { return data_.opens(id); }
+    const std::vector<double>& get_highs(SymbolId id) const { return data_.highs(id); }
+    const std::vector<double>& get_lows(SymbolId id) const { return data_.lows(id); }
+    const std::vector<double>& get_closes(SymbolId id) const { return data_.closes(id); }
+    // Bars received for symbol so far; with a retention window the getters
+    // above hold only the retained tail of these.
+    std::size_t get_bar_count(const std::string& symbol) const { return data_.bar_count(symbol); }
+    std::size_t get_bar_count(SymbolId id) const { return data_.bar_count(id); }
+
+    // Shareable storage behind the getters above, for zero-copy export.
+    const SharedSeries& get_equity_series() const { return equity_curve_.series(); }
+    std::size_t get_equity_len() const { return equity_curve_.series().size(); }
+    const DataHandler& get_data() const { return data_; }
 
 private:
     Portfolio portfolio_;
@@ -55,21 +131,25 @@ private:
     double max_drawdown_limit_ = 0.05;
     double var_limit_ = 0.02;
     bool risk_shutdown_ = false;
+    int risk_cadence_ = 1;
+    int ticks_since_risk_check_ = 0;
     bool quiet_ = false;
 
     bool use_regime_filter_ = false;
     int regime_lookback_ = 252;
-    std::map<std::string, std::vector<double>> price_history_buffer_;
+    int regime_recluster_every_ = 1;
+    std::vector<StreamingRegimeDetector> regime_detectors_;  // by SymbolId
 
     void check_risk_limits(double timestamp);
     void liquidator(double timestamp, const std::string& reason);
-    void hibernate_positions(double timestamp, const std::string& symbol, double price);
+    void hibernate_positions(double timestamp, SymbolId id, double price);
 
     DataHandler data_;
 
     EquityCurve equity_curve_;
 
-    std::unique_ptr<Strategy> strategy_;
+    std::string strategy_type_;
+    StrategyPtr strategy_;
     RiskManager risk_manager_{0.05, 0.03};
 };
 
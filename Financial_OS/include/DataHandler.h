@@ -1,30 +1,123 @@
 // include/DataHandler.h
 
 #pragma once
+#include <array>
+#include <cmath>
+#include <cstddef>
 #include <string>
-#include <unordered_map>
 #include <vector>
 
+#include "Rolling.h"
+#include "SharedSeries.h"
+#include "SymbolTable.h"
+
+// The engine's single bar store: every OHLC series lives here once, and
+// strategies read the tail they need through the engine instead of keeping
+// their own copies. By default nothing is dropped; set_retention(n) bounds each
+// series to (at least) its last n bars -- see SharedSeries.
+//
+// It also owns the engine's SymbolTable. Per-symbol state sits in a flat vector
+// indexed by SymbolId; the string overloads resolve the name once and forward.
 class DataHandler {
 public:
+    // Log returns over the last 30 closes: the window the risk engine's
+    // parametric VaR is computed on.
+    static constexpr std::size_t kReturnWindow = 29;
+
+    SymbolId intern(const std::string& symbol) {
+        const SymbolId id = symbols_.intern(symbol);
+        if (static_cast<std::size_t>(id) == bars_.size()) {
+            SymbolBars& bars = bars_.emplace_back();
+            for (auto* column : bars.columns()) column->set_retention(retention_);
+        }
+        return id;
+    }
+    [[nodiscard]] const SymbolTable& symbols() const { return symbols_; }
+
+    // id must come from intern(); it is not bounds-checked.
+    void add_bar(SymbolId id, double open, double high, double low, double close) {
+        SymbolBars& bars = bars_[static_cast<std::size_t>(id)];
+        bars.open.push_back(open);
+        bars.high.push_back(high);
+        bars.low.push_back(low);
+        if (bars.close.size() > 0) {
+            const double prev = bars.close.values().back();
+            bars.log_returns.push(std::log(close / prev));
+        }
+        bars.close.push_back(close);
+    }
     void add_bar(const std::string& symbol, double open, double high, double low, double close) {
-        opens_[symbol].push_back(open);
-        highs_[symbol].push_back(high);
-        lows_[symbol].push_back(low);
-        closes_[symbol].push_back(close);
+        add_bar(intern(symbol), open, high, low, close);
     }
 
-    [[nodiscard]] const std::vector<double>& opens(const std::string& symbol) const { return opens_.at(symbol); }
-    [[nodiscard]] const std::vector<double>& highs(const std::string& symbol) const { return highs_.at(symbol); }
-    [[nodiscard]] const std::vector<double>& lows(const std::string& symbol) const { return lows_.at(symbol); }
-    [[nodiscard]] const std::vector<double>& closes(const std::string& symbol) const { return closes_.at(symbol); }
+    [[nodiscard]] const SharedSeries& open_series(SymbolId id) const { return bars_[static_cast<std::size_t>(id)].open; }
+    [[nodiscard]] const SharedSeries& high_series(SymbolId id) const { return bars_[static_cast<std::size_t>(id)].high; }
+    [[nodiscard]] const SharedSeries& low_series(SymbolId id) const { return bars_[static_cast<std::size_t>(id)].low; }
+    [[nodiscard]] const SharedSeries& close_series(SymbolId id) const { return bars_[static_cast<std::size_t>(id)].close; }
 
-    [[nodiscard]] bool has_closes(const std::string& symbol) const { return closes_.count(symbol) > 0; }
+    [[nodiscard]] const std::vector<double>& opens(SymbolId id) const { return open_series(id).values(); }
+    [[nodiscard]] const std::vector<double>& highs(SymbolId id) const { return high_series(id).values(); }
+    [[nodiscard]] const std::vector<double>& lows(SymbolId id) const { return low_series(id).values(); }
+    [[nodiscard]] const std::vector<double>& closes(SymbolId id) const { return close_series(id).values(); }
+
+    // Name-based lookups throw std::out_of_range for a symbol never seen.
+    [[nodiscard]] const SharedSeries& open_series(const std::string& symbol) const { return open_series(symbols_.at(symbol)); }
+    [[nodiscard]] const SharedSeries& high_series(const std::string& symbol) const { return high_series(symbols_.at(symbol)); }
+    [[nodiscard]] const SharedSeries& low_series(const std::string& symbol) const { return low_series(symbols_.at(symbol)); }
+    [[nodiscard]] const SharedSeries& close_series(const std::string& symbol) const { return close_series(symbols_.at(symbol)); }
+
+    [[nodiscard]] const std::vector<double>& opens(const std::string& symbol) const { return open_series(symbol).values(); }
+    [[nodiscard]] const std::vector<double>& highs(const std::string& symbol) const { return high_series(symbol).values(); }
+    [[nodiscard]] const std::vector<double>& lows(const std::string& symbol) const { return low_series(symbol).values(); }
+    [[nodiscard]] const std::vector<double>& closes(const std::string& symbol) const { return close_series(symbol).values(); }
+
+    // Bars ever received for symbol, including any no longer retained.
+    [[nodiscard]] std::size_t bar_count(SymbolId id) const {
+        const auto i = static_cast<std::size_t>(id);
+        return id >= 0 && i < bars_.size() ? bars_[i].close.total() : 0;
+    }
+    [[nodiscard]] std::size_t bar_count(const std::string& symbol) const { return bar_count(symbols_.find(symbol)); }
+    [[nodiscard]] bool has_closes(SymbolId id) const { return bar_count(id) > 0; }
+    [[nodiscard]] bool has_closes(const std::string& symbol) const { return bar_count(symbol) > 0; }
+
+    // 0 = keep full history. Applies to existing and future symbols.
+    void set_retention(std::size_t bars) {
+        retention_ = bars;
+        for (auto& symbol_bars : bars_) {
+            for (auto* column : symbol_bars.columns()) column->set_retention(bars);
+        }
+    }
+    [[nodiscard]] std::size_t retention() const { return retention_; }
+
+    // Rolling sum / sum of squares of the last kReturnWindow log returns,
+    // maintained in O(1) per bar. Only present once a symbol has two closes.
+    [[nodiscard]] const RollingMoments* log_return_stats(SymbolId id) const {
+        const auto i = static_cast<std::size_t>(id);
+        if (id < 0 || i >= bars_.size() || bars_[i].log_returns.count() == 0) return nullptr;
+        return &bars_[i].log_returns;
+    }
+    [[nodiscard]] const RollingMoments* log_return_stats(const std::string& symbol) const {
+        return log_return_stats(symbols_.find(symbol));
+    }
+
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(symbols_, bars_, retention_); }
 
 private:
-    std::unordered_map<std::string, std::vector<double>> opens_;
-    std::unordered_map<std::string, std::vector<double>> highs_;
-    std::unordered_map<std::string, std::vector<double>> lows_;
-    std::unordered_map<std::string, std::vector<double>> closes_;
-};
+    struct SymbolBars {
+        SharedSeries open;
+        SharedSeries high;
+        SharedSeries low;
+        SharedSeries close;
+        RollingMoments log_returns{kReturnWindow};
+
+        std::array<SharedSeries*, 4> columns() { return {&open, &high, &low, &close}; }
 
+        template <typename Ar>
+        void serialize(Ar& ar) { ar(open, high, low, close, log_returns); }
+    };
+
+    SymbolTable symbols_;
+    std::vector<SymbolBars> bars_;
+    std::size_t retention_ = 0;
+};
@@ -1,9 +1,22 @@
 // include/EquityCurve.h
 
 #pragma once
+#include <algorithm>
+#include <cmath>
+#include <cstddef>
+#include <cstdint>
+#include <stdexcept>
 #include <vector>
 
 #include "Analytics.h"
+#include "SharedSeries.h"
+
+// How often the engine appends an equity point. EVERY_TICK records after
+// every bar (one point per symbol per timestamp in a multi-asset run);
+// PER_TIMESTAMP keeps one point per distinct timestamp and INTERVAL one per
+// floor(timestamp / interval) bucket -- in both cases the equity after the
+// last bar of the bucket.
+enum class EquitySampling : std::int8_t { EVERY_TICK, PER_TIMESTAMP, INTERVAL };
 
 class EquityCurve {
 public:
@@ -28,12 +41,69 @@ public:
         }
     }
 
-    [[nodiscard]] double max_drawdown() const { return max_drawdown_; }
+    // Sampled recording. Outside EVERY_TICK the current bucket stays open --
+    // its equity is overwritten by each observation -- and is appended only
+    // once a later bucket starts or flush() is called, so recorded points are
+    // never rewritten (incremental readers of series() stay consistent).
+    void observe(double timestamp, double equity) {
+        if (sampling_ == EquitySampling::EVERY_TICK) {
+            record(equity);
+            return;
+        }
+        const double bucket = sampling_ == EquitySampling::INTERVAL ? std::floor(timestamp / interval_) : timestamp;
+        if (has_open_ && bucket != open_bucket_) record(open_equity_);
+        has_open_ = true;
+        open_bucket_ = bucket;
+        open_equity_ = equity;
+    }
+
+    // Appends the open bucket's point, if any.
+    void flush() {
+        if (has_open_) {
+            record(open_equity_);
+            has_open_ = false;
+        }
+    }
+
+    // Switching mode first flushes the open bucket.
+    void set_sampling(EquitySampling sampling, double interval = 0.0) {
+        if (sampling == EquitySampling::INTERVAL && !(interval > 0.0)) {
+            throw std::invalid_argument("equity sampling interval must be positive");
+        }
+        flush();
+        sampling_ = sampling;
+        interval_ = interval;
+    }
+    [[nodiscard]] EquitySampling sampling() const { return sampling_; }
+    [[nodiscard]] double interval() const { return interval_; }
+
+    // Max drawdown of the recorded points plus the open bucket's current
+    // equity, so a risk check inside a bucket still sees the latest value.
+    [[nodiscard]] double max_drawdown() const {
+        if (!has_open_ || history_.total() == 0 || open_equity_ > peak_) return max_drawdown_;
+        return std::min(max_drawdown_, (open_equity_ - peak_) / peak_);
+    }
 
-    [[nodiscard]] const std::vector<double>& history() const { return history_; }
+    // Keep only (at least) the last `points` equity values; 0 keeps all. The
+    // drawdown statistics above still cover the whole run.
+    void set_retention(std::size_t points) { history_.set_retention(points); }
+
+    [[nodiscard]] const std::vector<double>& history() const { return history_.values(); }
+    [[nodiscard]] const SharedSeries& series() const { return history_; }
+
+    template <typename Ar>
+    void serialize(Ar& ar) {
+        ar(history_, peak_, max_drawdown_, sampling_, interval_, has_open_, open_bucket_, open_equity_);
+    }
 
 private:
-    std::vector<double> history_;
+    SharedSeries history_;
     double peak_ = 0.0;
     double max_drawdown_ = 0.0;
+
+    EquitySampling sampling_ = EquitySampling::EVERY_TICK;
+    double interval_ = 0.0;
+    bool has_open_ = false;
+    double open_bucket_ = 0.0;
+    double open_equity_ = 0.0;
 };
@@ -3,110 +3,78 @@
 #ifndef HYPEROPTIMIZER_H
 #define HYPEROPTIMIZER_H
 
+#include <cstddef>
+#include <cstdint>
+#include <functional>
+#include <map>
+#include <optional>
+#include <string>
 #include <vector>
-#include <algorithm>
-#include <random>
-#include <fmt/core.h>
-#include "Backtester.h"
+#include "Sweep.h"
 
 struct Gene {
     int fast;
     int slow;
     int signal;
     double fitness;
+};
 
-    static Gene Random(std::mt19937& rng) {
-        std::uniform_int_distribution<int> dist_fast(5, 50);
-        std::uniform_int_distribution<int> dist_slow(2, 100);
-        std::uniform_int_distribution<int> dist_signal(5, 30);
+// Bounds of one strategy parameter in the search space. Integer parameters
+// (windows, periods) are sampled and mutated on whole numbers only.
+struct ParamRange {
+    double low;
+    double high;
+    bool integer = false;
+};
 
-        int f = dist_fast(rng);
-        int s = dist_slow(rng);
-        if (f >= s) s = f + 5;
+struct EvolveOptions {
+    int generations = 20;
+    int population_size = 50;
+    double elite_fraction = 0.2;  // best individuals carried over unchanged
+    double mutation_rate = 0.1;   // chance each parameter of a child is perturbed
+    std::optional<std::uint64_t> seed;  // unset: seeded from std::random_device
+    // Stop once the best fitness has not improved by more than `tolerance` for
+    // `patience` consecutive generations (0 = never stop early).
+    int patience = 0;
+    double tolerance = 1e-9;
+    // Stop after the generation during which this much wall time has passed
+    // (0 = no budget).
+    double time_budget_seconds = 0.0;
+    // Applied to every new individual before it is scored, e.g. to keep
+    // MACD's fast window below its slow one.
+    std::function<void(std::map<std::string, double>&)> repair;
+};
 
-        return {f, s, dist_signal(rng), -999.0};
-    }
+struct EvolveResult {
+    std::map<std::string, double> best_params;
+    double best_fitness = 0.0;         // return_pct
+    int generations = 0;               // generations scored
+    std::size_t evaluations = 0;       // distinct backtests run
+    std::size_t cache_hits = 0;        // individuals scored from the memo
+    std::vector<double> best_history;  // best fitness after each generation
+    std::string stop_reason;           // "generations", "plateau" or "time_budget"
 };
 
 class GeneticOptimizer {
 public:
-    static Gene evolve_macd(const std::vector<double>& prices, double initial_capital, int generations = 10, int population_size = 50) {
-        std::random_device rd;
-        std::mt19937 rng(rd());
-
-        std::vector<Gene> population;
-        for (int i = 0; i < population_size; ++i) {
-            population.push_back(Gene::Random(rng));
-        }
-
-        for (int gen = 0; gen < generations; ++gen) {
-            for (auto& individual : population) {
-                individual.fitness = Evaluate(individual, prices, initial_capital);
-            }
-
-            std::sort(population.begin(), population.end(), [](const Gene& a, const Gene& b){
-                return a.fitness > b.fitness;
-            });
-
-            std::vector<Gene> next_generation;
-
-            int elite_count = population_size * 0.2;
-            for (int i = 0; i < elite_count; ++i) next_generation.push_back(population[i]);
-
-            while (next_generation.size() < static_cast<size_t>(population_size)) {
-                Gene p1 = TournamentSelect(population, rng);
-                Gene p2 = TournamentSelect(population, rng);
-                Gene child = Crossover(p1, p2, rng);
-                Mutate(child, rng);
-                next_generation.push_back(child);
-            }
-            population = next_generation;
-        }
-
-        return population[0];
-    }
-
-private:
-    static double Evaluate(const Gene& c, const std::vector<double>& prices, double capital) {
-        Backtester engine(capital, "MACD", 1.0);
-        engine.set_macd_parameters(c.fast, c.slow, c.signal);
-
-        for (size_t t = 0; t < prices.size(); ++t) {
-            engine.on_market_data("TARGET", static_cast<double>(t), prices[t], prices[t], prices[t], prices[t]);
-        }
-        return (engine.get_total_equity() - capital) / capital * 100.0;
-    }
-
-    static Gene TournamentSelect(const std::vector<Gene>& pop, std::mt19937& rng) {
-        std::uniform_int_distribution<int> dist_idx(0, pop.size() - 1);
-        Gene best = pop[dist_idx(rng)];
-        for (int i = 0; i < 2; ++i) {
-            Gene contender = pop[dist_idx(rng)];
-            if (contender.fitness > best.fitness) best = contender;
-        }
-        return best;
-    }
-
-    static Gene Crossover(const Gene& p1, Gene& p2, std::mt19937& rng) {
-        std::uniform_int_distribution<int> dist_split(0, 1);
-        Gene child = {
-            dist_split(rng) ? p1.fast : p2.fast,
-            dist_split(rng) ? p1.slow : p2.slow,
-            dist_split(rng) ? p1.signal : p2.signal,
-            -999.0
-        };
-        if (child.fast >= child.slow) child.slow = child.fast + 5;
-        return child;
-    }
-
-    static void Mutate(Gene& c, std::mt19937& rng) {
-        std::uniform_real_distribution<double> dist_prob(0.0, 1.0);
-        std::uniform_int_distribution<int> dist_val(-2, 2);
-
-        if (dist_prob(rng) < 0.1) c.fast = std::max(2, c.fast + dist_val(rng));
-        if (dist_prob(rng) < 0.1) c.slow = std::max(c.fast + 5, c.slow + dist_val(rng));
-        if (dist_prob(rng) < 0.1) c.signal = std::max(2, c.signal + dist_val(rng));
-    }
+    // Evolutionary search over `space` for the parameters of `strategy` that
+    // maximise return_pct on `data`. Each generation's unscored individuals
+    // are backtested together through RunSweep() on the shared worker pool;
+    // fitness is memoised by parameter tuple, so elites and duplicates are
+    // never run twice. With a seed the search is reproducible. Bad bounds,
+    // options, strategies or parameter names throw std::invalid_argument.
+    static EvolveResult evolve(const std::string& strategy, const std::map<std::string, ParamRange>& space,
+                               const SweepData& data, const SweepOptions& options = {},
+                               const EvolveOptions& evolve_options = {}, unsigned int num_threads = 0);
+
+    // evolve_macd's repair: a slow window at or below the fast one becomes
+    // fast + 5. A no-op unless both are present.
+    static void repair_macd(std::map<std::string, double>& params);
+
+    // MACD over a single close series (fast 5-50, slow 2-100, signal 5-30,
+    // slow kept above fast by repair_macd).
+    static Gene evolve_macd(const std::vector<double>& prices, double initial_capital, int generations = 10,
+                            int population_size = 50, std::optional<std::uint64_t> seed = std::nullopt);
 };
 
-#endif
\ No newline at end of file
+#endif
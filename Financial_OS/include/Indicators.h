@@ -0,0 +1,53 @@
+// include/Indicators.h
+
+#pragma once
+#include <cstddef>
+
+// Row-major (rows x cols) panel of doubles: row t is one timestamp, column j
+// one symbol. A single series is a panel with cols == 1.
+struct PanelView {
+    const double* data;
+    std::size_t rows;
+    std::size_t cols;
+};
+
+// Batch indicators over a whole panel, built on the same Rolling.h kernels
+// the strategies update per bar -- a column here is bit-identical to what a
+// strategy sees after receiving those closes one by one. Columns are
+// independent and processed in parallel (num_threads as in ParallelFor).
+//
+// Every output buffer has the panel's shape. Rows before an indicator has a
+// value are NaN. A row with a non-finite input is a missing bar, skipped as
+// run_panel skips it: its outputs are NaN and the column resumes, state
+// intact, at its next finite row (so a symbol that lists late behaves as if
+// the engine first saw it there). Periods below the documented minimum throw
+// std::invalid_argument.
+class Indicators {
+public:
+    // EMA with alpha = 2 / (period + 1), seeded with the first value (EMAStrategy).
+    static void EMA(PanelView prices, int period, double* out, unsigned int num_threads = 0);
+
+    // MACDStrategy's line, signal and histogram (line - signal). The line is
+    // defined from the slow_period-th price on; the signal EMA is seeded with
+    // its first value.
+    static void MACD(PanelView prices, int fast_period, int slow_period, int signal_period, double* line,
+                     double* signal, double* histogram, unsigned int num_threads = 0);
+
+    // Simple-average RSI over the last `period` changes (RSIStrategy,
+    // Analytics::CalculateRSI); defined from row `period` on.
+    static void RSI(PanelView prices, int period, double* out, unsigned int num_threads = 0);
+
+    // Mean +/- mult * population std. dev. of the last `period` prices
+    // (BollingerStrategy); defined from row period - 1 on.
+    static void Bollinger(PanelView prices, int period, double mult, double* middle, double* upper, double* lower,
+                          unsigned int num_threads = 0);
+
+    // Population std. dev. of the last `window` log returns -- the per-bar
+    // volatility the VaR check reads from DataHandler (window 29 there).
+    static void RollingVolatility(PanelView prices, int window, double* out, unsigned int num_threads = 0);
+
+    // Yang-Zhang volatility over the last `window` bars (RollingYangZhang);
+    // all four panels must have the same shape. window must be at least 2.
+    static void YangZhang(PanelView open, PanelView high, PanelView low, PanelView close, int window, double* out,
+                          unsigned int num_threads = 0);
+};
@@ -0,0 +1,80 @@
+// include/KalmanBank.h
+
+#ifndef KALMAN_BANK_H
+#define KALMAN_BANK_H
+
+#include <cstddef>
+#include <utility>
+#include <vector>
+#include "Indicators.h"
+
+// Many independent pair filters stepped together. Pair k tracks
+// y = intercept + hedge_ratio * x with the two-state filter of KalmanFilter
+// (random-walk state noise delta, observation noise vt), and the z-score of
+// its spread over the last `window` spreads as KalmanPairsStrategy computes
+// it. The state is kept structure-of-arrays -- one vector per quantity,
+// indexed by pair -- so a step over every pair is a few straight loops over
+// contiguous doubles instead of one 2x2 Eigen filter object per pair.
+class KalmanBank {
+public:
+    KalmanBank() = default;
+    KalmanBank(std::size_t pairs, std::size_t window, double delta = 1e-4, double vt = 1e-3);
+
+    // One step for every pair, x[k] and y[k] being pair k's leg prices. A pair
+    // with a non-finite leg keeps its state and gets a NaN spread and z-score.
+    void update(const double* x, const double* y);
+    // One step for pairs[0..count) only, x[i] and y[i] being the legs of pairs[i].
+    void update(const std::size_t* pairs, std::size_t count, const double* x, const double* y);
+
+    [[nodiscard]] std::size_t size() const { return theta0_.size(); }
+    [[nodiscard]] std::size_t window() const { return window_; }
+    [[nodiscard]] double intercept(std::size_t k) const { return theta0_[k]; }
+    [[nodiscard]] double hedge_ratio(std::size_t k) const { return theta1_[k]; }
+    // Spread and z-score at pair k's last step; the z-score is NaN until a
+    // full window of spreads is in, or while they are flat.
+    [[nodiscard]] double spread(std::size_t k) const { return spread_[k]; }
+    [[nodiscard]] double z_score(std::size_t k) const { return z_[k]; }
+
+    // A fresh bank run over a (T, N) price panel, pairs[k] naming the (x, y)
+    // columns of pair k. Each output is (T, pairs) row-major: the state after
+    // row t. Pairs are split into blocks run in parallel on the shared pool.
+    // Columns out of range, an empty pair list or window 0 throw
+    // std::invalid_argument.
+    static void Run(PanelView prices, const std::vector<std::pair<std::size_t, std::size_t>>& pairs,
+                    std::size_t window, double delta, double vt, double* hedge_ratio, double* intercept,
+                    double* spread, double* z_score, unsigned int num_threads = 0);
+
+    template <typename Ar>
+    void serialize(Ar& ar) {
+        ar(window_, delta_, vt_, theta0_, theta1_, p00_, p01_, p11_, spread_, z_, ring_, head_, count_, sum_, sum_sq_,
+           since_resum_);
+    }
+
+private:
+    bool filter(std::size_t k, double x, double y);
+    void push(std::size_t k);
+
+    std::size_t window_ = 1;
+    double delta_ = 1e-4;
+    double vt_ = 1e-3;
+
+    // Filter state: theta = (intercept, hedge ratio), P symmetric.
+    std::vector<double> theta0_;
+    std::vector<double> theta1_;
+    std::vector<double> p00_;
+    std::vector<double> p01_;
+    std::vector<double> p11_;
+    std::vector<double> spread_;
+    std::vector<double> z_;
+
+    // Spread window per pair (ring_[k * window_ ...]) with running sums,
+    // re-summed every window_ pushes as RollingMoments does.
+    std::vector<double> ring_;
+    std::vector<std::size_t> head_;
+    std::vector<std::size_t> count_;
+    std::vector<double> sum_;
+    std::vector<double> sum_sq_;
+    std::vector<std::size_t> since_resum_;
+};
+
+#endif
@@ -39,6 +39,14 @@ public:
         return y - (theta_(0) + theta_(1) * x);
     }
 
+    template <typename Ar>
+    void serialize(Ar& ar) {
+        for (Eigen::Index i = 0; i < theta_.size(); ++i) ar(theta_(i));
+        for (Eigen::Index i = 0; i < P_.size(); ++i) ar(P_(i));
+        for (Eigen::Index i = 0; i < Vw_.size(); ++i) ar(Vw_(i));
+        ar(Vv_);
+    }
+
 private:
     Eigen::Vector2d theta_;
     Eigen::Matrix2d P_;
@@ -9,6 +9,8 @@
 #include <numeric>
 #include <algorithm>
 #include <random>
+#include <cstdint>
+#include <optional>
 #include <Eigen/Dense>
 
 struct OptimizationResult {
@@ -21,7 +23,12 @@ struct OptimizationResult {
 class Optimizer {
 public:
     void add_asset(const std::string& symbol, const std::vector<double>& returns);
-    OptimizationResult optimize_sharpe_ratio(int num_simulations, double risk_free_rate, unsigned int num_threads = 0);
+    // Best Sharpe ratio among num_simulations random long-only portfolios.
+    // With a seed the result is reproducible, whatever num_threads is;
+    // unset, it is seeded from std::random_device. num_simulations <= 0
+    // throws std::invalid_argument.
+    OptimizationResult optimize_sharpe_ratio(int num_simulations, double risk_free_rate, unsigned int num_threads = 0,
+                                             std::optional<std::uint64_t> seed = std::nullopt);
     OptimizationResult optimize_inverse_volatility(double risk_free_rate = 0.0);
     OptimizationResult optimize_minimum_variance(double risk_free_rate = 0.0);
     OptimizationResult optimize_max_sharpe_analytic(double risk_free_rate = 0.0);
@@ -6,6 +6,7 @@
 #include <string>
 #include <map>
 #include <Eigen/Dense>
+#include "Indicators.h"
 
 struct PCAResult {
     std::map<std::string, double> z_scores;
@@ -15,4 +16,70 @@ struct PCAResult {
 class PCAArbitrage {
 public:
     static PCAResult CalculateSignals(const std::map<std::string, std::vector<double>>& prices, int num_components = 1);
-};
\ No newline at end of file
+
+    // CalculateSignals on every trailing `window` prices of a (T, N) price
+    // panel, through StreamingPCA: out is (T, N) row-major z-scores, NaN
+    // for the first window - 1 rows. window must be at least 3.
+    static void RollingSignals(PanelView prices, int window, double* out, int num_components = 1,
+                               int refactor_every = 50);
+};
+
+// CalculateSignals over a sliding window of return rows (one return per
+// asset per row), kept up to date as rows arrive instead of rebuilt. The
+// window's sums and cross-products are updated per row -- add the new row,
+// drop the oldest, O(N^2) -- and the top components are refined from the
+// previous row's by subspace iteration, O(N^2 K) per sweep. A full
+// eigendecomposition, with the sums re-accumulated from the window to shed
+// drift, runs once the window first fills, every `refactor_every` rows, and
+// whenever the iteration fails to converge. The z-scores and explained
+// variance match CalculateSignals on the same window to within `tolerance`.
+class StreamingPCA {
+public:
+    StreamingPCA() = default;
+    StreamingPCA(std::size_t assets, std::size_t window, int num_components = 1, int refactor_every = 50,
+                 double tolerance = 1e-10);
+
+    // Appends one row of `assets` returns, dropping the oldest once the
+    // window is full, and recomputes the signals if it is.
+    void push(const double* returns);
+
+    [[nodiscard]] std::size_t assets() const { return n_; }
+    [[nodiscard]] bool ready() const { return rows_ == window_ && window_ > 1; }
+    // By asset, for the latest row; empty until ready().
+    [[nodiscard]] const std::vector<double>& z_scores() const { return z_; }
+    [[nodiscard]] const std::vector<double>& explained_variance() const { return explained_; }
+    // Full eigendecompositions so far.
+    [[nodiscard]] std::size_t refactors() const { return refactors_; }
+
+    template <typename Ar>
+    void serialize(Ar& ar) {
+        ar(n_, window_, k_, block_, refactor_every_, tolerance_, ring_, head_, rows_, since_refactor_, refactors_, sum_,
+           cross_, components_, z_, explained_);
+    }
+
+private:
+    [[nodiscard]] Eigen::MatrixXd covariance(Eigen::VectorXd& mean, Eigen::VectorXd& scale) const;
+    void resum();
+    void refactor(const Eigen::MatrixXd& cov);
+    bool refine(const Eigen::MatrixXd& cov);
+    void signals(const Eigen::MatrixXd& cov, const Eigen::VectorXd& mean, const Eigen::VectorXd& scale);
+
+    std::size_t n_ = 0;
+    std::size_t window_ = 0;
+    std::size_t k_ = 1;
+    std::size_t block_ = 1;  // vectors iterated: k_ plus a few more, for speed
+    int refactor_every_ = 50;
+    double tolerance_ = 1e-10;
+
+    std::vector<double> ring_;  // window_ x n_ rows; the oldest at head_ once full
+    std::size_t head_ = 0;
+    std::size_t rows_ = 0;
+    std::size_t since_refactor_ = 0;
+    std::size_t refactors_ = 0;
+
+    std::vector<double> sum_;         // per asset, over the window
+    std::vector<double> cross_;       // n_ x n_ sums of r_j * r_k, lower triangle kept
+    std::vector<double> components_;  // n_ x block_ column-major; empty before the first refactor
+    std::vector<double> z_;
+    std::vector<double> explained_;
+};
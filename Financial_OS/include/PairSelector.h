@@ -5,6 +5,7 @@
 #include <vector>
 #include <map>
 #include "Analytics.h"
+#include "Indicators.h"
 
 struct PairResult {
     std::string asset_a;
@@ -14,7 +15,74 @@ struct PairResult {
     double r_squared;
 };
 
+// Thresholds of the cointegration funnel, applied in order of cost: a pair
+// is only tested further if it passed every earlier stage.
+struct CointegrationOptions {
+    double min_correlation = 0.5;       // 1: |log-return correlation| at least this...
+    std::size_t max_candidates = 5000;  //    ...and among this many most correlated pairs
+    int adf_lags = 1;                   // 2: Engle-Granger ADF below the critical value
+    double significance = 0.05;         //    at this level (0.01, 0.05 or 0.10)
+    double min_half_life = 1.0;         // 3: spread half-life within [min, max] bars
+    double max_half_life = 252.0;
+    double max_hurst = 1.0;             // 4: spread Hurst exponent at most this (1 = report only)
+    int hurst_max_lag = 20;
+    bool single_precision = false;      // float GEMM for stage 1
+};
+
+// A pair that passed every stage: log(a) = alpha + beta * log(b) + spread.
+struct CointegratedPair {
+    std::string asset_a;
+    std::string asset_b;
+    double correlation;
+    double alpha;
+    double beta;
+    double adf_statistic;
+    double half_life;
+    double hurst;
+};
+
+struct CointegrationReport {
+    std::vector<CointegratedPair> pairs;  // most negative ADF statistic first
+    double critical_value = 0.0;          // the ADF threshold used
+    // How many pairs reached each stage, and columns left out for gaps.
+    std::size_t screened = 0;
+    std::size_t correlated = 0;
+    std::size_t stationary = 0;
+    std::size_t mean_reverting = 0;
+    std::size_t skipped_symbols = 0;
+};
+
+// Pair screening on log-return correlations. The returns are standardised
+// once into a matrix Z whose column products are the correlations, and Z^T Z
+// is evaluated in square tiles on the shared worker pool, so memory stays at
+// one tile per worker however wide the universe. Each tile keeps only its
+// best top_n pairs (a bounded heap), ranked by |correlation|, ties by symbol
+// order. single_precision runs the GEMM in float, halving memory and
+// roughly doubling throughput for very wide universes at ~1e-6 accuracy.
 class PairSelector {
 public:
-    static std::vector<PairResult> FindTopPairs(const std::map<std::string, std::vector<double>>& data, int top_n = 5);
-};
\ No newline at end of file
+    // Series with fewer than 30 prices are skipped; series of different
+    // lengths have correlation 0, as Analytics::CalculateCorrelation.
+    static std::vector<PairResult> FindTopPairs(const std::map<std::string, std::vector<double>>& data, int top_n = 5,
+                                                bool single_precision = false, unsigned int num_threads = 0);
+
+    // Same screen over a (T, N) price panel, one column per symbol.
+    static std::vector<PairResult> FindTopPairs(PanelView prices, const std::vector<std::string>& symbols,
+                                                int top_n = 5, bool single_precision = false,
+                                                unsigned int num_threads = 0);
+
+    // The full N x N log-return correlation matrix of a (T, N) price panel,
+    // written row-major to `out`.
+    static void CorrelationMatrix(PanelView prices, double* out, bool single_precision = false,
+                                  unsigned int num_threads = 0);
+
+    // Engle-Granger screen over a (T, N) price panel. Stage 1 is the
+    // correlation screen above; the surviving candidates are then tested in
+    // parallel, each regressing log(a) on log(b) and checking the residual
+    // spread's ADF statistic, half-life and Hurst exponent, stopping at the
+    // first stage it fails. Columns with a missing or non-positive price are
+    // skipped. Bad options throw std::invalid_argument.
+    static CointegrationReport ScreenCointegration(PanelView prices, const std::vector<std::string>& symbols,
+                                                   const CointegrationOptions& options = {},
+                                                   unsigned int num_threads = 0);
+};
@@ -0,0 +1,16 @@
+// include/Parallel.h
+
+#pragma once
+#include <cstddef>
+#include <functional>
+
+// Runs body(i) for every i in [0, n) on the engine's shared worker pool and
+// blocks until all calls have returned. num_threads == 1 uses a dedicated
+// single worker (deterministic ordering for debugging); anything else uses the
+// pool sized to hardware_concurrency(). body must be safe to call concurrently
+// for different i, and must not call ParallelFor itself (the waiting caller
+// would hold a worker the nested loop needs). If body throws, ParallelFor
+// still waits for every call to finish, then rethrows the first exception
+// (in index-block order) to the caller; the rest of the loop's output is then
+// unspecified.
+void ParallelFor(std::size_t n, const std::function<void(std::size_t)>& body, unsigned int num_threads = 0);
@@ -1,10 +1,18 @@
 // include/Portfolio.h
 
 #pragma once
+#include <algorithm>
+#include <cmath>
+#include <cstddef>
+#include <cstdint>
 #include <string>
-#include <unordered_map>
 #include <vector>
 
+#include "SymbolTable.h"
+
+enum class Side : std::int8_t { SELL = -1, BUY = 1 };
+
+// Row view of one fill, materialized on demand from the TradeLedger.
 struct Trade {
     int id;
     std::string symbol;
@@ -15,59 +23,159 @@ struct Trade {
     double timestamp;
 };
 
+// Column-wise trade log. Symbols are dictionary-encoded (symbol_ids index into
+// symbols()), sides are the Side enum, and the trade id is the row number, so a
+// fill costs a handful of scalar appends instead of a string-bearing struct.
+class TradeLedger {
+public:
+    void append(const std::string& symbol, Side side, double quantity, double price,
+                double commission, double timestamp) {
+        symbol_ids_.push_back(symbols_.intern(symbol));
+        sides_.push_back(static_cast<std::int8_t>(side));
+        quantities_.push_back(quantity);
+        prices_.push_back(price);
+        commissions_.push_back(commission);
+        timestamps_.push_back(timestamp);
+    }
+
+    [[nodiscard]] std::size_t size() const { return symbol_ids_.size(); }
+
+    [[nodiscard]] const std::vector<std::string>& symbols() const { return symbols_.names(); }
+    [[nodiscard]] const std::vector<std::int32_t>& symbol_ids() const { return symbol_ids_; }
+    [[nodiscard]] const std::vector<std::int8_t>& sides() const { return sides_; }
+    [[nodiscard]] const std::vector<double>& quantities() const { return quantities_; }
+    [[nodiscard]] const std::vector<double>& prices() const { return prices_; }
+    [[nodiscard]] const std::vector<double>& commissions() const { return commissions_; }
+    [[nodiscard]] const std::vector<double>& timestamps() const { return timestamps_; }
+
+    [[nodiscard]] Trade row(std::size_t i) const {
+        return {static_cast<int>(i), symbols_.name(symbol_ids_[i]),
+                sides_[i] == static_cast<std::int8_t>(Side::BUY) ? "BUY" : "SELL",
+                quantities_[i], prices_[i], commissions_[i], timestamps_[i]};
+    }
+
+    template <typename Ar>
+    void serialize(Ar& ar) {
+        ar(symbols_, symbol_ids_, sides_, quantities_, prices_, commissions_, timestamps_);
+    }
+
+    [[nodiscard]] std::vector<Trade> rows() const {
+        std::vector<Trade> out;
+        out.reserve(size());
+        for (std::size_t i = 0; i < size(); ++i) out.push_back(row(i));
+        return out;
+    }
+
+private:
+    SymbolTable symbols_;
+    std::vector<std::int32_t> symbol_ids_;
+    std::vector<std::int8_t> sides_;
+    std::vector<double> quantities_;
+    std::vector<double> prices_;
+    std::vector<double> commissions_;
+    std::vector<double> timestamps_;
+};
+
+// Cash, positions and last marks. Positions are keyed by the engine's dense
+// SymbolId (flat vectors, no hashing on the tick path); the symbol name is only
+// needed when a fill is written to the ledger.
 class Portfolio {
 public:
     explicit Portfolio(double initial_capital) : cash_(initial_capital) {}
 
-    void mark(const std::string& symbol, double price) { last_price_[symbol] = price; }
+    void mark(SymbolId id, double price) {
+        ensure(id);
+        const auto i = static_cast<std::size_t>(id);
+        const double old_price = marked_[i] ? last_price_[i] : 0.0;
+        last_price_[i] = price;
+        marked_[i] = 1;
+        if (holdings_[i] != 0.0) revalue(holdings_[i] * (price - old_price));
+    }
 
-    void execute(const std::string& symbol, const std::string& side,
-                 double quantity, double price, double timestamp) {
+    void execute(SymbolId id, const std::string& symbol, Side side, double quantity, double price, double timestamp) {
         if (quantity <= 0) return;
-
+        ensure(id);
         double commission = quantity * price * 0.0001;
-
-        if (side == "BUY") {
+        const auto i = static_cast<std::size_t>(id);
+        if (side == Side::BUY) {
             cash_ -= (quantity * price + commission);
-            holdings_[symbol] += quantity;
-            trades_.push_back({(int)trades_.size(), symbol, "BUY", quantity, price, commission, timestamp});
-        } else if (side == "SELL") {
+            holdings_[i] += quantity;
+        } else {
             cash_ += (quantity * price - commission);
-            holdings_[symbol] -= quantity;
-            trades_.push_back({(int)trades_.size(), symbol, "SELL", quantity, price, commission, timestamp});
+            holdings_[i] -= quantity;
         }
+        // Positions are valued at the last mark, not the fill price.
+        if (marked_[i]) revalue(static_cast<double>(side) * quantity * last_price_[i]);
+        trades_.append(symbol, side, quantity, price, commission, timestamp);
     }
 
-    [[nodiscard]] double total_equity() const {
-        double total = cash_ + custom_pnl_;
-        for (const auto& [sym, qty] : holdings_) {
-            if (last_price_.count(sym)) {
-                total += qty * last_price_.at(sym);
+    // O(1): cash plus the running market value kept by mark()/execute().
+    [[nodiscard]] double total_equity() const { return cash_ + custom_pnl_ + market_value_; }
+
+    // Sum of holding * last price over marked symbols, recomputed from scratch
+    // in id order. total_equity() tracks this up to rounding.
+    [[nodiscard]] double full_market_value() const {
+        double total = 0.0;
+        for (std::size_t i = 0; i < holdings_.size(); ++i) {
+            if (marked_[i]) {
+                total += holdings_[i] * last_price_[i];
             }
         }
         return total;
     }
 
-    [[nodiscard]] double holding(const std::string& symbol) const {
-        if (holdings_.count(symbol)) return holdings_.at(symbol);
-        return 0.0;
+    [[nodiscard]] double holding(SymbolId id) const {
+        const auto i = static_cast<std::size_t>(id);
+        return id >= 0 && i < holdings_.size() ? holdings_[i] : 0.0;
+    }
+    [[nodiscard]] double last_price(SymbolId id) const {
+        const auto i = static_cast<std::size_t>(id);
+        return id >= 0 && i < last_price_.size() && marked_[i] ? last_price_[i] : 0.0;
     }
+    // Positions indexed by SymbolId (0 for symbols never traded); may be
+    // shorter than the symbol table.
+    [[nodiscard]] const std::vector<double>& holdings() const { return holdings_; }
 
     [[nodiscard]] double cash() const { return cash_; }
     void set_custom_pnl(double pnl) { custom_pnl_ = pnl; }
+    [[nodiscard]] const TradeLedger& trades() const { return trades_; }
 
-    [[nodiscard]] const std::unordered_map<std::string, double>& holdings() const { return holdings_; }
-    [[nodiscard]] const std::vector<Trade>& trades() const { return trades_; }
-
-    [[nodiscard]] double last_price(const std::string& symbol) const {
-        auto it = last_price_.find(symbol);
-        return it != last_price_.end() ? it->second : 0.0;
+    template <typename Ar>
+    void serialize(Ar& ar) {
+        ar(cash_, custom_pnl_, holdings_, last_price_, marked_, market_value_, updates_since_resum_, trades_);
     }
 
 private:
+    // Applies a change in market value. The running sum is rebuilt from the
+    // positions once every max(kMinResumInterval, #symbols) updates, which
+    // keeps the amortized cost O(1) while bounding floating-point drift. A
+    // non-finite running value (a NaN/inf mark) is rebuilt right away, so it
+    // clears as soon as the bad price is marked over, like the old full sum.
+    void revalue(double delta) {
+        market_value_ += delta;
+        if (++updates_since_resum_ >= std::max(kMinResumInterval, holdings_.size()) || !std::isfinite(market_value_)) {
+            market_value_ = full_market_value();
+            updates_since_resum_ = 0;
+        }
+    }
+
+    static constexpr std::size_t kMinResumInterval = 256;
+
+    void ensure(SymbolId id) {
+        const auto needed = static_cast<std::size_t>(id) + 1;
+        if (holdings_.size() < needed) {
+            holdings_.resize(needed, 0.0);
+            last_price_.resize(needed, 0.0);
+            marked_.resize(needed, 0);
+        }
+    }
+
     double cash_;
     double custom_pnl_ = 0.0;
-    std::unordered_map<std::string, double> holdings_;
-    std::unordered_map<std::string, double> last_price_;
-    std::vector<Trade> trades_;
+    std::vector<double> holdings_;
+    std::vector<double> last_price_;
+    std::vector<std::uint8_t> marked_;
+    double market_value_ = 0.0;
+    std::size_t updates_since_resum_ = 0;
+    TradeLedger trades_;
 };
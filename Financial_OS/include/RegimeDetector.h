@@ -1,9 +1,13 @@
 // include/RegimeDetector.h
 
 #pragma once
+#include <cstddef>
+#include <map>
 #include <vector>
 #include <string>
 
+#include "Rolling.h"
+
 enum class MarketState {
     BEAR = 0,
     SIDEWAYS = 1,
@@ -18,7 +22,85 @@ struct RegimeResult {
     double current_trend;
 };
 
+// Per-bar regime history of one series, column-wise. state_id is -1 during
+// warm-up, where volatility and trend are 0 (as in RegimeResult).
+struct RegimeSeries {
+    std::vector<int> state_id;
+    std::vector<double> volatility;
+    std::vector<double> trend;
+};
+
 class RegimeDetector {
 public:
     static RegimeResult DetectRegime(const std::vector<double>& prices, int window_size = 20);
-};
\ No newline at end of file
+
+    // Label every bar in one pass through a StreamingRegimeDetector (see below
+    // for how its labels relate to DetectRegime on each prefix).
+    static RegimeSeries LabelSeries(const std::vector<double>& prices, int window_size = 20, int lookback = 252,
+                                    int recluster_every = 1);
+    // LabelSeries for every symbol, one symbol per task on the shared pool.
+    static std::map<std::string, RegimeSeries> LabelUniverse(const std::map<std::string, std::vector<double>>& universe,
+                                                             int window_size = 20, int lookback = 252,
+                                                             int recluster_every = 1, unsigned int num_threads = 0);
+};
+
+// Streaming counterpart of DetectRegime for one price series. Each price costs
+// O(1) to ingest: the (volatility, trend) feature of the trailing window comes
+// from rolling sums, and the feature set is a ring bounded by `lookback`, so
+// memory stays flat however long the stream runs. classify() warm-starts
+// k-means from the previous centroids and only re-runs it every
+// `recluster_every` calls; in between, the newest point is assigned to its
+// nearest centroid. Features and the warm-up rules match DetectRegime; cluster
+// labels can differ where the warm start settles in a different local optimum.
+class StreamingRegimeDetector {
+public:
+    explicit StreamingRegimeDetector(int window_size = 20, int lookback = 252, int recluster_every = 1);
+
+    void update(double price);
+    RegimeResult classify();
+
+    [[nodiscard]] std::size_t count() const { return seen_; }
+    void set_recluster_every(int recluster_every) { recluster_every_ = recluster_every; }
+
+    template <typename Ar>
+    void serialize(Ar& ar) {
+        ar(window_, lookback_, recluster_every_, prices_, returns_, vols_, trends_, clusters_,
+           feature_head_, feature_count_, pending_vol_, pending_trend_, has_pending_,
+           centroid_vol_, centroid_trend_, centroids_ready_, seen_, since_recluster_);
+    }
+
+private:
+    static constexpr int K = 3;
+
+    [[nodiscard]] std::size_t feature_index(std::size_t age) const;
+    int nearest_centroid(double vol, double trend) const;
+    void init_centroids();
+    void run_kmeans();
+
+    int window_;
+    int lookback_;
+    int recluster_every_;
+
+    std::vector<double> prices_;  // ring of the last window_ prices
+    RollingMoments returns_;      // log returns inside that window
+
+    // Ring of (vol, trend, cluster) for past windows, capacity lookback_ - window_.
+    std::vector<double> vols_;
+    std::vector<double> trends_;
+    std::vector<int> clusters_;
+    std::size_t feature_head_ = 0;
+    std::size_t feature_count_ = 0;
+
+    // Window ending at the newest price; DetectRegime only clusters up to the
+    // window ending one price earlier, so it joins the ring on the next update.
+    double pending_vol_ = 0.0;
+    double pending_trend_ = 0.0;
+    bool has_pending_ = false;
+
+    std::vector<double> centroid_vol_;
+    std::vector<double> centroid_trend_;
+    bool centroids_ready_ = false;
+
+    std::size_t seen_ = 0;
+    int since_recluster_ = 0;
+};
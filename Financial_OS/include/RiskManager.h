@@ -32,6 +32,9 @@ public:
         return false;
     }
 
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(stop_loss_pct_, trailing_stop_pct_); }
+
 private:
     double stop_loss_pct_;
     double trailing_stop_pct_;
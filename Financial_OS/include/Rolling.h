@@ -0,0 +1,305 @@
+// include/Rolling.h
+
+#pragma once
+#include <algorithm>
+#include <cmath>
+#include <cstddef>
+#include <vector>
+
+// Incremental indicator kernels: each push() is O(1) regardless of window
+// length, and each kernel reproduces the batch formula it replaces (noted per
+// class) up to rounding. Windowed sums are rebuilt from the window every
+// `window` pushes, which bounds drift and flushes NaN/inf once they leave.
+
+// Fixed-window running sum and sum of squares, O(1) per push. The sums are
+// rebuilt from the window (oldest to newest, starting from 0.0 -- the same
+// order as std::accumulate / std::inner_product over that window) once every
+// `window` pushes. That bounds floating-point drift, and a NaN/inf that has
+// left the window stops contaminating the sums at the next rebuild.
+class RollingMoments {
+public:
+    explicit RollingMoments(std::size_t window = 1) : buf_(window > 0 ? window : 1) {}
+
+    void push(double x) {
+        const std::size_t window = buf_.size();
+        if (count_ == window) {
+            const double old = buf_[head_];
+            sum_ -= old;
+            sum_sq_ -= old * old;
+        } else {
+            ++count_;
+        }
+        buf_[head_] = x;
+        if (++head_ == window) head_ = 0;
+        sum_ += x;
+        sum_sq_ += x * x;
+
+        if (++pushes_since_resum_ >= window) resum();
+    }
+
+    [[nodiscard]] std::size_t window() const { return buf_.size(); }
+    [[nodiscard]] std::size_t count() const { return count_; }
+    [[nodiscard]] bool full() const { return count_ == buf_.size(); }
+    [[nodiscard]] double sum() const { return sum_; }
+    [[nodiscard]] double sum_sq() const { return sum_sq_; }
+    [[nodiscard]] double mean() const { return count_ == 0 ? 0.0 : sum_ / static_cast<double>(count_); }
+    // Population variance, clamped at 0 against cancellation in sum_sq/n - mean^2.
+    [[nodiscard]] double variance() const {
+        if (count_ == 0) return 0.0;
+        const double m = mean();
+        return std::max(0.0, sum_sq_ / static_cast<double>(count_) - m * m);
+    }
+
+    // Population standard deviation, same formula as Analytics::CalculateVolatility.
+    [[nodiscard]] double volatility() const {
+        if (count_ == 0) return 0.0;
+        const double n = static_cast<double>(count_);
+        const double mean = sum_ / n;
+        const double variance = (sum_sq_ / n) - (mean * mean);
+        return std::sqrt(variance);
+    }
+
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(buf_, head_, count_, sum_, sum_sq_, pushes_since_resum_); }
+
+private:
+    void resum() {
+        const std::size_t window = buf_.size();
+        const std::size_t oldest = count_ == window ? head_ : 0;
+        sum_ = 0.0;
+        sum_sq_ = 0.0;
+        for (std::size_t i = 0; i < count_; ++i) {
+            const double x = buf_[(oldest + i) % window];
+            sum_ += x;
+            sum_sq_ += x * x;
+        }
+        pushes_since_resum_ = 0;
+    }
+
+    std::vector<double> buf_;
+    std::size_t head_ = 0;
+    std::size_t count_ = 0;
+    double sum_ = 0.0;
+    double sum_sq_ = 0.0;
+    std::size_t pushes_since_resum_ = 0;
+};
+
+// Windowed sums of (x, y) pairs for an OLS fit y = a + b*x over the last
+// `window` pairs -- the sums an AR(1) refit over a price window needs.
+class RollingOLS {
+public:
+    explicit RollingOLS(std::size_t window = 1) : xs_(window > 0 ? window : 1), ys_(xs_.size()) {}
+
+    void push(double x, double y) {
+        const std::size_t window = xs_.size();
+        if (count_ == window) {
+            const double ox = xs_[head_];
+            const double oy = ys_[head_];
+            sum_x_ -= ox;
+            sum_y_ -= oy;
+            sum_xx_ -= ox * ox;
+            sum_xy_ -= ox * oy;
+        } else {
+            ++count_;
+        }
+        xs_[head_] = x;
+        ys_[head_] = y;
+        if (++head_ == window) head_ = 0;
+        sum_x_ += x;
+        sum_y_ += y;
+        sum_xx_ += x * x;
+        sum_xy_ += x * y;
+
+        if (++pushes_since_resum_ >= window) resum();
+    }
+
+    [[nodiscard]] std::size_t window() const { return xs_.size(); }
+    [[nodiscard]] std::size_t count() const { return count_; }
+    [[nodiscard]] bool full() const { return count_ == xs_.size(); }
+
+    // Same expressions as a direct fit over the window:
+    // b = (Sxy - n*mx*my) / (Sxx - n*mx*mx), a = my - b*mx.
+    [[nodiscard]] double slope() const {
+        const double n = static_cast<double>(count_);
+        const double mean_x = sum_x_ / n;
+        const double mean_y = sum_y_ / n;
+        return (sum_xy_ - n * mean_x * mean_y) / (sum_xx_ - n * mean_x * mean_x);
+    }
+    [[nodiscard]] double intercept() const { return intercept(slope()); }
+    [[nodiscard]] double intercept(double slope) const {
+        const double n = static_cast<double>(count_);
+        return sum_y_ / n - slope * (sum_x_ / n);
+    }
+
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(xs_, ys_, head_, count_, sum_x_, sum_y_, sum_xx_, sum_xy_, pushes_since_resum_); }
+
+private:
+    void resum() {
+        const std::size_t window = xs_.size();
+        const std::size_t oldest = count_ == window ? head_ : 0;
+        sum_x_ = sum_y_ = sum_xx_ = sum_xy_ = 0.0;
+        for (std::size_t i = 0; i < count_; ++i) {
+            const std::size_t k = (oldest + i) % window;
+            sum_x_ += xs_[k];
+            sum_y_ += ys_[k];
+            sum_xx_ += xs_[k] * xs_[k];
+            sum_xy_ += xs_[k] * ys_[k];
+        }
+        pushes_since_resum_ = 0;
+    }
+
+    std::vector<double> xs_;
+    std::vector<double> ys_;
+    std::size_t head_ = 0;
+    std::size_t count_ = 0;
+    double sum_x_ = 0.0;
+    double sum_y_ = 0.0;
+    double sum_xx_ = 0.0;
+    double sum_xy_ = 0.0;
+    std::size_t pushes_since_resum_ = 0;
+};
+
+// RSI over the last `period` price changes with simple averages -- the value
+// Analytics::CalculateRSI returns for the same history (Cutler's RSI).
+class RollingRSI {
+public:
+    explicit RollingRSI(std::size_t period = 14) : gains_(period), losses_(period) {}
+
+    void push(double price) {
+        if (has_prev_) {
+            const double change = price - prev_;
+            gains_.push(change > 0 ? change : 0.0);
+            losses_.push(change > 0 ? 0.0 : std::abs(change));
+        }
+        prev_ = price;
+        has_prev_ = true;
+    }
+
+    [[nodiscard]] bool ready() const { return gains_.full(); }
+    [[nodiscard]] double value() const {
+        const double period = static_cast<double>(gains_.window());
+        const double avg_gain = gains_.sum() / period;
+        const double avg_loss = losses_.sum() / period;
+        if (avg_loss == 0) return 100.0;
+        const double rs = avg_gain / avg_loss;
+        return 100.0 - (100.0 / (1.0 + rs));
+    }
+
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(gains_, losses_, prev_, has_prev_); }
+
+private:
+    RollingMoments gains_;
+    RollingMoments losses_;
+    double prev_ = 0.0;
+    bool has_prev_ = false;
+};
+
+// Wilder's RSI: seeded with the simple average of the first `period` changes,
+// then smoothed as avg = (avg * (period - 1) + x) / period.
+class WilderRSI {
+public:
+    explicit WilderRSI(std::size_t period = 14) : period_(period > 0 ? period : 1) {}
+
+    void push(double price) {
+        if (has_prev_) {
+            const double change = price - prev_;
+            const double gain = change > 0 ? change : 0.0;
+            const double loss = change > 0 ? 0.0 : -change;
+            const double p = static_cast<double>(period_);
+            ++changes_;
+            if (changes_ <= period_) {
+                avg_gain_ += gain / p;
+                avg_loss_ += loss / p;
+            } else {
+                avg_gain_ = (avg_gain_ * (p - 1.0) + gain) / p;
+                avg_loss_ = (avg_loss_ * (p - 1.0) + loss) / p;
+            }
+        }
+        prev_ = price;
+        has_prev_ = true;
+    }
+
+    [[nodiscard]] bool ready() const { return changes_ >= period_; }
+    [[nodiscard]] double value() const {
+        if (avg_loss_ == 0) return 100.0;
+        return 100.0 - (100.0 / (1.0 + avg_gain_ / avg_loss_));
+    }
+
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(period_, changes_, avg_gain_, avg_loss_, prev_, has_prev_); }
+
+private:
+    std::size_t period_;
+    std::size_t changes_ = 0;
+    double avg_gain_ = 0.0;
+    double avg_loss_ = 0.0;
+    double prev_ = 0.0;
+    bool has_prev_ = false;
+};
+
+// EMA with alpha = 2 / (period + 1), seeded with the first value.
+class Ema {
+public:
+    explicit Ema(int period = 1) : alpha_(2.0 / (period + 1)) {}
+
+    double push(double x) {
+        value_ = seeded_ ? (x - value_) * alpha_ + value_ : x;
+        seeded_ = true;
+        return value_;
+    }
+
+    [[nodiscard]] bool seeded() const { return seeded_; }
+    [[nodiscard]] double value() const { return value_; }
+
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(alpha_, value_, seeded_); }
+
+private:
+    double alpha_;
+    double value_ = 0.0;
+    bool seeded_ = false;
+};
+
+// Yang-Zhang volatility over the last `window` bars: overnight (open vs prior
+// close) and open-to-close sample variances plus the Rogers-Satchell term,
+// sigma^2 = s_o^2 + k*s_c^2 + (1-k)*rs with k = 0.34 / (1.34 + (n+1)/(n-1)).
+// Per-bar (not annualised); the first bar only seeds the prior close.
+class RollingYangZhang {
+public:
+    explicit RollingYangZhang(std::size_t window = 20)
+        : overnight_(window >= 2 ? window : 2), open_close_(overnight_.window()), rs_(overnight_.window()) {}
+
+    void push(double open, double high, double low, double close) {
+        if (has_prev_) {
+            const double ho = std::log(high / open);
+            const double lo = std::log(low / open);
+            const double co = std::log(close / open);
+            overnight_.push(std::log(open / prev_close_));
+            open_close_.push(co);
+            rs_.push(ho * (ho - co) + lo * (lo - co));
+        }
+        prev_close_ = close;
+        has_prev_ = true;
+    }
+
+    [[nodiscard]] bool ready() const { return rs_.full(); }
+    [[nodiscard]] double value() const {
+        const double n = static_cast<double>(rs_.window());
+        const double k = 0.34 / (1.34 + (n + 1.0) / (n - 1.0));
+        const double bessel = n / (n - 1.0);
+        const double var = overnight_.variance() * bessel + k * open_close_.variance() * bessel + (1.0 - k) * rs_.mean();
+        return std::sqrt(std::max(0.0, var));
+    }
+
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(overnight_, open_close_, rs_, prev_close_, has_prev_); }
+
+private:
+    RollingMoments overnight_;
+    RollingMoments open_close_;
+    RollingMoments rs_;
+    double prev_close_ = 0.0;
+    bool has_prev_ = false;
+};
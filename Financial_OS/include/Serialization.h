@@ -0,0 +1,141 @@
+// include/Serialization.h
+
+#pragma once
+#include <cstddef>
+#include <cstdint>
+#include <cstring>
+#include <map>
+#include <stdexcept>
+#include <string>
+#include <string_view>
+#include <type_traits>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+// Minimal binary archive for engine snapshots. A type opts in with a member
+//     template <typename Ar> void serialize(Ar& ar) { ar(a_, b_, c_); }
+// that lists its fields once; the same function both saves (serial::Writer)
+// and loads (serial::Reader). Scalars are written in native byte order, so a
+// snapshot is meant to be restored by the same build on the same platform.
+namespace serial {
+
+namespace detail {
+template <typename T> struct is_vector : std::false_type {};
+template <typename T, typename A> struct is_vector<std::vector<T, A>> : std::true_type {};
+
+template <typename T> struct is_map : std::false_type {};
+template <typename K, typename V, typename C, typename A> struct is_map<std::map<K, V, C, A>> : std::true_type {};
+template <typename K, typename V, typename H, typename E, typename A>
+struct is_map<std::unordered_map<K, V, H, E, A>> : std::true_type {};
+
+template <typename T>
+constexpr bool is_scalar_v = std::is_arithmetic_v<T> || std::is_enum_v<T>;
+} // namespace detail
+
+class Writer {
+public:
+    static constexpr bool is_loading = false;
+
+    template <typename... Ts>
+    void operator()(const Ts&... values) { (write(values), ...); }
+
+    [[nodiscard]] std::string take() { return std::move(buf_); }
+
+private:
+    template <typename T>
+    void write(const T& value) {
+        if constexpr (detail::is_scalar_v<T>) {
+            buf_.append(reinterpret_cast<const char*>(&value), sizeof(T));
+        } else if constexpr (std::is_same_v<T, std::string>) {
+            write(static_cast<std::uint64_t>(value.size()));
+            buf_.append(value);
+        } else if constexpr (detail::is_vector<T>::value) {
+            write(static_cast<std::uint64_t>(value.size()));
+            if constexpr (detail::is_scalar_v<typename T::value_type>) {
+                buf_.append(reinterpret_cast<const char*>(value.data()), value.size() * sizeof(typename T::value_type));
+            } else {
+                for (const auto& item : value) write(item);
+            }
+        } else if constexpr (detail::is_map<T>::value) {
+            write(static_cast<std::uint64_t>(value.size()));
+            for (const auto& [key, item] : value) {
+                write(key);
+                write(item);
+            }
+        } else {
+            // serialize() is shared with loading, so it cannot be const.
+            const_cast<T&>(value).serialize(*this);
+        }
+    }
+
+    std::string buf_;
+};
+
+class Reader {
+public:
+    static constexpr bool is_loading = true;
+
+    explicit Reader(std::string_view bytes) : bytes_(bytes) {}
+
+    template <typename... Ts>
+    void operator()(Ts&... values) { (read(values), ...); }
+
+    [[nodiscard]] bool at_end() const { return pos_ == bytes_.size(); }
+
+private:
+    void take(void* dst, std::size_t n) {
+        if (n > bytes_.size() - pos_) {
+            throw std::invalid_argument("snapshot is truncated or corrupt");
+        }
+        std::memcpy(dst, bytes_.data() + pos_, n);
+        pos_ += n;
+    }
+
+    std::size_t read_size(std::size_t min_item_bytes) {
+        std::uint64_t n = 0;
+        read(n);
+        if (min_item_bytes > 0 && n > (bytes_.size() - pos_) / min_item_bytes) {
+            throw std::invalid_argument("snapshot is truncated or corrupt");
+        }
+        return static_cast<std::size_t>(n);
+    }
+
+    template <typename T>
+    void read(T& value) {
+        if constexpr (detail::is_scalar_v<T>) {
+            take(&value, sizeof(T));
+        } else if constexpr (std::is_same_v<T, std::string>) {
+            value.resize(read_size(1));
+            take(value.data(), value.size());
+        } else if constexpr (detail::is_vector<T>::value) {
+            using Item = typename T::value_type;
+            if constexpr (detail::is_scalar_v<Item>) {
+                value.resize(read_size(sizeof(Item)));
+                take(value.data(), value.size() * sizeof(Item));
+            } else {
+                const std::size_t n = read_size(1);
+                value.clear();
+                value.reserve(n);
+                for (std::size_t i = 0; i < n; ++i) read(value.emplace_back());
+            }
+        } else if constexpr (detail::is_map<T>::value) {
+            const std::size_t n = read_size(1);
+            value.clear();
+            for (std::size_t i = 0; i < n; ++i) {
+                typename T::key_type key{};
+                typename T::mapped_type item{};
+                read(key);
+                read(item);
+                value.emplace(std::move(key), std::move(item));
+            }
+        } else {
+            value.serialize(*this);
+        }
+    }
+
+    std::string_view bytes_;
+    std::size_t pos_ = 0;
+};
+
+} // namespace serial
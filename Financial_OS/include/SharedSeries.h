@@ -0,0 +1,90 @@
+// include/SharedSeries.h
+
+#pragma once
+#include <algorithm>
+#include <cstddef>
+#include <iterator>
+#include <memory>
+#include <vector>
+
+// Append-only series of doubles whose buffer can be handed out without a copy
+// (the Python bindings wrap share() in a read-only NumPy array). An exported
+// buffer is never written behind the reader's back: appends only touch slots
+// past the exported length, and if the buffer is full while someone still holds
+// it, push_back moves to a fresh buffer instead of reallocating in place. A
+// view therefore stays valid after the engine moves on -- it just sees the
+// points that existed when it was taken.
+//
+// With set_retention(n) the series keeps a bounded tail instead of the whole
+// history: once the buffer holds 2n points, the oldest n are dropped in one
+// go (or the last n are copied to a fresh buffer if the old one is exported).
+// values() is then always contiguous, holds at least the last n points (or
+// everything, if fewer were appended), and memory stays at <= 2n doubles --
+// a ring buffer with an amortised O(1) compaction instead of wrap-around, so
+// readers keep getting plain spans. total() counts every point ever appended.
+class SharedSeries {
+public:
+    SharedSeries() : data_(std::make_shared<std::vector<double>>()) {}
+    SharedSeries(const SharedSeries& other)
+        : data_(std::make_shared<std::vector<double>>(*other.data_)), retention_(other.retention_), total_(other.total_) {}
+    SharedSeries& operator=(const SharedSeries& other) {
+        if (this != &other) {
+            data_ = std::make_shared<std::vector<double>>(*other.data_);
+            retention_ = other.retention_;
+            total_ = other.total_;
+        }
+        return *this;
+    }
+    SharedSeries(SharedSeries&&) noexcept = default;
+    SharedSeries& operator=(SharedSeries&&) noexcept = default;
+
+    void push_back(double value) {
+        if (retention_ > 0 && data_->size() >= 2 * retention_) trim();
+        if (data_->size() == data_->capacity() && data_.use_count() > 1) {
+            auto grown = std::make_shared<std::vector<double>>();
+            grown->reserve(std::max<std::size_t>(16, data_->capacity() * 2));
+            grown->assign(data_->begin(), data_->end());
+            data_ = std::move(grown);
+        }
+        data_->push_back(value);
+        ++total_;
+    }
+
+    // 0 keeps everything (the default). Shrinking takes effect on the next append.
+    void set_retention(std::size_t points) { retention_ = points; }
+    [[nodiscard]] std::size_t retention() const { return retention_; }
+
+    [[nodiscard]] const std::vector<double>& values() const { return *data_; }
+    [[nodiscard]] std::shared_ptr<const std::vector<double>> share() const { return data_; }
+    [[nodiscard]] std::size_t size() const { return data_->size(); }
+    [[nodiscard]] std::size_t total() const { return total_; }
+
+    template <typename Ar>
+    void serialize(Ar& ar) {
+        if constexpr (Ar::is_loading) {
+            auto loaded = std::make_shared<std::vector<double>>();
+            ar(*loaded);
+            data_ = std::move(loaded);
+        } else {
+            ar(*data_);
+        }
+        ar(retention_, total_);
+    }
+
+private:
+    void trim() {
+        const auto keep_from = data_->end() - static_cast<std::ptrdiff_t>(retention_);
+        if (data_.use_count() > 1) {
+            auto kept = std::make_shared<std::vector<double>>();
+            kept->reserve(2 * retention_);
+            kept->assign(keep_from, data_->end());
+            data_ = std::move(kept);
+        } else {
+            data_->erase(data_->begin(), keep_from);
+        }
+    }
+
+    std::shared_ptr<std::vector<double>> data_;
+    std::size_t retention_ = 0;
+    std::size_t total_ = 0;
+};
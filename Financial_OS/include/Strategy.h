@@ -3,6 +3,8 @@
 #ifndef STRATEGY_H
 #define STRATEGY_H
 
+#include <cstddef>
+#include <memory>
 #include <string>
 #include <vector>
 #include <unordered_map>
@@ -12,7 +14,12 @@
 #include <cmath>
 #include "Analytics.h"
 #include "KalmanFilter.h"
+#include "KalmanBank.h"
+#include "PCAArbitrage.h"
 #include "BlackScholesFormulas.h"
+#include "Rolling.h"
+#include "Serialization.h"
+#include "SymbolTable.h"
 #include <map>
 #include <fmt/core.h>
 
@@ -159,44 +166,146 @@ class Strategy {
 public:
     virtual ~Strategy() = default;
     virtual void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) = 0;
+    // What the engine actually calls per bar: the same bar plus the symbol's
+    // dense id. By default it forwards to on_market_data; hot-path strategies
+    // override it to keep per-symbol state in vectors indexed by id.
+    virtual void on_bar(Backtester& engine, SymbolId id, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
+        (void)id;
+        on_market_data(engine, symbol, timestamp, open, high, low, close);
+    }
     virtual void on_order_book_update(class Backtester& engine, const OrderBook& book, double timestamp) {
         (void)engine; (void)book; (void)timestamp;
     }
     virtual void on_event(Backtester& engine, const Event& event) {
         (void)engine; (void)event;
     }
+
+    // How many trailing bars per symbol this strategy reads from the engine's
+    // bar store (Backtester::get_closes() etc.) on each call. The engine never
+    // retains fewer than this, whatever set_bar_retention() asks for.
+    virtual std::size_t lookback() const { return 0; }
+
+    // Tunable parameters by name with their current values (empty if none).
+    // Backtester::set_parameters() accepts exactly these names.
+    virtual std::map<std::string, double> parameters() const { return {}; }
+
+    // Deep copy and binary checkpointing of the full indicator state, used by
+    // Backtester::snapshot()/restore() and by copying an engine.
+    virtual std::unique_ptr<Strategy> clone() const = 0;
+    virtual void save(serial::Writer& out) const = 0;
+    virtual void load(serial::Reader& in) = 0;
+};
+
+// Implements clone/save/load for a concrete strategy from its copy constructor
+// and its serialize(ar) member, which lists every field once.
+template <typename Derived>
+class StrategyBase : public Strategy {
+public:
+    std::unique_ptr<Strategy> clone() const override {
+        return std::make_unique<Derived>(static_cast<const Derived&>(*this));
+    }
+    void save(serial::Writer& out) const override { out(static_cast<const Derived&>(*this)); }
+    void load(serial::Reader& in) override { in(static_cast<Derived&>(*this)); }
 };
 
-class EMAStrategy : public Strategy {
+// Owning strategy pointer with value semantics: copying it clones the strategy,
+// so a copied Backtester carries its own indicator state.
+class StrategyPtr {
+public:
+    StrategyPtr() = default;
+    StrategyPtr(std::unique_ptr<Strategy> strategy) : ptr_(std::move(strategy)) {}
+    StrategyPtr(const StrategyPtr& other) : ptr_(other.ptr_ ? other.ptr_->clone() : nullptr) {}
+    StrategyPtr& operator=(const StrategyPtr& other) {
+        if (this != &other) ptr_ = other.ptr_ ? other.ptr_->clone() : nullptr;
+        return *this;
+    }
+    StrategyPtr(StrategyPtr&&) noexcept = default;
+    StrategyPtr& operator=(StrategyPtr&&) noexcept = default;
+
+    Strategy* operator->() const { return ptr_.get(); }
+    Strategy& operator*() const { return *ptr_; }
+    [[nodiscard]] Strategy* get() const { return ptr_.get(); }
+    explicit operator bool() const { return ptr_ != nullptr; }
+
+private:
+    std::unique_ptr<Strategy> ptr_;
+};
+
+class EMAStrategy : public StrategyBase<EMAStrategy> {
 public:
     EMAStrategy(int short_window = 20, int long_window = 50)
         : short_window_(short_window), long_window_(long_window) {}
 
+    void set_parameters(int short_window, int long_window) {
+        short_window_ = short_window;
+        long_window_ = long_window;
+        state_.clear();
+    }
+    std::map<std::string, double> parameters() const override {
+        return {{"short_window", short_window_}, {"long_window", long_window_}};
+    }
+
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
+    void on_bar(Backtester& engine, SymbolId id, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
+
+    template <typename Ar>
+    void serialize(Ar& ar) {
+        ar(short_window_, long_window_, state_);
+    }
 
 private:
+    struct SymbolState {
+        Ema short_ema;
+        Ema long_ema;
+        std::size_t bars_seen = 0;
+
+        template <typename Ar>
+        void serialize(Ar& ar) { ar(short_ema, long_ema, bars_seen); }
+    };
+
     int short_window_;
     int long_window_;
-    std::unordered_map<std::string, double> current_short_ema_;
-    std::unordered_map<std::string, double> current_long_ema_;
-    std::unordered_map<std::string, std::vector<double>> history_;
+    std::vector<SymbolState> state_;  // by SymbolId
 };
 
-class RSIStrategy : public Strategy {
+class RSIStrategy : public StrategyBase<RSIStrategy> {
 public:
     RSIStrategy(int period = 14, double buy_thresh = 30.0, double sell_thresh = 70.0)
         : period_(period), buy_thresh_(buy_thresh), sell_thresh_(sell_thresh) {}
 
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
+    void on_bar(Backtester& engine, SymbolId id, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
+    std::size_t lookback() const override { return static_cast<std::size_t>(period_) + 1; }
+    std::map<std::string, double> parameters() const override {
+        return {{"period", period_}, {"buy_thresh", buy_thresh_}, {"sell_thresh", sell_thresh_}};
+    }
+
+    void set_parameters(int period, double buy_thresh, double sell_thresh) {
+        period_ = period;
+        buy_thresh_ = buy_thresh;
+        sell_thresh_ = sell_thresh;
+        state_.clear();
+    }
+
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(period_, buy_thresh_, sell_thresh_, state_); }
 
 private:
+    struct SymbolState {
+        RollingRSI rsi;
+        std::size_t fed = 0;  // engine bars consumed
+
+        template <typename Ar>
+        void serialize(Ar& ar) { ar(rsi, fed); }
+    };
+
     int period_;
     double buy_thresh_;
     double sell_thresh_;
-    std::unordered_map<std::string, std::vector<double>> history_;
+    std::vector<SymbolState> state_;  // by SymbolId
 };
 
-class MACDStrategy : public Strategy {
+class MACDStrategy : public StrategyBase<MACDStrategy> {
 public:
     MACDStrategy(int fast = 12, int slow = 26, int signal = 9)
         : fast_period_(fast), slow_period_(slow), signal_period_(signal) {}
@@ -205,86 +314,156 @@ public:
         fast_period_ = fast;
         slow_period_ = slow;
         signal_period_ = signal;
-        fast_ema_.clear();
-        slow_ema_.clear();
-        macd_line_.clear();
-        signal_line_.clear();
-        history_.clear();
+        state_.clear();
+    }
+    std::map<std::string, double> parameters() const override {
+        return {{"fast", fast_period_}, {"slow", slow_period_}, {"signal", signal_period_}};
     }
 
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
+    void on_bar(Backtester& engine, SymbolId id, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
+
+    template <typename Ar>
+    void serialize(Ar& ar) {
+        ar(fast_period_, slow_period_, signal_period_, state_);
+    }
 
 private:
     int fast_period_;
     int slow_period_;
     int signal_period_;
-    
-    std::unordered_map<std::string, double> fast_ema_;
-    std::unordered_map<std::string, double> slow_ema_;
-    std::unordered_map<std::string, double> macd_line_;
-    std::unordered_map<std::string, double> signal_line_;
-    std::unordered_map<std::string, std::vector<double>> history_;
+
+    struct SymbolState {
+        Ema fast_ema;
+        Ema slow_ema;
+        double macd_line = 0.0;
+        Ema signal_line;
+        std::size_t bars_seen = 0;
+
+        template <typename Ar>
+        void serialize(Ar& ar) { ar(fast_ema, slow_ema, macd_line, signal_line, bars_seen); }
+    };
+    std::vector<SymbolState> state_;  // by SymbolId
 };
 
-class BollingerStrategy : public Strategy {
+class BollingerStrategy : public StrategyBase<BollingerStrategy> {
 public:
     BollingerStrategy(int period = 20, double std_dev_mult = 2.0)
         : period_(period), mult_(std_dev_mult) {}
 
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
+    void on_bar(Backtester& engine, SymbolId id, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
+    std::size_t lookback() const override { return static_cast<std::size_t>(period_); }
+    std::map<std::string, double> parameters() const override {
+        return {{"period", period_}, {"std_dev_mult", mult_}};
+    }
+
+    void set_parameters(int period, double std_dev_mult) {
+        period_ = period;
+        mult_ = std_dev_mult;
+        state_.clear();
+    }
+
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(period_, mult_, state_); }
 
 private:
+    struct SymbolState {
+        RollingMoments closes;
+        std::size_t fed = 0;  // engine bars consumed
+
+        template <typename Ar>
+        void serialize(Ar& ar) { ar(closes, fed); }
+    };
+
     int period_;
     double mult_;
-    std::unordered_map<std::string, std::vector<double>> history_;
+    std::vector<SymbolState> state_;  // by SymbolId
 };
 
-class VolatilityStrategy : public Strategy {
+class VolatilityStrategy : public StrategyBase<VolatilityStrategy> {
 public:
     VolatilityStrategy(double k = 0.5) : k_(k) {}
 
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
+    void on_bar(Backtester& engine, SymbolId id, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
 
     void set_k(double k) { k_ = k; }
+    std::size_t lookback() const override { return 2; }
+    std::map<std::string, double> parameters() const override { return {{"k", k_}}; }
+
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(k_); }
 
 private:
     double k_;
 };
 
-class OUStrategy : public Strategy {
+class OUStrategy : public StrategyBase<OUStrategy> {
 public:
     OUStrategy(int window = 60, double z_score_thresh = 2.0)
         : window_(window), z_thresh_(z_score_thresh) {}
 
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
+    void on_bar(Backtester& engine, SymbolId id, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
 
     void set_parameters(int window, double z_thresh) {
         window_ = window;
         z_thresh_ = z_thresh;
-        history_.clear();
+        state_.clear();
     }
+    std::size_t lookback() const override { return static_cast<std::size_t>(window_) + 1; }
+    std::map<std::string, double> parameters() const override {
+        return {{"window", window_}, {"z_thresh", z_thresh_}};
+    }
+
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(window_, z_thresh_, state_); }
 
 private:
+    struct SymbolState {
+        RollingOLS ar1;  // (close[t-1], close[t]) pairs
+        double prev_close = 0.0;
+        bool has_prev = false;
+        std::size_t fed = 0;  // engine bars consumed
+
+        template <typename Ar>
+        void serialize(Ar& ar) { ar(ar1, prev_close, has_prev, fed); }
+    };
+
     int window_;
     double z_thresh_;
-    std::unordered_map<std::string, std::vector<double>> history_;
+    std::vector<SymbolState> state_;  // by SymbolId
 };
 
-class KalmanPairsStrategy : public Strategy {
+class KalmanPairsStrategy : public StrategyBase<KalmanPairsStrategy> {
 public:
     KalmanPairsStrategy(const std::string& asset_x = "KO", const std::string& asset_y = "PEP", double z_thresh = 2.0, int window = 30)
         : asset_x_(asset_x), asset_y_(asset_y), z_thresh_(z_thresh), window_(window) {}
 
+    // A new window restarts the spread statistics.
     void set_parameters(int window, double z_thresh) {
         window_ = window;
         z_thresh_ = z_thresh;
+        spreads_ = RollingMoments(static_cast<std::size_t>(window));
+    }
+    std::map<std::string, double> parameters() const override {
+        return {{"window", window_}, {"threshold", z_thresh_}};
     }
 
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
+    void on_bar(Backtester& engine, SymbolId id, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
+
+    template <typename Ar>
+    void serialize(Ar& ar) {
+        ar(asset_x_, asset_y_, id_x_, id_y_, z_thresh_, window_, buffer_x_, buffer_y_, kf_, spreads_);
+    }
 
 private:
     std::string asset_x_;
     std::string asset_y_;
+    SymbolId id_x_ = kNoSymbol;  // resolved on the first bar
+    SymbolId id_y_ = kNoSymbol;
     double z_thresh_;
     int window_;
 
@@ -292,30 +471,107 @@ private:
     std::unordered_map<double, double> buffer_y_;
 
     KalmanFilter kf_;
-    std::vector<double> spread_history_;
+    RollingMoments spreads_{static_cast<std::size_t>(window_)};  // last window_ spreads
 };
 
-class PCAStatArbStrategy : public Strategy {
+// KalmanPairsStrategy over a basket of (x, y) pairs in one engine. Every
+// pair's hedge ratio and spread z-score live in one KalmanBank, stepped as
+// soon as both legs of a pair have printed at a timestamp -- all the pairs a
+// bar completes go through the bank together. Each pair trades its own legs
+// at 0.4 x leverage x equity / pairs notional a leg: short y / long x above
+// +threshold, the reverse below -threshold, flat once |z| < 0.5. Positions
+// are tracked per pair, so pairs may share a leg; the portfolio nets them.
+class KalmanBasketStrategy : public StrategyBase<KalmanBasketStrategy> {
+public:
+    explicit KalmanBasketStrategy(const std::vector<std::pair<std::string, std::string>>& pairs = {{"KO", "PEP"}},
+                                  double z_thresh = 2.0, int window = 30);
+
+    // Replaces the basket and restarts every filter. A pair with the same
+    // symbol on both legs, or an empty basket, throws std::invalid_argument.
+    void set_pairs(const std::vector<std::pair<std::string, std::string>>& pairs);
+    // A new window restarts the filters.
+    void set_parameters(int window, double z_thresh);
+    std::map<std::string, double> parameters() const override {
+        return {{"window", window_}, {"threshold", z_thresh_}};
+    }
+    [[nodiscard]] const KalmanBank& bank() const { return bank_; }
+
+    void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
+    void on_bar(Backtester& engine, SymbolId id, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
+
+    template <typename Ar>
+    void serialize(Ar& ar) {
+        ar(legs_x_, legs_y_, z_thresh_, window_, id_x_, id_y_, pairs_of_, last_close_, last_time_, last_step_,
+           bank_, qty_x_, qty_y_, side_);
+    }
+
+private:
+    void reset();
+    void resolve(Backtester& engine);
+    void trade(Backtester& engine, std::size_t k, double timestamp);
+
+    std::vector<std::string> legs_x_;
+    std::vector<std::string> legs_y_;
+    double z_thresh_;
+    int window_;
+
+    // Resolved on the first bar.
+    std::vector<SymbolId> id_x_;
+    std::vector<SymbolId> id_y_;
+    std::vector<std::vector<std::size_t>> pairs_of_;  // by symbol id: pairs with that leg
+    std::vector<double> last_close_;                  // by symbol id
+    std::vector<double> last_time_;
+    std::vector<double> last_step_;                   // by pair: timestamp of its last step
+
+    KalmanBank bank_;
+    std::vector<double> qty_x_;  // by pair: this pair's own leg positions
+    std::vector<double> qty_y_;
+    std::vector<int> side_;      // +1 long spread, -1 short, 0 flat
+
+    // Scratch for one bar's batch.
+    std::vector<std::size_t> ready_;
+    std::vector<double> ready_x_;
+    std::vector<double> ready_y_;
+};
+
+class PCAStatArbStrategy : public StrategyBase<PCAStatArbStrategy> {
 public:
     PCAStatArbStrategy(int window = 60, double z_thresh = 2.0);
 
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
+    std::size_t lookback() const override { return static_cast<std::size_t>(window_); }
+
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(window_, z_thresh_, last_timestamp_, symbols_, current_z_scores_, pca_, pca_bars_); }
 
 private:
+    void update_signals(Backtester& engine);
+
     int window_;
     double z_thresh_;
     double last_timestamp_;
 
-    std::map<std::string, std::vector<double>> history_;
+    std::vector<std::string> symbols_;  // basket, sorted
     std::map<std::string, double> current_z_scores_;
+
+    // The basket's last window_ - 1 log returns, advanced one row per bar;
+    // rebuilt from the closes when the basket changes or a symbol skips a bar.
+    StreamingPCA pca_;
+    std::vector<std::size_t> pca_bars_;  // bar count per symbol at the last row
 };
 
-class GammaScalpingStrategy : public Strategy {
+class GammaScalpingStrategy : public StrategyBase<GammaScalpingStrategy> {
 public:
     GammaScalpingStrategy(double option_qty = 1000.0, double strike = 100.0, double implied_vol = 0.20, double hedge_band = 5.0);
 
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) {
+        ar(option_qty_, strike_, implied_vol_, hedge_band_, risk_free_rate_, time_to_expiry_,
+           initial_option_price_, is_initialized_);
+    }
+
 private:
     double option_qty_;
     double strike_;
@@ -327,13 +583,16 @@ private:
     bool is_initialized_ = false;
 };
 
-class MarketMakerStrategy : public Strategy {
+class MarketMakerStrategy : public StrategyBase<MarketMakerStrategy> {
 public:
     MarketMakerStrategy(double risk_aversion = 0.1, double volatility = 0.2, double kappa = 1.5);
 
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close);
     void on_order_book_update(Backtester& engine, const OrderBook& book, double timestamp) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(gamma_, sigma_, kappa_, time_horizon_); }
+
 private:
     double gamma_;
     double sigma_;
@@ -341,13 +600,16 @@ private:
     double time_horizon_;
 };
 
-class VWAPExecutionStrategy : public Strategy {
+class VWAPExecutionStrategy : public StrategyBase<VWAPExecutionStrategy> {
 public:
     VWAPExecutionStrategy(double target_qty = 10000.0, double slice_qty = 500.0, double total_time = 200.0);
 
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
     void on_order_book_update(Backtester& engine, const OrderBook& book, double timestamp) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(target_qty_, slice_qty_, total_time_, executed_qty_); }
+
 private:
     double target_qty_;
     double slice_qty_;
@@ -355,24 +617,30 @@ private:
     double executed_qty_;
 };
 
-class TWAPExecutionStrategy : public Strategy {
+class TWAPExecutionStrategy : public StrategyBase<TWAPExecutionStrategy> {
 public:
     TWAPExecutionStrategy(double target_qty = 10000.0, double total_time = 200.0);
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
     void on_order_book_update(Backtester& engine, const OrderBook& book, double timestamp) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(target_qty_, total_time_, executed_qty_); }
+
 private:
     double target_qty_;
     double total_time_;
     double executed_qty_;
 };
 
-class POVExecutionStrategy : public Strategy {
+class POVExecutionStrategy : public StrategyBase<POVExecutionStrategy> {
 public:
     POVExecutionStrategy(double target_qty = 10000.0, double participation_rate = 0.05);
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
     void on_order_book_update(Backtester& engine, const OrderBook& book, double timestamp) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(target_qty_, participation_rate_, executed_qty_, last_market_volume_); }
+
 private:
     double target_qty_;
     double participation_rate_;
@@ -380,12 +648,15 @@ private:
     double last_market_volume_;
 };
 
-class IcebergExecutionStrategy : public Strategy {
+class IcebergExecutionStrategy : public StrategyBase<IcebergExecutionStrategy> {
 public:
     IcebergExecutionStrategy(double target_qty = 10000.0, double display_size = 100.0);
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
     void on_order_book_update(Backtester& engine, const OrderBook& book, double timestamp) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(target_qty_, display_size_, executed_qty_, current_visible_qty_); }
+
 private:
     double target_qty_;
     double display_size_;
@@ -393,22 +664,33 @@ private:
     double current_visible_qty_;
 };
 
-class SniperExecutionStrategy : public Strategy {
+class SniperExecutionStrategy : public StrategyBase<SniperExecutionStrategy> {
 public:
     SniperExecutionStrategy(double target_qty = 1000.0, double target_price = 99.0);
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
     void on_order_book_update(Backtester& engine, const OrderBook& book, double timestamp) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(target_qty_, target_price_, executed_qty_); }
+
 private:
     double target_qty_;
     double target_price_;
     double executed_qty_;
 };
 
-class VRPHarvestingStrategy : public Strategy {
+class VRPHarvestingStrategy : public StrategyBase<VRPHarvestingStrategy> {
 public:
     VRPHarvestingStrategy(double strike = 100.0, double time_to_expiry = 30.0 / 252.0, double iv_threshold = 0.05);
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
+    void on_bar(Backtester& engine, SymbolId id, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
+    std::size_t lookback() const override { return 20; }
+
+    template <typename Ar>
+    void serialize(Ar& ar) {
+        ar(strike_, time_to_expiry_, iv_threshold_, risk_free_rate_, position_opened_,
+           initial_option_premium_, option_qty_);
+    }
 
 private:
     double strike_;
@@ -420,12 +702,15 @@ private:
     double option_qty_ = 1000.0;
 };
 
-class AvellanedaStoikovStrategy : public Strategy {
+class AvellanedaStoikovStrategy : public StrategyBase<AvellanedaStoikovStrategy> {
 public:
     AvellanedaStoikovStrategy(double gamma = 0.1, double sigma = 0.2, double kappa = 1.5, double T = 1.0);
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
     void on_order_book_update(Backtester& engine, const OrderBook& book, double timestamp) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(gamma_, sigma_, kappa_, T_, last_bid_quote_, last_ask_quote_); }
+
 private:
     double gamma_;
     double sigma_;
@@ -436,20 +721,26 @@ private:
     double last_ask_quote_ = 0.0;
 };
 
-class EventDrivenSuite : public Strategy {
+class EventDrivenSuite : public StrategyBase<EventDrivenSuite> {
 public:
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
     void on_event(Backtester& engine, const Event& event) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(latest_prices_); }
+
 private:
     std::map<std::string, double> latest_prices_;
 };
 
-class AdvancedMicrostructureSuite : public Strategy {
+class AdvancedMicrostructureSuite : public StrategyBase<AdvancedMicrostructureSuite> {
 public:
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
     void on_event(Backtester& engine, const Event& event) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(last_price_A_, last_price_B_, msg_count_, window_start_, toxicity_alert_); }
+
 private:
     double last_price_A_ = 0.0;
     double last_price_B_ = 0.0;
@@ -459,66 +750,90 @@ private:
     bool toxicity_alert_ = false;
 };
 
-class CryptoDeFiSuite : public Strategy {
+class CryptoDeFiSuite : public StrategyBase<CryptoDeFiSuite> {
 public:
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
     void on_event(Backtester& engine, const Event& event) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(latest_spot_prices_); }
+
 private:
     std::map<std::string, double> latest_spot_prices_;
 };
 
-class AlternativeDataSuite : public Strategy {
+class AlternativeDataSuite : public StrategyBase<AlternativeDataSuite> {
 public:
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
     void on_event(Backtester& engine, const Event& event) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(latest_prices_); }
+
 private:
     std::map<std::string, double> latest_prices_;
 };
 
-class AdvancedDownsideSuite : public Strategy {
+class AdvancedDownsideSuite : public StrategyBase<AdvancedDownsideSuite> {
 public:
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
     void on_event(Backtester& engine, const Event& event) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(latest_prices_); }
+
 private:
     std::map<std::string, double> latest_prices_;
 };
 
-class GlobalMacroSuite : public Strategy {
+class GlobalMacroSuite : public StrategyBase<GlobalMacroSuite> {
 public:
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
     void on_event(Backtester& engine, const Event& event) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(latest_prices_); }
+
 private:
     std::map<std::string, double> latest_prices_;
 };
 
-class AIBehavioralSuite : public Strategy {
+class AIBehavioralSuite : public StrategyBase<AIBehavioralSuite> {
 public:
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
     void on_event(Backtester& engine, const Event& event) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(latest_prices_); }
+
 private:
     std::map<std::string, double> latest_prices_;
 };
 
-class GrandFinaleSuite : public Strategy {
+class GrandFinaleSuite : public StrategyBase<GrandFinaleSuite> {
 public:
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
     void on_event(Backtester& engine, const Event& event) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(latest_prices_); }
+
 private:
     std::map<std::string, double> latest_prices_;
 };
 
-class L3ExecutionSuite : public Strategy {
+class L3ExecutionSuite : public StrategyBase<L3ExecutionSuite> {
 public:
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
     void on_order_book_update(Backtester& engine, const OrderBook& book, double timestamp) override;
     void on_event(Backtester& engine, const Event& event) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) {
+        ar(last_trade_price_, vpin_bucket_vol_, toxicity_shield_active_, arrival_price_,
+           fill_rates_);
+    }
+
 private:
     double last_trade_price_ = 0.0;
     double vpin_bucket_vol_ = 0.0;
@@ -528,29 +843,38 @@ private:
     std::map<std::string, double> fill_rates_;
 };
 
-class StructuralArbSuite : public Strategy {
+class StructuralArbSuite : public StrategyBase<StructuralArbSuite> {
 public:
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
     void on_event(Backtester& engine, const Event& event) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(latest_prices_); }
+
 private:
     std::map<std::string, double> latest_prices_;
 };
 
-class DeepCryptoCycleSuite : public Strategy {
+class DeepCryptoCycleSuite : public StrategyBase<DeepCryptoCycleSuite> {
 public:
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
     void on_event(Backtester& engine, const Event& event) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(latest_prices_); }
+
 private:
     std::map<std::string, double> latest_prices_;
 };
 
-class MetaBrainSuite : public Strategy {
+class MetaBrainSuite : public StrategyBase<MetaBrainSuite> {
 public:
     void on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) override;
     void on_event(Backtester& engine, const Event& event) override;
 
+    template <typename Ar>
+    void serialize(Ar& ar) { ar(latest_prices_); }
+
 private:
     std::map<std::string, double> latest_prices_;
 };
@@ -0,0 +1,92 @@
+// include/Sweep.h
+
+#pragma once
+#include <cstddef>
+#include <cstdint>
+#include <map>
+#include <optional>
+#include <string>
+#include <vector>
+
+// A run_panel panel, borrowed for the duration of a sweep: every
+// configuration replays the same buffers, nothing is copied per run.
+struct SweepData {
+    std::vector<std::string> symbols;
+    const double* timestamps;
+    const double* ohlc;  // n_times x symbols.size() x 4, row-major
+    std::size_t n_times;
+};
+
+struct SweepOptions {
+    double initial_capital = 100000.0;
+    double leverage = 1.0;
+    double max_drawdown_limit = 0.05;  // as Backtester::set_risk_params
+    double var_limit = 0.02;
+};
+
+// One row per configuration, stored by column. parameters[k][i] is
+// parameter_names[k] for configuration i -- the strategy's full parameter set,
+// so defaults a configuration left out are filled in.
+struct SweepResult {
+    std::vector<std::string> parameter_names;
+    std::vector<std::vector<double>> parameters;
+    std::vector<double> final_equity;
+    std::vector<double> return_pct;
+    std::vector<double> max_drawdown;  // <= 0, as Backtester::get_max_drawdown
+    std::vector<double> sharpe;        // of per-timestamp equity returns, x sqrt(252)
+    std::vector<std::int64_t> trades;
+};
+
+// Cartesian product of a {name: values} grid, last name varying fastest.
+std::vector<std::map<std::string, double>> ExpandGrid(const std::map<std::string, std::vector<double>>& grid);
+
+// Runs a fresh Backtester(strategy) per configuration over `data`, each
+// configured through Backtester::set_parameters() and sampling equity per
+// timestamp (as the API server does). Runs go to the shared worker pool
+// (num_threads as in ParallelFor). The strategy and every configuration are
+// validated on the calling thread first: an unknown strategy or parameter
+// throws std::invalid_argument before any run starts.
+SweepResult RunSweep(const std::string& strategy, const std::vector<std::map<std::string, double>>& configs,
+                     const SweepData& data, const SweepOptions& options = {}, unsigned int num_threads = 0);
+
+struct HalvingOptions {
+    double eta = 3.0;  // keep the best 1/eta of each rung, grow the span eta-fold
+    // Timestamps in the first rung. 0 picks the span at which halving down to
+    // one configuration lands exactly on the full history.
+    std::size_t min_bars = 0;
+    std::optional<std::uint64_t> seed;  // Hyperband's sampling; unset: std::random_device
+};
+
+// A successive-halving leaderboard. `table` holds one row per configuration
+// run, best first (longest span, then return_pct), each with the metrics of
+// the longest span it reached.
+struct HalvingResult {
+    SweepResult table;
+    std::vector<std::size_t> bars;  // timestamps replayed for the row (its budget)
+    std::vector<int> rung;          // last rung reached, 0 = first
+    std::vector<int> bracket;       // Hyperband bracket (0 for RunSuccessiveHalving)
+    std::size_t total_bars = 0;     // sum of `bars`
+    std::size_t full_bars = 0;      // what RunSweep would have replayed
+};
+
+// Successive halving: every configuration runs the first min_bars timestamps,
+// the best 1/eta (at least one) by return_pct continue over an eta-times
+// longer prefix, and so on until the survivors reach the end of `data`.
+// Survivors resume their engines rather than replaying the prefix, so a
+// finalist's row is exactly what RunSweep would report for it. Engines are
+// configured and validated as in RunSweep.
+HalvingResult RunSuccessiveHalving(const std::string& strategy,
+                                   const std::vector<std::map<std::string, double>>& configs, const SweepData& data,
+                                   const SweepOptions& options = {}, const HalvingOptions& halving = {},
+                                   unsigned int num_threads = 0);
+
+// Hyperband over a pool of configurations: brackets s = s_max..0, with
+// s_max = floor(log_eta(n_times / min_bars)), each running successive halving
+// on ceil((s_max + 1) / (s + 1) * eta^s) configurations sampled from the pool
+// (without replacement, capped at the pool size) starting at n_times / eta^s
+// timestamps. min_bars = 0 sets s_max to the rungs it takes to halve the pool
+// down to one, the depth RunSuccessiveHalving would use on all of it. Rows of
+// all brackets share one leaderboard.
+HalvingResult RunHyperband(const std::string& strategy, const std::vector<std::map<std::string, double>>& pool,
+                           const SweepData& data, const SweepOptions& options = {}, const HalvingOptions& halving = {},
+                           unsigned int num_threads = 0);
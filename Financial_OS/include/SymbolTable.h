@@ -0,0 +1,60 @@
+// include/SymbolTable.h
+
+#pragma once
+#include <cstddef>
+#include <cstdint>
+#include <stdexcept>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+// Dense integer handle for a symbol: ids are 0, 1, 2, ... in registration
+// order, so per-symbol state can live in flat vectors indexed by id instead of
+// string-keyed hash maps.
+using SymbolId = std::int32_t;
+inline constexpr SymbolId kNoSymbol = -1;
+
+class SymbolTable {
+public:
+    // Id of `name`, registering it on first sight.
+    SymbolId intern(const std::string& name) {
+        auto [it, inserted] = index_.try_emplace(name, static_cast<SymbolId>(names_.size()));
+        if (inserted) names_.push_back(name);
+        return it->second;
+    }
+
+    // Id of `name`, or kNoSymbol if it was never registered.
+    [[nodiscard]] SymbolId find(const std::string& name) const {
+        auto it = index_.find(name);
+        return it != index_.end() ? it->second : kNoSymbol;
+    }
+
+    // Like find(), but an unknown name is an error.
+    [[nodiscard]] SymbolId at(const std::string& name) const {
+        const SymbolId id = find(name);
+        if (id == kNoSymbol) throw std::out_of_range("unknown symbol '" + name + "'");
+        return id;
+    }
+
+    [[nodiscard]] const std::string& name(SymbolId id) const {
+        if (id < 0 || static_cast<std::size_t>(id) >= names_.size()) {
+            throw std::out_of_range("unknown symbol id " + std::to_string(id));
+        }
+        return names_[static_cast<std::size_t>(id)];
+    }
+    [[nodiscard]] const std::vector<std::string>& names() const { return names_; }
+    [[nodiscard]] std::size_t size() const { return names_.size(); }
+
+    template <typename Ar>
+    void serialize(Ar& ar) {
+        ar(names_);
+        if constexpr (Ar::is_loading) {
+            index_.clear();
+            for (std::size_t i = 0; i < names_.size(); ++i) index_.emplace(names_[i], static_cast<SymbolId>(i));
+        }
+    }
+
+private:
+    std::unordered_map<std::string, SymbolId> index_;
+    std::vector<std::string> names_;
+};
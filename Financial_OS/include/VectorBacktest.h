@@ -0,0 +1,53 @@
+// include/VectorBacktest.h
+
+#pragma once
+#include <cstddef>
+#include <cstdint>
+#include <map>
+#include <string>
+#include <vector>
+
+#include "Indicators.h"
+
+// Fast path for screening the single-asset signal strategies (EMA, MACD, RSI,
+// BB) over a close panel. Every column is an independent backtest: exactly
+// what a fresh Backtester(initial_capital, strategy, leverage) would do fed
+// that column's closes one by one as flat bars -- same indicator kernels, same
+// entry/exit rules, 20%-of-cash sizing at close * 1.001, 1bp commission, and
+// the same max-drawdown / parametric-VaR stop that liquidates and halts. Only
+// equity differs, and only by rounding: it is recomputed as cash + qty * close
+// instead of the engine's running market value. There is no regime filter,
+// cross-column cash, or risk cadence other than every bar.
+//
+// Screen with this, then replay the finalists through the full engine.
+struct VectorBacktestConfig {
+    std::string strategy = "EMA";
+    // Strategy parameters by name, defaults as in the strategy constructors:
+    //   EMA  short_window=20 long_window=50
+    //   MACD fast=12 slow=26 signal=9
+    //   RSI  period=14 buy_thresh=30 sell_thresh=70
+    //   BB   period=20 std_dev_mult=2
+    std::map<std::string, double> params;
+    double initial_capital = 100000.0;
+    double leverage = 1.0;
+    double max_drawdown_limit = 0.05;  // as Backtester::set_risk_params
+    double var_limit = 0.02;
+};
+
+struct VectorBacktestResult {
+    std::size_t rows = 0;
+    std::size_t cols = 0;
+    std::vector<double> equity;    // rows x cols, equity after each bar
+    std::vector<double> position;  // rows x cols, holding after each bar
+    std::vector<double> final_equity;
+    std::vector<double> max_drawdown;    // <= 0, as Backtester::get_max_drawdown
+    std::vector<std::int64_t> trades;    // fills, liquidations included
+    std::vector<std::uint8_t> halted;    // 1 if the risk stop fired
+};
+
+// Columns run in parallel (num_threads as in ParallelFor). NaN closes are not
+// bars: the column skips them, as run_panel does, and repeats its last
+// equity/position. Unknown strategies or parameter names, non-integral
+// periods and periods below 1 throw std::invalid_argument.
+VectorBacktestResult RunVectorBacktest(PanelView closes, const VectorBacktestConfig& config,
+                                       unsigned int num_threads = 0);
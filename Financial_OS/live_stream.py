@@ -24,6 +24,8 @@ print(f"-> Booting Native C++ Engine with Strategy: {strategy_name}")
 
 engine = FinancialEngine.Backtester(initial_capital, strategy_name, 1.0)
 engine.set_regime_filter(False, 252)
+# 24/7 session: keep a bounded tail of bars/equity so memory stays flat
+engine.set_bar_retention(5000)
 tick_count = 0
 
 def on_message(ws, message):
@@ -44,7 +46,7 @@ def on_message(ws, message):
     # Console Update (Print every 10 ticks to prevent console IO bottleneck)
     if tick_count % 10 == 0:
         equity = engine.get_total_equity()
-        trades = len(engine.get_trade_history())
+        trades = engine.get_trade_count()
         inventory = engine.get_holdings(ticker)
         print(f"[Live Tick {tick_count:>4} {ticker} Price: ${price:.2f} | Inventory: {inventory:.4f} | Trades: {trades} | C++ Equity: ${equity:.2f}]")
 
@@ -56,7 +58,7 @@ def on_close(ws, close_status_code, close_msg):
     print("  Connection Closed. Final Engine State:          ")
     print("==================================================")
     print(f"Final Equity: ${engine.get_total_equity():.2f}")
-    print(f"Total Trades: {len(engine.get_trade_history())}")
+    print(f"Total Trades: {engine.get_trade_count()}")
     print("Shutting down FinancialOS Live System.")
 
 def on_open(ws):
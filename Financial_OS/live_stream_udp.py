@@ -24,6 +24,7 @@ def main():
     print(f"-> Booting Native C++ Engine with Strategy: {strategy_name}")
     engine = FinancialEngine.Backtester(initial_capital, strategy_name, 1.0)
     engine.set_regime_filter(False, 252)
+    engine.set_bar_retention(5000)
 
     UDP_IP = "127.0.0.1"
     UDP_PORT = 9999
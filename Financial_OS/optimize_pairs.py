@@ -40,19 +40,19 @@ def create_random_gene():
         "threshold": random.uniform(1.0, 3.5)
     }
 
-def evaluate_fitness(gene):
-    payload = copy.deepcopy(BASE_PAYLOAD)
-    payload["pairs_window"] = gene["window"]
-    payload["pairs_threshold"] = gene["threshold"]
+def evaluate_population(population):
+    # One /api/sweep call per generation: the prices go over the wire once and
+    # the server runs every gene in parallel against the same panel.
+    payload = dict(BASE_PAYLOAD)
+    payload["configs"] = [{"window": g["window"], "threshold": g["threshold"]} for g in population]
 
     try:
-        resp = requests.post("http://localhost:8000/api/backtest", json=payload)
+        resp = requests.post("http://localhost:8000/api/sweep", json=payload)
         if resp.status_code == 200:
-            res = resp.json()
-            return res['return_pct']
-        return -999.0
+            return resp.json()["results"]["return_pct"]
+        return [-999.0] * len(population)
     except:
-        return -999.0
+        return [-999.0] * len(population)
 
 def mutate(gene):
     if random.random() < 0.3:
@@ -71,8 +71,7 @@ for gen in range(GENERATIONS):
     print(f"\n[Generation {gen+1}] Fighting...")
 
     scored_pop = []
-    for gene in population:
-        score = evaluate_fitness(gene)
+    for score, gene in zip(evaluate_population(population), population):
         scored_pop.append((score, gene))
         print(f"  > Gene [W={gene['window']:2d}, T={gene['threshold']:.2f}] -> Return: {score:.2f}%")
 
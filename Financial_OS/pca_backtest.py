@@ -1,5 +1,6 @@
 import sys
 import os
+import numpy as np
 import yfinance as yf
 import pandas as pd
 
@@ -31,11 +32,9 @@ def run_stat_arb_backtest():
 
     print(f"  [System] Engine initialized. Feeding {len(df)} trading days to C++ Core...")
 
-    for i, (date, row) in enumerate(df.iterrows()):
-        timestamp = float(i)
-        for ticker in TICKERS:
-            price = float(row[ticker])
-            engine.on_market_data(ticker, timestamp, price, price, price, price)
+    closes = df[TICKERS].to_numpy(dtype=np.float64)
+    panel = np.repeat(closes[:, :, np.newaxis], 4, axis=2)
+    engine.run_panel(TICKERS, np.arange(len(df), dtype=np.float64), panel)
 
     equity = engine.get_total_equity()
     mdd = engine.get_max_drawdown()
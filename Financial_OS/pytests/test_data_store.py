@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -51,6 +52,75 @@ def test_get_ohlc_empty_when_symbol_unknown(con):
     assert result["dates"]  == []
     assert result["closes"] == []
 
+def test_get_ohlc_arrays_matches_get_ohlc(con):
+    _insert(con, "AAPL", "2020-01-02", 1, 2, 0.5, 1.5)
+    _insert(con, "AAPL", "2020-01-01", 1, 2, 0.5, 1.4)
+
+    arrays = data_store.get_ohlc_arrays(con, "AAPL")
+    lists = data_store.get_ohlc(con, "AAPL")
+
+    for key in ("opens", "highs", "lows", "closes"):
+        assert arrays[key].dtype == np.float64
+        assert arrays[key].flags["C_CONTIGUOUS"]
+        assert arrays[key].tolist() == lists[key]
+    assert [str(d)[:10] for d in arrays["dates"]] == _dates(lists)
+
+def test_get_ohlc_arrays_maps_null_to_nan(con):
+    _insert(con, "AAPL", "2020-01-01", 1, 2, None, 1.5)
+
+    arrays = data_store.get_ohlc_arrays(con, "AAPL")
+
+    assert not isinstance(arrays["lows"], np.ma.MaskedArray)
+    assert np.isnan(arrays["lows"][0])
+
+def test_get_ohlc_arrays_filters_by_start_and_end(con):
+    for d in ("2020-01-01", "2020-01-02", "2020-01-03"):
+        _insert(con, "AAPL", d, 1, 2, 0.5, 1.5)
+
+    arrays = data_store.get_ohlc_arrays(con, "AAPL", start="2020-01-02", end="2020-01-02")
+
+    assert len(arrays["closes"]) == 1
+
+def test_get_ohlc_arrow_returns_table(con):
+    pa = pytest.importorskip("pyarrow")
+    _insert(con, "AAPL", "2020-01-01", 1, 2, 0.5, 1.5)
+
+    table = data_store.get_ohlc_arrow(con, "AAPL")
+
+    assert isinstance(table, pa.Table)
+    assert table.column_names == ["date", "open", "high", "low", "close"]
+    assert table.column("close").to_pylist() == [1.5]
+
+def test_get_ohlc_panel_aligns_on_union_of_dates(con):
+    _insert(con, "AAPL", "2020-01-01", 1, 2, 0.5, 1.5)
+    _insert(con, "AAPL", "2020-01-02", 1, 2, 0.5, 1.6)
+    _insert(con, "MSFT", "2020-01-02", 10, 20, 5, 15)
+    _insert(con, "MSFT", "2020-01-03", 10, 20, 5, 16)
+
+    panel = data_store.get_ohlc_panel(con, ["MSFT", "AAPL"])
+
+    assert [str(d)[:10] for d in panel["dates"]] == ["2020-01-01", "2020-01-02", "2020-01-03"]
+    assert panel["symbols"] == ["MSFT", "AAPL"]
+    assert panel["ohlc"].shape == (3, 2, 4)
+    assert panel["ohlc"][1, 0].tolist() == [10, 20, 5, 15]
+    assert panel["ohlc"][1, 1].tolist() == [1, 2, 0.5, 1.6]
+    assert np.isnan(panel["ohlc"][0, 0]).all()
+    assert np.isnan(panel["ohlc"][2, 1]).all()
+
+def test_get_ohlc_panel_rejects_empty_symbols(con):
+    with pytest.raises(ValueError):
+        data_store.get_ohlc_panel(con, [])
+
+def test_get_ohlc_panel_drops_repeated_symbols(con):
+    _insert(con, "AAPL", "2020-01-01", 1, 2, 0.5, 1.5)
+    _insert(con, "MSFT", "2020-01-01", 10, 20, 5, 15)
+
+    panel = data_store.get_ohlc_panel(con, ["MSFT", "AAPL", "MSFT"])
+
+    assert panel["symbols"] == ["MSFT", "AAPL"]
+    assert panel["ohlc"].shape == (1, 2, 4)
+    assert not np.isnan(panel["ohlc"]).any()
+
 def test_symbols_aggregates_counts_and_date_range(con):
     _insert(con, "AAPL", "2020-01-01", 1, 2, 0.5, 1.5)
     _insert(con, "AAPL", "2020-01-02", 1, 2, 0.5, 1.5)
@@ -1,8 +1,9 @@
 import sys
 import os
-from typing import List, Dict
+import numpy as np
+from typing import List, Dict, Literal, Optional, Tuple, Union
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator, model_validator
 
 try:
     import FinancialEngine as fe
@@ -28,23 +29,102 @@ class BacktestRequest(BaseModel):
     max_drawdown_limit: float = 0.10
     pairs_window: int = 30
     pairs_threshold: float = 2.0
+    # (x, y) symbol pairs for PAIRS_BASKET, all traded from one engine.
+    pairs: List[Tuple[str, str]] = []
+    # Strategy parameters by name (see engine.get_parameters()); applied after
+    # pairs_window / pairs_threshold, so they win.
+    params: Dict[str, float] = {}
+    # One equity point per bar ("tick"), per timestamp, or per `equity_interval`
+    # timestamps. Sampling also feeds max_drawdown and the drawdown hard stop,
+    # so it stays opt-in; "timestamp" keeps multi-asset curves as long as the data.
+    equity_sampling: Literal["tick", "timestamp", "interval"] = "tick"
+    equity_interval: float = 0.0
+    # Decimate the returned curve to at most this many points (0 = return all).
+    equity_points: int = 0
+    equity_downsample: Literal["lttb", "minmax"] = "lttb"
+
+    @field_validator("equity_points")
+    @classmethod
+    def _check_equity_points(cls, v: int) -> int:
+        if v != 0 and v < 3:
+            raise ValueError("equity_points must be 0 (all) or at least 3")
+        return v
+
+    @model_validator(mode="after")
+    def _check_equity_interval(self):
+        if self.equity_sampling == "interval" and not self.equity_interval > 0:
+            raise ValueError('equity_interval must be positive when equity_sampling is "interval"')
+        return self
+
+class SweepRequest(BaseModel):
+    initial_capital: float = 10000.0
+    assets: Dict[str, AssetData]
+    strategy: str = "EMA"
+    leverage: float = 1.0
+    max_drawdown_limit: float = 0.10
+    # Either a {name: [values]} grid (every combination is run) or an explicit
+    # list of {name: value} configurations.
+    param_grid: Optional[Dict[str, List[float]]] = None
+    configs: Optional[List[Dict[str, float]]] = None
 
 class OptimizationRequest(BaseModel):
     assets: Dict[str, List[float]] 
     risk_free_rate: float = 0.02
     num_simulations: int = 10000
+    seed: Optional[int] = None  # fixes the sampled portfolios
 
 class EvolutionRequest(BaseModel):
-    prices: List[float]
+    # A single close series, or `assets` for multi-asset strategies (PAIRS).
+    prices: List[float] = []
+    assets: Optional[Dict[str, AssetData]] = None
+    strategy: str = "MACD"
+    # {name: [low, high]}; integer bounds search whole numbers only.
+    # Defaults to MACD_SPACE for MACD.
+    space: Optional[Dict[str, List[Union[int, float]]]] = None
+    initial_capital: float = 10000.0
+    leverage: float = 1.0
+    max_drawdown_limit: float = 0.05
     generations: int = 20
     population_size: int = 100
+    seed: Optional[int] = None
+    # Stop after this many generations without improvement (0 = never).
+    patience: int = 0
+    # Wall-clock budget in seconds (0 = none).
+    time_budget: float = 0.0
 
 class ScanRequest(BaseModel):
-    assets: Dict[str, AssetData]
+    # Full OHLC per asset, or just closes -- the lighter payload for wide universes.
+    assets: Dict[str, AssetData] = {}
+    closes: Dict[str, List[float]] = {}
+    top_n: int = 5
+    # float32 correlations: about twice as fast for thousands of names.
+    single_precision: bool = False
+    # Also run the Engle-Granger funnel over the most correlated pairs; series
+    # are aligned on their last min(len) closes.
+    cointegration: bool = False
+    min_correlation: float = 0.5
+    significance: float = 0.05
+    max_half_life: float = 252.0
 
 class RegimeRequest(BaseModel):
     prices: List[float]
     window_size: int = 20
+    history: bool = False
+
+def build_panel(assets: Dict[str, AssetData]):
+    """A (T, N, 4) OHLC panel clocked by the first asset, NaN where a shorter
+    series has run out (the engine skips those bars)."""
+    symbols = list(assets.keys())
+    data_len = len(assets[symbols[0]].closes)
+    panel = np.full((data_len, len(symbols), 4), np.nan)
+    for j, symbol in enumerate(symbols):
+        data = assets[symbol]
+        for f, column in enumerate((data.opens, data.highs, data.lows, data.closes)):
+            k = min(len(column), data_len)
+            panel[:k, j, f] = column[:k]
+    return symbols, panel
+
+MACD_SPACE = {"fast": [5, 50], "slow": [20, 100], "signal": [5, 30]}
 
 # --- API Endpoints ---
 
@@ -59,48 +139,54 @@ def run_backtest(req: BacktestRequest):
         engine = fe.Backtester(req.initial_capital, req.strategy, req.leverage)
         engine.set_risk_params(req.max_drawdown_limit, 0.02)
 
-        if req.strategy == "PAIRS":
+        if req.strategy == "PAIRS_BASKET" and req.pairs:
+            engine.set_pairs_basket(req.pairs)
+        if req.strategy in ("PAIRS", "PAIRS_BASKET"):
             engine.set_pairs_parameters(req.pairs_window, req.pairs_threshold)
+
+        sampling = {
+            "tick": fe.EquitySampling.EVERY_TICK,
+            "timestamp": fe.EquitySampling.PER_TIMESTAMP,
+            "interval": fe.EquitySampling.INTERVAL,
+        }[req.equity_sampling]
+        engine.set_equity_sampling(sampling, req.equity_interval)
         
+        if req.params:
+            engine.set_parameters(req.params)
+
         # 2. Feed Data
         if not req.assets:
             raise HTTPException(status_code = 400, detail="No assets provided")
 
-        first_symbol = list(req.assets.keys())[0]
-        data_len = len(req.assets[first_symbol].closes)
-
-        for t in range(data_len):
-            timestamp = float(t)
-            for symbol, data in req.assets.items():
-                if t < len(data.closes):
-                    engine.on_market_data(
-                        symbol,
-                        timestamp,
-                        data.opens[t],
-                        data.highs[t],
-                        data.lows[t],
-                        data.closes[t]
-                    )
-            
+        symbols, panel = build_panel(req.assets)
+        engine.run_panel(symbols, np.arange(len(panel), dtype=np.float64), panel)
+
         # 3. Retrieve Raw Data from C++
         final_equity = engine.get_total_equity()
-        raw_trades = engine.get_trade_history()
+        ledger = engine.get_trade_ledger()
         mdd = engine.get_max_drawdown()
-        equity_history = engine.get_equity_history()
-
-        # 4. [CRITICAL STEP] Convert C++ Objects to Python Dictionaries
-        # We MUST convert them manually, or FastAPI will crash.
-        clean_trade_list = []
-        for tr in raw_trades:
-            clean_trade_list.append({
-                "id": tr.id,
-                "symbol": tr.symbol,
-                "side": tr.side,
-                "qty": float(tr.quantity),
-                "price": float(tr.price),
-                "comm": float(tr.commission),
-                "time": float(tr.timestamp)
-            })
+        equity = engine.get_equity_history()
+        equity_index = None
+        if req.equity_points and len(equity) > req.equity_points:
+            downsample = fe.Analytics.downsample_lttb if req.equity_downsample == "lttb" else fe.Analytics.downsample_minmax
+            picked = downsample(equity, req.equity_points)
+            equity, equity_index = equity[picked], picked.tolist()
+        equity_history = equity.tolist()
+
+        # 4. [CRITICAL STEP] Convert C++ columns to plain Python lists
+        # FastAPI can't serialize NumPy arrays; .tolist() per column avoids a per-trade loop.
+        names = np.asarray(ledger["symbols"], dtype=object)
+        trade_columns = {
+            "id": ledger["id"].tolist(),
+            "symbol": names[ledger["symbol"]].tolist(),
+            "side": np.where(ledger["side"] > 0, "BUY", "SELL").tolist(),
+            "qty": ledger["quantity"].tolist(),
+            "price": ledger["price"].tolist(),
+            "comm": ledger["commission"].tolist(),
+            "time": ledger["timestamp"].tolist()
+        }
+        # trade_history keeps its per-trade shape; the columns go out as trade_ledger.
+        trade_list = [dict(zip(trade_columns, row)) for row in zip(*trade_columns.values())]
 
         # 5. Return the CLEAN Python dictionary
         return {
@@ -109,15 +195,44 @@ def run_backtest(req: BacktestRequest):
             "final_equity": final_equity,
             "return_pct": ((final_equity - req.initial_capital) / req.initial_capital) * 100,
             "max_drawdown": mdd * 100.0,
-            "total_trades": len(clean_trade_list),
+            "total_trades": len(trade_list),
             "equity_history": equity_history,
-            "trade_history": clean_trade_list
+            # Positions of the returned points in the full curve, when decimated.
+            "equity_index": equity_index,
+            "trade_history": trade_list,
+            "trade_ledger": trade_columns
         }
 
     except Exception as e:
         print(f"[Server Error] {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/sweep")
+def run_sweep(req: SweepRequest):
+    if not req.assets:
+        raise HTTPException(status_code=400, detail="No assets provided")
+    if (req.param_grid is None) == (req.configs is None):
+        raise HTTPException(status_code=400, detail="Provide exactly one of param_grid or configs")
+    try:
+        # The panel is built once and shared by every configuration.
+        symbols, panel = build_panel(req.assets)
+        table = fe.sweep(req.strategy, req.param_grid if req.param_grid is not None else req.configs, panel,
+                         symbols=symbols, initial_capital=req.initial_capital, leverage=req.leverage,
+                         max_drawdown_limit=req.max_drawdown_limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"[Sweep Error] {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    table["max_drawdown"] = table["max_drawdown"] * 100.0
+    return {
+        "status": "success",
+        "strategy": req.strategy,
+        "count": len(table["final_equity"]),
+        "results": {name: column.tolist() for name, column in table.items()}
+    }
+
 @app.post("/api/optimize")
 def run_optimizer(req: OptimizationRequest):
     try:
@@ -130,7 +245,7 @@ def run_optimizer(req: OptimizationRequest):
             opt.add_asset(symbol, returns)
             assets_list.append(symbol)
             
-        result = opt.optimize_sharpe_ratio(req.num_simulations, req.risk_free_rate)
+        result = opt.optimize_sharpe_ratio(req.num_simulations, req.risk_free_rate, seed=req.seed)
         
         allocation = {}
         for i, symbol in enumerate(assets_list):
@@ -144,21 +259,51 @@ def run_optimizer(req: OptimizationRequest):
             "expected_volatility": result.portfolio_volatility,
             "allocation": allocation
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/evolve")
 def run_evolution(req: EvolutionRequest):
-    best = fe.GeneticOptimizer.evolve_macd(req.prices, 10000.0, req.generations, req.population_size)
+    space = req.space
+    if space is None:
+        if req.strategy != "MACD":
+            raise HTTPException(status_code=400, detail="space is required for strategies other than MACD")
+        space = MACD_SPACE
+    if req.strategy == "MACD" and "fast" in space and "slow" in space and space["fast"][1] + 5 > space["slow"][1]:
+        # The engine repairs slow <= fast to slow = fast + 5; that must stay in range.
+        raise HTTPException(status_code=400, detail="MACD space needs fast's upper bound + 5 <= slow's upper bound")
+    if req.assets:
+        symbols, panel = build_panel(req.assets)
+    elif req.prices:
+        symbols, panel = None, np.asarray(req.prices, dtype=np.float64)
+    else:
+        raise HTTPException(status_code=400, detail="No price data provided")
+
+    try:
+        result = fe.evolve(req.strategy, {name: tuple(bounds) for name, bounds in space.items()}, panel,
+                           symbols=symbols, generations=req.generations, population_size=req.population_size,
+                           seed=req.seed, patience=req.patience, time_budget=req.time_budget,
+                           initial_capital=req.initial_capital, leverage=req.leverage,
+                           max_drawdown_limit=req.max_drawdown_limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     return {
-        "best_params": {"fast": best.fast, "slow": best.slow, "signal": best.signal},
-        "return_pct": best.fitness
+        "best_params": result["best_params"],
+        "return_pct": result["best_fitness"],
+        "generations": result["generations"],
+        "evaluations": result["evaluations"],
+        "cache_hits": result["cache_hits"],
+        "stop_reason": result["stop_reason"],
+        "history": result["history"].tolist()
     }
 
 @app.post("/api/scan")
 def scan_universe(req: ScanRequest):
     try:
-        price_map = {}
+        price_map = {symbol: closes for symbol, closes in req.closes.items() if closes}
         for symbol, data in req.assets.items():
             if not data.closes: continue
             price_map[symbol] = data.closes
@@ -166,7 +311,7 @@ def scan_universe(req: ScanRequest):
         if len(price_map) < 2:
             raise HTTPException(status_code=400, detail="Need at least 2 assets to scan.")
 
-        top_pairs = fe.PairSelector.find_top_pairs(price_map, 5)
+        top_pairs = fe.PairSelector.find_top_pairs(price_map, req.top_n, req.single_precision)
 
         results = []
         for p in top_pairs:
@@ -178,12 +323,27 @@ def scan_universe(req: ScanRequest):
                 "r_squared": p.r_squared
             })
 
-        return {
+        response = {
             "status": "success",
             "scanned_count": len(price_map),
             "top_pairs": results
         }
+        if req.cointegration:
+            symbols = list(price_map.keys())
+            length = min(len(closes) for closes in price_map.values())
+            panel = np.column_stack([price_map[s][-length:] for s in symbols])
+            screen = fe.PairSelector.cointegration_screen(
+                panel, symbols, min_correlation=req.min_correlation, significance=req.significance,
+                max_half_life=req.max_half_life, single_precision=req.single_precision)
+            response["cointegration"] = {
+                "critical_value": screen["critical_value"],
+                "funnel": screen["funnel"],
+                "pairs": {name: np.asarray(column).tolist() for name, column in screen["pairs"].items()},
+            }
+        return response
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"[Scan Error] {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -196,13 +356,17 @@ def detect_market_regime(req: RegimeRequest):
 
         result = fe.RegimeDetector.detect_regime(req.prices, req.window_size)
 
-        return {
+        response = {
             "status": "success",
             "state_id": result.state_id,
             "state_name": result.state_name,
             "current_volatility": result.current_volatility,
             "current_trend": result.current_trend
         }
+        if req.history:
+            labels = fe.RegimeDetector.label_series(req.prices, req.window_size)
+            response["history"] = {name: column.tolist() for name, column in labels.items()}
+        return response
     except Exception as e:
         print(f"[Regime Error] {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -3,6 +3,7 @@
 from fastapi import FastAPI
 from pydantic import BaseModel
 from datetime import date
+from typing import Literal
 from celery import Celery, chord
 from celery.result import AsyncResult
 import os
@@ -44,6 +45,54 @@ def job_status(job_id: str):
         payload["error"] = str(res.result)
     return payload
 
+class HalvingRequest(BaseModel):
+    symbols: list[str]
+    start: str | None = None
+    end: str | None = None
+    strategy: str = "EMA"
+    # {name: [values]}; every combination is a candidate.
+    param_grid: dict[str, list[float]]
+    method: Literal["successive_halving", "hyperband"] = "successive_halving"
+    eta: float = 3.0
+    min_bars: int = 0
+    seed: int | None = None  # Hyperband only
+    initial_capital: float = 100000.0
+    leverage: float = 1.0
+    max_drawdown_limit: float = 0.05
+
+@app.post("/halving")
+def submit_halving(req: HalvingRequest):
+    async_result = celery_client.send_task(
+        "run_halving_job",
+        args=[req.symbols, req.start, req.end, req.strategy, req.param_grid,
+              req.method, req.eta, req.min_bars, req.seed,
+              req.initial_capital, req.leverage, req.max_drawdown_limit],
+    )
+    return {"job_id": async_result.id, "state": "PENDING"}
+
+class CointegrationRequest(BaseModel):
+    # None: every symbol in the store.
+    symbols: list[str] | None = None
+    start: str | None = None
+    end: str | None = None
+    min_correlation: float = 0.5
+    max_candidates: int = 5000
+    adf_lags: int = 1
+    significance: float = 0.05
+    min_half_life: float = 1.0
+    max_half_life: float = 252.0
+    max_hurst: float = 1.0
+
+@app.post("/cointegration")
+def submit_cointegration(req: CointegrationRequest):
+    async_result = celery_client.send_task(
+        "run_cointegration_job",
+        args=[req.symbols, req.start, req.end, req.min_correlation, req.max_candidates,
+              req.adf_lags, req.significance, req.min_half_life, req.max_half_life,
+              req.max_hurst],
+    )
+    return {"job_id": async_result.id, "state": "PENDING"}
+
 def _add_months(d: date, months: int) -> date:
     total = d.month - 1 + months
     year  = d.year + total // 12
@@ -1,5 +1,8 @@
 # services/tasks.py
 
+import math
+
+import numpy as np
 import FinancialEngine as fe
 import data_store
 import duckdb
@@ -7,24 +10,22 @@ from services.celery_app import celery_app
 
 def _run_backtest(con, symbols, start, end, strategy, initial_capital, leverage):
     engine = fe.Backtester(initial_capital, strategy, leverage)
-    series = {sym: data_store.get_ohlc(con, sym, start=start, end=end)
-              for sym in symbols}
-    n = min(len(s["closes"]) for s in series.values())
-    for i in range(n):
-        for sym in symbols:
-            bars = series[sym]
-            engine.on_market_data(
-                sym, float(i),
-                bars["opens"][i], bars["highs"][i],
-                bars["lows"][i], bars["closes"][i],
-            )
-    trades = []
-    for tr in engine.get_trade_history():
-        trades.append({
-            "id": tr.id, "symbol": tr.symbol, "side": tr.side,
-            "qty": float(tr.quantity), "price": float(tr.price),
-            "comm": float(tr.commission), "time": float(tr.timestamp),
-        })
+    panel = data_store.get_ohlc_panel(con, symbols, start=start, end=end)
+    symbols = panel["symbols"]
+    n = len(panel["dates"])
+    engine.run_panel(symbols, np.arange(n, dtype=np.float64), panel["ohlc"])
+    ledger = engine.get_trade_ledger()
+    names = np.asarray(ledger["symbols"], dtype=object)
+    # Column-oriented: one list per field rather than one dict per fill.
+    trades = {
+        "id": ledger["id"].tolist(),
+        "symbol": names[ledger["symbol"]].tolist(),
+        "side": np.where(ledger["side"] > 0, "BUY", "SELL").tolist(),
+        "qty": ledger["quantity"].tolist(),
+        "price": ledger["price"].tolist(),
+        "comm": ledger["commission"].tolist(),
+        "time": ledger["timestamp"].tolist(),
+    }
     final_equity = engine.get_total_equity()
     return {
         "symbols": symbols,
@@ -35,7 +36,7 @@ def _run_backtest(con, symbols, start, end, strategy, initial_capital, leverage)
         "final_equity": final_equity,
         "return_pct": (final_equity - initial_capital) / initial_capital * 100.0,
         "max_drawdown": engine.get_max_drawdown() * 100.0,
-        "total_trades": len(trades),
+        "total_trades": len(trades["id"]),
         "trades": trades,
     }
 
@@ -55,6 +56,78 @@ def run_backtest_job(symbols, start, end, strategy="MACD",
     finally:
         con.close()                     
 
+@celery_app.task(
+    name="run_halving_job",
+    autoretry_for=(duckdb.IOException,),
+    retry_backoff=True,
+    retry_backoff_max=10,
+    retry_jitter=True,
+    max_retries=3,
+)
+def run_halving_job(symbols, start, end, strategy, param_grid, method="successive_halving",
+                    eta=3.0, min_bars=0, seed=None, initial_capital=100000.0, leverage=1.0,
+                    max_drawdown_limit=0.05):
+    con = data_store.connect_readonly()
+    try:
+        panel = data_store.get_ohlc_panel(con, symbols, start=start, end=end)
+    finally:
+        con.close()
+    symbols = panel["symbols"]
+    # Only Hyperband samples configurations, so only it takes a seed.
+    search, sampling = ((fe.hyperband, {"seed": seed}) if method == "hyperband"
+                        else (fe.successive_halving, {}))
+    board = search(strategy, param_grid, panel["ohlc"], symbols=symbols, eta=eta,
+                   min_bars=min_bars, initial_capital=initial_capital,
+                   leverage=leverage, max_drawdown_limit=max_drawdown_limit, **sampling)
+    n = len(panel["dates"])
+    # Distinct configurations in the grid: Hyperband brackets resample it, so
+    # one configuration can appear in several leaderboard rows.
+    configs = math.prod(len(values) for values in param_grid.values())
+    return {
+        "symbols": symbols,
+        "strategy": strategy,
+        "method": method,
+        "bars": n,
+        "configs": configs,
+        # Engine bars spent vs. a full sweep of every configuration.
+        "total_bars": int(board["bars"].sum()),
+        "full_bars": configs * n,
+        "leaderboard": {name: column.tolist() for name, column in board.items()},
+    }
+
+@celery_app.task(
+    name="run_cointegration_job",
+    autoretry_for=(duckdb.IOException,),
+    retry_backoff=True,
+    retry_backoff_max=10,
+    retry_jitter=True,
+    max_retries=3,
+)
+def run_cointegration_job(symbols=None, start=None, end=None, min_correlation=0.5,
+                          max_candidates=5000, adf_lags=1, significance=0.05,
+                          min_half_life=1.0, max_half_life=252.0, max_hurst=1.0):
+    con = data_store.connect_readonly()
+    try:
+        if not symbols:
+            symbols = data_store.symbols(con)["symbol"].tolist()
+        panel = data_store.get_ohlc_panel(con, symbols, start=start, end=end)
+    finally:
+        con.close()
+    symbols = panel["symbols"]
+    # Symbols with a gap in the window are skipped (counted in the funnel).
+    closes = np.ascontiguousarray(panel["ohlc"][:, :, 3])
+    screen = fe.PairSelector.cointegration_screen(
+        closes, symbols, min_correlation=min_correlation, max_candidates=max_candidates,
+        adf_lags=adf_lags, significance=significance, min_half_life=min_half_life,
+        max_half_life=max_half_life, max_hurst=max_hurst)
+    return {
+        "symbols": len(symbols),
+        "bars": len(panel["dates"]),
+        "critical_value": screen["critical_value"],
+        "funnel": screen["funnel"],
+        "pairs": {name: np.asarray(column).tolist() for name, column in screen["pairs"].items()},
+    }
+
 @celery_app.task(name="aggregate_walkforward")
 def aggregate_walkforward(window_results):
     growth = 1.0
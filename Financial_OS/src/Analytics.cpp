@@ -1,6 +1,8 @@
 // src/Analytics.cpp
 
 #include "../include/Analytics.h"
+#include <Eigen/Dense>
+#include <limits>
 
 std::vector<double> Analytics::CalculateLogReturns(const std::vector<double>& prices) {
     if (prices.size() < 2) return {};
@@ -192,4 +194,193 @@ LinearRegressionResult Analytics::FitLinearRegression(const std::vector<double>&
     }
 
     return res;
-}
\ No newline at end of file
+}
+
+double Analytics::CalculateADFStatistic(const std::vector<double>& series, int lags) {
+    if (lags < 0) throw std::invalid_argument("lags must be non-negative");
+    const auto p = static_cast<std::size_t>(lags);
+    const std::size_t k = p + 1;
+    // Rows t = p+1 .. n-1 of the regression; one residual degree of freedom at least.
+    if (series.size() < p + k + 3) return std::nan("");
+    const std::size_t n = series.size();
+
+    Eigen::MatrixXd xtx = Eigen::MatrixXd::Zero(k, k);
+    Eigen::VectorXd xty = Eigen::VectorXd::Zero(k);
+    double yty = 0.0;
+    Eigen::VectorXd row(k);
+    for (std::size_t t = p + 1; t < n; ++t) {
+        row(0) = series[t - 1];
+        for (std::size_t i = 1; i <= p; ++i) row(i) = series[t - i] - series[t - i - 1];
+        const double dy = series[t] - series[t - 1];
+        xtx.selfadjointView<Eigen::Lower>().rankUpdate(row);
+        xty += dy * row;
+        yty += dy * dy;
+    }
+
+    const Eigen::LDLT<Eigen::MatrixXd> ldlt(xtx);  // reads the lower triangle only
+    if (ldlt.info() != Eigen::Success || !(ldlt.vectorD().minCoeff() > 0.0)) return std::nan("");
+    const Eigen::VectorXd coef = ldlt.solve(xty);
+    const auto dof = static_cast<double>(n - p - 1 - k);
+    const double rss = std::max(0.0, yty - coef.dot(xty));
+    const double s2 = rss / dof;
+    const double var_gamma = s2 * ldlt.solve(Eigen::VectorXd::Unit(static_cast<Eigen::Index>(k), 0))(0);
+    if (!(var_gamma > 0.0)) return std::nan("");
+    return coef(0) / std::sqrt(var_gamma);
+}
+
+double Analytics::EngleGrangerCriticalValue(std::size_t n_obs, double significance) {
+    // tau_inf, tau_1, tau_2 of the response surface tau_inf + tau_1/T + tau_2/T^2.
+    double b0, b1, b2;
+    if (std::abs(significance - 0.01) < 1e-12) {
+        b0 = -3.89644; b1 = -10.9519; b2 = -22.527;
+    } else if (std::abs(significance - 0.05) < 1e-12) {
+        b0 = -3.33613; b1 = -6.1101; b2 = -6.823;
+    } else if (std::abs(significance - 0.10) < 1e-12) {
+        b0 = -3.04445; b1 = -4.2412; b2 = -2.720;
+    } else {
+        throw std::invalid_argument("significance must be 0.01, 0.05 or 0.10");
+    }
+    if (n_obs == 0) throw std::invalid_argument("n_obs must be positive");
+    const double inv = 1.0 / static_cast<double>(n_obs);
+    return b0 + b1 * inv + b2 * inv * inv;
+}
+
+double Analytics::CalculateHalfLife(const std::vector<double>& spread) {
+    if (spread.size() < 3) return std::numeric_limits<double>::infinity();
+    const std::size_t m = spread.size() - 1;
+    double mean_x = 0.0, mean_y = 0.0;
+    for (std::size_t t = 1; t <= m; ++t) {
+        mean_x += spread[t - 1];
+        mean_y += spread[t] - spread[t - 1];
+    }
+    mean_x /= static_cast<double>(m);
+    mean_y /= static_cast<double>(m);
+    double sxy = 0.0, sxx = 0.0;
+    for (std::size_t t = 1; t <= m; ++t) {
+        const double dx = spread[t - 1] - mean_x;
+        sxy += dx * (spread[t] - spread[t - 1] - mean_y);
+        sxx += dx * dx;
+    }
+    if (sxx == 0.0) return std::numeric_limits<double>::infinity();
+    // e_t = phi * e_{t-1} + ..., phi = 1 + lambda; a negative phi overshoots
+    // but still decays at |phi| per bar.
+    const double phi = std::abs(1.0 + sxy / sxx);
+    if (!(phi < 1.0)) return std::numeric_limits<double>::infinity();
+    if (phi == 0.0) return 0.0;
+    return -std::log(2.0) / std::log(phi);
+}
+
+double Analytics::CalculateHurstExponent(const std::vector<double>& series, int max_lag) {
+    const std::size_t top = std::min<std::size_t>(max_lag > 0 ? static_cast<std::size_t>(max_lag) : 0,
+                                                  series.size() / 2);
+    if (top < 3) return std::nan("");
+    // Least-squares slope of log std(x_{t+tau} - x_t) on log tau.
+    double sx = 0.0, sy = 0.0, sxx = 0.0, sxy = 0.0;
+    std::size_t points = 0;
+    for (std::size_t tau = 2; tau <= top; ++tau) {
+        const std::size_t m = series.size() - tau;
+        double sum = 0.0, sq = 0.0;
+        for (std::size_t t = 0; t < m; ++t) {
+            const double d = series[t + tau] - series[t];
+            sum += d;
+            sq += d * d;
+        }
+        const double mean = sum / static_cast<double>(m);
+        const double var = sq / static_cast<double>(m) - mean * mean;
+        if (!(var > 0.0)) return std::nan("");
+        const double x = std::log(static_cast<double>(tau));
+        const double y = 0.5 * std::log(var);
+        sx += x;
+        sy += y;
+        sxx += x * x;
+        sxy += x * y;
+        ++points;
+    }
+    const auto np = static_cast<double>(points);
+    return (np * sxy - sx * sy) / (np * sxx - sx * sx);
+}
+
+namespace {
+
+// All indices when no decimation is needed; validates max_points otherwise.
+bool KeepAll(std::size_t n, std::size_t max_points, std::vector<std::size_t>& out) {
+    if (max_points < 3) {
+        throw std::invalid_argument("max_points must be at least 3");
+    }
+    if (n > max_points) return false;
+    out.resize(n);
+    std::iota(out.begin(), out.end(), std::size_t{0});
+    return true;
+}
+
+} // namespace
+
+std::vector<std::size_t> Analytics::DownsampleLTTB(const std::vector<double>& series, std::size_t max_points) {
+    const std::size_t n = series.size();
+    std::vector<std::size_t> out;
+    if (KeepAll(n, max_points, out)) return out;
+
+    out.reserve(max_points);
+    out.push_back(0);
+    // Interior points [1, n-1) split into max_points-2 buckets; x is the index.
+    const double every = static_cast<double>(n - 2) / static_cast<double>(max_points - 2);
+    std::size_t a = 0;
+    for (std::size_t b = 0; b < max_points - 2; ++b) {
+        const std::size_t start = static_cast<std::size_t>(b * every) + 1;
+        const std::size_t end = std::min(static_cast<std::size_t>((b + 1) * every) + 1, n - 1);
+
+        // Third vertex: the average of the next bucket (the last point for the final bucket).
+        const std::size_t next_start = end;
+        const std::size_t next_end = std::min(static_cast<std::size_t>((b + 2) * every) + 1, n);
+        double avg_x = 0.0, avg_y = 0.0;
+        for (std::size_t i = next_start; i < next_end; ++i) {
+            avg_x += static_cast<double>(i);
+            avg_y += series[i];
+        }
+        const double count = static_cast<double>(next_end - next_start);
+        avg_x /= count;
+        avg_y /= count;
+
+        const double ax = static_cast<double>(a);
+        const double ay = series[a];
+        std::size_t best = start;
+        double best_area = -1.0;
+        for (std::size_t i = start; i < end; ++i) {
+            const double area = std::abs((ax - avg_x) * (series[i] - ay) - (ax - static_cast<double>(i)) * (avg_y - ay));
+            if (area > best_area) {
+                best_area = area;
+                best = i;
+            }
+        }
+        out.push_back(best);
+        a = best;
+    }
+    out.push_back(n - 1);
+    return out;
+}
+
+std::vector<std::size_t> Analytics::DownsampleMinMax(const std::vector<double>& series, std::size_t max_points) {
+    const std::size_t n = series.size();
+    std::vector<std::size_t> out;
+    if (KeepAll(n, max_points, out)) return out;
+
+    out.reserve(max_points);
+    out.push_back(0);
+    // Two points per bucket over the interior [1, n-1).
+    const std::size_t buckets = (max_points - 2) / 2;
+    const std::size_t interior = n - 2;
+    for (std::size_t b = 0; b < buckets; ++b) {
+        const std::size_t start = 1 + b * interior / buckets;
+        const std::size_t end = 1 + (b + 1) * interior / buckets;
+        if (start == end) continue;
+        std::size_t lo = start, hi = start;
+        for (std::size_t i = start + 1; i < end; ++i) {
+            if (series[i] < series[lo]) lo = i;
+            if (series[i] > series[hi]) hi = i;
+        }
+        out.push_back(std::min(lo, hi));
+        if (lo != hi) out.push_back(std::max(lo, hi));
+    }
+    out.push_back(n - 1);
+    return out;
+}
@@ -7,151 +7,190 @@
 #include "../include/StrategyFactory.h"
 #include <fmt/core.h>
 #include <fmt/color.h>
+#include <algorithm>
 #include <cmath>
+#include <cstdint>
 #include <iostream>
+#include <stdexcept>
+#include <string_view>
+
+namespace {
+
+// Grows a per-SymbolId state vector to cover id, new slots built by make().
+template <typename State, typename Make>
+State& StateFor(std::vector<State>& states, SymbolId id, Make make) {
+    const auto i = static_cast<std::size_t>(id);
+    while (states.size() <= i) states.push_back(make());
+    return states[i];
+}
+
+// Pushes every close the engine stored for id since the last call (fed counts
+// bars consumed), so an incremental indicator sees the same history as a
+// recompute over get_closes(id) -- including bars the strategy was not called
+// for while the regime filter hibernated it. If the gap is longer than the
+// retained tail, the state is reset and rebuilt from that tail, which still
+// covers the strategy's lookback().
+template <typename State, typename Make, typename Push>
+void FeedNewCloses(const Backtester& engine, SymbolId id, State& state, Make make, Push push) {
+    const std::size_t total = engine.get_bar_count(id);
+    const std::vector<double>& closes = engine.get_closes(id);
+    std::size_t missing = total - state.fed;
+    if (missing > closes.size()) {
+        state = make();
+        missing = closes.size();
+    }
+    for (std::size_t i = closes.size() - missing; i < closes.size(); ++i) push(state, closes[i]);
+    state.fed = total;
+}
 
-double update_ema_calc_multi(double current_price, double prev_ema, int period) {
-    if (prev_ema < 0.0) return current_price;
-    double alpha = 2.0 / (period + 1);
-    return (current_price - prev_ema) * alpha + prev_ema;
+// Buys (delta > 0) or sells |delta| units of id.
+void TradeDelta(Backtester& engine, SymbolId id, double delta, double price, double timestamp) {
+    if (delta > 1e-9) engine.send_order(id, Side::BUY, delta, price, timestamp);
+    if (delta < -1e-9) engine.send_order(id, Side::SELL, -delta, price, timestamp);
 }
 
+} // namespace
+
 void EMAStrategy::on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
-    (void)timestamp; (void) open; (void) high; (void) low;
+    on_bar(engine, engine.register_symbol(symbol), symbol, timestamp, open, high, low, close);
+}
 
-    if (history_.find(symbol) == history_.end()) {
-        current_short_ema_[symbol] = -1.0;
-        current_long_ema_[symbol] = -1.0;
-        history_[symbol] = {};
-    }
+void EMAStrategy::on_bar(Backtester& engine, SymbolId id, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
+    (void)symbol; (void) open; (void) high; (void) low;
 
-    history_[symbol].push_back(close);
-    
-    current_short_ema_[symbol] = update_ema_calc_multi(close, current_short_ema_[symbol], short_window_);
-    current_long_ema_[symbol] = update_ema_calc_multi(close, current_long_ema_[symbol], long_window_);
+    SymbolState& st = StateFor(state_, id, [this] { return SymbolState{Ema(short_window_), Ema(long_window_)}; });
 
-    if (history_[symbol].size() > static_cast<size_t>(long_window_)) {
-        double current_holdings = engine.get_holdings(symbol);
-        double s_ema = current_short_ema_[symbol];
-        double l_ema = current_long_ema_[symbol];
+    const std::size_t bars = ++st.bars_seen;
+    const double s_ema = st.short_ema.push(close);
+    const double l_ema = st.long_ema.push(close);
+
+    if (bars > static_cast<size_t>(long_window_)) {
+        double current_holdings = engine.get_holdings(id);
 
         if (s_ema > l_ema && current_holdings <= 1e-6) {
             double cash = engine.get_cash_balance();
             double capital_to_use = cash * 0.2 * engine.get_leverage();
             if (capital_to_use > 0) {
                 double qty = capital_to_use / (close * 1.001);
-                engine.send_order(symbol, "BUY", qty, close, timestamp);
+                engine.send_order(id, Side::BUY, qty, close, timestamp);
             }
         }
         else if (s_ema < l_ema && current_holdings > 1e-6) {
-            engine.send_order(symbol, "SELL", current_holdings, close, timestamp);
+            engine.send_order(id, Side::SELL, current_holdings, close, timestamp);
         }
     }
 }
 
 void RSIStrategy::on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
-    (void)open; (void)high; (void)low;
-    history_[symbol].push_back(close);
+    on_bar(engine, engine.register_symbol(symbol), symbol, timestamp, open, high, low, close);
+}
 
-    if (history_[symbol].size() <= static_cast<size_t>(period_ + 1)) return;
+void RSIStrategy::on_bar(Backtester& engine, SymbolId id, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
+    (void)symbol; (void)open; (void)high; (void)low;
 
-    double rsi = Analytics::CalculateRSI(history_[symbol], period_);
-    double current_holdings = engine.get_holdings(symbol);
+    const auto make = [this] { return SymbolState{RollingRSI(static_cast<std::size_t>(period_))}; };
+    SymbolState& st = StateFor(state_, id, make);
+    FeedNewCloses(engine, id, st, make, [](SymbolState& s, double c) { s.rsi.push(c); });
+
+    if (engine.get_bar_count(id) <= static_cast<size_t>(period_ + 1)) return;
+
+    double rsi = st.rsi.value();
+    double current_holdings = engine.get_holdings(id);
 
     if (rsi < buy_thresh_ && current_holdings <= 1e-6) {
         double cash = engine.get_cash_balance();
         double capital_to_use = cash * 0.2 * engine.get_leverage();
         if (capital_to_use > 0) {
             double qty = capital_to_use / (close * 1.001);
-            engine.send_order(symbol, "BUY", qty, close, timestamp);
+            engine.send_order(id, Side::BUY, qty, close, timestamp);
         }
     }
     else if (rsi > sell_thresh_ && current_holdings > 1e-6) {
-        engine.send_order(symbol, "SELL", current_holdings, close, timestamp);
+        engine.send_order(id, Side::SELL, current_holdings, close, timestamp);
     }
 }
 
 void MACDStrategy::on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
-    (void)open; (void)high; (void)low;
-
-    if (history_.find(symbol) == history_.end()) {
-        fast_ema_[symbol] = -1.0;
-        slow_ema_[symbol] = -1.0;
-        signal_line_[symbol] = 0.0;
-        macd_line_[symbol] = 0.0;
-    }
+    on_bar(engine, engine.register_symbol(symbol), symbol, timestamp, open, high, low, close);
+}
 
-    history_[symbol].push_back(close);
+void MACDStrategy::on_bar(Backtester& engine, SymbolId id, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
+    (void)symbol; (void)open; (void)high; (void)low;
 
-    fast_ema_[symbol] = update_ema_calc_multi(close, fast_ema_[symbol], fast_period_);
-    slow_ema_[symbol] = update_ema_calc_multi(close, slow_ema_[symbol], slow_period_);
+    SymbolState& st = StateFor(state_, id, [this] {
+        return SymbolState{Ema(fast_period_), Ema(slow_period_), 0.0, Ema(signal_period_)};
+    });
 
-    if (history_[symbol].size() >= static_cast<size_t>(slow_period_)) {
-        double prev_macd = macd_line_[symbol];
-        double prev_signal = signal_line_[symbol];
+    const std::size_t bars = ++st.bars_seen;
+    const double fast = st.fast_ema.push(close);
+    const double slow = st.slow_ema.push(close);
 
-        macd_line_[symbol] = fast_ema_[symbol] - slow_ema_[symbol];
+    if (bars >= static_cast<size_t>(slow_period_)) {
+        double prev_macd = st.macd_line;
+        double prev_signal = st.signal_line.value();  // 0 until the first MACD value
 
-        if (prev_signal == 0.0) signal_line_[symbol] = macd_line_[symbol];
-        else signal_line_[symbol] = (macd_line_[symbol] - prev_signal) * (2.0 / (signal_period_ + 1)) + prev_signal;
+        st.macd_line = fast - slow;
+        const double signal = st.signal_line.push(st.macd_line);
 
-        double current_holdings = engine.get_holdings(symbol);
+        double current_holdings = engine.get_holdings(id);
 
-        if (prev_macd < prev_signal && macd_line_[symbol] > signal_line_[symbol] && current_holdings <= 1e-6) {
+        if (prev_macd < prev_signal && st.macd_line > signal && current_holdings <= 1e-6) {
             double cash = engine.get_cash_balance();
             double capital_to_use = cash * 0.2 * engine.get_leverage();
             if (capital_to_use > 0) {
                 double qty = capital_to_use / (close * 1.001);
-                engine.send_order(symbol, "BUY", qty, close, timestamp);
+                engine.send_order(id, Side::BUY, qty, close, timestamp);
             }
         }
-        else if (prev_macd > prev_signal && macd_line_[symbol] < signal_line_[symbol] && current_holdings > 1e-6) {
-            engine.send_order(symbol, "SELL", current_holdings, close, timestamp);
+        else if (prev_macd > prev_signal && st.macd_line < signal && current_holdings > 1e-6) {
+            engine.send_order(id, Side::SELL, current_holdings, close, timestamp);
         }
     }
 }
 
 void BollingerStrategy::on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
-    (void)open; (void)high; (void)low;
+    on_bar(engine, engine.register_symbol(symbol), symbol, timestamp, open, high, low, close);
+}
 
-    history_[symbol].push_back(close);
-    if (history_[symbol].size() < static_cast<size_t>(period_)) return;
+void BollingerStrategy::on_bar(Backtester& engine, SymbolId id, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
+    (void)symbol; (void)open; (void)high; (void)low;
 
-    double sum = 0.0;
-    const auto& prices = history_[symbol];
-    for (int i = 0; i < period_; ++i) sum += prices[prices.size() - 1 - i];
-    double sma = sum / period_;
+    const auto make = [this] { return SymbolState{RollingMoments(static_cast<std::size_t>(period_))}; };
+    SymbolState& st = StateFor(state_, id, make);
+    FeedNewCloses(engine, id, st, make, [](SymbolState& s, double c) { s.closes.push(c); });
 
-    double variance = 0.0;
-    for (int i = 0; i < period_; ++i) {
-        double val = prices[prices.size() - 1 - i];
-        variance += (val - sma) * (val - sma);
-    }
-    double std_dev = std::sqrt(variance / period_);
+    if (!st.closes.full()) return;
+
+    double sma = st.closes.mean();
+    double std_dev = std::sqrt(st.closes.variance());
 
     double upper_band = sma + (std_dev * mult_);
     double lower_band = sma - (std_dev * mult_);
 
-    double current_holdings = engine.get_holdings(symbol);
+    double current_holdings = engine.get_holdings(id);
 
     if (close <= lower_band && current_holdings <= 1e-6) {
         double cash = engine.get_cash_balance();
         double capital_to_use = cash * 0.2 * engine.get_leverage();
         if (capital_to_use > 0) {
             double qty = capital_to_use / (close * 1.001);
-            engine.send_order(symbol, "BUY", qty, close, timestamp);
+            engine.send_order(id, Side::BUY, qty, close, timestamp);
         }
     }
     else if (close >= upper_band && current_holdings > 1e-6) {
-        engine.send_order(symbol, "SELL", current_holdings, close, timestamp);
+        engine.send_order(id, Side::SELL, current_holdings, close, timestamp);
     }
 }
 
 void VolatilityStrategy::on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
-    (void)low; (void)close;
+    on_bar(engine, engine.register_symbol(symbol), symbol, timestamp, open, high, low, close);
+}
 
-    const auto& highs = engine.get_highs(symbol);
-    const auto& lows = engine.get_lows(symbol);
+void VolatilityStrategy::on_bar(Backtester& engine, SymbolId id, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
+    (void)symbol; (void)low; (void)close;
+
+    const auto& highs = engine.get_highs(id);
+    const auto& lows = engine.get_lows(id);
 
     if (highs.size() < 2) return;
 
@@ -160,7 +199,7 @@ void VolatilityStrategy::on_market_data(Backtester& engine, const std::string& s
     double range = prev_high - prev_low;
     double target_price = open + (range * k_);
 
-    double current_holdings = engine.get_holdings(symbol);
+    double current_holdings = engine.get_holdings(id);
 
     if (current_holdings <= 1e-6) {
         double buy_price = 0.0;
@@ -172,68 +211,71 @@ void VolatilityStrategy::on_market_data(Backtester& engine, const std::string& s
             double capital_to_use = cash * 0.2 * engine.get_leverage();
             if (capital_to_use > 0) {
                 double qty = capital_to_use / (buy_price * 1.001);
-                engine.send_order(symbol, "BUY", qty, buy_price, timestamp);
+                engine.send_order(id, Side::BUY, qty, buy_price, timestamp);
             }
         }
     }
 }
 
 void OUStrategy::on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
-    (void)open; (void)high; (void)low;
-
-    history_[symbol].push_back(close);
-    const auto& prices = history_[symbol];
+    on_bar(engine, engine.register_symbol(symbol), symbol, timestamp, open, high, low, close);
+}
 
-    if (prices.size() <= static_cast<size_t>(window_)) return;
+void OUStrategy::on_bar(Backtester& engine, SymbolId id, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
+    (void)symbol; (void)open; (void)high; (void)low;
 
-    double sum_x = 0.0, sum_y = 0.0, sum_xx = 0.0, sum_xy = 0.0;
-    int n = window_;
-    size_t start_idx = prices.size() - window_ - 1;
+    const auto make = [this] { return SymbolState{RollingOLS(static_cast<std::size_t>(window_))}; };
+    SymbolState& st = StateFor(state_, id, make);
+    FeedNewCloses(engine, id, st, make, [](SymbolState& s, double c) {
+        if (s.has_prev) s.ar1.push(s.prev_close, c);
+        s.prev_close = c;
+        s.has_prev = true;
+    });
 
-    for (int i = 0; i < n; ++i) {
-        double x = prices[start_idx + i];
-        double y = prices[start_idx + i + 1];
-        sum_x += x; sum_y += y;
-        sum_xx += x * x; sum_xy += x * y;
-    }
+    if (!st.ar1.full()) return;
 
-    double mean_x = sum_x / n;
-    double mean_y = sum_y / n;
-    double b = (sum_xy - n * mean_x * mean_y) / (sum_xx - n * mean_x * mean_x);
-    double a = mean_y - b * mean_x;
+    const double n = window_;
+    double b = st.ar1.slope();
+    double a = st.ar1.intercept(b);
 
     if (b <= 0.0 || b >= 1.0) return;
 
     double mu = a / (1.0 - b);
-    double sum_e2 = 0.0;
-    for (int i = 0; i < n; ++i) {
-        double x = prices[start_idx + i];
-        double y = prices[start_idx + i + 1];
-        double e = y - (a + b * x);
-        sum_e2 = e * e;
-    }
+    // The residual term is the newest pair's only -- what the original
+    // per-window loop computed, since it assigned rather than accumulated.
+    const std::vector<double>& prices = engine.get_closes(id);
+    double e = close - (a + b * prices[prices.size() - 2]);
+    double sum_e2 = e * e;
     double sigma_eq = std::sqrt((sum_e2 / (n - 2)) / (1.0 - b * b));
     double z_score = (close - mu) / sigma_eq;
 
-    double current_holdings = engine.get_holdings(symbol);
+    double current_holdings = engine.get_holdings(id);
 
     if (z_score < -z_thresh_ && current_holdings <= 1e-6) {
         double cash = engine.get_cash_balance();
         double capital_to_use = cash * 0.2 * engine.get_leverage();
         if (capital_to_use > 0) {
             double qty = capital_to_use / (close * 1.001);
-            engine.send_order(symbol, "BUY", qty, close, timestamp);
+            engine.send_order(id, Side::BUY, qty, close, timestamp);
         }
     } else if (z_score > 0.0 && current_holdings > 1e-6) {
-        engine.send_order(symbol, "SELL", current_holdings, close, timestamp);
+        engine.send_order(id, Side::SELL, current_holdings, close, timestamp);
     }
 }
 
 void KalmanPairsStrategy::on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
-    (void)open; (void)high; (void)low;
+    on_bar(engine, engine.register_symbol(symbol), symbol, timestamp, open, high, low, close);
+}
 
-    if (symbol == asset_x_) buffer_x_[timestamp] = close;
-    if (symbol == asset_y_) buffer_y_[timestamp] = close;
+void KalmanPairsStrategy::on_bar(Backtester& engine, SymbolId id, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
+    (void)symbol; (void)open; (void)high; (void)low;
+
+    if (id_x_ == kNoSymbol) {
+        id_x_ = engine.register_symbol(asset_x_);
+        id_y_ = engine.register_symbol(asset_y_);
+    }
+    if (id == id_x_) buffer_x_[timestamp] = close;
+    if (id == id_y_) buffer_y_[timestamp] = close;
 
     if (buffer_x_.count(timestamp) && buffer_y_.count(timestamp)) {
         double px = buffer_x_[timestamp];
@@ -241,24 +283,18 @@ void KalmanPairsStrategy::on_market_data(Backtester& engine, const std::string&
 
         kf_.update(px, py);
         double spread = kf_.get_spread(px, py);
-        spread_history_.push_back(spread);
+        spreads_.push(spread);
 
-        if (spread_history_.size() < static_cast<size_t>(window_)) return;
+        if (!spreads_.full()) return;
 
-        double sum = 0.0, sum_sq = 0.0;
-        for (int i = 0; i < window_; ++i) {
-            double val = spread_history_[spread_history_.size() - 1 - i];
-            sum += val;
-            sum_sq += val * val;
-        }
-        double mean = sum / window_;
-        double std_dev = std::sqrt((sum_sq / window_) - (mean * mean));
+        double mean = spreads_.mean();
+        double std_dev = spreads_.volatility();
         
         if (std_dev < 1e-9) return;
         double z_score = (spread - mean) / std_dev;
 
-        double holding_x = engine.get_holdings(asset_x_);
-        double holding_y = engine.get_holdings(asset_y_);
+        double holding_x = engine.get_holdings(id_x_);
+        double holding_y = engine.get_holdings(id_y_);
         double total_equity = engine.get_total_equity();
         double leverage = engine.get_leverage();
 
@@ -270,35 +306,35 @@ void KalmanPairsStrategy::on_market_data(Backtester& engine, const std::string&
                 double current_val = holding_y * py;
                 double diff = current_val - (-target_notional);
                 double qty_to_sell = diff / py;
-                if (qty_to_sell > 0) engine.send_order(asset_y_, "SELL", qty_to_sell, py, timestamp);
+                if (qty_to_sell > 0) engine.send_order(id_y_, Side::SELL, qty_to_sell, py, timestamp);
             }
             if (holding_x * px < target_notional) {
                 double qty_needed = (target_notional - (holding_x * px)) / px;
-                if (qty_needed > 0) engine.send_order(asset_x_, "BUY", qty_needed, px, timestamp);
+                if (qty_needed > 0) engine.send_order(id_x_, Side::BUY, qty_needed, px, timestamp);
             }
         }
         else if (z_score < -z_thresh_) {
             // Target: Long Y, Short X
             if (holding_y * py < target_notional) { 
                 double qty_needed = (target_notional - (holding_y * py)) / py;
-                if (qty_needed > 0) engine.send_order(asset_y_, "BUY", qty_needed, py, timestamp);
+                if (qty_needed > 0) engine.send_order(id_y_, Side::BUY, qty_needed, py, timestamp);
             }
             if (holding_x * px > -target_notional) {
                 double current_val = holding_x * px;
                 double diff = current_val - (-target_notional);
                 double qty_to_sell = diff / px;
-                if (qty_to_sell > 0) engine.send_order(asset_x_, "SELL", qty_to_sell, px, timestamp);
+                if (qty_to_sell > 0) engine.send_order(id_x_, Side::SELL, qty_to_sell, px, timestamp);
             }
         }
         else if (std::abs(z_score) < 0.5) {
             // Exit All
             if (std::abs(holding_x) > 1e-6) {
-                if (holding_x > 0) engine.send_order(asset_x_, "SELL", holding_x, px, timestamp);
-                else engine.send_order(asset_x_, "BUY", -holding_x, px, timestamp);
+                if (holding_x > 0) engine.send_order(id_x_, Side::SELL, holding_x, px, timestamp);
+                else engine.send_order(id_x_, Side::BUY, -holding_x, px, timestamp);
             }
             if (std::abs(holding_y) > 1e-6) {
-                if (holding_y > 0) engine.send_order(asset_y_, "SELL", holding_y, py, timestamp);
-                else engine.send_order(asset_y_, "BUY", -holding_y, py, timestamp);
+                if (holding_y > 0) engine.send_order(id_y_, Side::SELL, holding_y, py, timestamp);
+                else engine.send_order(id_y_, Side::BUY, -holding_y, py, timestamp);
             }
         }
 
@@ -307,32 +343,177 @@ void KalmanPairsStrategy::on_market_data(Backtester& engine, const std::string&
     }
 }
 
+KalmanBasketStrategy::KalmanBasketStrategy(const std::vector<std::pair<std::string, std::string>>& pairs,
+                                           double z_thresh, int window)
+    : z_thresh_(z_thresh), window_(window) {
+    set_pairs(pairs);
+}
+
+void KalmanBasketStrategy::set_pairs(const std::vector<std::pair<std::string, std::string>>& pairs) {
+    if (pairs.empty()) throw std::invalid_argument("the basket needs at least one pair");
+    for (const auto& [x, y] : pairs) {
+        if (x == y) throw std::invalid_argument("pair legs must differ, got '" + x + "' twice");
+    }
+    legs_x_.clear();
+    legs_y_.clear();
+    for (const auto& [x, y] : pairs) {
+        legs_x_.push_back(x);
+        legs_y_.push_back(y);
+    }
+    reset();
+}
+
+void KalmanBasketStrategy::set_parameters(int window, double z_thresh) {
+    window_ = window;
+    z_thresh_ = z_thresh;
+    bank_ = KalmanBank(legs_x_.size(), static_cast<std::size_t>(std::max(window, 1)));
+}
+
+void KalmanBasketStrategy::reset() {
+    const std::size_t n = legs_x_.size();
+    id_x_.clear();
+    id_y_.clear();
+    pairs_of_.clear();
+    last_close_.clear();
+    last_time_.clear();
+    last_step_.assign(n, std::nan(""));
+    bank_ = KalmanBank(n, static_cast<std::size_t>(std::max(window_, 1)));
+    qty_x_.assign(n, 0.0);
+    qty_y_.assign(n, 0.0);
+    side_.assign(n, 0);
+}
+
+void KalmanBasketStrategy::resolve(Backtester& engine) {
+    for (std::size_t k = 0; k < legs_x_.size(); ++k) {
+        id_x_.push_back(engine.register_symbol(legs_x_[k]));
+        id_y_.push_back(engine.register_symbol(legs_y_[k]));
+        for (const SymbolId leg : {id_x_[k], id_y_[k]}) {
+            StateFor(pairs_of_, leg, [] { return std::vector<std::size_t>{}; }).push_back(k);
+        }
+    }
+    last_close_.assign(pairs_of_.size(), std::nan(""));
+    last_time_.assign(pairs_of_.size(), std::nan(""));
+}
+
+void KalmanBasketStrategy::on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
+    on_bar(engine, engine.register_symbol(symbol), symbol, timestamp, open, high, low, close);
+}
+
+void KalmanBasketStrategy::on_bar(Backtester& engine, SymbolId id, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
+    (void)symbol; (void)open; (void)high; (void)low;
+
+    if (id_x_.empty()) resolve(engine);
+    const auto leg = static_cast<std::size_t>(id);
+    if (leg >= pairs_of_.size() || pairs_of_[leg].empty()) return;
+    last_close_[leg] = close;
+    last_time_[leg] = timestamp;
+
+    // Every pair this bar completes at this timestamp, stepped as one batch.
+    ready_.clear();
+    ready_x_.clear();
+    ready_y_.clear();
+    for (const std::size_t k : pairs_of_[leg]) {
+        const auto x = static_cast<std::size_t>(id_x_[k]);
+        const auto y = static_cast<std::size_t>(id_y_[k]);
+        if (last_time_[x] != timestamp || last_time_[y] != timestamp || last_step_[k] == timestamp) continue;
+        last_step_[k] = timestamp;
+        ready_.push_back(k);
+        ready_x_.push_back(last_close_[x]);
+        ready_y_.push_back(last_close_[y]);
+    }
+    if (ready_.empty()) return;
+    bank_.update(ready_.data(), ready_.size(), ready_x_.data(), ready_y_.data());
+    for (const std::size_t k : ready_) trade(engine, k, timestamp);
+}
+
+void KalmanBasketStrategy::trade(Backtester& engine, std::size_t k, double timestamp) {
+    const double z = bank_.z_score(k);
+    if (std::isnan(z)) return;
+    int side = side_[k];
+    if (z > z_thresh_) {
+        side = -1;  // short y, long x
+    } else if (z < -z_thresh_) {
+        side = 1;   // long y, short x
+    } else if (std::abs(z) < 0.5) {
+        side = 0;
+    }
+    if (side == side_[k]) return;
+
+    const double px = last_close_[static_cast<std::size_t>(id_x_[k])];
+    const double py = last_close_[static_cast<std::size_t>(id_y_[k])];
+    double target_x = 0.0;
+    double target_y = 0.0;
+    if (side != 0) {
+        const double notional = engine.get_total_equity() * 0.4 * engine.get_leverage() /
+                                static_cast<double>(legs_x_.size());
+        target_x = -side * notional / px;
+        target_y = side * notional / py;
+    }
+    TradeDelta(engine, id_x_[k], target_x - qty_x_[k], px, timestamp);
+    TradeDelta(engine, id_y_[k], target_y - qty_y_[k], py, timestamp);
+    qty_x_[k] = target_x;
+    qty_y_[k] = target_y;
+    side_[k] = side;
+}
+
 PCAStatArbStrategy::PCAStatArbStrategy(int window, double z_thresh)
     : window_(window), z_thresh_(z_thresh), last_timestamp_(-1.0) {}
 
+// PCAArbitrage::CalculateSignals over each symbol's last window_ closes.
+// When every symbol has gained exactly one bar since the last call, that is
+// one new row of returns for pca_; otherwise pca_ restarts from the window.
+void PCAStatArbStrategy::update_signals(Backtester& engine) {
+    if (window_ < 30) {  // CalculateSignals skips series this short
+        current_z_scores_.clear();
+        return;
+    }
+    const std::size_t n = symbols_.size();
+    std::vector<std::size_t> bars(n);
+    for (std::size_t j = 0; j < n; ++j) bars[j] = engine.get_bar_count(symbols_[j]);
+
+    bool advanced = pca_.assets() == n && pca_bars_.size() == n;
+    for (std::size_t j = 0; advanced && j < n; ++j) advanced = bars[j] == pca_bars_[j] + 1;
+
+    std::vector<double> row(n);
+    const auto fill_row = [&](std::size_t back) {
+        for (std::size_t j = 0; j < n; ++j) {
+            const auto& closes = engine.get_closes(symbols_[j]);
+            const std::size_t i = closes.size() - 1 - back;
+            row[j] = std::log(closes[i] / closes[i - 1]);
+        }
+    };
+    if (advanced) {
+        fill_row(0);
+        pca_.push(row.data());
+    } else {
+        pca_ = StreamingPCA(n, static_cast<std::size_t>(window_) - 1);
+        for (std::size_t back = static_cast<std::size_t>(window_) - 1; back-- > 0;) {
+            fill_row(back);
+            pca_.push(row.data());
+        }
+    }
+    pca_bars_ = std::move(bars);
+
+    current_z_scores_.clear();
+    for (std::size_t j = 0; j < n; ++j) current_z_scores_[symbols_[j]] = pca_.z_scores()[j];
+}
+
 void PCAStatArbStrategy::on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
     (void)open; (void)high; (void)low;
 
-    history_[symbol].push_back(close);
+    auto pos = std::lower_bound(symbols_.begin(), symbols_.end(), symbol);
+    if (pos == symbols_.end() || *pos != symbol) symbols_.insert(pos, symbol);
 
     if (timestamp != last_timestamp_) {
         bool enough_data = true;
-        for (const auto& [sym, prices] : history_) {
-            if (prices.size() < static_cast<size_t>(window_)) {
+        for (const auto& sym : symbols_) {
+            if (engine.get_bar_count(sym) < static_cast<size_t>(window_)) {
                 enough_data = false;
                 break;
             }
         }
 
-        if (enough_data) {
-            std::map<std::string, std::vector<double>> window_data;
-            for (const auto& [sym, prices] : history_) {
-                window_data[sym] = std::vector<double>(prices.end() - window_, prices.end());
-            }
-
-            PCAResult res = PCAArbitrage::CalculateSignals(window_data, 1);
-            current_z_scores_ = res.z_scores;
-        }
+        if (enough_data) update_signals(engine);
         last_timestamp_ = timestamp;
     }
 
@@ -344,16 +525,16 @@ void PCAStatArbStrategy::on_market_data(Backtester& engine, const std::string& s
     double cash = engine.get_cash_balance();
     double target_notional = cash * 0.10 * engine.get_leverage();
 
-    int basket_size = history_.size();
+    int basket_size = static_cast<int>(symbols_.size());
     if (basket_size <= 1) return;
     double hedge_notional_per_asset = target_notional / (basket_size - 1);
 
     if (z_score < -z_thresh_ && current_holdings <= 1e-6 && target_notional > 0) {
         engine.send_order(symbol, "BUY", target_notional / close, close, timestamp);
 
-        for (const auto& [hedge_sym, prices] : history_) {
+        for (const auto& hedge_sym : symbols_) {
             if (hedge_sym != symbol) {
-                double hedge_price = prices.back();
+                double hedge_price = engine.get_closes(hedge_sym).back();
                 engine.send_order(hedge_sym, "SELL", hedge_notional_per_asset / hedge_price, hedge_price, timestamp);
             }
         }
@@ -362,9 +543,9 @@ void PCAStatArbStrategy::on_market_data(Backtester& engine, const std::string& s
     else if (z_score > z_thresh_ && current_holdings >= -1e-6 && target_notional > 0) {
         engine.send_order(symbol, "SELL", target_notional / close, close, timestamp);
 
-        for (const auto& [hedge_sym, prices] : history_) {
+        for (const auto& hedge_sym : symbols_) {
             if (hedge_sym != symbol) {
-                double hedge_price = prices.back();
+                double hedge_price = engine.get_closes(hedge_sym).back();
                 engine.send_order(hedge_sym, "BUY", hedge_notional_per_asset / hedge_price, hedge_price, timestamp);
             }
         }
@@ -376,10 +557,10 @@ void PCAStatArbStrategy::on_market_data(Backtester& engine, const std::string& s
         if (current_holdings > 0) engine.send_order(symbol, "SELL", current_holdings, close, timestamp);
         else engine.send_order(symbol, "BUY", -current_holdings, close, timestamp);
 
-        for (const auto& [hedge_sym, prices] : history_) {
+        for (const auto& hedge_sym : symbols_) {
             if (hedge_sym != symbol) {
                 double h_qty = engine.get_holdings(hedge_sym);
-                double h_price = prices.back();
+                double h_price = engine.get_closes(hedge_sym).back();
                 if (h_qty > 0) engine.send_order(hedge_sym, "SELL", h_qty, h_price, timestamp);
                 else if (h_qty < 0) engine.send_order(hedge_sym, "BUY", -h_qty, h_price, timestamp);
             }
@@ -584,9 +765,13 @@ VRPHarvestingStrategy::VRPHarvestingStrategy(double strike, double time_to_expir
     : strike_(strike), time_to_expiry_(time_to_expiry), iv_threshold_(iv_threshold) {}
 
 void VRPHarvestingStrategy::on_market_data(Backtester& engine, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
-    (void)open; (void)high; (void)low;
+    on_bar(engine, engine.register_symbol(symbol), symbol, timestamp, open, high, low, close);
+}
 
-    const auto& closes = engine.get_closes(symbol);
+void VRPHarvestingStrategy::on_bar(Backtester& engine, SymbolId id, const std::string& symbol, double timestamp, double open, double high, double low, double close) {
+    (void)symbol; (void)open; (void)high; (void)low;
+
+    const auto& closes = engine.get_closes(id);
     if (closes.size() < 20) return;
 
     std::vector<double> recent_prices(closes.end() - 20, closes.end());
@@ -625,12 +810,12 @@ void VRPHarvestingStrategy::on_market_data(Backtester& engine, const std::string
         double otm_put_delta = otm_call_greeks.delta - 1.0;
 
         double position_delta = (-(atm_call_greeks.delta + atm_put_delta) + (otm_call_greeks.delta + otm_put_delta)) * option_qty_;
-        double current_stock_qty = engine.get_holdings(symbol);
+        double current_stock_qty = engine.get_holdings(id);
         double delta_hedge_qty = position_delta - current_stock_qty;
 
         if (std::abs(delta_hedge_qty) > 5.0) {
-            if (delta_hedge_qty > 0) engine.send_order(symbol, "BUY", delta_hedge_qty, close, timestamp);
-            else engine.send_order(symbol, "SELL", std::abs(delta_hedge_qty), close, timestamp);
+            if (delta_hedge_qty > 0) engine.send_order(id, Side::BUY, delta_hedge_qty, close, timestamp);
+            else engine.send_order(id, Side::SELL, std::abs(delta_hedge_qty), close, timestamp);
         }
 
         time_to_expiry_ = 1.0 / 252.0;
@@ -645,10 +830,10 @@ void VRPHarvestingStrategy::on_market_data(Backtester& engine, const std::string
             fmt::print("[VRP] Expiry reached (Spot: {:.2f}). Net Settlement Cost: ${:.2f}\n", close, settlement_cost);
             fmt::print(fg(fmt::color::cyan), "[VRP] Net Option Premium Profit: ${:.2f}\n", net_profit);
 
-            current_stock_qty = engine.get_holdings(symbol);
+            current_stock_qty = engine.get_holdings(id);
             if (std::abs(current_stock_qty) > 1e-6) {
-                if (current_stock_qty > 0) engine.send_order(symbol, "SELL", current_stock_qty, close, timestamp);
-                else engine.send_order(symbol, "BUY", std::abs(current_stock_qty), close, timestamp);
+                if (current_stock_qty > 0) engine.send_order(id, Side::SELL, current_stock_qty, close, timestamp);
+                else engine.send_order(id, Side::BUY, std::abs(current_stock_qty), close, timestamp);
             }
 
             engine.update_custom_pnl(net_profit);
@@ -1316,62 +1501,158 @@ Backtester::Backtester(double initial_capital, std::string strategy_type, double
     : portfolio_(initial_capital), leverage_(leverage) {
     
     strategy_ = StrategyFactory::Instance().CreateStrategy(strategy_type);
+    strategy_type_ = std::move(strategy_type);
     if (!strategy_) {
-        fmt::print("[Warning] Uknown strategy '{}', defaulting to EMA.\n", strategy_type);
+        fmt::print("[Warning] Uknown strategy '{}', defaulting to EMA.\n", strategy_type_);
         strategy_ = StrategyFactory::Instance().CreateStrategy("EMA");
+        strategy_type_ = "EMA";
     }
 }
 
-void Backtester::set_regime_filter(bool use_filter, int lookback) {
+namespace {
+constexpr std::string_view kSnapshotMagic = "FOS-BACKTESTER";
+constexpr std::uint32_t kSnapshotVersion = 7;
+}
+
+std::string Backtester::snapshot() const {
+    serial::Writer out;
+    out(std::string(kSnapshotMagic), kSnapshotVersion, strategy_type_);
+    strategy_->save(out);
+    out(portfolio_, leverage_, max_drawdown_limit_, var_limit_, risk_shutdown_, risk_cadence_,
+        ticks_since_risk_check_, quiet_, use_regime_filter_, regime_lookback_, regime_recluster_every_,
+        regime_detectors_, data_, equity_curve_, risk_manager_);
+    return out.take();
+}
+
+void Backtester::restore(const std::string& bytes) {
+    serial::Reader in(bytes);
+    std::string magic;
+    std::uint32_t version = 0;
+    std::string strategy_type;
+    in(magic);
+    if (magic != kSnapshotMagic) {
+        throw std::invalid_argument("not a Backtester snapshot");
+    }
+    in(version);
+    if (version != kSnapshotVersion) {
+        throw std::invalid_argument("unsupported Backtester snapshot version " + std::to_string(version));
+    }
+    in(strategy_type);
+
+    // Load into a fresh engine first so a bad snapshot leaves *this untouched.
+    Backtester restored(0.0);
+    restored.strategy_ = StrategyFactory::Instance().CreateStrategy(strategy_type);
+    if (!restored.strategy_) {
+        throw std::invalid_argument("snapshot names unknown strategy '" + strategy_type + "'");
+    }
+    restored.strategy_type_ = strategy_type;
+    restored.strategy_->load(in);
+    in(restored.portfolio_, restored.leverage_, restored.max_drawdown_limit_, restored.var_limit_,
+       restored.risk_shutdown_, restored.risk_cadence_, restored.ticks_since_risk_check_, restored.quiet_,
+       restored.use_regime_filter_, restored.regime_lookback_, restored.regime_recluster_every_,
+       restored.regime_detectors_, restored.data_, restored.equity_curve_, restored.risk_manager_);
+    if (!in.at_end()) {
+        throw std::invalid_argument("snapshot has trailing bytes");
+    }
+    *this = std::move(restored);
+}
+
+void Backtester::set_regime_filter(bool use_filter, int lookback, int recluster_every) {
+    if (recluster_every < 1) {
+        throw std::invalid_argument("recluster_every must be at least 1");
+    }
     use_regime_filter_ = use_filter;
     regime_lookback_ = lookback;
+    regime_recluster_every_ = recluster_every;
+    for (auto& detector : regime_detectors_) detector.set_recluster_every(recluster_every);
     fmt::print("[System] Regime Filter: {}, Lookback: {}\n", use_filter ? "ON" : "OFF", lookback);
 }
 
-void Backtester::hibernate_positions(double timestamp, const std::string& symbol, double price) {
-    double qty = get_holdings(symbol);
+void Backtester::set_bar_retention(std::size_t bars) {
+    if (bars > 0 && strategy_) bars = std::max(bars, strategy_->lookback());
+    data_.set_retention(bars);
+    equity_curve_.set_retention(bars);
+}
+
+void Backtester::hibernate_positions(double timestamp, SymbolId id, double price) {
+    double qty = get_holdings(id);
     if (std::abs(qty) > 1e-6) {
         if (qty > 0) {
-            send_order(symbol, "SELL", qty, price, timestamp);
+            send_order(id, Side::SELL, qty, price, timestamp);
         } else {
-            send_order(symbol, "BUY", -qty, price, timestamp);
+            send_order(id, Side::BUY, -qty, price, timestamp);
         }
     }
 }
 
-void Backtester::on_market_data(const std::string& symbol ,double timestamp, double open, double high, double low, double close) {
-    portfolio_.mark(symbol, close);
+void Backtester::on_market_data(const std::string& symbol, double timestamp, double open, double high, double low, double close) {
+    on_market_data(register_symbol(symbol), timestamp, open, high, low, close);
+}
+
+void Backtester::on_market_data(SymbolId id, double timestamp, double open, double high, double low, double close) {
+    portfolio_.mark(id, close);
 
-    data_.add_bar(symbol, open, high, low, close);
+    data_.add_bar(id, open, high, low, close);
 
     bool is_bear_market = false;
     if (use_regime_filter_) {
-        price_history_buffer_[symbol].push_back(close);
-        const auto& history = price_history_buffer_[symbol];
+        const auto slot = static_cast<std::size_t>(id);
+        if (regime_detectors_.size() <= slot) {
+            regime_detectors_.resize(slot + 1, StreamingRegimeDetector(20, 252, regime_recluster_every_));
+        }
+        auto& detector = regime_detectors_[slot];
+        detector.update(close);
 
-        if (history.size() >= static_cast<size_t>(regime_lookback_)) {
-            RegimeResult regime = RegimeDetector::DetectRegime(history, 20);
+        if (detector.count() >= static_cast<size_t>(regime_lookback_)) {
+            RegimeResult regime = detector.classify();
             if (regime.state_name == "Bear") {
                 is_bear_market = true;
             }
         }
     }
 
-    if (!risk_shutdown_) {
+    if (!risk_shutdown_ && ++ticks_since_risk_check_ >= risk_cadence_) {
+        ticks_since_risk_check_ = 0;
         check_risk_limits(timestamp);
     }
 
     if (!risk_shutdown_) {
         if (is_bear_market) {
-            hibernate_positions(timestamp, symbol, close);
+            hibernate_positions(timestamp, id, close);
         } else {
             if (strategy_) {
-                strategy_->on_market_data(*this, symbol, timestamp, open, high, low, close);
+                strategy_->on_bar(*this, id, data_.symbols().name(id), timestamp, open, high, low, close);
             }
         }
     }
 
-    equity_curve_.record(get_total_equity());
+    equity_curve_.observe(timestamp, get_total_equity());
+}
+
+void Backtester::run_bars(const std::string& symbol, const double* timestamps, const double* open,
+                          const double* high, const double* low, const double* close, std::size_t n) {
+    const SymbolId id = register_symbol(symbol);
+    for (std::size_t i = 0; i < n; ++i) {
+        on_market_data(id, timestamps[i], open[i], high[i], low[i], close[i]);
+    }
+    equity_curve_.flush();
+}
+
+void Backtester::run_panel(const std::vector<std::string>& symbols, const double* timestamps,
+                           const double* ohlc, std::size_t n_times) {
+    const std::size_t n_symbols = symbols.size();
+    std::vector<SymbolId> ids;
+    ids.reserve(n_symbols);
+    for (const auto& symbol : symbols) ids.push_back(register_symbol(symbol));
+    for (std::size_t t = 0; t < n_times; ++t) {
+        const double* row = ohlc + t * n_symbols * 4;
+        for (std::size_t j = 0; j < n_symbols; ++j) {
+            const double* bar = row + j * 4;
+            if (std::isnan(bar[0]) || std::isnan(bar[1]) || std::isnan(bar[2]) || std::isnan(bar[3])) continue;
+            on_market_data(ids[j], timestamps[t], bar[0], bar[1], bar[2], bar[3]);
+        }
+    }
+    equity_curve_.flush();
 }
 
 void Backtester::on_order_book_update(const OrderBook& book, double timestamp) {
@@ -1380,8 +1661,16 @@ void Backtester::on_order_book_update(const OrderBook& book, double timestamp) {
     }
 }
 
+void Backtester::send_order(SymbolId id, Side side, double quantity, double price, double timestamp) {
+    portfolio_.execute(id, data_.symbols().name(id), side, quantity, price, timestamp);
+}
+
 void Backtester::send_order(const std::string& symbol, const std::string& side, double quantity, double price, double timestamp) {
-    portfolio_.execute(symbol, side, quantity, price, timestamp);
+    if (side == "BUY") {
+        send_order(register_symbol(symbol), Side::BUY, quantity, price, timestamp);
+    } else if (side == "SELL") {
+        send_order(register_symbol(symbol), Side::SELL, quantity, price, timestamp);
+    }
 }
 
 double Backtester::get_total_equity() const {
@@ -1389,7 +1678,7 @@ double Backtester::get_total_equity() const {
 }
 
 double Backtester::get_holdings(const std::string& symbol) const {
-    return portfolio_.holding(symbol);
+    return portfolio_.holding(data_.symbols().find(symbol));
 }
 
 double Backtester::get_max_drawdown() const {
@@ -1402,6 +1691,9 @@ const std::vector<double>& Backtester::get_lows(const std::string& symbol) const
 const std::vector<double>& Backtester::get_closes(const std::string& symbol) const { return data_.closes(symbol); }
 
 void Backtester::set_macd_parameters(int fast, int slow, int signal) {
+    if (fast < 1 || slow < 1 || signal < 1) {
+        throw std::invalid_argument("MACD fast, slow and signal periods must be at least 1");
+    }
     if (auto* macd = dynamic_cast<MACDStrategy*>(strategy_.get())) {
         macd->set_parameters(fast, slow, signal);
     }
@@ -1417,6 +1709,14 @@ std::vector<double> Backtester::get_equity_history() const {
     return equity_curve_.history();
 }
 
+void Backtester::set_risk_cadence(int ticks) {
+    if (ticks < 1) {
+        throw std::invalid_argument("risk cadence must be at least 1 tick");
+    }
+    risk_cadence_ = ticks;
+    ticks_since_risk_check_ = 0;
+}
+
 void Backtester::set_risk_params(double max_drawdown_limit, double var_limit) {
     max_drawdown_limit_ = max_drawdown_limit;
     var_limit_ = var_limit;
@@ -1432,15 +1732,18 @@ void Backtester::check_risk_limits(double timestamp) {
     double total_risk_amount = 0.0;
     double equity = get_total_equity();
 
-    for (const auto& [sym, qty] : portfolio_.holdings()) {
-        if (std::abs(qty) > 1e-6 && data_.has_closes(sym)) {
-            const auto& prices = data_.closes(sym);
-            if (prices.size() > 30) {
-                std::vector<double> recent_prices(prices.end() - 30, prices.end());
-                std::vector<double> returns = Analytics::CalculateLogReturns(recent_prices);
-                double vol = Analytics::CalculateVolatility(returns);
-
-                double position_value = std::abs(qty * portfolio_.last_price(sym));
+    const std::vector<double>& holdings = portfolio_.holdings();
+    for (std::size_t i = 0; i < holdings.size(); ++i) {
+        const double qty = holdings[i];
+        const auto id = static_cast<SymbolId>(i);
+        if (std::abs(qty) > 1e-6 && data_.has_closes(id)) {
+            // Volatility of the last 29 log returns (30 closes), from the
+            // rolling sums DataHandler keeps -- no copies, no per-tick logs.
+            const RollingMoments* returns = data_.log_return_stats(id);
+            if (returns && data_.bar_count(id) > 30) {
+                double vol = returns->volatility();
+
+                double position_value = std::abs(qty * portfolio_.last_price(id));
                 double position_var = Analytics::CalculateParametricVaR(position_value, vol, 0.95);
 
                 total_risk_amount += position_var;
@@ -1465,13 +1768,16 @@ void Backtester::liquidator(double timestamp, const std::string& reason) {
         fmt::print("Execution: LIQUIDATING ALL POSITIONS...\n");
     }
 
-    for (const auto& [sym, qty] :portfolio_.holdings()) {
+    const std::vector<double>& holdings = portfolio_.holdings();
+    for (std::size_t i = 0; i < holdings.size(); ++i) {
+        const double qty = holdings[i];
+        const auto id = static_cast<SymbolId>(i);
         if (std::abs(qty) > 1e-6) {
-            double price = portfolio_.last_price(sym);
+            double price = portfolio_.last_price(id);
             if (qty > 0) {
-                send_order(sym, "SELL", qty, price, timestamp);
+                send_order(id, Side::SELL, qty, price, timestamp);
             } else {
-                send_order(sym, "BUY", -qty, price, timestamp);
+                send_order(id, Side::BUY, -qty, price, timestamp);
             }
         }
     }
@@ -1482,10 +1788,113 @@ void Backtester::liquidator(double timestamp, const std::string& reason) {
     }
 }
 
+// A longer window also raises a configured bar retention to the new lookback.
+void Backtester::set_rsi_parameters(int period, double buy_thresh, double sell_thresh) {
+    if (period < 1) {
+        throw std::invalid_argument("RSI period must be at least 1");
+    }
+    if (auto* rsi = dynamic_cast<RSIStrategy*>(strategy_.get())) {
+        rsi->set_parameters(period, buy_thresh, sell_thresh);
+        if (data_.retention() > 0) set_bar_retention(data_.retention());
+    } else {
+        fmt::print("[Error] Current strategy is not RSIStrategy. Cannot set parameters.\n");
+    }
+}
+
+void Backtester::set_bollinger_parameters(int period, double std_dev_mult) {
+    if (period < 1) {
+        throw std::invalid_argument("Bollinger period must be at least 1");
+    }
+    if (auto* bb = dynamic_cast<BollingerStrategy*>(strategy_.get())) {
+        bb->set_parameters(period, std_dev_mult);
+        if (data_.retention() > 0) set_bar_retention(data_.retention());
+    } else {
+        fmt::print("[Error] Current strategy is not BollingerStrategy. Cannot set parameters.\n");
+    }
+}
+
+void Backtester::set_ou_parameters(int window, double z_thresh) {
+    if (window < 3) {
+        throw std::invalid_argument("OU window must be at least 3");
+    }
+    if (auto* ou = dynamic_cast<OUStrategy*>(strategy_.get())) {
+        ou->set_parameters(window, z_thresh);
+        if (data_.retention() > 0) set_bar_retention(data_.retention());
+    } else {
+        fmt::print("[Error] Current strategy is not OUStrategy. Cannot set parameters.\n");
+    }
+}
+
+void Backtester::set_ema_parameters(int short_window, int long_window) {
+    if (short_window < 1 || long_window < 1) {
+        throw std::invalid_argument("EMA windows must be at least 1");
+    }
+    if (auto* ema = dynamic_cast<EMAStrategy*>(strategy_.get())) {
+        ema->set_parameters(short_window, long_window);
+    } else {
+        fmt::print("[Error] Current strategy is not EMAStrategy. Cannot set parameters.\n");
+    }
+}
+
+std::map<std::string, double> Backtester::get_parameters() const {
+    return strategy_ ? strategy_->parameters() : std::map<std::string, double>{};
+}
+
+void Backtester::set_parameter(const std::string& name, double value) {
+    set_parameters({{name, value}});
+}
+
+void Backtester::set_parameters(const std::map<std::string, double>& params) {
+    if (params.empty()) return;
+    std::map<std::string, double> merged = get_parameters();
+    for (const auto& [name, value] : params) {
+        auto it = merged.find(name);
+        if (it == merged.end()) {
+            throw std::invalid_argument("strategy '" + strategy_type_ + "' has no parameter '" + name + "'");
+        }
+        it->second = value;
+    }
+    const auto whole = [&merged](const std::string& name) {
+        const double v = merged.at(name);
+        if (v != std::floor(v)) {
+            throw std::invalid_argument(name + " must be a whole number");
+        }
+        return static_cast<int>(v);
+    };
+
+    Strategy* s = strategy_.get();
+    if (dynamic_cast<EMAStrategy*>(s)) {
+        set_ema_parameters(whole("short_window"), whole("long_window"));
+    } else if (dynamic_cast<RSIStrategy*>(s)) {
+        set_rsi_parameters(whole("period"), merged.at("buy_thresh"), merged.at("sell_thresh"));
+    } else if (dynamic_cast<MACDStrategy*>(s)) {
+        set_macd_parameters(whole("fast"), whole("slow"), whole("signal"));
+    } else if (dynamic_cast<BollingerStrategy*>(s)) {
+        set_bollinger_parameters(whole("period"), merged.at("std_dev_mult"));
+    } else if (dynamic_cast<OUStrategy*>(s)) {
+        set_ou_parameters(whole("window"), merged.at("z_thresh"));
+    } else if (dynamic_cast<VolatilityStrategy*>(s)) {
+        set_volatility_k(merged.at("k"));
+    } else if (dynamic_cast<KalmanPairsStrategy*>(s) || dynamic_cast<KalmanBasketStrategy*>(s)) {
+        set_pairs_parameters(whole("window"), merged.at("threshold"));
+    }
+}
+
 void Backtester::set_pairs_parameters(int window, double threshold) {
+    if (window < 2) {
+        throw std::invalid_argument("pairs window must be at least 2");
+    }
     if (auto* pairs = dynamic_cast<KalmanPairsStrategy*>(strategy_.get())) {
         pairs->set_parameters(window, threshold);
+    } else if (auto* basket = dynamic_cast<KalmanBasketStrategy*>(strategy_.get())) {
+        basket->set_parameters(window, threshold);
     } else {
         fmt::print("[Error] Current strategy is not KalmanPairsStrategy. Cannot set parameters.\n");
     }
 }
+
+void Backtester::set_pairs_basket(const std::vector<std::pair<std::string, std::string>>& pairs) {
+    auto* basket = dynamic_cast<KalmanBasketStrategy*>(strategy_.get());
+    if (!basket) throw std::invalid_argument("strategy '" + strategy_type_ + "' does not trade a pairs basket");
+    basket->set_pairs(pairs);
+}
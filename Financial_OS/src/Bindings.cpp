@@ -2,16 +2,28 @@
 
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include <pybind11/numpy.h>
+
+#include <algorithm>
+#include <cstdint>
+#include <memory>
+#include <numeric>
+#include <optional>
+
 #include "../include/BlackScholesFormulas.h"
 #include "../include/BinomialTree.h"
 #include "../include/PayoffFactory.h"
 #include "../include/Payoff.h"
 #include "../include/Parameters.h"
 #include "../include/Analytics.h"
+#include "../include/Indicators.h"
+#include "../include/VectorBacktest.h"
+#include "../include/Sweep.h"
 #include "../include/Backtester.h"
 #include "../include/Optimizer.h"
 #include "../include/HyperOptimizer.h"
 #include "../include/PairSelector.h"
+#include "../include/KalmanBank.h"
 #include "../include/RegimeDetector.h"
 #include "../include/PCAArbitrage.h"
 #include "../include/OrderBook.h"
@@ -29,6 +41,560 @@ double RunBinomialTree(double Spot, double Rate, double Div, double Vol, double
     return SimpleBinomialTree(Spot, r, d, Vol, Expiry, Steps, *PayoffPtr, IsAmerican);
 }
 
+// Contiguous float64 view of whatever array-like Python hands us (a float64
+// C-contiguous ndarray passes through without a copy).
+using DoubleArray = py::array_t<double, py::array::c_style | py::array::forcecast>;
+
+std::size_t RequireSeries(const DoubleArray& arr, const char* name, py::ssize_t expected) {
+    if (arr.ndim() != 1) {
+        throw std::invalid_argument(std::string(name) + " must be 1-D");
+    }
+    if (expected >= 0 && arr.shape(0) != expected) {
+        throw std::invalid_argument(std::string(name) + " length does not match timestamps");
+    }
+    return static_cast<std::size_t>(arr.shape(0));
+}
+
+void RunBars(Backtester& engine, const std::string& symbol, const DoubleArray& timestamps,
+             const DoubleArray& open, const DoubleArray& high, const DoubleArray& low, const DoubleArray& close) {
+    const std::size_t n = RequireSeries(timestamps, "timestamps", -1);
+    const auto len = static_cast<py::ssize_t>(n);
+    RequireSeries(open, "open", len);
+    RequireSeries(high, "high", len);
+    RequireSeries(low, "low", len);
+    RequireSeries(close, "close", len);
+
+    py::gil_scoped_release release;
+    engine.run_bars(symbol, timestamps.data(), open.data(), high.data(), low.data(), close.data(), n);
+}
+
+void RunPanel(Backtester& engine, const std::vector<std::string>& symbols, const DoubleArray& timestamps,
+              const DoubleArray& ohlc) {
+    const std::size_t n = RequireSeries(timestamps, "timestamps", -1);
+    if (ohlc.ndim() != 3 || ohlc.shape(0) != static_cast<py::ssize_t>(n)
+        || ohlc.shape(1) != static_cast<py::ssize_t>(symbols.size()) || ohlc.shape(2) != 4) {
+        throw std::invalid_argument("ohlc must have shape (len(timestamps), len(symbols), 4)");
+    }
+
+    py::gil_scoped_release release;
+    engine.run_panel(symbols, timestamps.data(), ohlc.data(), n);
+}
+
+// Read-only NumPy view over series[start, stop). The capsule keeps its own
+// reference to the buffer, so the array stays valid after further ingestion
+// (SharedSeries never rewrites an exported buffer) and after the engine dies.
+py::array_t<double> SeriesView(const SharedSeries& series, std::size_t start, std::size_t stop) {
+    auto* owner = new std::shared_ptr<const std::vector<double>>(series.share());
+    py::capsule base(owner, [](void* p) { delete static_cast<std::shared_ptr<const std::vector<double>>*>(p); });
+
+    stop = std::min(stop, (*owner)->size());
+    start = std::min(start, stop);
+    py::array_t<double> view({static_cast<py::ssize_t>(stop - start)}, {static_cast<py::ssize_t>(sizeof(double))},
+                             (*owner)->data() + start, base);
+    view.attr("setflags")(py::arg("write") = false);
+    return view;
+}
+
+py::array_t<double> FullView(const SharedSeries& series) {
+    return SeriesView(series, 0, series.size());
+}
+
+py::array_t<double> EquitySlice(const Backtester& engine, py::ssize_t start, std::optional<py::ssize_t> stop) {
+    if (start < 0 || (stop && *stop < 0)) {
+        throw std::invalid_argument("equity_slice bounds must be non-negative");
+    }
+    const std::size_t end = stop ? static_cast<std::size_t>(*stop) : engine.get_equity_len();
+    return SeriesView(engine.get_equity_series(), static_cast<std::size_t>(start), end);
+}
+
+template <typename T>
+py::array_t<T> ColumnCopy(const std::vector<T>& column) {
+    return py::array_t<T>(static_cast<py::ssize_t>(column.size()), column.data());
+}
+
+// Analytics::Downsample* over a NumPy series; indices come back as int64.
+template <std::vector<std::size_t> (*Select)(const std::vector<double>&, std::size_t)>
+py::array_t<std::int64_t> DownsampleIndices(const DoubleArray& series, std::size_t max_points) {
+    const std::size_t n = RequireSeries(series, "series", -1);
+    std::vector<std::size_t> picked;
+    {
+        py::gil_scoped_release release;
+        picked = Select(std::vector<double>(series.data(), series.data() + n), max_points);
+    }
+    py::array_t<std::int64_t> out(static_cast<py::ssize_t>(picked.size()));
+    std::copy(picked.begin(), picked.end(), out.mutable_data());
+    return out;
+}
+
+// Columnar export of the trade log: one NumPy array per field, with `symbol`
+// holding int32 codes into the `symbols` dictionary and `side` +1 (BUY) / -1
+// (SELL). Ready for pa.DictionaryArray / pd.Categorical without a Python loop.
+py::dict TradeLedgerColumns(const Backtester& engine) {
+    const TradeLedger& ledger = engine.get_trade_ledger();
+    py::array_t<std::int64_t> ids(static_cast<py::ssize_t>(ledger.size()));
+    std::iota(ids.mutable_data(), ids.mutable_data() + ledger.size(), std::int64_t{0});
+
+    py::dict columns;
+    columns["id"] = ids;
+    columns["symbol"] = ColumnCopy(ledger.symbol_ids());
+    columns["side"] = ColumnCopy(ledger.sides());
+    columns["quantity"] = ColumnCopy(ledger.quantities());
+    columns["price"] = ColumnCopy(ledger.prices());
+    columns["commission"] = ColumnCopy(ledger.commissions());
+    columns["timestamp"] = ColumnCopy(ledger.timestamps());
+    columns["symbols"] = py::cast(ledger.symbols());
+    return columns;
+}
+
+// RegimeSeries as a dict of NumPy columns (state_id int32, volatility, trend).
+py::dict RegimeSeriesColumns(const RegimeSeries& series) {
+    py::dict columns;
+    columns["state_id"] = ColumnCopy(series.state_id);
+    columns["volatility"] = ColumnCopy(series.volatility);
+    columns["trend"] = ColumnCopy(series.trend);
+    return columns;
+}
+
+py::dict LabelSeries(const std::vector<double>& prices, int window_size, int lookback, int recluster_every) {
+    RegimeSeries series;
+    {
+        py::gil_scoped_release release;
+        series = RegimeDetector::LabelSeries(prices, window_size, lookback, recluster_every);
+    }
+    return RegimeSeriesColumns(series);
+}
+
+py::dict LabelUniverse(const std::map<std::string, std::vector<double>>& universe, int window_size, int lookback,
+                       int recluster_every, unsigned int num_threads) {
+    std::map<std::string, RegimeSeries> labelled;
+    {
+        py::gil_scoped_release release;
+        labelled = RegimeDetector::LabelUniverse(universe, window_size, lookback, recluster_every, num_threads);
+    }
+    py::dict out;
+    for (const auto& [symbol, series] : labelled) out[py::str(symbol)] = RegimeSeriesColumns(series);
+    return out;
+}
+
+// A 1-D series (one column) or a 2-D (T x N) panel, as Indicators expects it.
+PanelView RequirePanel(const DoubleArray& arr, const char* name) {
+    if (arr.ndim() == 1) return {arr.data(), static_cast<std::size_t>(arr.shape(0)), 1};
+    if (arr.ndim() == 2) {
+        return {arr.data(), static_cast<std::size_t>(arr.shape(0)), static_cast<std::size_t>(arr.shape(1))};
+    }
+    throw std::invalid_argument(std::string(name) + " must be 1-D or 2-D (T x N)");
+}
+
+py::array_t<double> EmptyLike(const DoubleArray& arr) {
+    return py::array_t<double>(std::vector<py::ssize_t>(arr.shape(), arr.shape() + arr.ndim()));
+}
+
+py::array_t<double> IndicatorEMA(const DoubleArray& prices, int period, unsigned int num_threads) {
+    const PanelView panel = RequirePanel(prices, "prices");
+    auto out = EmptyLike(prices);
+    double* dst = out.mutable_data();
+    py::gil_scoped_release release;
+    Indicators::EMA(panel, period, dst, num_threads);
+    return out;
+}
+
+py::tuple IndicatorMACD(const DoubleArray& prices, int fast, int slow, int signal, unsigned int num_threads) {
+    const PanelView panel = RequirePanel(prices, "prices");
+    auto line = EmptyLike(prices);
+    auto sig = EmptyLike(prices);
+    auto hist = EmptyLike(prices);
+    double* dst[3] = {line.mutable_data(), sig.mutable_data(), hist.mutable_data()};
+    {
+        py::gil_scoped_release release;
+        Indicators::MACD(panel, fast, slow, signal, dst[0], dst[1], dst[2], num_threads);
+    }
+    return py::make_tuple(line, sig, hist);
+}
+
+py::array_t<double> IndicatorRSI(const DoubleArray& prices, int period, unsigned int num_threads) {
+    const PanelView panel = RequirePanel(prices, "prices");
+    auto out = EmptyLike(prices);
+    double* dst = out.mutable_data();
+    py::gil_scoped_release release;
+    Indicators::RSI(panel, period, dst, num_threads);
+    return out;
+}
+
+py::tuple IndicatorBollinger(const DoubleArray& prices, int period, double mult, unsigned int num_threads) {
+    const PanelView panel = RequirePanel(prices, "prices");
+    auto middle = EmptyLike(prices);
+    auto upper = EmptyLike(prices);
+    auto lower = EmptyLike(prices);
+    double* dst[3] = {middle.mutable_data(), upper.mutable_data(), lower.mutable_data()};
+    {
+        py::gil_scoped_release release;
+        Indicators::Bollinger(panel, period, mult, dst[0], dst[1], dst[2], num_threads);
+    }
+    return py::make_tuple(middle, upper, lower);
+}
+
+py::array_t<double> IndicatorRollingVol(const DoubleArray& prices, int window, unsigned int num_threads) {
+    const PanelView panel = RequirePanel(prices, "prices");
+    auto out = EmptyLike(prices);
+    double* dst = out.mutable_data();
+    py::gil_scoped_release release;
+    Indicators::RollingVolatility(panel, window, dst, num_threads);
+    return out;
+}
+
+py::array_t<double> IndicatorYangZhang(const DoubleArray& open, const DoubleArray& high, const DoubleArray& low,
+                                       const DoubleArray& close, int window, unsigned int num_threads) {
+    const PanelView o = RequirePanel(open, "open");
+    const PanelView h = RequirePanel(high, "high");
+    const PanelView l = RequirePanel(low, "low");
+    const PanelView c = RequirePanel(close, "close");
+    auto out = EmptyLike(close);
+    double* dst = out.mutable_data();
+    py::gil_scoped_release release;
+    Indicators::YangZhang(o, h, l, c, window, dst, num_threads);
+    return out;
+}
+
+// Vector backtest over a 1-D series or (T x N) close panel: equity and
+// position with the input's shape, per-column summaries as 1-D arrays.
+py::dict VectorBacktest(const DoubleArray& closes, const std::string& strategy,
+                        const std::map<std::string, double>& params, double initial_capital, double leverage,
+                        double max_drawdown_limit, double var_limit, unsigned int num_threads) {
+    const PanelView panel = RequirePanel(closes, "closes");
+    VectorBacktestConfig config;
+    config.strategy = strategy;
+    config.params = params;
+    config.initial_capital = initial_capital;
+    config.leverage = leverage;
+    config.max_drawdown_limit = max_drawdown_limit;
+    config.var_limit = var_limit;
+
+    VectorBacktestResult result;
+    {
+        py::gil_scoped_release release;
+        result = RunVectorBacktest(panel, config, num_threads);
+    }
+    const std::vector<py::ssize_t> shape(closes.shape(), closes.shape() + closes.ndim());
+    py::dict out;
+    out["equity"] = py::array_t<double>(shape, result.equity.data());
+    out["position"] = py::array_t<double>(shape, result.position.data());
+    out["final_equity"] = ColumnCopy(result.final_equity);
+    out["max_drawdown"] = ColumnCopy(result.max_drawdown);
+    out["trades"] = ColumnCopy(result.trades);
+    out["halted"] = ColumnCopy(result.halted).attr("astype")("bool");
+    return out;
+}
+
+std::vector<PairResult> FindTopPairsPanel(const DoubleArray& prices, const std::vector<std::string>& symbols,
+                                          int top_n, bool single_precision, unsigned int num_threads) {
+    const PanelView view = RequirePanel(prices, "prices");
+    py::gil_scoped_release release;
+    return PairSelector::FindTopPairs(view, symbols, top_n, single_precision, num_threads);
+}
+
+py::array_t<double> PairCorrelationMatrix(const DoubleArray& prices, bool single_precision, unsigned int num_threads) {
+    const PanelView view = RequirePanel(prices, "prices");
+    const auto n = static_cast<py::ssize_t>(view.cols);
+    py::array_t<double> out({n, n});
+    double* data = out.mutable_data();
+    {
+        py::gil_scoped_release release;
+        PairSelector::CorrelationMatrix(view, data, single_precision, num_threads);
+    }
+    return out;
+}
+
+// KalmanBank::Run over a 1-D / (T, N) price panel: (T, pairs) arrays.
+py::dict KalmanBankPanel(const DoubleArray& prices, const std::vector<std::pair<std::size_t, std::size_t>>& pairs,
+                         std::size_t window, double delta, double vt, unsigned int num_threads) {
+    const PanelView view = RequirePanel(prices, "prices");
+    const std::vector<py::ssize_t> shape{static_cast<py::ssize_t>(view.rows), static_cast<py::ssize_t>(pairs.size())};
+    py::array_t<double> hedge_ratio(shape);
+    py::array_t<double> intercept(shape);
+    py::array_t<double> spread(shape);
+    py::array_t<double> z_score(shape);
+    {
+        double* h = hedge_ratio.mutable_data();
+        double* i = intercept.mutable_data();
+        double* s = spread.mutable_data();
+        double* z = z_score.mutable_data();
+        py::gil_scoped_release release;
+        KalmanBank::Run(view, pairs, window, delta, vt, h, i, s, z, num_threads);
+    }
+    py::dict out;
+    out["hedge_ratio"] = hedge_ratio;
+    out["intercept"] = intercept;
+    out["spread"] = spread;
+    out["z_score"] = z_score;
+    return out;
+}
+
+py::array_t<double> PCARollingSignals(const DoubleArray& prices, int window, int num_components,
+                                      int refactor_every) {
+    const PanelView view = RequirePanel(prices, "prices");
+    py::array_t<double> out(std::vector<py::ssize_t>{static_cast<py::ssize_t>(view.rows),
+                                                     static_cast<py::ssize_t>(view.cols)});
+    double* dst = out.mutable_data();
+    py::gil_scoped_release release;
+    PCAArbitrage::RollingSignals(view, window, dst, num_components, refactor_every);
+    return out;
+}
+
+void StreamingPCAPush(StreamingPCA& pca, const DoubleArray& returns) {
+    if (returns.ndim() != 1 || static_cast<std::size_t>(returns.shape(0)) != pca.assets()) {
+        throw std::invalid_argument("returns must be 1-D with one entry per asset");
+    }
+    pca.push(returns.data());
+}
+
+// The cointegration funnel as columns (ranked, strongest first) plus the
+// per-stage counts.
+py::dict ScreenCointegrationPanel(const DoubleArray& prices, const std::vector<std::string>& symbols,
+                                  double min_correlation, std::size_t max_candidates, int adf_lags,
+                                  double significance, double min_half_life, double max_half_life,
+                                  double max_hurst, int hurst_max_lag, bool single_precision,
+                                  unsigned int num_threads) {
+    const PanelView view = RequirePanel(prices, "prices");
+    CointegrationOptions options;
+    options.min_correlation = min_correlation;
+    options.max_candidates = max_candidates;
+    options.adf_lags = adf_lags;
+    options.significance = significance;
+    options.min_half_life = min_half_life;
+    options.max_half_life = max_half_life;
+    options.max_hurst = max_hurst;
+    options.hurst_max_lag = hurst_max_lag;
+    options.single_precision = single_precision;
+    CointegrationReport report;
+    {
+        py::gil_scoped_release release;
+        report = PairSelector::ScreenCointegration(view, symbols, options, num_threads);
+    }
+    std::vector<std::string> asset_a, asset_b;
+    std::vector<double> correlation, alpha, beta, adf, half_life, hurst;
+    for (const CointegratedPair& p : report.pairs) {
+        asset_a.push_back(p.asset_a);
+        asset_b.push_back(p.asset_b);
+        correlation.push_back(p.correlation);
+        alpha.push_back(p.alpha);
+        beta.push_back(p.beta);
+        adf.push_back(p.adf_statistic);
+        half_life.push_back(p.half_life);
+        hurst.push_back(p.hurst);
+    }
+    py::dict columns;
+    columns["asset_a"] = py::cast(asset_a);
+    columns["asset_b"] = py::cast(asset_b);
+    columns["correlation"] = ColumnCopy(correlation);
+    columns["alpha"] = ColumnCopy(alpha);
+    columns["beta"] = ColumnCopy(beta);
+    columns["adf_statistic"] = ColumnCopy(adf);
+    columns["half_life"] = ColumnCopy(half_life);
+    columns["hurst"] = ColumnCopy(hurst);
+
+    py::dict funnel;
+    funnel["screened"] = report.screened;
+    funnel["correlated"] = report.correlated;
+    funnel["stationary"] = report.stationary;
+    funnel["mean_reverting"] = report.mean_reverting;
+    funnel["passed"] = report.pairs.size();
+    funnel["skipped_symbols"] = report.skipped_symbols;
+
+    py::dict out;
+    out["pairs"] = columns;
+    out["funnel"] = funnel;
+    out["critical_value"] = report.critical_value;
+    return out;
+}
+
+// A panel for RunSweep()/evolve(): (T, N, 4) OHLC as run_panel takes it, or
+// (T, N) / (T,) closes replayed as flat bars, converted once. An OHLC panel is
+// borrowed, so `panel` must outlive this. symbols default to S0, S1, ... and
+// timestamps to 0..T-1.
+class SweepPanel {
+public:
+    SweepPanel(const DoubleArray& panel, std::optional<std::vector<std::string>> symbols,
+               std::optional<DoubleArray> timestamps) {
+        if (panel.ndim() < 1 || panel.ndim() > 3 || (panel.ndim() == 3 && panel.shape(2) != 4)) {
+            throw std::invalid_argument("panel must be (T, N, 4) OHLC, (T, N) closes or (T,) closes");
+        }
+        n_times_ = static_cast<std::size_t>(panel.shape(0));
+        const std::size_t n_symbols = panel.ndim() == 1 ? 1 : static_cast<std::size_t>(panel.shape(1));
+        ohlc_ = panel.data();
+        if (panel.ndim() < 3) {
+            flat_bars_.reserve(n_times_ * n_symbols * 4);
+            for (std::size_t i = 0; i < n_times_ * n_symbols; ++i) flat_bars_.insert(flat_bars_.end(), 4, panel.data()[i]);
+            ohlc_ = flat_bars_.data();
+        }
+
+        if (!symbols) {
+            symbols.emplace();
+            for (std::size_t j = 0; j < n_symbols; ++j) symbols->push_back("S" + std::to_string(j));
+        } else if (symbols->size() != n_symbols) {
+            throw std::invalid_argument("symbols must name every panel column");
+        }
+        symbols_ = std::move(*symbols);
+        if (timestamps) {
+            RequireSeries(*timestamps, "timestamps", static_cast<py::ssize_t>(n_times_));
+            clock_.assign(timestamps->data(), timestamps->data() + n_times_);
+        } else {
+            clock_.resize(n_times_);
+            std::iota(clock_.begin(), clock_.end(), 0.0);
+        }
+    }
+
+    [[nodiscard]] SweepData data() const { return {symbols_, clock_.data(), ohlc_, n_times_}; }
+
+private:
+    std::vector<std::string> symbols_;
+    std::vector<double> clock_;
+    std::vector<double> flat_bars_;
+    const double* ohlc_ = nullptr;
+    std::size_t n_times_ = 0;
+};
+
+SweepOptions MakeSweepOptions(double initial_capital, double leverage, double max_drawdown_limit, double var_limit) {
+    SweepOptions options;
+    options.initial_capital = initial_capital;
+    options.leverage = leverage;
+    options.max_drawdown_limit = max_drawdown_limit;
+    options.var_limit = var_limit;
+    return options;
+}
+
+// A parameter grid: a {name: [values]} dict, expanded to its Cartesian
+// product, or a list of {name: value} dicts.
+std::vector<std::map<std::string, double>> ReadConfigs(const py::object& param_grid) {
+    if (py::isinstance<py::dict>(param_grid)) {
+        return ExpandGrid(param_grid.cast<std::map<std::string, std::vector<double>>>());
+    }
+    return param_grid.cast<std::vector<std::map<std::string, double>>>();
+}
+
+py::dict SweepColumns(const SweepResult& result) {
+    py::dict columns;
+    for (std::size_t k = 0; k < result.parameter_names.size(); ++k) {
+        columns[py::str(result.parameter_names[k])] = ColumnCopy(result.parameters[k]);
+    }
+    columns["final_equity"] = ColumnCopy(result.final_equity);
+    columns["return_pct"] = ColumnCopy(result.return_pct);
+    columns["max_drawdown"] = ColumnCopy(result.max_drawdown);
+    columns["sharpe"] = ColumnCopy(result.sharpe);
+    columns["trades"] = ColumnCopy(result.trades);
+    return columns;
+}
+
+// fe.sweep: evaluate a parameter grid on one panel, shared by every run.
+py::dict Sweep(const std::string& strategy, const py::object& param_grid, const DoubleArray& panel,
+               std::optional<std::vector<std::string>> symbols, std::optional<DoubleArray> timestamps,
+               double initial_capital, double leverage, double max_drawdown_limit, double var_limit,
+               unsigned int num_threads) {
+    const std::vector<std::map<std::string, double>> configs = ReadConfigs(param_grid);
+    const SweepPanel data(panel, std::move(symbols), std::move(timestamps));
+    const SweepOptions options = MakeSweepOptions(initial_capital, leverage, max_drawdown_limit, var_limit);
+
+    SweepResult result;
+    {
+        py::gil_scoped_release release;
+        result = RunSweep(strategy, configs, data.data(), options, num_threads);
+    }
+    return SweepColumns(result);
+}
+
+// fe.successive_halving / fe.hyperband: the leaderboard as sweep columns plus
+// each row's bars, rung and bracket.
+template <HalvingResult (*Search)(const std::string&, const std::vector<std::map<std::string, double>>&,
+                                  const SweepData&, const SweepOptions&, const HalvingOptions&, unsigned int)>
+py::dict Halving(const std::string& strategy, const py::object& param_grid, const DoubleArray& panel,
+                 std::optional<std::vector<std::string>> symbols, std::optional<DoubleArray> timestamps, double eta,
+                 std::size_t min_bars, std::optional<std::uint64_t> seed, double initial_capital, double leverage,
+                 double max_drawdown_limit, double var_limit, unsigned int num_threads) {
+    const std::vector<std::map<std::string, double>> configs = ReadConfigs(param_grid);
+    const SweepPanel data(panel, std::move(symbols), std::move(timestamps));
+    const SweepOptions options = MakeSweepOptions(initial_capital, leverage, max_drawdown_limit, var_limit);
+    HalvingOptions halving;
+    halving.eta = eta;
+    halving.min_bars = min_bars;
+    halving.seed = seed;
+
+    HalvingResult result;
+    {
+        py::gil_scoped_release release;
+        result = Search(strategy, configs, data.data(), options, halving, num_threads);
+    }
+    py::dict columns = SweepColumns(result.table);
+    columns["bars"] = ColumnCopy(result.bars);
+    columns["rung"] = ColumnCopy(result.rung);
+    columns["bracket"] = ColumnCopy(result.bracket);
+    return columns;
+}
+
+// fe.successive_halving runs every configuration, so it has no seed to take.
+py::dict SuccessiveHalving(const std::string& strategy, const py::object& param_grid, const DoubleArray& panel,
+                           std::optional<std::vector<std::string>> symbols, std::optional<DoubleArray> timestamps,
+                           double eta, std::size_t min_bars, double initial_capital, double leverage,
+                           double max_drawdown_limit, double var_limit, unsigned int num_threads) {
+    return Halving<RunSuccessiveHalving>(strategy, param_grid, panel, std::move(symbols), std::move(timestamps), eta,
+                                         min_bars, std::nullopt, initial_capital, leverage, max_drawdown_limit,
+                                         var_limit, num_threads);
+}
+
+// fe.evolve: space is {name: (low, high)}; a range whose bounds are both
+// Python ints searches whole numbers only, and comes back as an int. MACD
+// keeps slow above fast as evolve_macd does.
+py::dict Evolve(const std::string& strategy, const py::dict& space, const DoubleArray& panel,
+                std::optional<std::vector<std::string>> symbols, std::optional<DoubleArray> timestamps,
+                int generations, int population_size, double elite_fraction, double mutation_rate,
+                std::optional<std::uint64_t> seed, int patience, double tolerance, double time_budget,
+                double initial_capital, double leverage, double max_drawdown_limit, double var_limit,
+                unsigned int num_threads) {
+    std::map<std::string, ParamRange> ranges;
+    for (const auto& [key, value] : space) {
+        const auto bounds = value.cast<py::sequence>();
+        if (bounds.size() != 2) throw std::invalid_argument("search ranges must be (low, high) pairs");
+        const auto is_int = [](const py::handle& h) { return py::isinstance<py::int_>(h) && !py::isinstance<py::bool_>(h); };
+        ranges[key.cast<std::string>()] = {bounds[0].cast<double>(), bounds[1].cast<double>(),
+                                           is_int(bounds[0]) && is_int(bounds[1])};
+    }
+    const SweepPanel data(panel, std::move(symbols), std::move(timestamps));
+    const SweepOptions options = MakeSweepOptions(initial_capital, leverage, max_drawdown_limit, var_limit);
+    EvolveOptions evolve_options;
+    evolve_options.generations = generations;
+    evolve_options.population_size = population_size;
+    evolve_options.elite_fraction = elite_fraction;
+    evolve_options.mutation_rate = mutation_rate;
+    evolve_options.seed = seed;
+    evolve_options.patience = patience;
+    evolve_options.tolerance = tolerance;
+    evolve_options.time_budget_seconds = time_budget;
+    if (strategy == "MACD") evolve_options.repair = GeneticOptimizer::repair_macd;
+
+    EvolveResult result;
+    {
+        py::gil_scoped_release release;
+        result = GeneticOptimizer::evolve(strategy, ranges, data.data(), options, evolve_options, num_threads);
+    }
+
+    py::dict best_params;
+    for (const auto& [name, value] : result.best_params) {
+        const auto range = ranges.find(name);
+        if (range != ranges.end() && range->second.integer) {
+            best_params[py::str(name)] = static_cast<long long>(value);
+        } else {
+            best_params[py::str(name)] = value;
+        }
+    }
+    py::dict out;
+    out["best_params"] = best_params;
+    out["best_fitness"] = result.best_fitness;
+    out["generations"] = result.generations;
+    out["evaluations"] = result.evaluations;
+    out["cache_hits"] = result.cache_hits;
+    out["history"] = ColumnCopy(result.best_history);
+    out["stop_reason"] = result.stop_reason;
+    return out;
+}
+
 PYBIND11_MODULE(FinancialEngine, m) {
     m.doc() = "Financial Engine powered by C++ Core (Multi-Asset & Kalman)";
 
@@ -44,7 +610,7 @@ PYBIND11_MODULE(FinancialEngine, m) {
     m.def("calculate_greeks", &BlackScholes::CalculateGreeks, "Calculate Options Greeks",
           py::arg("spot"), py::arg("strike"), py::arg("r"), py::arg("d"), py::arg("vol"), py::arg("expiry"), py::arg("is_call"));
 
-    m.def("binomial_tree_price", &RunBinomialTree, "Binomial Tree Option Pricing",
+    m.def("binomial_tree_price", &RunBinomialTree, "Binomial Tree Option Pricing", py::call_guard<py::gil_scoped_release>(),
         py::arg("spot"), py::arg("rate"), py::arg("div"), py::arg("vol"), py::arg("expiry"),
         py::arg("steps"), py::arg("payoff_type"), py::arg("strike"), py::arg("is_american"));
 
@@ -53,6 +619,11 @@ PYBIND11_MODULE(FinancialEngine, m) {
     // =========================================================================
 
     // Enums
+    py::enum_<EquitySampling>(m, "EquitySampling")
+        .value("EVERY_TICK", EquitySampling::EVERY_TICK)
+        .value("PER_TIMESTAMP", EquitySampling::PER_TIMESTAMP)
+        .value("INTERVAL", EquitySampling::INTERVAL).export_values();
+
     py::enum_<ActionType>(m, "ActionType")
         .value("INDEX_REBALANCE", ActionType::INDEX_REBALANCE)
         .value("MERGER_ANNOUNCEMENT", ActionType::MERGER_ANNOUNCEMENT)
@@ -228,12 +799,36 @@ PYBIND11_MODULE(FinancialEngine, m) {
     // =========================================================================
     // 3. Analytics & Machine Learning Proxies
     // =========================================================================
+    // The heavy entry points below run with the GIL released: pybind11 converts
+    // the arguments first, drops the GIL for the C++ call, and re-acquires it to
+    // build the result. None of them touch Python objects or shared mutable
+    // state, so separate Python threads get real multicore overlap. An
+    // Optimizer or Backtester *instance* is still single-threaded (see
+    // ENGINEERING_DECISIONS.md #12).
     py::class_<Analytics>(m, "Analytics")
         .def_static("calculate_log_returns", &Analytics::CalculateLogReturns)
         .def_static("calculate_volatility", &Analytics::CalculateVolatility)
         .def_static("calculate_var", &Analytics::CalculateVaR)
         .def_static("calculate_es", &Analytics::CalculateES)
-        .def_static("fit_linear_regression", &Analytics::FitLinearRegression);
+        .def_static("fit_linear_regression", &Analytics::FitLinearRegression)
+        .def_static("adf_statistic", &Analytics::CalculateADFStatistic,
+            "Augmented Dickey-Fuller t-statistic of a spread (no deterministic terms)",
+            py::arg("series"), py::arg("lags") = 1)
+        .def_static("engle_granger_critical_value", &Analytics::EngleGrangerCriticalValue,
+            "MacKinnon critical value for a two-variable Engle-Granger test",
+            py::arg("n_obs"), py::arg("significance") = 0.05)
+        .def_static("half_life", &Analytics::CalculateHalfLife,
+            "Mean-reversion half-life in bars from an AR(1) fit of the spread",
+            py::arg("spread"))
+        .def_static("hurst_exponent", &Analytics::CalculateHurstExponent,
+            "Hurst exponent from the scaling of lagged differences",
+            py::arg("series"), py::arg("max_lag") = 20)
+        .def_static("downsample_lttb", &DownsampleIndices<&Analytics::DownsampleLTTB>,
+            "Indices of at most max_points points of series, largest-triangle-three-buckets",
+            py::arg("series"), py::arg("max_points"))
+        .def_static("downsample_minmax", &DownsampleIndices<&Analytics::DownsampleMinMax>,
+            "Indices of at most max_points points of series, keeping each bucket's min and max",
+            py::arg("series"), py::arg("max_points"));
 
     py::class_<OptimizationResult>(m, "OptimizationResult")
         .def_readonly("optimal_weights", &OptimizationResult::optimal_weights)
@@ -244,12 +839,12 @@ PYBIND11_MODULE(FinancialEngine, m) {
     py::class_<Optimizer>(m, "Optimizer")
         .def(py::init<>())
         .def("add_asset", &Optimizer::add_asset)
-        .def("optimize_sharpe_ratio", &Optimizer::optimize_sharpe_ratio, py::arg("num_simulations"), py::arg("risk_free_rate"), py::arg("num_threads") = 0)
-        .def("optimize_inverse_volatility", &Optimizer::optimize_inverse_volatility, py::arg("risk_free_rate") = 0.0)
-        .def("optimize_minimum_variance", &Optimizer::optimize_minimum_variance, py::arg("risk_free_rate") = 0.0)
-        .def("optimize_max_sharpe_analytic", &Optimizer::optimize_max_sharpe_analytic, py::arg("risk_free_rate") = 0.0)
-        .def("optimize_max_sharpe_shrunk", &Optimizer::optimize_max_sharpe_shrunk, py::arg("risk_free_rate") = 0.0)
-        .def("optimize_max_sharpe_robust", &Optimizer::optimize_max_sharpe_robust, py::arg("risk_free_rate") = 0.0);
+        .def("optimize_sharpe_ratio", &Optimizer::optimize_sharpe_ratio, py::call_guard<py::gil_scoped_release>(), py::arg("num_simulations"), py::arg("risk_free_rate"), py::arg("num_threads") = 0, py::arg("seed") = py::none())
+        .def("optimize_inverse_volatility", &Optimizer::optimize_inverse_volatility, py::call_guard<py::gil_scoped_release>(), py::arg("risk_free_rate") = 0.0)
+        .def("optimize_minimum_variance", &Optimizer::optimize_minimum_variance, py::call_guard<py::gil_scoped_release>(), py::arg("risk_free_rate") = 0.0)
+        .def("optimize_max_sharpe_analytic", &Optimizer::optimize_max_sharpe_analytic, py::call_guard<py::gil_scoped_release>(), py::arg("risk_free_rate") = 0.0)
+        .def("optimize_max_sharpe_shrunk", &Optimizer::optimize_max_sharpe_shrunk, py::call_guard<py::gil_scoped_release>(), py::arg("risk_free_rate") = 0.0)
+        .def("optimize_max_sharpe_robust", &Optimizer::optimize_max_sharpe_robust, py::call_guard<py::gil_scoped_release>(), py::arg("risk_free_rate") = 0.0);
 
     py::class_<Gene>(m, "Gene")
         .def_readonly("fast", &Gene::fast)
@@ -258,9 +853,9 @@ PYBIND11_MODULE(FinancialEngine, m) {
         .def_readonly("fitness", &Gene::fitness);
 
     py::class_<GeneticOptimizer>(m, "GeneticOptimizer")
-        .def_static("evolve_macd", &GeneticOptimizer::evolve_macd,
+        .def_static("evolve_macd", &GeneticOptimizer::evolve_macd, py::call_guard<py::gil_scoped_release>(),
             py::arg("prices"), py::arg("initial_capital"),
-            py::arg("generations") = 10, py::arg("population_size") = 50);
+            py::arg("generations") = 10, py::arg("population_size") = 50, py::arg("seed") = py::none());
 
     py::class_<PairResult>(m, "PairResult")
         .def_readonly("asset_a", &PairResult::asset_a)
@@ -270,9 +865,26 @@ PYBIND11_MODULE(FinancialEngine, m) {
         .def_readonly("r_squared", &PairResult::r_squared);
 
     py::class_<PairSelector>(m, "PairSelector")
-        .def_static("find_top_pairs", &PairSelector::FindTopPairs,
-            "Find the pair with highest correlation",
-            py::arg("market_data"), py::arg("top_n") = 5);
+        .def_static("find_top_pairs",
+            py::overload_cast<const std::map<std::string, std::vector<double>>&, int, bool, unsigned int>(
+                &PairSelector::FindTopPairs),
+            "The top_n pairs by |log-return correlation|, with hedge ratio and R^2",
+            py::call_guard<py::gil_scoped_release>(),
+            py::arg("market_data"), py::arg("top_n") = 5, py::arg("single_precision") = false,
+            py::arg("num_threads") = 0)
+        .def_static("find_top_pairs", &FindTopPairsPanel,
+            "Same screen over a (T, N) price panel, one column per symbol",
+            py::arg("prices"), py::arg("symbols"), py::arg("top_n") = 5, py::arg("single_precision") = false,
+            py::arg("num_threads") = 0)
+        .def_static("correlation_matrix", &PairCorrelationMatrix,
+            "N x N log-return correlation matrix of a (T, N) price panel",
+            py::arg("prices"), py::arg("single_precision") = false, py::arg("num_threads") = 0)
+        .def_static("cointegration_screen", &ScreenCointegrationPanel,
+            "Engle-Granger funnel (correlation, ADF, half-life, Hurst) over a (T, N) price panel",
+            py::arg("prices"), py::arg("symbols"), py::arg("min_correlation") = 0.5,
+            py::arg("max_candidates") = 5000, py::arg("adf_lags") = 1, py::arg("significance") = 0.05,
+            py::arg("min_half_life") = 1.0, py::arg("max_half_life") = 252.0, py::arg("max_hurst") = 1.0,
+            py::arg("hurst_max_lag") = 20, py::arg("single_precision") = false, py::arg("num_threads") = 0);
 
     py::class_<LinearRegressionResult>(m, "LinearRegressionResult")
         .def_readonly("alpha", &LinearRegressionResult::alpha)
@@ -287,8 +899,96 @@ PYBIND11_MODULE(FinancialEngine, m) {
 
     py::class_<RegimeDetector>(m, "RegimeDetector")
         .def_static("detect_regime", &RegimeDetector::DetectRegime,
-            "Detect market regime using K-Means clustering",
-            py::arg("prices"), py::arg("window_size") = 20);
+            "Detect market regime using K-Means clustering", py::call_guard<py::gil_scoped_release>(),
+            py::arg("prices"), py::arg("window_size") = 20)
+        .def_static("label_series", &LabelSeries,
+            "Regime of every bar in one pass: dict of state_id / volatility / trend arrays",
+            py::arg("prices"), py::arg("window_size") = 20, py::arg("lookback") = 252, py::arg("recluster_every") = 1)
+        .def_static("label_universe", &LabelUniverse,
+            "label_series for every symbol of a {symbol: prices} dict, in parallel",
+            py::arg("universe"), py::arg("window_size") = 20, py::arg("lookback") = 252,
+            py::arg("recluster_every") = 1, py::arg("num_threads") = 0);
+
+    auto indicators = m.def_submodule("indicators",
+        "Batch indicators over a 1-D series or a (T x N) panel, matching the strategies' numerics. "
+        "Outputs have the input's shape, NaN until the indicator is defined; NaN inputs are missing bars, "
+        "skipped (NaN out) as run_panel skips them. Columns run in parallel.");
+    indicators.def("ema", &IndicatorEMA, "EMA with alpha = 2 / (period + 1), seeded with the first price",
+        py::arg("prices"), py::arg("period"), py::arg("num_threads") = 0);
+    indicators.def("macd", &IndicatorMACD, "(macd, signal, histogram) as MACDStrategy computes them",
+        py::arg("prices"), py::arg("fast") = 12, py::arg("slow") = 26, py::arg("signal") = 9, py::arg("num_threads") = 0);
+    indicators.def("rsi", &IndicatorRSI, "Simple-average RSI over the last `period` changes",
+        py::arg("prices"), py::arg("period") = 14, py::arg("num_threads") = 0);
+    indicators.def("bollinger", &IndicatorBollinger, "(middle, upper, lower) bands: mean +/- mult * population std",
+        py::arg("prices"), py::arg("period") = 20, py::arg("mult") = 2.0, py::arg("num_threads") = 0);
+    indicators.def("rolling_vol", &IndicatorRollingVol,
+        "Per-bar volatility of the last `window` log returns (the VaR check uses 29)",
+        py::arg("prices"), py::arg("window") = 29, py::arg("num_threads") = 0);
+    indicators.def("yang_zhang", &IndicatorYangZhang, "Per-bar Yang-Zhang volatility over the last `window` bars",
+        py::arg("open"), py::arg("high"), py::arg("low"), py::arg("close"), py::arg("window") = 20,
+        py::arg("num_threads") = 0);
+
+    m.def("vector_backtest", &VectorBacktest,
+        "Screen EMA/MACD/RSI/BB over each close column as an independent single-asset Backtester run "
+        "(same sizing, commission and risk stop). Returns equity/position arrays and per-column "
+        "final_equity, max_drawdown, trades, halted.",
+        py::arg("closes"), py::arg("strategy") = "EMA", py::arg("params") = std::map<std::string, double>{},
+        py::arg("initial_capital") = 100000.0, py::arg("leverage") = 1.0, py::arg("max_drawdown_limit") = 0.05,
+        py::arg("var_limit") = 0.02, py::arg("num_threads") = 0);
+
+    m.def("sweep", &Sweep,
+        "Backtest `strategy` once per configuration of param_grid ({name: [values]} grid or list of "
+        "{name: value}) over one panel, in parallel with the GIL released. Returns a dict of columns: "
+        "every strategy parameter, final_equity, return_pct, max_drawdown, sharpe, trades.",
+        py::arg("strategy"), py::arg("param_grid"), py::arg("panel"), py::arg("symbols") = py::none(),
+        py::arg("timestamps") = py::none(), py::arg("initial_capital") = 100000.0, py::arg("leverage") = 1.0,
+        py::arg("max_drawdown_limit") = 0.05, py::arg("var_limit") = 0.02, py::arg("num_threads") = 0);
+
+    m.def("successive_halving", &SuccessiveHalving,
+        "Successive halving of param_grid (as sweep): all configurations run the first min_bars timestamps "
+        "(0 = auto), the best 1/eta by return_pct resume on an eta-times longer prefix, until the survivors "
+        "reach the end. Returns the leaderboard, best first, as sweep columns plus bars (timestamps "
+        "replayed), rung and bracket.",
+        py::arg("strategy"), py::arg("param_grid"), py::arg("panel"), py::arg("symbols") = py::none(),
+        py::arg("timestamps") = py::none(), py::arg("eta") = 3.0, py::arg("min_bars") = 0,
+        py::arg("initial_capital") = 100000.0, py::arg("leverage") = 1.0,
+        py::arg("max_drawdown_limit") = 0.05, py::arg("var_limit") = 0.02, py::arg("num_threads") = 0);
+
+    m.def("hyperband", &Halving<RunHyperband>,
+        "Hyperband over the configurations of param_grid: successive-halving brackets from aggressive "
+        "(many configurations from min_bars timestamps; 0 = as deep as successive_halving on the whole pool) to a plain sweep of a few, each sampling "
+        "its configurations from the pool (seeded by `seed`). Returns one leaderboard as successive_halving.",
+        py::arg("strategy"), py::arg("param_grid"), py::arg("panel"), py::arg("symbols") = py::none(),
+        py::arg("timestamps") = py::none(), py::arg("eta") = 3.0, py::arg("min_bars") = 0,
+        py::arg("seed") = py::none(), py::arg("initial_capital") = 100000.0, py::arg("leverage") = 1.0,
+        py::arg("max_drawdown_limit") = 0.05, py::arg("var_limit") = 0.02, py::arg("num_threads") = 0);
+
+    m.def("kalman_bank", &KalmanBankPanel,
+        "Kalman hedge ratios for many pairs at once over a (T, N) price panel, pairs being (x, y) column "
+        "indices; y = intercept + hedge_ratio * x, filter and z-score window as the PAIRS strategy. Returns "
+        "(T, pairs) arrays hedge_ratio, intercept, spread and z_score (NaN until `window` spreads, and "
+        "for a pair at a row where a leg is NaN).",
+        py::arg("prices"), py::arg("pairs"), py::arg("window") = 30, py::arg("delta") = 1e-4,
+        py::arg("vt") = 1e-3, py::arg("num_threads") = 0);
+
+    m.def("evolve", &Evolve,
+        "Genetic search for the `strategy` parameters in space ({name: (low, high)}, int bounds = whole "
+        "numbers) maximising return_pct on the panel. Generations are scored in parallel with a fitness "
+        "memo (MACD keeps slow above fast: slow = fast + 5 otherwise); stops on `generations`, a "
+        "`patience`-generation plateau or `time_budget` seconds. Returns "
+        "best_params, best_fitness, generations, evaluations, cache_hits, history and stop_reason.",
+        py::arg("strategy"), py::arg("space"), py::arg("panel"), py::arg("symbols") = py::none(),
+        py::arg("timestamps") = py::none(), py::arg("generations") = 20, py::arg("population_size") = 50,
+        py::arg("elite_fraction") = 0.2, py::arg("mutation_rate") = 0.1, py::arg("seed") = py::none(),
+        py::arg("patience") = 0, py::arg("tolerance") = 1e-9, py::arg("time_budget") = 0.0,
+        py::arg("initial_capital") = 100000.0, py::arg("leverage") = 1.0, py::arg("max_drawdown_limit") = 0.05,
+        py::arg("var_limit") = 0.02, py::arg("num_threads") = 0);
+
+    py::class_<StreamingRegimeDetector>(m, "StreamingRegimeDetector")
+        .def(py::init<int, int, int>(), py::arg("window_size") = 20, py::arg("lookback") = 252, py::arg("recluster_every") = 1)
+        .def("update", &StreamingRegimeDetector::update, py::arg("price"), "Ingest one price (O(1))")
+        .def("classify", &StreamingRegimeDetector::classify, "Regime of the latest window (warm-started k-means)")
+        .def("count", &StreamingRegimeDetector::count);
 
     py::class_<PCAResult>(m, "PCAResult")
         .def_readonly("z_scores", &PCAResult::z_scores)
@@ -296,8 +996,23 @@ PYBIND11_MODULE(FinancialEngine, m) {
 
     py::class_<PCAArbitrage>(m, "PCAArbitrage")
         .def_static("calculate_signals", &PCAArbitrage::CalculateSignals,
-            "Calculate PCA-based Stat-Arb Z-scores",
-            py::arg("prices"), py::arg("num_components") = 1);
+            "Calculate PCA-based Stat-Arb Z-scores", py::call_guard<py::gil_scoped_release>(),
+            py::arg("prices"), py::arg("num_components") = 1)
+        .def_static("rolling_signals", &PCARollingSignals,
+            "calculate_signals on every trailing `window` prices of a (T, N) price panel, updated row by row "
+            "(see StreamingPCA). Returns (T, N) z-scores, NaN for the first window - 1 rows.",
+            py::arg("prices"), py::arg("window") = 60, py::arg("num_components") = 1,
+            py::arg("refactor_every") = 50);
+
+    py::class_<StreamingPCA>(m, "StreamingPCA")
+        .def(py::init<std::size_t, std::size_t, int, int, double>(), py::arg("assets"), py::arg("window"),
+             py::arg("num_components") = 1, py::arg("refactor_every") = 50, py::arg("tolerance") = 1e-10)
+        .def("push", &StreamingPCAPush, py::arg("returns"),
+             "Append one row of returns (one per asset), dropping the oldest once `window` rows are in")
+        .def("ready", &StreamingPCA::ready)
+        .def_property_readonly("z_scores", &StreamingPCA::z_scores)
+        .def_property_readonly("explained_variance", &StreamingPCA::explained_variance)
+        .def_property_readonly("refactors", &StreamingPCA::refactors);
 
     py::class_<BSGreeks>(m, "BSGreeks")
         .def_readonly("delta", &BSGreeks::delta)
@@ -306,6 +1021,10 @@ PYBIND11_MODULE(FinancialEngine, m) {
         .def_readonly("vega", &BSGreeks::vega)
         .def_readonly("rho", &BSGreeks::rho);
 
+    py::enum_<Side>(m, "Side")
+        .value("BUY", Side::BUY)
+        .value("SELL", Side::SELL);
+
     py::class_<Trade>(m, "Trade")
         .def_readonly("id", &Trade::id)
         .def_readonly("symbol", &Trade::symbol)
@@ -340,31 +1059,101 @@ PYBIND11_MODULE(FinancialEngine, m) {
             py::arg("leverage") = 1.0)
 
         // Core Hooks
-        .def("on_market_data", &Backtester::on_market_data, py::arg("symbol"), py::arg("timestamp"), py::arg("open"), py::arg("high"), py::arg("low"), py::arg("close"))
+        .def("register_symbol", &Backtester::register_symbol,
+            "Dense integer id for a symbol (registered on first use); stable for the engine's lifetime and across snapshots",
+            py::arg("symbol"))
+        .def("symbol_name", &Backtester::symbol_name, py::arg("symbol_id"))
+        .def("get_symbols", [](const Backtester& e) { return e.get_symbols().names(); }, "Registered symbols, in id order")
+        .def("on_market_data", py::overload_cast<const std::string&, double, double, double, double, double>(&Backtester::on_market_data),
+            py::arg("symbol"), py::arg("timestamp"), py::arg("open"), py::arg("high"), py::arg("low"), py::arg("close"))
+        .def("on_market_data", [](Backtester& e, SymbolId id, double ts, double o, double h, double l, double c) {
+                (void)e.symbol_name(id);  // IndexError for an id that was never registered
+                e.on_market_data(id, ts, o, h, l, c);
+            }, "Same as the string overload, keyed by an id from register_symbol()",
+            py::arg("symbol_id"), py::arg("timestamp"), py::arg("open"), py::arg("high"), py::arg("low"), py::arg("close"))
+        .def("run_bars", &RunBars, "Replay a whole bar series for one symbol in C++ (GIL released)",
+            py::arg("symbol"), py::arg("timestamps"), py::arg("open"), py::arg("high"), py::arg("low"), py::arg("close"))
+        .def("run_panel", &RunPanel, "Replay a (T, N, 4) OHLC panel, symbols interleaved per timestamp; NaN bars are skipped (GIL released)",
+            py::arg("symbols"), py::arg("timestamps"), py::arg("ohlc"))
         .def("on_order_book_update", &Backtester::on_order_book_update, py::arg("book"), py::arg("timestamp"))
-        .def("send_order", &Backtester::send_order, py::arg("symbol"), py::arg("side"), py::arg("quantity"), py::arg("price"), py::arg("timestamp"))
+        .def("send_order", py::overload_cast<const std::string&, const std::string&, double, double, double>(&Backtester::send_order), py::arg("symbol"), py::arg("side"), py::arg("quantity"), py::arg("price"), py::arg("timestamp"))
+        .def("send_order", [](Backtester& e, SymbolId id, const std::string& side, double quantity, double price, double ts) {
+                (void)e.symbol_name(id);
+                if (side == "BUY") e.send_order(id, Side::BUY, quantity, price, ts);
+                else if (side == "SELL") e.send_order(id, Side::SELL, quantity, price, ts);
+            }, "Same as the string overload, keyed by an id from register_symbol()",
+            py::arg("symbol_id"), py::arg("side"), py::arg("quantity"), py::arg("price"), py::arg("timestamp"))
 
         // Advanced 75-Strategy Event Routers (The Bridge)
         .def("send_event", &Backtester::send_event)
 
         // Engine State Getters
-        .def("get_holdings", &Backtester::get_holdings, py::arg("symbol"))
-        .def("get_opens", &Backtester::get_opens, py::return_value_policy::reference, py::arg("symbol"))
-        .def("get_highs", &Backtester::get_highs, py::return_value_policy::reference, py::arg("symbol"))
-        .def("get_lows", &Backtester::get_lows, py::return_value_policy::reference, py::arg("symbol"))
-        .def("get_closes", &Backtester::get_closes, py::return_value_policy::reference, py::arg("symbol"))
+        .def("get_holdings", py::overload_cast<const std::string&>(&Backtester::get_holdings, py::const_), py::arg("symbol"))
+        .def("get_holdings", [](const Backtester& e, SymbolId id) { (void)e.symbol_name(id); return e.get_holdings(id); },
+            py::arg("symbol_id"))
+        // History getters are read-only zero-copy NumPy views, not fresh lists.
+        // The id overloads raise IndexError for an id that was never registered.
+        .def("get_opens", [](const Backtester& e, const std::string& s) { return FullView(e.get_data().open_series(s)); }, py::arg("symbol"))
+        .def("get_opens", [](const Backtester& e, SymbolId id) { (void)e.symbol_name(id); return FullView(e.get_data().open_series(id)); }, py::arg("symbol_id"))
+        .def("get_highs", [](const Backtester& e, const std::string& s) { return FullView(e.get_data().high_series(s)); }, py::arg("symbol"))
+        .def("get_highs", [](const Backtester& e, SymbolId id) { (void)e.symbol_name(id); return FullView(e.get_data().high_series(id)); }, py::arg("symbol_id"))
+        .def("get_lows", [](const Backtester& e, const std::string& s) { return FullView(e.get_data().low_series(s)); }, py::arg("symbol"))
+        .def("get_lows", [](const Backtester& e, SymbolId id) { (void)e.symbol_name(id); return FullView(e.get_data().low_series(id)); }, py::arg("symbol_id"))
+        .def("get_closes", [](const Backtester& e, const std::string& s) { return FullView(e.get_data().close_series(s)); }, py::arg("symbol"))
+        .def("get_closes", [](const Backtester& e, SymbolId id) { (void)e.symbol_name(id); return FullView(e.get_data().close_series(id)); }, py::arg("symbol_id"))
+        .def("get_bar_count", py::overload_cast<const std::string&>(&Backtester::get_bar_count, py::const_), py::arg("symbol"))
+        .def("get_bar_count", [](const Backtester& e, SymbolId id) { (void)e.symbol_name(id); return e.get_bar_count(id); }, py::arg("symbol_id"))
         .def("get_total_equity", &Backtester::get_total_equity)
         .def("get_cash_balance", &Backtester::get_cash_balance)
         .def("get_leverage", &Backtester::get_leverage)
         .def("get_trade_history", &Backtester::get_trade_history)
+        .def("get_trade_ledger", &TradeLedgerColumns, "Trade log as NumPy columns plus a `symbols` dictionary")
+        .def("get_trade_count", &Backtester::get_trade_count)
         .def("get_max_drawdown", &Backtester::get_max_drawdown)
-        .def("get_equity_history", &Backtester::get_equity_history)
+        .def("get_equity_history", [](const Backtester& e) { return FullView(e.get_equity_series()); })
+        .def("equity_len", &Backtester::get_equity_len, "Number of recorded equity points (O(1))")
+        .def("equity_slice", &EquitySlice, "Read-only view of equity points [start, stop), for incremental polling",
+            py::arg("start"), py::arg("stop") = py::none())
+
+        // Checkpointing: snapshot() -> bytes, restore(bytes), clone() / copy.deepcopy / pickle
+        .def("snapshot", [](const Backtester& e) { return py::bytes(e.snapshot()); },
+            "Serialize the full engine state (portfolio, equity, bars, strategy indicators, risk flags)")
+        .def("restore", [](Backtester& e, const py::bytes& state) { e.restore(std::string(state)); }, py::arg("state"))
+        .def("clone", [](const Backtester& e) { return Backtester(e); }, "Independent deep copy of this engine")
+        .def("__copy__", [](const Backtester& e) { return Backtester(e); })
+        .def("__deepcopy__", [](const Backtester& e, py::dict) { return Backtester(e); }, py::arg("memo"))
+        .def(py::pickle(
+            [](const Backtester& e) { return py::make_tuple(py::bytes(e.snapshot())); },
+            [](const py::tuple& state) {
+                if (state.size() != 1) throw std::runtime_error("invalid Backtester pickle state");
+                Backtester e(0.0);
+                e.restore(state[0].cast<std::string>());
+                return e;
+            }))
 
         // Control Parameters
         .def("set_risk_params", &Backtester::set_risk_params, py::arg("max_drawdown_limit") = 0.05, py::arg("var_limit") = 0.02)
+        .def("set_risk_cadence", &Backtester::set_risk_cadence, py::arg("ticks"), "Evaluate risk limits every `ticks` bars")
         .def("set_pairs_parameters", &Backtester::set_pairs_parameters, py::arg("window"), py::arg("threshold"))
+        .def("set_pairs_basket", &Backtester::set_pairs_basket, "The (x, y) symbol pairs PAIRS_BASKET trades",
+            py::arg("pairs"))
         .def("set_macd_parameters", &Backtester::set_macd_parameters)
+        .def("set_rsi_parameters", &Backtester::set_rsi_parameters, py::arg("period"), py::arg("buy_thresh") = 30.0, py::arg("sell_thresh") = 70.0)
+        .def("set_bollinger_parameters", &Backtester::set_bollinger_parameters, py::arg("period"), py::arg("std_dev_mult") = 2.0)
+        .def("set_ou_parameters", &Backtester::set_ou_parameters, py::arg("window"), py::arg("z_thresh") = 2.0)
+        .def("set_ema_parameters", &Backtester::set_ema_parameters, py::arg("short_window"), py::arg("long_window"))
+        .def("get_parameters", &Backtester::get_parameters, "The strategy's tunable parameters as {name: value}")
+        .def("set_parameters", &Backtester::set_parameters, py::arg("params"),
+             "Override any subset of get_parameters() from a {name: value} dict")
+        .def("set_parameter", &Backtester::set_parameter, py::arg("name"), py::arg("value"))
         .def("set_volatility_k", &Backtester::set_volatility_k)
-        .def("set_regime_filter", &Backtester::set_regime_filter, py::arg("use_filter"), py::arg("lookback") = 252)
+        .def("set_regime_filter", &Backtester::set_regime_filter, py::arg("use_filter"), py::arg("lookback") = 252, py::arg("recluster_every") = 1)
+        .def("set_bar_retention", &Backtester::set_bar_retention, py::arg("bars"),
+             "Keep only the last `bars` bars (and equity points) in memory; 0 = keep all. Never below the strategy lookback.")
+        .def("get_bar_retention", &Backtester::get_bar_retention)
+        .def("set_equity_sampling", &Backtester::set_equity_sampling, py::arg("sampling"), py::arg("interval") = 0.0,
+             "Record equity every bar (EVERY_TICK), once per distinct timestamp (PER_TIMESTAMP) or per `interval` of timestamp (INTERVAL)")
+        .def("get_equity_sampling", &Backtester::get_equity_sampling)
+        .def("flush_equity", &Backtester::flush_equity, "Record the open sampling bucket's equity point now")
         .def("set_quiet", &Backtester::set_quiet, py::arg("quiet"));
 }
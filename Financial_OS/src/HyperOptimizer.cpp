@@ -0,0 +1,237 @@
+// src/HyperOptimizer.cpp
+
+#include "../include/HyperOptimizer.h"
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <numeric>
+#include <random>
+#include <stdexcept>
+
+namespace {
+
+struct Individual {
+    std::vector<double> values;  // in space order
+    double fitness = 0.0;
+};
+
+// The search space in a fixed (name) order, so an individual is just the
+// vector of its values -- which is also its memo key.
+class Space {
+public:
+    explicit Space(const std::map<std::string, ParamRange>& space) {
+        if (space.empty()) throw std::invalid_argument("search space is empty");
+        for (const auto& [name, range] : space) {
+            ParamRange r = range;
+            if (r.integer) {
+                r.low = std::ceil(r.low);
+                r.high = std::floor(r.high);
+            }
+            if (!(r.low <= r.high)) {
+                throw std::invalid_argument("search range for '" + name + "' is empty");
+            }
+            names_.push_back(name);
+            ranges_.push_back(r);
+        }
+    }
+
+    [[nodiscard]] std::size_t size() const { return names_.size(); }
+
+    std::vector<double> random(std::mt19937_64& rng) const {
+        std::vector<double> values(size());
+        for (std::size_t k = 0; k < size(); ++k) values[k] = draw(k, rng);
+        return values;
+    }
+
+    void mutate(std::vector<double>& values, double rate, std::mt19937_64& rng) const {
+        std::uniform_real_distribution<double> coin(0.0, 1.0);
+        for (std::size_t k = 0; k < size(); ++k) {
+            if (coin(rng) >= rate) continue;
+            const ParamRange& r = ranges_[k];
+            const double span = r.high - r.low;
+            if (r.integer) {
+                const auto reach = std::max<long long>(1, std::llround(0.05 * span));
+                std::uniform_int_distribution<long long> step(-reach, reach);
+                values[k] += static_cast<double>(step(rng));
+            } else {
+                std::normal_distribution<double> step(0.0, 0.1 * span);
+                values[k] += step(rng);
+            }
+            values[k] = std::clamp(values[k], r.low, r.high);
+        }
+    }
+
+    [[nodiscard]] std::map<std::string, double> params(const std::vector<double>& values) const {
+        std::map<std::string, double> out;
+        for (std::size_t k = 0; k < size(); ++k) out.emplace(names_[k], values[k]);
+        return out;
+    }
+
+    // Runs the repair hook and maps its result back into range.
+    void repair(std::vector<double>& values, const EvolveOptions& options) const {
+        if (!options.repair) return;
+        std::map<std::string, double> named = params(values);
+        options.repair(named);
+        for (std::size_t k = 0; k < size(); ++k) {
+            const ParamRange& r = ranges_[k];
+            double v = named.at(names_[k]);
+            if (r.integer) v = std::round(v);
+            values[k] = std::clamp(v, r.low, r.high);
+        }
+    }
+
+private:
+    double draw(std::size_t k, std::mt19937_64& rng) const {
+        const ParamRange& r = ranges_[k];
+        if (r.integer) {
+            std::uniform_int_distribution<long long> dist(static_cast<long long>(r.low), static_cast<long long>(r.high));
+            return static_cast<double>(dist(rng));
+        }
+        std::uniform_real_distribution<double> dist(r.low, r.high);
+        return dist(rng);
+    }
+
+    std::vector<std::string> names_;
+    std::vector<ParamRange> ranges_;
+};
+
+const Individual& TournamentSelect(const std::vector<Individual>& population, std::mt19937_64& rng) {
+    std::uniform_int_distribution<std::size_t> pick(0, population.size() - 1);
+    const Individual* best = &population[pick(rng)];
+    for (int i = 0; i < 2; ++i) {
+        const Individual& contender = population[pick(rng)];
+        if (contender.fitness > best->fitness) best = &contender;
+    }
+    return *best;
+}
+
+std::vector<double> Crossover(const Individual& a, const Individual& b, std::mt19937_64& rng) {
+    std::bernoulli_distribution take_a(0.5);
+    std::vector<double> child(a.values.size());
+    for (std::size_t k = 0; k < child.size(); ++k) child[k] = take_a(rng) ? a.values[k] : b.values[k];
+    return child;
+}
+
+} // namespace
+
+EvolveResult GeneticOptimizer::evolve(const std::string& strategy, const std::map<std::string, ParamRange>& space,
+                                      const SweepData& data, const SweepOptions& options,
+                                      const EvolveOptions& evolve_options, unsigned int num_threads) {
+    const Space search(space);
+    const EvolveOptions& o = evolve_options;
+    if (o.generations < 1) throw std::invalid_argument("generations must be at least 1");
+    if (o.population_size < 2) throw std::invalid_argument("population_size must be at least 2");
+    if (!(o.elite_fraction >= 0.0 && o.elite_fraction < 1.0)) {
+        throw std::invalid_argument("elite_fraction must be in [0, 1)");
+    }
+    if (o.patience < 0) throw std::invalid_argument("patience must be non-negative");
+
+    const auto started = std::chrono::steady_clock::now();
+    std::mt19937_64 rng(o.seed ? *o.seed : std::random_device{}());
+    const auto population_size = static_cast<std::size_t>(o.population_size);
+    const std::size_t elite_count =
+        std::max<std::size_t>(1, static_cast<std::size_t>(o.elite_fraction * static_cast<double>(population_size)));
+
+    std::vector<Individual> population(population_size);
+    for (auto& individual : population) {
+        individual.values = search.random(rng);
+        search.repair(individual.values, o);
+    }
+
+    EvolveResult result;
+    std::map<std::vector<double>, double> memo;
+    int stale = 0;
+
+    for (int gen = 0; gen < o.generations; ++gen) {
+        // Score everything the memo hasn't seen in one parallel sweep.
+        std::vector<std::vector<double>> pending;
+        for (const auto& individual : population) {
+            if (memo.count(individual.values) ||
+                std::find(pending.begin(), pending.end(), individual.values) != pending.end()) {
+                ++result.cache_hits;
+            } else {
+                pending.push_back(individual.values);
+            }
+        }
+        if (!pending.empty()) {
+            std::vector<std::map<std::string, double>> configs;
+            configs.reserve(pending.size());
+            for (const auto& values : pending) configs.push_back(search.params(values));
+            const SweepResult scores = RunSweep(strategy, configs, data, options, num_threads);
+            for (std::size_t i = 0; i < pending.size(); ++i) memo.emplace(pending[i], scores.return_pct[i]);
+            result.evaluations += pending.size();
+        }
+        for (auto& individual : population) individual.fitness = memo.at(individual.values);
+
+        std::stable_sort(population.begin(), population.end(),
+                         [](const Individual& a, const Individual& b) { return a.fitness > b.fitness; });
+
+        const double best = population.front().fitness;
+        if (gen > 0 && best <= result.best_fitness + o.tolerance) {
+            ++stale;
+        } else {
+            stale = 0;
+        }
+        if (gen == 0 || best > result.best_fitness) {
+            result.best_fitness = best;
+            result.best_params = search.params(population.front().values);
+        }
+        result.best_history.push_back(result.best_fitness);
+        result.generations = gen + 1;
+
+        const std::chrono::duration<double> elapsed = std::chrono::steady_clock::now() - started;
+        if (o.patience > 0 && stale >= o.patience) {
+            result.stop_reason = "plateau";
+            break;
+        }
+        if (o.time_budget_seconds > 0.0 && elapsed.count() >= o.time_budget_seconds) {
+            result.stop_reason = "time_budget";
+            break;
+        }
+        if (gen + 1 == o.generations) {
+            result.stop_reason = "generations";
+            break;
+        }
+
+        std::vector<Individual> next(population.begin(), population.begin() + elite_count);
+        while (next.size() < population_size) {
+            Individual child;
+            child.values = Crossover(TournamentSelect(population, rng), TournamentSelect(population, rng), rng);
+            search.mutate(child.values, o.mutation_rate, rng);
+            search.repair(child.values, o);
+            next.push_back(std::move(child));
+        }
+        population = std::move(next);
+    }
+    return result;
+}
+
+void GeneticOptimizer::repair_macd(std::map<std::string, double>& params) {
+    const auto fast = params.find("fast");
+    const auto slow = params.find("slow");
+    if (fast == params.end() || slow == params.end()) return;
+    if (fast->second >= slow->second) slow->second = fast->second + 5;
+}
+
+Gene GeneticOptimizer::evolve_macd(const std::vector<double>& prices, double initial_capital, int generations,
+                                   int population_size, std::optional<std::uint64_t> seed) {
+    std::vector<double> timestamps(prices.size());
+    std::iota(timestamps.begin(), timestamps.end(), 0.0);
+    std::vector<double> bars;
+    bars.reserve(prices.size() * 4);
+    for (double price : prices) bars.insert(bars.end(), 4, price);
+
+    SweepOptions options;
+    options.initial_capital = initial_capital;
+    EvolveOptions evolve_options;
+    evolve_options.generations = generations;
+    evolve_options.population_size = population_size;
+    evolve_options.seed = seed;
+    evolve_options.repair = repair_macd;
+
+    const EvolveResult best = evolve("MACD",
+        {{"fast", {5, 50, true}}, {"slow", {2, 100, true}}, {"signal", {5, 30, true}}},
+        {{"TARGET"}, timestamps.data(), bars.data(), prices.size()}, options, evolve_options);
+    return {static_cast<int>(best.best_params.at("fast")), static_cast<int>(best.best_params.at("slow")),
+            static_cast<int>(best.best_params.at("signal")), best.best_fitness};
+}
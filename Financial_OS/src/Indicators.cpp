@@ -0,0 +1,157 @@
+// src/Indicators.cpp
+
+#include "../include/Indicators.h"
+#include "../include/Parallel.h"
+#include "../include/Rolling.h"
+#include <algorithm>
+#include <array>
+#include <cmath>
+#include <limits>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+namespace {
+
+// Columns handed to one worker together: rows are walked across the whole
+// block, so each row read touches one cache line instead of one per column.
+constexpr std::size_t kColumnBlock = 8;
+constexpr double kNaN = std::numeric_limits<double>::quiet_NaN();
+
+void RequireAtLeast(int value, int minimum, const char* name) {
+    if (value < minimum) {
+        throw std::invalid_argument(std::string(name) + " must be at least " + std::to_string(minimum));
+    }
+}
+
+// Runs one kernel per column over the panels in `in` (all of one shape),
+// writing Out values per row. step(kernel, x, y) sees the row's inputs for
+// that column and fills y, which starts as NaN; a row with a non-finite input
+// is not a bar -- its outputs stay NaN and the kernel is not stepped.
+template <std::size_t In, std::size_t Out, typename Make, typename Step>
+void RunColumns(const std::array<PanelView, In>& in, const std::array<double*, Out>& out, Make make, Step step,
+                unsigned int num_threads) {
+    const std::size_t rows = in[0].rows;
+    const std::size_t cols = in[0].cols;
+    const std::size_t blocks = (cols + kColumnBlock - 1) / kColumnBlock;
+
+    ParallelFor(blocks, [&](std::size_t b) {
+        const std::size_t first = b * kColumnBlock;
+        const std::size_t last = std::min(cols, first + kColumnBlock);
+        std::vector<decltype(make())> kernels;
+        kernels.reserve(last - first);
+        for (std::size_t j = first; j < last; ++j) kernels.push_back(make());
+
+        for (std::size_t t = 0; t < rows; ++t) {
+            for (std::size_t j = first; j < last; ++j) {
+                const std::size_t at = t * cols + j;
+                std::array<double, In> x;
+                for (std::size_t k = 0; k < In; ++k) x[k] = in[k].data[at];
+                std::array<double, Out> y;
+                y.fill(kNaN);
+
+                if (std::all_of(x.begin(), x.end(), [](double v) { return std::isfinite(v); })) {
+                    step(kernels[j - first], x, y);
+                }
+
+                for (std::size_t k = 0; k < Out; ++k) out[k][at] = y[k];
+            }
+        }
+    }, num_threads);
+}
+
+struct MacdKernel {
+    Ema fast;
+    Ema slow;
+    Ema signal;
+    std::size_t seen = 0;
+};
+
+struct LogReturnKernel {
+    RollingMoments returns;
+    double prev = 0.0;
+    bool has_prev = false;
+};
+
+} // namespace
+
+void Indicators::EMA(PanelView prices, int period, double* out, unsigned int num_threads) {
+    RequireAtLeast(period, 1, "period");
+    RunColumns<1, 1>({prices}, {out}, [period] { return Ema(period); },
+        [](Ema& ema, const std::array<double, 1>& x, std::array<double, 1>& y) { y[0] = ema.push(x[0]); },
+        num_threads);
+}
+
+void Indicators::MACD(PanelView prices, int fast_period, int slow_period, int signal_period, double* line,
+                      double* signal, double* histogram, unsigned int num_threads) {
+    RequireAtLeast(fast_period, 1, "fast_period");
+    RequireAtLeast(slow_period, 1, "slow_period");
+    RequireAtLeast(signal_period, 1, "signal_period");
+    const auto slow_bars = static_cast<std::size_t>(slow_period);
+    RunColumns<1, 3>({prices}, {line, signal, histogram},
+        [=] { return MacdKernel{Ema(fast_period), Ema(slow_period), Ema(signal_period)}; },
+        [slow_bars](MacdKernel& k, const std::array<double, 1>& x, std::array<double, 3>& y) {
+            const double fast = k.fast.push(x[0]);
+            const double slow = k.slow.push(x[0]);
+            if (++k.seen < slow_bars) return;
+            const double macd = fast - slow;
+            const double sig = k.signal.push(macd);
+            y = {macd, sig, macd - sig};
+        },
+        num_threads);
+}
+
+void Indicators::RSI(PanelView prices, int period, double* out, unsigned int num_threads) {
+    RequireAtLeast(period, 1, "period");
+    RunColumns<1, 1>({prices}, {out}, [period] { return RollingRSI(static_cast<std::size_t>(period)); },
+        [](RollingRSI& rsi, const std::array<double, 1>& x, std::array<double, 1>& y) {
+            rsi.push(x[0]);
+            if (rsi.ready()) y[0] = rsi.value();
+        },
+        num_threads);
+}
+
+void Indicators::Bollinger(PanelView prices, int period, double mult, double* middle, double* upper, double* lower,
+                           unsigned int num_threads) {
+    RequireAtLeast(period, 1, "period");
+    RunColumns<1, 3>({prices}, {middle, upper, lower},
+        [period] { return RollingMoments(static_cast<std::size_t>(period)); },
+        [mult](RollingMoments& closes, const std::array<double, 1>& x, std::array<double, 3>& y) {
+            closes.push(x[0]);
+            if (!closes.full()) return;
+            const double sma = closes.mean();
+            const double std_dev = std::sqrt(closes.variance());
+            y = {sma, sma + (std_dev * mult), sma - (std_dev * mult)};
+        },
+        num_threads);
+}
+
+void Indicators::RollingVolatility(PanelView prices, int window, double* out, unsigned int num_threads) {
+    RequireAtLeast(window, 1, "window");
+    RunColumns<1, 1>({prices}, {out},
+        [window] { return LogReturnKernel{RollingMoments(static_cast<std::size_t>(window))}; },
+        [](LogReturnKernel& k, const std::array<double, 1>& x, std::array<double, 1>& y) {
+            if (k.has_prev) k.returns.push(std::log(x[0] / k.prev));
+            k.prev = x[0];
+            k.has_prev = true;
+            if (k.returns.full()) y[0] = k.returns.volatility();
+        },
+        num_threads);
+}
+
+void Indicators::YangZhang(PanelView open, PanelView high, PanelView low, PanelView close, int window, double* out,
+                           unsigned int num_threads) {
+    RequireAtLeast(window, 2, "window");
+    for (const PanelView& panel : {open, high, low}) {
+        if (panel.rows != close.rows || panel.cols != close.cols) {
+            throw std::invalid_argument("open, high, low and close must have the same shape");
+        }
+    }
+    RunColumns<4, 1>({open, high, low, close}, {out},
+        [window] { return RollingYangZhang(static_cast<std::size_t>(window)); },
+        [](RollingYangZhang& yz, const std::array<double, 4>& x, std::array<double, 1>& y) {
+            yz.push(x[0], x[1], x[2], x[3]);
+            if (yz.ready()) y[0] = yz.value();
+        },
+        num_threads);
+}
@@ -0,0 +1,162 @@
+// src/KalmanBank.cpp
+
+#include "../include/KalmanBank.h"
+#include "../include/Parallel.h"
+#include <algorithm>
+#include <cmath>
+#include <stdexcept>
+
+namespace {
+
+// Pairs per task in Run(): a block's state (~20 doubles a pair plus its
+// spread window) stays cache-resident across the time loop.
+constexpr std::size_t kBlock = 64;
+
+struct FilterState {
+    double theta0;
+    double theta1;
+    double p00;
+    double p01;
+    double p11;
+};
+
+// KalmanFilter::update on one pair's state, with P's symmetry used to skip P10.
+inline FilterState Step(FilterState s, double delta, double vt, double x, double y) {
+    const double p00 = s.p00 + delta;
+    const double p11 = s.p11 + delta;
+    const double e = y - (s.theta0 + s.theta1 * x);
+    const double ph0 = p00 + x * s.p01;  // P H^T = (H P)^T
+    const double ph1 = s.p01 + x * p11;
+    const double q = ph0 + ph1 * x + vt;
+    const double k0 = ph0 / q;
+    const double k1 = ph1 / q;
+    return {s.theta0 + k0 * e, s.theta1 + k1 * e, p00 - k0 * ph0, s.p01 - k0 * ph1, p11 - k1 * ph1};
+}
+
+inline bool Finite(double x, double y) { return x - x == 0.0 && y - y == 0.0; }
+
+} // namespace
+
+KalmanBank::KalmanBank(std::size_t pairs, std::size_t window, double delta, double vt)
+    : window_(window > 0 ? window : 1), delta_(delta), vt_(vt),
+      theta0_(pairs, 0.0), theta1_(pairs, 0.0), p00_(pairs, 1.0), p01_(pairs, 0.0), p11_(pairs, 1.0),
+      spread_(pairs, std::nan("")), z_(pairs, std::nan("")),
+      ring_(pairs * window_, 0.0), head_(pairs, 0), count_(pairs, 0), sum_(pairs, 0.0), sum_sq_(pairs, 0.0),
+      since_resum_(pairs, 0) {}
+
+bool KalmanBank::filter(std::size_t k, double x, double y) {
+    if (!Finite(x, y)) {
+        spread_[k] = std::nan("");
+        z_[k] = std::nan("");
+        return false;
+    }
+    const FilterState s = Step({theta0_[k], theta1_[k], p00_[k], p01_[k], p11_[k]}, delta_, vt_, x, y);
+    theta0_[k] = s.theta0;
+    theta1_[k] = s.theta1;
+    p00_[k] = s.p00;
+    p01_[k] = s.p01;
+    p11_[k] = s.p11;
+    spread_[k] = y - (s.theta0 + s.theta1 * x);
+    return true;
+}
+
+// RollingMoments::push of pair k's new spread, then its z-score.
+void KalmanBank::push(std::size_t k) {
+    const double s = spread_[k];
+    double* ring = ring_.data() + k * window_;
+    if (count_[k] == window_) {
+        const double old = ring[head_[k]];
+        sum_[k] -= old;
+        sum_sq_[k] -= old * old;
+    } else {
+        ++count_[k];
+    }
+    ring[head_[k]] = s;
+    if (++head_[k] == window_) head_[k] = 0;
+    sum_[k] += s;
+    sum_sq_[k] += s * s;
+
+    if (++since_resum_[k] >= window_) {
+        const std::size_t oldest = count_[k] == window_ ? head_[k] : 0;
+        double sum = 0.0;
+        double sum_sq = 0.0;
+        for (std::size_t i = 0; i < count_[k]; ++i) {
+            const double v = ring[(oldest + i) % window_];
+            sum += v;
+            sum_sq += v * v;
+        }
+        sum_[k] = sum;
+        sum_sq_[k] = sum_sq;
+        since_resum_[k] = 0;
+    }
+
+    z_[k] = std::nan("");
+    if (count_[k] < window_) return;
+    const double n = static_cast<double>(window_);
+    const double mean = sum_[k] / n;
+    const double vol = std::sqrt(sum_sq_[k] / n - mean * mean);
+    if (vol >= 1e-9) z_[k] = (s - mean) / vol;
+}
+
+void KalmanBank::update(const double* x, const double* y) {
+    const std::size_t n = size();
+    const double nan = std::nan("");
+    // Branch-free over every pair so the filter loop vectorizes: a pair with
+    // a missing leg just has its old state written back.
+    for (std::size_t k = 0; k < n; ++k) {
+        const bool ok = Finite(x[k], y[k]);
+        const FilterState s = Step({theta0_[k], theta1_[k], p00_[k], p01_[k], p11_[k]}, delta_, vt_, x[k], y[k]);
+        theta0_[k] = ok ? s.theta0 : theta0_[k];
+        theta1_[k] = ok ? s.theta1 : theta1_[k];
+        p00_[k] = ok ? s.p00 : p00_[k];
+        p01_[k] = ok ? s.p01 : p01_[k];
+        p11_[k] = ok ? s.p11 : p11_[k];
+        spread_[k] = ok ? y[k] - (s.theta0 + s.theta1 * x[k]) : nan;
+    }
+    for (std::size_t k = 0; k < n; ++k) {
+        if (Finite(x[k], y[k])) {
+            push(k);
+        } else {
+            z_[k] = nan;
+        }
+    }
+}
+
+void KalmanBank::update(const std::size_t* pairs, std::size_t count, const double* x, const double* y) {
+    for (std::size_t i = 0; i < count; ++i) {
+        if (filter(pairs[i], x[i], y[i])) push(pairs[i]);
+    }
+}
+
+void KalmanBank::Run(PanelView prices, const std::vector<std::pair<std::size_t, std::size_t>>& pairs,
+                     std::size_t window, double delta, double vt, double* hedge_ratio, double* intercept,
+                     double* spread, double* z_score, unsigned int num_threads) {
+    if (pairs.empty()) throw std::invalid_argument("need at least one pair");
+    if (window == 0) throw std::invalid_argument("window must be at least 1");
+    for (const auto& [x, y] : pairs) {
+        if (x >= prices.cols || y >= prices.cols) throw std::invalid_argument("pair column out of range");
+    }
+
+    const std::size_t n_pairs = pairs.size();
+    const std::size_t blocks = (n_pairs + kBlock - 1) / kBlock;
+    ParallelFor(blocks, [&](std::size_t b) {
+        const std::size_t first = b * kBlock;
+        const std::size_t count = std::min(kBlock, n_pairs - first);
+        KalmanBank bank(count, window, delta, vt);
+        std::vector<double> x(count);
+        std::vector<double> y(count);
+        for (std::size_t t = 0; t < prices.rows; ++t) {
+            const double* row = prices.data + t * prices.cols;
+            for (std::size_t i = 0; i < count; ++i) {
+                x[i] = row[pairs[first + i].first];
+                y[i] = row[pairs[first + i].second];
+            }
+            bank.update(x.data(), y.data());
+            const std::size_t out = t * n_pairs + first;
+            std::copy(bank.theta1_.begin(), bank.theta1_.end(), hedge_ratio + out);
+            std::copy(bank.theta0_.begin(), bank.theta0_.end(), intercept + out);
+            std::copy(bank.spread_.begin(), bank.spread_.end(), spread + out);
+            std::copy(bank.z_.begin(), bank.z_.end(), z_score + out);
+        }
+    }, num_threads);
+}
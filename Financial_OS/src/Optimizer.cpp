@@ -1,10 +1,51 @@
 // src/Optimizer.cpp
 
 #include "../include/Optimizer.h"
+#include "../include/Parallel.h"
+#include <cstdint>
+#include <limits>
 #include <numeric>
 #include <random>
-#include "BS_thread_pool.hpp"
-#include <thread>
+#include <stdexcept>
+
+namespace {
+
+// Trials drawn and scored together in optimize_sharpe_ratio: one B x n
+// weights matrix and one GEMM against the covariance per block.
+constexpr std::size_t kTrialBlock = 256;
+
+std::uint64_t Mix(std::uint64_t x) {
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9ULL;
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EBULL;
+    return x ^ (x >> 31);
+}
+
+// Counter-based stream: draw i of stream k is a pure function of (seed, k, i)
+// -- SplitMix64 keyed per stream -- so a block's trials do not depend on
+// which thread runs it, or in what order.
+class CounterStream {
+public:
+    CounterStream(std::uint64_t seed, std::uint64_t stream) : key_(Mix(seed ^ Mix(stream + 0x9E3779B97F4A7C15ULL))) {}
+
+    // Uniform on (0, 1].
+    double next() {
+        const std::uint64_t bits = Mix(key_ + 0x9E3779B97F4A7C15ULL * ++counter_);
+        return static_cast<double>((bits >> 11) + 1) * 0x1.0p-53;
+    }
+
+private:
+    std::uint64_t key_;
+    std::uint64_t counter_ = 0;
+};
+
+struct Trial {
+    double sharpe = -1e9;
+    double ann_ret = 0.0;
+    double ann_vol = 0.0;
+    std::vector<double> weights;
+};
+
+} // namespace
 
 void Optimizer::add_asset(const std::string& symbol, const std::vector<double>& returns) {
     symbols_.push_back(symbol);
@@ -61,73 +102,85 @@ std::pair<double, double> Optimizer::calculate_portfolio_metrics(
     return {port_return, std::sqrt(port_variance)};
 }
 
-OptimizationResult Optimizer::optimize_sharpe_ratio(int num_simulations, 
-    double risk_free_rate, unsigned int num_threads) {
+// Random long-only portfolios, uniform on the simplex (Dirichlet(1, ..., 1):
+// normalised Exp(1) draws), scored in blocks: with the trials as the rows of
+// W, the variances are the row sums of (W * Sigma) .* W. Block b draws from
+// its own counter-based stream, so a given seed picks the same portfolio
+// whatever the thread count; ties go to the earliest trial.
+OptimizationResult Optimizer::optimize_sharpe_ratio(int num_simulations,
+    double risk_free_rate, unsigned int num_threads, std::optional<std::uint64_t> seed) {
     size_t n_assets = symbols_.size();
     if (n_assets == 0) return {};
+    if (num_simulations <= 0) throw std::invalid_argument("num_simulations must be positive");
 
-    std::vector<double> means(n_assets);
+    Eigen::VectorXd means(n_assets);
     size_t n_periods = return_matrix_[0].size();
     for (size_t i = 0; i < n_assets; ++i) {
-        means[i] = std::accumulate(return_matrix_[i].begin(), return_matrix_[i].end(), 0.0) / n_periods;
+        means(i) = std::accumulate(return_matrix_[i].begin(), return_matrix_[i].end(), 0.0) / n_periods;
     }
 
-    auto cov_matrix = calculate_covariance_matrix();
-
-    std::vector<double> sharpes(num_simulations, -1e9);
-    std::vector<double> all_weights(static_cast<size_t>(num_simulations) * n_assets);
-    std::vector<double> ann_rets(num_simulations, 0.0);
-    std::vector<double> ann_vols(num_simulations, 0.0);
-
-    static BS::thread_pool single_threaded_pool(1);
-    static BS::thread_pool auto_threaded_pool(std::thread::hardware_concurrency());
-
-    auto run_trial = [&](int sim) {
-        thread_local std::mt19937 gen(std::random_device{}());
-        std::uniform_real_distribution<> dis(0.0, 1.0);
-
-        thread_local std::vector<double> weights;
-        weights.resize(n_assets);
-
-        double sum_weights = 0.0;
-        for (size_t i = 0; i < n_assets; ++i) {
-            weights[i] = dis(gen);
-            sum_weights += weights[i];
-        }
-        for (size_t i = 0; i < n_assets; ++i) {
-            weights[i] /= sum_weights;
+    const auto std_cov = calculate_covariance_matrix();
+    Eigen::MatrixXd cov(n_assets, n_assets);
+    for (size_t i = 0; i < n_assets; ++i) {
+        for (size_t j = 0; j < n_assets; ++j) {
+            cov(i, j) = std_cov[i][j];
         }
+    }
 
-        auto [p_ret, p_vol] = calculate_portfolio_metrics(weights, means, cov_matrix);
-
-        double ann_ret = p_ret * 252.0;
-        double ann_vol = p_vol * std::sqrt(252.0);
+    const std::uint64_t key = seed ? *seed : std::random_device{}();
+    const auto trials = static_cast<size_t>(num_simulations);
+    const size_t n_blocks = (trials + kTrialBlock - 1) / kTrialBlock;
+    std::vector<Trial> best(n_blocks);
+
+    ParallelFor(n_blocks, [&](size_t b) {
+        const size_t first = b * kTrialBlock;
+        const size_t rows = std::min(kTrialBlock, trials - first);
+        CounterStream stream(key, b);
+
+        Eigen::MatrixXd w(rows, n_assets);
+        for (size_t r = 0; r < rows; ++r) {
+            double sum_weights = 0.0;
+            for (size_t i = 0; i < n_assets; ++i) {
+                w(r, i) = -std::log(stream.next());
+                sum_weights += w(r, i);
+            }
+            w.row(r) /= sum_weights;
+        }
 
-        if (ann_vol > 1e-6) {
-            sharpes[sim] = (ann_ret - risk_free_rate) / ann_vol;
-            ann_rets[sim] = ann_ret;
-            ann_vols[sim] = ann_vol;
-            std::copy(weights.begin(), weights.end(), all_weights.begin() + static_cast<size_t>(sim) * n_assets);
+        const Eigen::VectorXd p_ret = w * means;
+        const Eigen::VectorXd p_var = (w * cov).cwiseProduct(w).rowwise().sum();
+
+        Trial& block_best = best[b];
+        size_t best_row = rows;
+        for (size_t r = 0; r < rows; ++r) {
+            double ann_ret = p_ret(r) * 252.0;
+            double ann_vol = std::sqrt(p_var(r)) * std::sqrt(252.0);
+            if (!(ann_vol > 1e-6)) continue;
+            double sharpe = (ann_ret - risk_free_rate) / ann_vol;
+            if (sharpe > block_best.sharpe) {
+                block_best.sharpe = sharpe;
+                block_best.ann_ret = ann_ret;
+                block_best.ann_vol = ann_vol;
+                best_row = r;
+            }
+        }
+        if (best_row < rows) {
+            block_best.weights.resize(n_assets);
+            for (size_t i = 0; i < n_assets; ++i) block_best.weights[i] = w(best_row, i);
         }
-    };
+    }, num_threads);
 
-    if (num_threads == 1) {
-        single_threaded_pool.submit_loop(0, num_simulations, run_trial).wait();
-    } else {
-        auto_threaded_pool.submit_loop(0, num_simulations, run_trial).wait();
+    size_t best_idx = 0;
+    for (size_t b = 1; b < n_blocks; ++b) {
+        if (best[b].sharpe > best[best_idx].sharpe) best_idx = b;
     }
 
-    auto best_it = std::max_element(sharpes.begin(), sharpes.end());
-    size_t best_idx = static_cast<size_t>(std::distance(sharpes.begin(), best_it));
-
     OptimizationResult best_result;
-    best_result.optimal_weights.assign(
-        all_weights.begin() + best_idx * n_assets,
-        all_weights.begin() + best_idx * n_assets + n_assets
-    );
-    best_result.portfolio_return = ann_rets[best_idx];
-    best_result.portfolio_volatility = ann_vols[best_idx];
-    best_result.sharpe_ratio = *best_it;
+    best_result.optimal_weights = best[best_idx].weights;
+    best_result.optimal_weights.resize(n_assets, 0.0);
+    best_result.portfolio_return = best[best_idx].ann_ret;
+    best_result.portfolio_volatility = best[best_idx].ann_vol;
+    best_result.sharpe_ratio = best[best_idx].sharpe;
 
     return best_result;
 }
@@ -5,6 +5,7 @@
 #include <cmath>
 #include <numeric>
 #include <algorithm>
+#include <stdexcept>
 
 PCAResult PCAArbitrage::CalculateSignals(const std::map<std::string, std::vector<double>>& prices, int num_components) {
     PCAResult result;
@@ -72,4 +73,180 @@ PCAResult PCAArbitrage::CalculateSignals(const std::map<std::string, std::vector
     }
 
     return result;
-}
\ No newline at end of file
+}
+
+namespace {
+
+// Subspace-iteration sweeps before StreamingPCA gives up and refactors.
+constexpr int kMaxSweeps = 8;
+// Extra vectors iterated beyond the components wanted: the error in the top
+// k then shrinks by lambda_{k+5} / lambda_k a sweep rather than
+// lambda_{k+1} / lambda_k, so a warm start settles in a few sweeps even
+// when the leading eigenvalues are close.
+constexpr std::size_t kOversample = 4;
+
+} // namespace
+
+StreamingPCA::StreamingPCA(std::size_t assets, std::size_t window, int num_components, int refactor_every,
+                           double tolerance)
+    : n_(assets), window_(window), refactor_every_(refactor_every), tolerance_(tolerance) {
+    if (assets == 0) throw std::invalid_argument("need at least one asset");
+    if (window < 2) throw std::invalid_argument("window must hold at least 2 rows");
+    if (num_components < 1) throw std::invalid_argument("num_components must be at least 1");
+    if (refactor_every < 1) throw std::invalid_argument("refactor_every must be at least 1");
+    if (!(tolerance > 0.0)) throw std::invalid_argument("tolerance must be positive");
+    k_ = std::min(static_cast<std::size_t>(num_components), n_);
+    block_ = std::min(k_ + kOversample, n_);
+    ring_.assign(window_ * n_, 0.0);
+    sum_.assign(n_, 0.0);
+    cross_.assign(n_ * n_, 0.0);
+}
+
+void StreamingPCA::push(const double* returns) {
+    double* slot = ring_.data() + head_ * n_;
+    const bool full = rows_ == window_;
+    bool finite = true;  // a NaN or inf in the sums would outlive its row
+    for (std::size_t j = 0; j < n_; ++j) {
+        const double add = returns[j];
+        const double drop = full ? slot[j] : 0.0;
+        finite = finite && std::isfinite(add) && std::isfinite(drop);
+        sum_[j] += add - drop;
+        double* row = cross_.data() + j * n_;
+        for (std::size_t k = 0; k <= j; ++k) {
+            row[k] += add * returns[k] - drop * slot[k];
+        }
+    }
+    std::copy(returns, returns + n_, slot);
+    if (++head_ == window_) head_ = 0;
+    if (!full) ++rows_;
+    if (!ready()) return;
+
+    const bool due =
+        components_.empty() || ++since_refactor_ >= static_cast<std::size_t>(refactor_every_) || !finite;
+    if (due) resum();
+    Eigen::VectorXd mean;
+    Eigen::VectorXd scale;
+    const Eigen::MatrixXd cov = covariance(mean, scale);
+    if (due || !refine(cov)) refactor(cov);
+    signals(cov, mean, scale);
+}
+
+// Sums from scratch over the window, shedding the rounding the add/drop
+// updates accumulate.
+void StreamingPCA::resum() {
+    std::fill(sum_.begin(), sum_.end(), 0.0);
+    std::fill(cross_.begin(), cross_.end(), 0.0);
+    for (std::size_t i = 0; i < rows_; ++i) {
+        const double* r = ring_.data() + i * n_;
+        for (std::size_t j = 0; j < n_; ++j) {
+            sum_[j] += r[j];
+            double* row = cross_.data() + j * n_;
+            for (std::size_t k = 0; k <= j; ++k) row[k] += r[j] * r[k];
+        }
+    }
+}
+
+// CalculateSignals' covariance of the standardised returns, from the sums:
+// column j of R is (r_j - mean_j) / scale_j, scale_j its population std.
+Eigen::MatrixXd StreamingPCA::covariance(Eigen::VectorXd& mean, Eigen::VectorXd& scale) const {
+    const double t = static_cast<double>(window_);
+    mean.resize(n_);
+    scale.resize(n_);
+    for (std::size_t j = 0; j < n_; ++j) {
+        mean(j) = sum_[j] / t;
+        const double stdev = std::sqrt(cross_[j * n_ + j] / t - mean(j) * mean(j));
+        scale(j) = stdev < 1e-8 ? 1.0 : stdev;
+    }
+    Eigen::MatrixXd cov(n_, n_);
+    for (std::size_t j = 0; j < n_; ++j) {
+        const double* row = cross_.data() + j * n_;
+        for (std::size_t k = 0; k <= j; ++k) {
+            const double c = (row[k] - t * mean(j) * mean(k)) / (scale(j) * scale(k) * (t - 1.0));
+            cov(j, k) = c;
+            cov(k, j) = c;
+        }
+    }
+    return cov;
+}
+
+void StreamingPCA::refactor(const Eigen::MatrixXd& cov) {
+    const Eigen::SelfAdjointEigenSolver<Eigen::MatrixXd> solver(cov);
+    const Eigen::MatrixXd top = solver.eigenvectors().rightCols(block_).rowwise().reverse();
+    components_.assign(top.data(), top.data() + n_ * block_);
+    const double total = solver.eigenvalues().sum();
+    explained_.resize(k_);
+    for (std::size_t i = 0; i < k_; ++i) explained_[i] = solver.eigenvalues()(n_ - 1 - i) / total;
+    since_refactor_ = 0;
+    ++refactors_;
+}
+
+// Subspace iteration from the previous row's block: each sweep a
+// Rayleigh-Ritz rotation of V onto the eigenvectors of V^T C V, in
+// decreasing order, stopping once the top k satisfy C v = lambda v to within
+// tolerance, else V <- orth(C V).
+bool StreamingPCA::refine(const Eigen::MatrixXd& cov) {
+    Eigen::Map<Eigen::MatrixXd> stored(components_.data(), n_, block_);
+    Eigen::MatrixXd v = stored;
+    Eigen::MatrixXd w(n_, block_);
+    for (int sweep = 0; sweep < kMaxSweeps; ++sweep) {
+        w.noalias() = cov * v;
+        const Eigen::SelfAdjointEigenSolver<Eigen::MatrixXd> ritz(v.transpose() * w);
+        const Eigen::MatrixXd rotation = ritz.eigenvectors().rowwise().reverse();
+        const Eigen::VectorXd values = ritz.eigenvalues().reverse();
+        v = v * rotation;
+        w = w * rotation;
+        const double residual =
+            (w.leftCols(k_) - v.leftCols(k_) * values.head(k_).asDiagonal()).norm();
+        if (residual <= tolerance_ * values.head(k_).norm()) {
+            stored = v;
+            const double total = cov.trace();
+            explained_.resize(k_);
+            for (std::size_t i = 0; i < k_; ++i) explained_[i] = values(i) / total;
+            return true;
+        }
+        const Eigen::HouseholderQR<Eigen::MatrixXd> qr(w);
+        v = qr.householderQ() * Eigen::MatrixXd::Identity(n_, block_);
+    }
+    return false;
+}
+
+// Residuals E = R (I - V V^T) without forming R: with G = R^T R, column j's
+// sum of squares is G_jj - 2 (G V)_j . V_j + V_j^T (V^T G V) V_j, and its
+// mean is zero since R's columns are centred.
+void StreamingPCA::signals(const Eigen::MatrixXd& cov, const Eigen::VectorXd& mean, const Eigen::VectorXd& scale) {
+    const double t = static_cast<double>(window_);
+    const Eigen::Map<const Eigen::MatrixXd> v(components_.data(), n_, k_);  // the top k of the block
+    const Eigen::MatrixXd gv = (t - 1.0) * (cov * v);
+    const Eigen::MatrixXd vgv = v.transpose() * gv;
+
+    const double* last = ring_.data() + (head_ == 0 ? window_ - 1 : head_ - 1) * n_;
+    Eigen::VectorXd x(n_);
+    for (std::size_t j = 0; j < n_; ++j) x(j) = (last[j] - mean(j)) / scale(j);
+    const Eigen::VectorXd residual = x - v * (v.transpose() * x);
+
+    z_.resize(n_);
+    for (std::size_t j = 0; j < n_; ++j) {
+        const double sum_sq = (t - 1.0) * cov(j, j) - 2.0 * gv.row(j).dot(v.row(j)) +
+                              v.row(j) * vgv * v.row(j).transpose();
+        const double stdev = std::sqrt(std::max(sum_sq, 0.0) / (t - 1.0));
+        z_[j] = stdev < 1e-8 ? 0.0 : -residual(j) / stdev;
+    }
+}
+
+void PCAArbitrage::RollingSignals(PanelView prices, int window, double* out, int num_components,
+                                  int refactor_every) {
+    if (window < 3) throw std::invalid_argument("window must be at least 3");
+    const std::size_t n = prices.cols;
+    std::fill(out, out + prices.rows * n, std::nan(""));
+    if (n == 0 || prices.rows < static_cast<std::size_t>(window)) return;
+
+    StreamingPCA pca(n, static_cast<std::size_t>(window) - 1, num_components, refactor_every);
+    std::vector<double> row(n);
+    for (std::size_t t = 1; t < prices.rows; ++t) {
+        const double* now = prices.data + t * n;
+        const double* before = now - n;
+        for (std::size_t j = 0; j < n; ++j) row[j] = std::log(now[j] / before[j]);
+        pca.push(row.data());
+        if (pca.ready()) std::copy(pca.z_scores().begin(), pca.z_scores().end(), out + t * n);
+    }
+}
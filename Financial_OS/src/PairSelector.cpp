@@ -1,76 +1,370 @@
 // src/PairSelector.cpp
 
 #include "../include/PairSelector.h"
-#include <iostream>
+#include "../include/Parallel.h"
+#include <Eigen/Dense>
 #include <algorithm>
 #include <cmath>
-#include <limits>
+#include <stdexcept>
+#include <tuple>
+#include <utility>
 
-std::vector<PairResult> PairSelector::FindTopPairs(const std::map<std::string, std::vector<double>>& data, int top_n) {
-    std::vector<PairResult> all_pairs;
+namespace {
 
-    std::vector<std::string> symbols;
-    std::vector<std::vector<double>> returns_cache;
+// Columns per GEMM tile: a tile of correlations is kTile x kTile scalars
+// (512 KB in double), whatever the universe size.
+constexpr Eigen::Index kTile = 256;
+constexpr std::size_t kMinPrices = 30;
 
-    for (const auto& [symbol, prices] : data) {
-        if (prices.size() < 30) continue;
-        symbols.push_back(symbol);
-        returns_cache.push_back(Analytics::CalculateLogReturns(prices));
-    }
+template <typename Scalar>
+using Matrix = Eigen::Matrix<Scalar, Eigen::Dynamic, Eigen::Dynamic>;
 
-    size_t n = symbols.size();
-    if (n < 2) return all_pairs;
+// A candidate pair by symbol index, a < b.
+struct Candidate {
+    double corr;
+    std::size_t a;
+    std::size_t b;
+};
 
-    for (size_t i = 0; i < n; ++i) {
-        for (size_t j = i + 1; j < n; ++j) {
-            double corr = Analytics::CalculateCorrelation(returns_cache[i], returns_cache[j]);
+// Ranking: larger |correlation| first, ties by symbol order.
+bool Ahead(const Candidate& x, const Candidate& y) {
+    const double ax = std::abs(x.corr);
+    const double ay = std::abs(y.corr);
+    if (ax != ay) return ax > ay;
+    return std::tie(x.a, x.b) < std::tie(y.a, y.b);
+}
 
-            PairResult res;
-            res.asset_a = symbols[i];
-            res.asset_b = symbols[j];
-            res.correlation = corr;
-            res.beta = 0.0;
-            res.r_squared = 0.0;
+// The best k candidates offered so far. The heap's front is the worst kept
+// one, so a new candidate costs one comparison unless it displaces it.
+class TopPairs {
+public:
+    explicit TopPairs(std::size_t k) : k_(k) { heap_.reserve(k); }
 
-            all_pairs.push_back(res);
+    void offer(const Candidate& c) {
+        if (k_ == 0 || std::isnan(c.corr)) return;
+        if (heap_.size() < k_) {
+            heap_.push_back(c);
+            std::push_heap(heap_.begin(), heap_.end(), Ahead);
+        } else if (Ahead(c, heap_.front())) {
+            std::pop_heap(heap_.begin(), heap_.end(), Ahead);
+            heap_.back() = c;
+            std::push_heap(heap_.begin(), heap_.end(), Ahead);
         }
     }
 
-    std::sort(all_pairs.begin(), all_pairs.end(), [](const PairResult& a, const PairResult& b){
-        return std::abs(a.correlation) > std::abs(b.correlation);
+    [[nodiscard]] bool full() const { return heap_.size() >= k_; }
+
+    [[nodiscard]] std::vector<Candidate> sorted() const {
+        std::vector<Candidate> out = heap_;
+        std::sort(out.begin(), out.end(), Ahead);
+        return out;
+    }
+
+private:
+    std::size_t k_;
+    std::vector<Candidate> heap_;
+};
+
+// Z (length x m) with column j = the returns of series j minus their mean,
+// over their root sum of squared deviations, so Z^T Z is the correlation
+// matrix. A flat series gets a zero column: correlation 0, as
+// Analytics::CalculateCorrelation. ret(t, j) is return t of series j.
+template <typename Scalar, typename Returns>
+Matrix<Scalar> Standardize(Eigen::Index length, Eigen::Index m, Returns ret) {
+    Matrix<Scalar> z(length, m);
+    std::vector<double> column(static_cast<std::size_t>(length));
+    for (Eigen::Index j = 0; j < m; ++j) {
+        double sum = 0.0;
+        for (Eigen::Index t = 0; t < length; ++t) sum += column[t] = ret(t, j);
+        const double mean = sum / static_cast<double>(length);
+        double sq = 0.0;
+        for (double r : column) sq += (r - mean) * (r - mean);
+        const double scale = sq > 0.0 ? 1.0 / std::sqrt(sq) : 0.0;
+        for (Eigen::Index t = 0; t < length; ++t) z(t, j) = static_cast<Scalar>((column[t] - mean) * scale);
+    }
+    return z;
+}
+
+// Calls visit(i0, j0, tile) for every tile of Z^T Z on or above the diagonal,
+// tile(ii, jj) being the correlation of columns i0 + ii and j0 + jj.
+template <typename Scalar, typename Visit>
+void ForEachTile(const Matrix<Scalar>& z, unsigned int num_threads, Visit visit) {
+    const Eigen::Index m = z.cols();
+    const Eigen::Index tiles = (m + kTile - 1) / kTile;
+    std::vector<std::pair<Eigen::Index, Eigen::Index>> work;
+    for (Eigen::Index bi = 0; bi < tiles; ++bi) {
+        for (Eigen::Index bj = bi; bj < tiles; ++bj) work.emplace_back(bi * kTile, bj * kTile);
+    }
+    ParallelFor(work.size(), [&](std::size_t w) {
+        const auto [i0, j0] = work[w];
+        const Eigen::Index ni = std::min(kTile, m - i0);
+        const Eigen::Index nj = std::min(kTile, m - j0);
+        Matrix<Scalar> tile(ni, nj);
+        tile.noalias() = z.middleCols(i0, ni).transpose() * z.middleCols(j0, nj);
+        visit(i0, j0, tile);
+    }, num_threads);
+}
+
+// Best k pairs among the columns of z with |correlation| at least min_abs;
+// column c is symbol ids[c] (ascending).
+template <typename Scalar>
+void ScreenGroup(const Matrix<Scalar>& z, const std::vector<std::size_t>& ids, std::size_t k, double min_abs,
+                 unsigned int num_threads, TopPairs& best) {
+    std::vector<std::vector<Candidate>> found;
+    const Eigen::Index tiles = (z.cols() + kTile - 1) / kTile;
+    found.resize(static_cast<std::size_t>(tiles * (tiles + 1) / 2));
+    const auto slot = [tiles](Eigen::Index i0, Eigen::Index j0) {
+        const Eigen::Index bi = i0 / kTile;
+        const Eigen::Index bj = j0 / kTile;
+        return static_cast<std::size_t>(bi * tiles - bi * (bi - 1) / 2 + (bj - bi));
+    };
+    ForEachTile(z, num_threads, [&](Eigen::Index i0, Eigen::Index j0, const Matrix<Scalar>& tile) {
+        TopPairs local(k);
+        for (Eigen::Index jj = 0; jj < tile.cols(); ++jj) {
+            const Eigen::Index j = j0 + jj;
+            for (Eigen::Index ii = 0; ii < tile.rows() && i0 + ii < j; ++ii) {
+                const double corr = std::clamp(static_cast<double>(tile(ii, jj)), -1.0, 1.0);
+                if (std::abs(corr) < min_abs) continue;
+                local.offer({corr, ids[i0 + ii], ids[j]});
+            }
+        }
+        found[slot(i0, j0)] = local.sorted();
     });
+    for (const auto& tile : found) {
+        for (const Candidate& c : tile) best.offer(c);
+    }
+}
 
-    std::vector<PairResult> top_pairs;
-    int count = 0;
+template <typename Returns>
+void Screen(Eigen::Index length, const std::vector<std::size_t>& ids, Returns ret, bool single_precision,
+            std::size_t k, unsigned int num_threads, TopPairs& best, double min_abs = 0.0) {
+    const auto m = static_cast<Eigen::Index>(ids.size());
+    if (single_precision) {
+        ScreenGroup(Standardize<float>(length, m, ret), ids, k, min_abs, num_threads, best);
+    } else {
+        ScreenGroup(Standardize<double>(length, m, ret), ids, k, min_abs, num_threads, best);
+    }
+}
 
-    for (auto& pair : all_pairs) {
-        if (count >= top_n) break;
+// Hedge ratio and fit of log(a) on log(b) over their common tail.
+PairResult Describe(const std::string& a, const std::string& b, double corr, const std::vector<double>& prices_a,
+                    const std::vector<double>& prices_b) {
+    const std::size_t min_len = std::min(prices_a.size(), prices_b.size());
+    std::vector<double> log_a;
+    std::vector<double> log_b;
+    log_a.reserve(min_len);
+    log_b.reserve(min_len);
+    for (auto it_a = prices_a.end() - min_len, it_b = prices_b.end() - min_len; it_a != prices_a.end(); ++it_a, ++it_b) {
+        log_a.push_back(std::log(*it_a));
+        log_b.push_back(std::log(*it_b));
+    }
+    const LinearRegressionResult reg = Analytics::FitLinearRegression(log_b, log_a);
+    return {a, b, corr, reg.beta, reg.r_squared};
+}
 
-        const std::vector<double>& prices_a = data.at(pair.asset_a);
-        const std::vector<double>& prices_b = data.at(pair.asset_b);
+std::size_t TopCount(int top_n) { return top_n > 0 ? static_cast<std::size_t>(top_n) : 0; }
 
-        size_t min_len = std::min(prices_a.size(), prices_b.size());
-        std::vector<double> log_a;
-        std::vector<double> log_b;
-        log_a.reserve(min_len);
-        log_b.reserve(min_len);
+void RequireOptions(const CointegrationOptions& o) {
+    if (!(o.min_correlation >= 0.0 && o.min_correlation <= 1.0)) {
+        throw std::invalid_argument("min_correlation must be in [0, 1]");
+    }
+    if (o.adf_lags < 0) throw std::invalid_argument("adf_lags must be non-negative");
+    if (!(o.min_half_life >= 0.0 && o.min_half_life <= o.max_half_life)) {
+        throw std::invalid_argument("half-life bounds must satisfy 0 <= min_half_life <= max_half_life");
+    }
+    if (o.hurst_max_lag < 3) throw std::invalid_argument("hurst_max_lag must be at least 3");
+}
 
-        auto it_a = prices_a.end() - min_len;
-        auto it_b = prices_b.end() - min_len;
+// How far a candidate got: the stage it failed, or kPassed.
+enum Stage : unsigned char { kAdf, kHalfLife, kHurst, kPassed };
 
-        for (; it_a != prices_a.end(); ++it_a, ++it_b) {
-            log_a.push_back(std::log(*it_a));
-            log_b.push_back(std::log(*it_b));
-        }
+struct Tested {
+    Stage stage = kAdf;
+    double alpha = 0.0;
+    double beta = 0.0;
+    double adf = 0.0;
+    double half_life = 0.0;
+    double hurst = 0.0;
+};
+
+// Stages 2-4 for one pair of log-price columns.
+Tested TestPair(const std::vector<double>& log_a, const std::vector<double>& log_b, double critical_value,
+                const CointegrationOptions& o) {
+    Tested out;
+    const LinearRegressionResult reg = Analytics::FitLinearRegression(log_b, log_a);
+    out.alpha = reg.alpha;
+    out.beta = reg.beta;
+    std::vector<double> spread(log_a.size());
+    for (std::size_t t = 0; t < spread.size(); ++t) spread[t] = log_a[t] - reg.alpha - reg.beta * log_b[t];
+
+    out.adf = Analytics::CalculateADFStatistic(spread, o.adf_lags);
+    if (!(out.adf < critical_value)) return out;
+    out.stage = kHalfLife;
+    out.half_life = Analytics::CalculateHalfLife(spread);
+    if (!(out.half_life >= o.min_half_life && out.half_life <= o.max_half_life)) return out;
+    out.stage = kHurst;
+    out.hurst = Analytics::CalculateHurstExponent(spread, o.hurst_max_lag);
+    if (out.hurst > o.max_hurst) return out;
+    out.stage = kPassed;
+    return out;
+}
+
+} // namespace
+
+std::vector<PairResult> PairSelector::FindTopPairs(const std::map<std::string, std::vector<double>>& data, int top_n,
+                                                   bool single_precision, unsigned int num_threads) {
+    std::vector<std::string> symbols;
+    std::vector<const std::vector<double>*> prices;
+    std::vector<std::vector<double>> returns;
+    for (const auto& [symbol, series] : data) {
+        if (series.size() < kMinPrices) continue;
+        symbols.push_back(symbol);
+        prices.push_back(&series);
+        returns.push_back(Analytics::CalculateLogReturns(series));
+    }
+    if (symbols.size() < 2) return {};
 
-        LinearRegressionResult reg = Analytics::FitLinearRegression(log_b, log_a);
+    // Only equal-length series are correlated; screen each length separately.
+    std::map<std::size_t, std::vector<std::size_t>> by_length;
+    for (std::size_t i = 0; i < returns.size(); ++i) by_length[returns[i].size()].push_back(i);
 
-        pair.beta = reg.beta;
-        pair.r_squared = reg.r_squared;
+    const std::size_t k = TopCount(top_n);
+    TopPairs best(k);
+    for (const auto& [length, ids] : by_length) {
+        if (ids.size() < 2) continue;
+        Screen(static_cast<Eigen::Index>(length), ids,
+               [&](Eigen::Index t, Eigen::Index j) { return returns[ids[j]][t]; },
+               single_precision, k, num_threads, best);
+    }
+    // Pairs across lengths (correlation 0) only fill a short list.
+    for (std::size_t a = 0; a < symbols.size() && !best.full(); ++a) {
+        for (std::size_t b = a + 1; b < symbols.size() && !best.full(); ++b) {
+            if (returns[a].size() != returns[b].size()) best.offer({0.0, a, b});
+        }
+    }
 
-        top_pairs.push_back(pair);
-        count++;
+    std::vector<PairResult> top_pairs;
+    for (const Candidate& c : best.sorted()) {
+        top_pairs.push_back(Describe(symbols[c.a], symbols[c.b], c.corr, *prices[c.a], *prices[c.b]));
     }
+    return top_pairs;
+}
+
+std::vector<PairResult> PairSelector::FindTopPairs(PanelView prices, const std::vector<std::string>& symbols,
+                                                   int top_n, bool single_precision, unsigned int num_threads) {
+    if (symbols.size() != prices.cols) throw std::invalid_argument("symbols must name every price column");
+    if (prices.rows < kMinPrices || prices.cols < 2) return {};
 
+    std::vector<std::size_t> ids(prices.cols);
+    for (std::size_t j = 0; j < ids.size(); ++j) ids[j] = j;
+    const auto at = [&](std::size_t t, std::size_t j) { return prices.data[t * prices.cols + j]; };
+
+    const std::size_t k = TopCount(top_n);
+    TopPairs best(k);
+    Screen(static_cast<Eigen::Index>(prices.rows - 1), ids,
+           [&](Eigen::Index t, Eigen::Index j) {
+               return std::log(at(static_cast<std::size_t>(t) + 1, static_cast<std::size_t>(j)) /
+                               at(static_cast<std::size_t>(t), static_cast<std::size_t>(j)));
+           },
+           single_precision, k, num_threads, best);
+
+    std::vector<PairResult> top_pairs;
+    std::vector<double> column_a(prices.rows);
+    std::vector<double> column_b(prices.rows);
+    for (const Candidate& c : best.sorted()) {
+        for (std::size_t t = 0; t < prices.rows; ++t) {
+            column_a[t] = at(t, c.a);
+            column_b[t] = at(t, c.b);
+        }
+        top_pairs.push_back(Describe(symbols[c.a], symbols[c.b], c.corr, column_a, column_b));
+    }
     return top_pairs;
-}
\ No newline at end of file
+}
+
+void PairSelector::CorrelationMatrix(PanelView prices, double* out, bool single_precision, unsigned int num_threads) {
+    if (prices.rows < 2) throw std::invalid_argument("need at least 2 prices per column");
+    const std::size_t n = prices.cols;
+    const auto length = static_cast<Eigen::Index>(prices.rows - 1);
+    const auto ret = [&](Eigen::Index t, Eigen::Index j) {
+        const std::size_t row = static_cast<std::size_t>(t) * n + static_cast<std::size_t>(j);
+        return std::log(prices.data[row + n] / prices.data[row]);
+    };
+    const auto write = [&](Eigen::Index i0, Eigen::Index j0, const auto& tile) {
+        for (Eigen::Index ii = 0; ii < tile.rows(); ++ii) {
+            for (Eigen::Index jj = 0; jj < tile.cols(); ++jj) {
+                const double corr = std::clamp(static_cast<double>(tile(ii, jj)), -1.0, 1.0);
+                const auto i = static_cast<std::size_t>(i0 + ii);
+                const auto j = static_cast<std::size_t>(j0 + jj);
+                out[i * n + j] = corr;
+                out[j * n + i] = corr;
+            }
+        }
+    };
+    const auto m = static_cast<Eigen::Index>(n);
+    if (single_precision) {
+        ForEachTile(Standardize<float>(length, m, ret), num_threads, write);
+    } else {
+        ForEachTile(Standardize<double>(length, m, ret), num_threads, write);
+    }
+}
+
+CointegrationReport PairSelector::ScreenCointegration(PanelView prices, const std::vector<std::string>& symbols,
+                                                      const CointegrationOptions& options,
+                                                      unsigned int num_threads) {
+    if (symbols.size() != prices.cols) throw std::invalid_argument("symbols must name every price column");
+    RequireOptions(options);
+    CointegrationReport report;
+    report.critical_value = Analytics::EngleGrangerCriticalValue(std::max<std::size_t>(prices.rows, 1),
+                                                                 options.significance);
+    const auto at = [&](std::size_t t, std::size_t j) { return prices.data[t * prices.cols + j]; };
+
+    std::vector<std::size_t> ids;
+    for (std::size_t j = 0; j < prices.cols; ++j) {
+        bool complete = true;
+        for (std::size_t t = 0; t < prices.rows && complete; ++t) complete = at(t, j) > 0.0 && std::isfinite(at(t, j));
+        if (complete) ids.push_back(j);
+    }
+    report.skipped_symbols = prices.cols - ids.size();
+    if (prices.rows < kMinPrices || ids.size() < 2) return report;
+    report.screened = ids.size() * (ids.size() - 1) / 2;
+
+    // Stage 1: the GEMM correlation screen, pruned at min_correlation.
+    TopPairs best(options.max_candidates);
+    Screen(static_cast<Eigen::Index>(prices.rows - 1), ids,
+           [&](Eigen::Index t, Eigen::Index j) {
+               const std::size_t col = ids[static_cast<std::size_t>(j)];
+               return std::log(at(static_cast<std::size_t>(t) + 1, col) / at(static_cast<std::size_t>(t), col));
+           },
+           options.single_precision, options.max_candidates, num_threads, best, options.min_correlation);
+    const std::vector<Candidate> candidates = best.sorted();
+    report.correlated = candidates.size();
+
+    // Stages 2-4, one candidate per task.
+    std::vector<Tested> tested(candidates.size());
+    ParallelFor(candidates.size(), [&](std::size_t i) {
+        std::vector<double> log_a(prices.rows);
+        std::vector<double> log_b(prices.rows);
+        for (std::size_t t = 0; t < prices.rows; ++t) {
+            log_a[t] = std::log(at(t, candidates[i].a));
+            log_b[t] = std::log(at(t, candidates[i].b));
+        }
+        tested[i] = TestPair(log_a, log_b, report.critical_value, options);
+    }, num_threads);
+
+    std::vector<std::size_t> passed;
+    for (std::size_t i = 0; i < tested.size(); ++i) {
+        if (tested[i].stage > kAdf) ++report.stationary;
+        if (tested[i].stage > kHalfLife) ++report.mean_reverting;
+        if (tested[i].stage == kPassed) passed.push_back(i);
+    }
+    std::sort(passed.begin(), passed.end(), [&](std::size_t x, std::size_t y) {
+        if (tested[x].adf != tested[y].adf) return tested[x].adf < tested[y].adf;
+        return std::tie(candidates[x].a, candidates[x].b) < std::tie(candidates[y].a, candidates[y].b);
+    });
+    for (std::size_t i : passed) {
+        const Candidate& c = candidates[i];
+        const Tested& r = tested[i];
+        report.pairs.push_back({symbols[c.a], symbols[c.b], c.corr, r.alpha, r.beta, r.adf, r.half_life, r.hurst});
+    }
+    return report;
+}
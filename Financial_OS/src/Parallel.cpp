@@ -0,0 +1,19 @@
+// src/Parallel.cpp
+
+#include "../include/Parallel.h"
+#include "BS_thread_pool.hpp"
+#include <thread>
+
+void ParallelFor(std::size_t n, const std::function<void(std::size_t)>& body, unsigned int num_threads) {
+    if (n == 0) return;
+
+    static BS::thread_pool single_threaded_pool(1);
+    static BS::thread_pool auto_threaded_pool(std::thread::hardware_concurrency());
+
+    auto& pool = num_threads == 1 ? single_threaded_pool : auto_threaded_pool;
+    auto futures = pool.submit_loop(std::size_t{0}, n, [&body](std::size_t i) { body(i); });
+    // Every block must be done before anything is rethrown: the others still
+    // reference the caller's frame through body.
+    futures.wait();
+    futures.get();
+}
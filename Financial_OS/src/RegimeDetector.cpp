@@ -2,10 +2,13 @@
 
 #include "../include/RegimeDetector.h"
 #include "../include/Analytics.h"
+#include "../include/Parallel.h"
 #include <cmath>
 #include <algorithm>
 #include <limits>
 #include <iostream>
+#include <stdexcept>
+#include <utility>
 
 struct Point {
     double vol;
@@ -118,4 +121,190 @@ RegimeResult RegimeDetector::DetectRegime(const std::vector<double>& prices, int
     else if (result.state_id == 2) result.state_name = "Bull";
 
     return result;
-}
\ No newline at end of file
+}
+
+RegimeSeries RegimeDetector::LabelSeries(const std::vector<double>& prices, int window_size, int lookback,
+                                         int recluster_every) {
+    StreamingRegimeDetector detector(window_size, lookback, recluster_every);
+    RegimeSeries series;
+    series.state_id.reserve(prices.size());
+    series.volatility.reserve(prices.size());
+    series.trend.reserve(prices.size());
+
+    for (double price : prices) {
+        detector.update(price);
+        const RegimeResult r = detector.classify();
+        series.state_id.push_back(r.state_id);
+        series.volatility.push_back(r.current_volatility);
+        series.trend.push_back(r.current_trend);
+    }
+    return series;
+}
+
+std::map<std::string, RegimeSeries> RegimeDetector::LabelUniverse(
+    const std::map<std::string, std::vector<double>>& universe, int window_size, int lookback, int recluster_every,
+    unsigned int num_threads) {
+    // Validate once on the calling thread, so bad arguments throw here rather
+    // than inside a worker.
+    [[maybe_unused]] const StreamingRegimeDetector probe(window_size, lookback, recluster_every);
+
+    std::vector<const std::pair<const std::string, std::vector<double>>*> entries;
+    entries.reserve(universe.size());
+    for (const auto& entry : universe) entries.push_back(&entry);
+
+    std::vector<RegimeSeries> labelled(entries.size());
+    ParallelFor(entries.size(), [&](std::size_t i) {
+        labelled[i] = LabelSeries(entries[i]->second, window_size, lookback, recluster_every);
+    }, num_threads);
+
+    std::map<std::string, RegimeSeries> result;
+    for (std::size_t i = 0; i < entries.size(); ++i) {
+        result.emplace(entries[i]->first, std::move(labelled[i]));
+    }
+    return result;
+}
+
+StreamingRegimeDetector::StreamingRegimeDetector(int window_size, int lookback, int recluster_every)
+    : window_(window_size), lookback_(lookback), recluster_every_(recluster_every),
+      returns_(static_cast<std::size_t>(std::max(window_size - 1, 1))) {
+    if (window_size < 3 || lookback <= window_size) {
+        throw std::invalid_argument("StreamingRegimeDetector needs 3 <= window_size < lookback");
+    }
+    if (recluster_every < 1) {
+        throw std::invalid_argument("recluster_every must be at least 1");
+    }
+    prices_.assign(static_cast<std::size_t>(window_), 0.0);
+    const auto capacity = static_cast<std::size_t>(lookback_ - window_);
+    vols_.assign(capacity, 0.0);
+    trends_.assign(capacity, 0.0);
+    clusters_.assign(capacity, -1);
+    centroid_vol_.assign(K, 0.0);
+    centroid_trend_.assign(K, 0.0);
+}
+
+std::size_t StreamingRegimeDetector::feature_index(std::size_t age) const {
+    // age 0 = newest feature in the ring
+    const std::size_t capacity = vols_.size();
+    return (feature_head_ + capacity - 1 - age) % capacity;
+}
+
+void StreamingRegimeDetector::update(double price) {
+    const auto w = static_cast<std::size_t>(window_);
+    if (seen_ > 0) {
+        returns_.push(std::log(price / prices_[(seen_ - 1) % w]));
+    }
+    prices_[seen_ % w] = price;
+    ++seen_;
+    ++since_recluster_;
+
+    if (has_pending_) {
+        const std::size_t capacity = vols_.size();
+        vols_[feature_head_] = pending_vol_;
+        trends_[feature_head_] = pending_trend_;
+        clusters_[feature_head_] = -1;
+        feature_head_ = (feature_head_ + 1) % capacity;
+        if (feature_count_ < capacity) ++feature_count_;
+    }
+
+    if (seen_ >= w) {
+        const double start_p = prices_[(seen_ - w) % w];
+        pending_vol_ = returns_.volatility() * std::sqrt(252);
+        pending_trend_ = ((price - start_p) / start_p) * (252.0 / window_);
+        has_pending_ = true;
+    }
+}
+
+int StreamingRegimeDetector::nearest_centroid(double vol, double trend) const {
+    double min_dist = std::numeric_limits<double>::max();
+    int best_k = -1;
+    for (int k = 0; k < K; ++k) {
+        double d_vol = vol - centroid_vol_[k];
+        double d_trend = trend - centroid_trend_[k];
+        double dist = d_vol * d_vol + d_trend * d_trend;
+        if (dist < min_dist) {
+            min_dist = dist;
+            best_k = k;
+        }
+    }
+    return best_k;
+}
+
+void StreamingRegimeDetector::init_centroids() {
+    // Same cold start as DetectRegime: lowest, median and highest trend point.
+    std::vector<std::size_t> order(feature_count_);
+    for (std::size_t a = 0; a < feature_count_; ++a) order[a] = feature_index(feature_count_ - 1 - a);
+    std::sort(order.begin(), order.end(), [this](std::size_t a, std::size_t b) { return trends_[a] < trends_[b]; });
+
+    const std::size_t picks[K] = {order.front(), order[order.size() / 2], order.back()};
+    for (int k = 0; k < K; ++k) {
+        centroid_vol_[k] = vols_[picks[k]];
+        centroid_trend_[k] = trends_[picks[k]];
+    }
+    centroids_ready_ = true;
+}
+
+void StreamingRegimeDetector::run_kmeans() {
+    for (int iter = 0; iter < 10; ++iter) {
+        bool changed = false;
+        for (std::size_t a = 0; a < feature_count_; ++a) {
+            const std::size_t i = feature_index(a);
+            const int best_k = nearest_centroid(vols_[i], trends_[i]);
+            if (clusters_[i] != best_k) {
+                clusters_[i] = best_k;
+                changed = true;
+            }
+        }
+
+        if (!changed) break;
+
+        double sum_vol[K] = {0.0, 0.0, 0.0};
+        double sum_trend[K] = {0.0, 0.0, 0.0};
+        int count[K] = {0, 0, 0};
+        // Oldest first, the order DetectRegime accumulates in.
+        for (std::size_t a = feature_count_; a-- > 0;) {
+            const std::size_t i = feature_index(a);
+            sum_vol[clusters_[i]] += vols_[i];
+            sum_trend[clusters_[i]] += trends_[i];
+            count[clusters_[i]]++;
+        }
+        for (int k = 0; k < K; ++k) {
+            if (count[k] > 0) {
+                centroid_vol_[k] = sum_vol[k] / count[k];
+                centroid_trend_[k] = sum_trend[k] / count[k];
+            }
+        }
+    }
+}
+
+RegimeResult StreamingRegimeDetector::classify() {
+    RegimeResult result = {-1, "Unknown", 0.0, 0.0};
+    if (seen_ < static_cast<std::size_t>(window_) * 2 || feature_count_ < static_cast<std::size_t>(K)) {
+        return result;
+    }
+
+    const std::size_t newest = feature_index(0);
+    result.current_volatility = vols_[newest];
+    result.current_trend = trends_[newest];
+
+    if (!centroids_ready_ || since_recluster_ >= recluster_every_) {
+        if (!centroids_ready_) init_centroids();
+        run_kmeans();
+        since_recluster_ = 0;
+    } else {
+        clusters_[newest] = nearest_centroid(vols_[newest], trends_[newest]);
+    }
+
+    // Rank of the current cluster by centroid trend (ties by index, as the
+    // (trend, k) sort in DetectRegime breaks them).
+    int state_id = 0;
+    const int current = clusters_[newest];
+    for (int k = 0; k < K; ++k) {
+        if (std::make_pair(centroid_trend_[k], k) < std::make_pair(centroid_trend_[current], current)) ++state_id;
+    }
+    result.state_id = state_id;
+    if (state_id == 0) result.state_name = "Bear";
+    else if (state_id == 1) result.state_name = "Sideways";
+    else result.state_name = "Bull";
+
+    return result;
+}
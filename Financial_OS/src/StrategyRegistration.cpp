@@ -22,6 +22,7 @@ public:
 
         // --- Pairs / stat-arb ---
         f.RegisterStrategy("PAIRS", [] { return std::make_unique<KalmanPairsStrategy>("KO", "PEP"); });
+        f.RegisterStrategy("PAIRS_BASKET", [] { return std::make_unique<KalmanBasketStrategy>(); });
         f.RegisterStrategy("PCA", [] { return std::make_unique<PCAStatArbStrategy>(60, 2.0); });
 
         // --- Vol / options / market making ---
@@ -0,0 +1,262 @@
+// src/Sweep.cpp
+
+#include "../include/Sweep.h"
+#include "../include/Analytics.h"
+#include "../include/Backtester.h"
+#include "../include/Parallel.h"
+#include "../include/StrategyFactory.h"
+#include <algorithm>
+#include <cmath>
+#include <numeric>
+#include <random>
+#include <stdexcept>
+
+std::vector<std::map<std::string, double>> ExpandGrid(const std::map<std::string, std::vector<double>>& grid) {
+    std::vector<std::map<std::string, double>> configs(1);
+    for (const auto& [name, values] : grid) {
+        if (values.empty()) {
+            throw std::invalid_argument("parameter grid for '" + name + "' is empty");
+        }
+        std::vector<std::map<std::string, double>> expanded;
+        expanded.reserve(configs.size() * values.size());
+        for (const auto& config : configs) {
+            for (double value : values) {
+                expanded.push_back(config);
+                expanded.back()[name] = value;
+            }
+        }
+        configs = std::move(expanded);
+    }
+    return configs;
+}
+
+namespace {
+
+double SharpeOf(const std::vector<double>& equity) {
+    if (equity.size() < 3) return 0.0;
+    std::vector<double> returns;
+    returns.reserve(equity.size() - 1);
+    for (std::size_t i = 1; i < equity.size(); ++i) {
+        if (equity[i - 1] != 0.0) returns.push_back(equity[i] / equity[i - 1] - 1.0);
+    }
+    if (returns.size() < 2) return 0.0;
+    const double mean = std::accumulate(returns.begin(), returns.end(), 0.0) / static_cast<double>(returns.size());
+    const double vol = Analytics::CalculateVolatility(returns);
+    return vol > 1e-12 ? mean / vol * std::sqrt(252.0) : 0.0;
+}
+
+// One quiet, risk-limited, per-timestamp-sampled engine per configuration.
+// Everything is configured up front, so bad parameters throw here rather
+// than inside a worker. Also sizes `table` for configs.size() rows and fills
+// in each row's resolved parameters.
+std::vector<Backtester> ConfigureEngines(const std::string& strategy,
+                                         const std::vector<std::map<std::string, double>>& configs,
+                                         const SweepOptions& options, SweepResult& table) {
+    if (!StrategyFactory::Instance().CreateStrategy(strategy)) {
+        throw std::invalid_argument("unknown strategy '" + strategy + "'");
+    }
+
+    const std::size_t n = configs.size();
+    table.final_equity.resize(n);
+    table.return_pct.resize(n);
+    table.max_drawdown.resize(n);
+    table.sharpe.resize(n);
+    table.trades.resize(n);
+
+    std::vector<Backtester> engines;
+    engines.reserve(n);
+    for (std::size_t i = 0; i < n; ++i) {
+        Backtester& engine = engines.emplace_back(options.initial_capital, strategy, options.leverage);
+        engine.set_quiet(true);
+        engine.set_risk_params(options.max_drawdown_limit, options.var_limit);
+        engine.set_equity_sampling(EquitySampling::PER_TIMESTAMP);
+        engine.set_parameters(configs[i]);
+
+        const std::map<std::string, double> resolved = engine.get_parameters();
+        if (i == 0) {
+            for (const auto& entry : resolved) table.parameter_names.push_back(entry.first);
+            table.parameters.assign(resolved.size(), std::vector<double>(n));
+        }
+        std::size_t k = 0;
+        for (const auto& entry : resolved) table.parameters[k++][i] = entry.second;
+    }
+    return engines;
+}
+
+// Replays rows [from, to) of `data` on top of whatever the engine has seen.
+void Advance(Backtester& engine, const SweepData& data, std::size_t from, std::size_t to) {
+    const std::size_t stride = data.symbols.size() * 4;
+    engine.run_panel(data.symbols, data.timestamps + from, data.ohlc + from * stride, to - from);
+}
+
+void Score(const Backtester& engine, const SweepOptions& options, SweepResult& table, std::size_t i) {
+    const double equity = engine.get_total_equity();
+    table.final_equity[i] = equity;
+    table.return_pct[i] = (equity - options.initial_capital) / options.initial_capital * 100.0;
+    table.max_drawdown[i] = engine.get_max_drawdown();
+    table.sharpe[i] = SharpeOf(engine.get_equity_history());
+    table.trades[i] = static_cast<std::int64_t>(engine.get_trade_count());
+}
+
+template <typename T>
+void Permute(std::vector<T>& column, const std::vector<std::size_t>& order) {
+    std::vector<T> out;
+    out.reserve(order.size());
+    for (std::size_t i : order) out.push_back(column[i]);
+    column = std::move(out);
+}
+
+// Successive halving of `configs`, first rung `start_span` timestamps long;
+// rows are appended to `out` unsorted.
+void Halve(const std::string& strategy, const std::vector<std::map<std::string, double>>& configs,
+           const SweepData& data, const SweepOptions& options, double eta, std::size_t start_span, int bracket,
+           unsigned int num_threads, HalvingResult& out) {
+    SweepResult table;
+    std::vector<Backtester> engines = ConfigureEngines(strategy, configs, options, table);
+    const std::size_t n = configs.size();
+    std::vector<std::size_t> bars(n, 0);
+    std::vector<int> rungs(n, 0);
+
+    std::vector<std::size_t> alive(n);
+    std::iota(alive.begin(), alive.end(), 0);
+    std::size_t done = 0;
+    std::size_t span = std::min(std::max<std::size_t>(start_span, 1), data.n_times);
+    for (int rung = 0; !alive.empty(); ++rung) {
+        ParallelFor(alive.size(), [&](std::size_t k) {
+            const std::size_t i = alive[k];
+            Advance(engines[i], data, done, span);
+            Score(engines[i], options, table, i);
+            bars[i] = span;
+            rungs[i] = rung;
+        }, num_threads);
+        done = span;
+        if (span >= data.n_times) break;
+
+        std::stable_sort(alive.begin(), alive.end(),
+                         [&](std::size_t a, std::size_t b) { return table.return_pct[a] > table.return_pct[b]; });
+        const auto keep = std::max<std::size_t>(1, static_cast<std::size_t>(static_cast<double>(alive.size()) / eta));
+        for (std::size_t k = keep; k < alive.size(); ++k) engines[alive[k]] = Backtester(0.0);
+        alive.resize(keep);
+        span = std::min(data.n_times, std::max(span + 1, static_cast<std::size_t>(std::ceil(static_cast<double>(span) * eta))));
+    }
+
+    SweepResult& all = out.table;
+    if (all.parameter_names.empty()) {
+        all.parameter_names = table.parameter_names;
+        all.parameters.resize(table.parameters.size());
+    }
+    for (std::size_t k = 0; k < table.parameters.size(); ++k) {
+        all.parameters[k].insert(all.parameters[k].end(), table.parameters[k].begin(), table.parameters[k].end());
+    }
+    all.final_equity.insert(all.final_equity.end(), table.final_equity.begin(), table.final_equity.end());
+    all.return_pct.insert(all.return_pct.end(), table.return_pct.begin(), table.return_pct.end());
+    all.max_drawdown.insert(all.max_drawdown.end(), table.max_drawdown.begin(), table.max_drawdown.end());
+    all.sharpe.insert(all.sharpe.end(), table.sharpe.begin(), table.sharpe.end());
+    all.trades.insert(all.trades.end(), table.trades.begin(), table.trades.end());
+    out.bars.insert(out.bars.end(), bars.begin(), bars.end());
+    out.rung.insert(out.rung.end(), rungs.begin(), rungs.end());
+    out.bracket.insert(out.bracket.end(), n, bracket);
+    out.total_bars += std::accumulate(bars.begin(), bars.end(), std::size_t{0});
+}
+
+// Leaderboard order: longest span reached first, then return_pct.
+void Rank(HalvingResult& out) {
+    std::vector<std::size_t> order(out.bars.size());
+    std::iota(order.begin(), order.end(), 0);
+    std::stable_sort(order.begin(), order.end(), [&](std::size_t a, std::size_t b) {
+        if (out.bars[a] != out.bars[b]) return out.bars[a] > out.bars[b];
+        return out.table.return_pct[a] > out.table.return_pct[b];
+    });
+    SweepResult& t = out.table;
+    for (auto& column : t.parameters) Permute(column, order);
+    Permute(t.final_equity, order);
+    Permute(t.return_pct, order);
+    Permute(t.max_drawdown, order);
+    Permute(t.sharpe, order);
+    Permute(t.trades, order);
+    Permute(out.bars, order);
+    Permute(out.rung, order);
+    Permute(out.bracket, order);
+}
+
+// Rungs it takes to halve n configurations down to one.
+int HalvingsToOne(std::size_t n, double eta) {
+    int halvings = 0;
+    for (double alive = static_cast<double>(n); alive >= eta; alive = std::floor(alive / eta)) ++halvings;
+    return halvings;
+}
+
+void RequireEta(double eta) {
+    if (!(eta > 1.0)) throw std::invalid_argument("eta must be greater than 1");
+}
+
+} // namespace
+
+SweepResult RunSweep(const std::string& strategy, const std::vector<std::map<std::string, double>>& configs,
+                     const SweepData& data, const SweepOptions& options, unsigned int num_threads) {
+    SweepResult result;
+    std::vector<Backtester> engines = ConfigureEngines(strategy, configs, options, result);
+
+    ParallelFor(configs.size(), [&](std::size_t i) {
+        Backtester& engine = engines[i];
+        Advance(engine, data, 0, data.n_times);
+        Score(engine, options, result, i);
+        engine = Backtester(0.0);  // release this run's bars and equity curve
+    }, num_threads);
+
+    return result;
+}
+
+HalvingResult RunSuccessiveHalving(const std::string& strategy,
+                                   const std::vector<std::map<std::string, double>>& configs, const SweepData& data,
+                                   const SweepOptions& options, const HalvingOptions& halving,
+                                   unsigned int num_threads) {
+    RequireEta(halving.eta);
+    std::size_t start = halving.min_bars;
+    if (start == 0) {
+        const double scale = std::pow(halving.eta, HalvingsToOne(configs.size(), halving.eta));
+        start = static_cast<std::size_t>(std::ceil(static_cast<double>(data.n_times) / scale));
+    }
+
+    HalvingResult out;
+    out.full_bars = configs.size() * data.n_times;
+    Halve(strategy, configs, data, options, halving.eta, start, 0, num_threads, out);
+    Rank(out);
+    return out;
+}
+
+HalvingResult RunHyperband(const std::string& strategy, const std::vector<std::map<std::string, double>>& pool,
+                           const SweepData& data, const SweepOptions& options, const HalvingOptions& halving,
+                           unsigned int num_threads) {
+    RequireEta(halving.eta);
+    const double eta = halving.eta;
+    const auto total = static_cast<double>(data.n_times);
+    int s_max = 0;
+    if (halving.min_bars > 0) {
+        while (static_cast<double>(halving.min_bars) * std::pow(eta, s_max + 1) <= total) ++s_max;
+    } else {
+        s_max = HalvingsToOne(pool.size(), eta);
+    }
+
+    std::mt19937_64 rng(halving.seed ? *halving.seed : std::random_device{}());
+    std::vector<std::size_t> indices(pool.size());
+    std::iota(indices.begin(), indices.end(), 0);
+
+    HalvingResult out;
+    for (int s = s_max; s >= 0; --s) {
+        const double wanted = std::ceil(static_cast<double>(s_max + 1) / (s + 1) * std::pow(eta, s));
+        const auto n = std::min(pool.size(), static_cast<std::size_t>(wanted));
+        std::shuffle(indices.begin(), indices.end(), rng);
+        std::vector<std::map<std::string, double>> configs;
+        configs.reserve(n);
+        for (std::size_t k = 0; k < n; ++k) configs.push_back(pool[indices[k]]);
+
+        const auto start = static_cast<std::size_t>(std::ceil(total / std::pow(eta, s)));
+        Halve(strategy, configs, data, options, eta, start, s, num_threads, out);
+    }
+    // Brackets resample the pool, so a configuration can have several rows;
+    // the baseline is one full run of each distinct configuration.
+    out.full_bars = pool.size() * data.n_times;
+    Rank(out);
+    return out;
+}
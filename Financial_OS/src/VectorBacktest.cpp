@@ -0,0 +1,287 @@
+// src/VectorBacktest.cpp
+
+#include "../include/VectorBacktest.h"
+#include "../include/Analytics.h"
+#include "../include/DataHandler.h"
+#include "../include/Parallel.h"
+#include "../include/Rolling.h"
+#include <algorithm>
+#include <cmath>
+#include <initializer_list>
+#include <stdexcept>
+#include <utility>
+
+namespace {
+
+enum class Signal { NONE, BUY, SELL };
+
+// Strategy parameters: the caller's values over the strategy's defaults, with
+// every name the caller passed checked against those defaults.
+class Params {
+public:
+    Params(const VectorBacktestConfig& config, std::initializer_list<std::pair<const char*, double>> defaults)
+        : values_(config.params) {
+        for (const auto& [name, value] : defaults) values_.emplace(name, value);
+        for (const auto& [name, value] : config.params) {
+            bool known = false;
+            for (const auto& entry : defaults) known = known || name == entry.first;
+            if (!known) {
+                throw std::invalid_argument("unknown " + config.strategy + " parameter '" + name + "'");
+            }
+        }
+    }
+
+    [[nodiscard]] double value(const std::string& name) const { return values_.at(name); }
+    [[nodiscard]] int period(const std::string& name) const {
+        const double v = value(name);
+        if (!(v >= 1.0) || v != std::floor(v)) {
+            throw std::invalid_argument(name + " must be a whole number >= 1");
+        }
+        return static_cast<int>(v);
+    }
+
+private:
+    std::map<std::string, double> values_;
+};
+
+// Entry/exit rules of the strategies in Backtester.cpp, one bar at a time.
+// `flat` is the strategies' holdings <= 1e-6 test.
+struct EmaRule {
+    Ema short_ema;
+    Ema long_ema;
+    std::size_t long_window;
+    std::size_t bars = 0;
+
+    Signal step(double close, bool flat) {
+        const double s = short_ema.push(close);
+        const double l = long_ema.push(close);
+        if (++bars <= long_window) return Signal::NONE;
+        if (s > l && flat) return Signal::BUY;
+        if (s < l && !flat) return Signal::SELL;
+        return Signal::NONE;
+    }
+};
+
+struct MacdRule {
+    Ema fast;
+    Ema slow;
+    Ema signal;
+    std::size_t slow_period;
+    double macd = 0.0;
+    std::size_t bars = 0;
+
+    Signal step(double close, bool flat) {
+        const double f = fast.push(close);
+        const double s = slow.push(close);
+        if (++bars < slow_period) return Signal::NONE;
+        const double prev_macd = macd;
+        const double prev_signal = signal.value();
+        macd = f - s;
+        const double sig = signal.push(macd);
+        if (prev_macd < prev_signal && macd > sig && flat) return Signal::BUY;
+        if (prev_macd > prev_signal && macd < sig && !flat) return Signal::SELL;
+        return Signal::NONE;
+    }
+};
+
+struct RsiRule {
+    RollingRSI rsi;
+    std::size_t period;
+    double buy_thresh;
+    double sell_thresh;
+    std::size_t bars = 0;
+
+    Signal step(double close, bool flat) {
+        rsi.push(close);
+        if (++bars <= period + 1) return Signal::NONE;
+        const double value = rsi.value();
+        if (value < buy_thresh && flat) return Signal::BUY;
+        if (value > sell_thresh && !flat) return Signal::SELL;
+        return Signal::NONE;
+    }
+};
+
+struct BollingerRule {
+    RollingMoments closes;
+    double mult;
+
+    Signal step(double close, bool flat) {
+        closes.push(close);
+        if (!closes.full()) return Signal::NONE;
+        const double sma = closes.mean();
+        const double std_dev = std::sqrt(closes.variance());
+        if (close <= sma - (std_dev * mult) && flat) return Signal::BUY;
+        if (close >= sma + (std_dev * mult) && !flat) return Signal::SELL;
+        return Signal::NONE;
+    }
+};
+
+// One column through the engine's per-bar sequence: mark, risk check,
+// strategy, equity point.
+template <typename Rule>
+class ColumnSim {
+public:
+    ColumnSim(Rule rule, const VectorBacktestConfig& config)
+        : rule_(std::move(rule)), config_(&config), cash_(config.initial_capital), equity_(cash_),
+          returns_(DataHandler::kReturnWindow) {}
+
+    void bar(double close) {
+        if (std::isnan(close)) return;  // not a bar: equity and position carry over
+        if (bars_ > 0) returns_.push(std::log(close / prev_close_));
+        prev_close_ = close;
+        ++bars_;
+
+        // Backtester::check_risk_limits
+        if (!halted_) {
+            bool breach = std::abs(max_dd_) > config_->max_drawdown_limit;
+            if (!breach) {
+                double risk = 0.0;
+                if (std::abs(qty_) > 1e-6 && bars_ > 30) {
+                    risk = Analytics::CalculateParametricVaR(std::abs(qty_ * close), returns_.volatility(), 0.95);
+                }
+                const double now = cash_ + qty_ * close;
+                breach = (now > 0 ? risk / now : 0.0) > config_->var_limit;
+            }
+            if (breach) {
+                if (std::abs(qty_) > 1e-6) fill(qty_ > 0 ? Signal::SELL : Signal::BUY, std::abs(qty_), close);
+                halted_ = true;
+            }
+        }
+
+        if (!halted_) {
+            switch (rule_.step(close, qty_ <= 1e-6)) {
+            case Signal::BUY: {
+                const double capital_to_use = cash_ * 0.2 * config_->leverage;
+                if (capital_to_use > 0) fill(Signal::BUY, capital_to_use / (close * 1.001), close);
+                break;
+            }
+            case Signal::SELL:
+                fill(Signal::SELL, qty_, close);
+                break;
+            case Signal::NONE:
+                break;
+            }
+        }
+
+        // EquityCurve::record
+        equity_ = cash_ + qty_ * close;
+        if (bars_ == 1 || equity_ > peak_) {
+            peak_ = equity_;
+        } else {
+            const double drawdown = (equity_ - peak_) / peak_;
+            if (drawdown < max_dd_) max_dd_ = drawdown;
+        }
+    }
+
+    [[nodiscard]] double equity() const { return equity_; }
+    [[nodiscard]] double position() const { return qty_; }
+
+    void finish(std::size_t j, VectorBacktestResult& out) const {
+        out.final_equity[j] = equity_;
+        out.max_drawdown[j] = max_dd_;
+        out.trades[j] = trades_;
+        out.halted[j] = halted_ ? 1 : 0;
+    }
+
+private:
+    // Portfolio::execute
+    void fill(Signal side, double quantity, double price) {
+        if (quantity <= 0) return;
+        const double commission = quantity * price * 0.0001;
+        if (side == Signal::BUY) {
+            cash_ -= (quantity * price + commission);
+            qty_ += quantity;
+        } else {
+            cash_ += (quantity * price - commission);
+            qty_ -= quantity;
+        }
+        ++trades_;
+    }
+
+    Rule rule_;
+    const VectorBacktestConfig* config_;
+    double cash_;
+    double qty_ = 0.0;
+    double equity_;
+    double peak_ = 0.0;
+    double max_dd_ = 0.0;
+    std::size_t bars_ = 0;
+    std::int64_t trades_ = 0;
+    bool halted_ = false;
+    RollingMoments returns_;
+    double prev_close_ = 0.0;
+};
+
+// Columns handed to one worker together and stepped row by row, so each row
+// read touches one cache line instead of one per column.
+constexpr std::size_t kColumnBlock = 8;
+
+template <typename Make>
+void RunColumns(PanelView closes, const VectorBacktestConfig& config, Make make, VectorBacktestResult& out,
+                unsigned int num_threads) {
+    const std::size_t blocks = (closes.cols + kColumnBlock - 1) / kColumnBlock;
+    ParallelFor(blocks, [&](std::size_t b) {
+        const std::size_t first = b * kColumnBlock;
+        const std::size_t last = std::min(closes.cols, first + kColumnBlock);
+        std::vector<ColumnSim<decltype(make())>> sims;
+        sims.reserve(last - first);
+        for (std::size_t j = first; j < last; ++j) sims.emplace_back(make(), config);
+
+        for (std::size_t t = 0; t < closes.rows; ++t) {
+            for (std::size_t j = first; j < last; ++j) {
+                const std::size_t at = t * closes.cols + j;
+                auto& sim = sims[j - first];
+                sim.bar(closes.data[at]);
+                out.equity[at] = sim.equity();
+                out.position[at] = sim.position();
+            }
+        }
+        for (std::size_t j = first; j < last; ++j) sims[j - first].finish(j, out);
+    }, num_threads);
+}
+
+} // namespace
+
+VectorBacktestResult RunVectorBacktest(PanelView closes, const VectorBacktestConfig& config, unsigned int num_threads) {
+    VectorBacktestResult out;
+    out.rows = closes.rows;
+    out.cols = closes.cols;
+    out.equity.resize(closes.rows * closes.cols);
+    out.position.resize(closes.rows * closes.cols);
+    out.final_equity.assign(closes.cols, config.initial_capital);
+    out.max_drawdown.assign(closes.cols, 0.0);
+    out.trades.assign(closes.cols, 0);
+    out.halted.assign(closes.cols, 0);
+
+    const std::string& s = config.strategy;
+    if (s == "EMA") {
+        const Params p(config, {{"short_window", 20}, {"long_window", 50}});
+        const int short_window = p.period("short_window");
+        const int long_window = p.period("long_window");
+        RunColumns(closes, config, [=] {
+            return EmaRule{Ema(short_window), Ema(long_window), static_cast<std::size_t>(long_window)};
+        }, out, num_threads);
+    } else if (s == "MACD") {
+        const Params p(config, {{"fast", 12}, {"slow", 26}, {"signal", 9}});
+        const int fast = p.period("fast");
+        const int slow = p.period("slow");
+        const int signal = p.period("signal");
+        RunColumns(closes, config, [=] {
+            return MacdRule{Ema(fast), Ema(slow), Ema(signal), static_cast<std::size_t>(slow)};
+        }, out, num_threads);
+    } else if (s == "RSI") {
+        const Params p(config, {{"period", 14}, {"buy_thresh", 30.0}, {"sell_thresh", 70.0}});
+        const auto period = static_cast<std::size_t>(p.period("period"));
+        const double buy = p.value("buy_thresh");
+        const double sell = p.value("sell_thresh");
+        RunColumns(closes, config, [=] { return RsiRule{RollingRSI(period), period, buy, sell}; }, out, num_threads);
+    } else if (s == "BB") {
+        const Params p(config, {{"period", 20}, {"std_dev_mult", 2.0}});
+        const auto period = static_cast<std::size_t>(p.period("period"));
+        const double mult = p.value("std_dev_mult");
+        RunColumns(closes, config, [=] { return BollingerRule{RollingMoments(period), mult}; }, out, num_threads);
+    } else {
+        throw std::invalid_argument("vector backtest supports EMA, MACD, RSI and BB, not '" + s + "'");
+    }
+    return out;
+}
@@ -21,6 +21,7 @@
 #include <cmath>
 #include <iomanip>
 #include <iostream>
+#include <thread>
 #include <vector>
 
 #include "Backtester.h"
@@ -64,6 +65,21 @@ Golden RunEngine(const std::string& strategy) {
             engine.get_trade_history().size()};
 }
 
+// Same run as RunEngine, but the whole series goes through run_bars in one call.
+Golden RunEngineBulk(const std::string& strategy) {
+    const double initial_capital = 100000.0;
+    Backtester engine(initial_capital, strategy, 1.0);
+
+    const std::vector<double> closes = MakeDeterministicSeries(300);
+    std::vector<double> timestamps(closes.size());
+    for (std::size_t t = 0; t < closes.size(); ++t) timestamps[t] = static_cast<double>(t);
+    engine.run_bars("TEST", timestamps.data(), closes.data(), closes.data(), closes.data(), closes.data(),
+                    closes.size());
+
+    return {engine.get_total_equity(), engine.get_max_drawdown(),
+            engine.get_trade_history().size()};
+}
+
 void PrintAndCheck(const char* label, const Golden& actual, const Golden& expected) {
     std::cout << "[GOLDEN] " << label << " equity=" << std::setprecision(12)
               << actual.equity << " mdd=" << actual.max_drawdown
@@ -123,6 +139,30 @@ TEST(BacktesterCharacterization, EmaDeterministicRun) {
     PrintAndCheck("EMA", RunEngine("EMA"), kGoldenEma);
 }
 
+TEST(BacktesterCharacterization, RunBarsMatchesPerBarGoldens) {
+    PrintAndCheck("MACD run_bars", RunEngineBulk("MACD"), kGoldenMacd);
+    PrintAndCheck("EMA run_bars", RunEngineBulk("EMA"), kGoldenEma);
+}
+
+// The bindings release the GIL around replays, so Python threads can drive
+// separate engines at once. Each instance must stay independent of the others.
+TEST(BacktesterCharacterization, ConcurrentEnginesMatchGoldens) {
+    constexpr int kThreads = 8;
+    std::vector<Golden> results(kThreads);
+    std::vector<std::thread> workers;
+    for (int i = 0; i < kThreads; ++i) {
+        workers.emplace_back([&results, i] {
+            results[i] = RunEngineBulk(i % 2 == 0 ? "MACD" : "EMA");
+        });
+    }
+    for (auto& w : workers) w.join();
+
+    for (int i = 0; i < kThreads; ++i) {
+        PrintAndCheck(i % 2 == 0 ? "MACD threaded" : "EMA threaded", results[i],
+                      i % 2 == 0 ? kGoldenMacd : kGoldenEma);
+    }
+}
+
 TEST(BacktesterCharacterization, MetaEventsRun) {
     PrintAndCheck("META_BRAIN", RunMetaEvents(), kGoldenMeta);
 }
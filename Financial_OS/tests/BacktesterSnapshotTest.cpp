@@ -0,0 +1,105 @@
+// tests/BacktesterSnapshotTest.cpp
+//
+// Forking an engine mid-run -- by copying it or via snapshot()/restore() --
+// must carry the full state: continuing the fork has to land exactly where an
+// uninterrupted run does.
+
+#include <gtest/gtest.h>
+
+#include <cmath>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+#include "Backtester.h"
+
+namespace {
+
+constexpr int kBars = 300;
+constexpr int kForkAt = 150;
+
+std::vector<double> MakeSeries(int n, double phase) {
+    std::vector<double> prices;
+    prices.reserve(n);
+    double price = 100.0;
+    for (int i = 0; i < n; ++i) {
+        price += 0.0005 * price + 2.0 * std::sin(i * 0.30 + phase) + 0.7 * std::cos(i * 0.11);
+        if (price < 1.0) price = 1.0;
+        prices.push_back(price);
+    }
+    return prices;
+}
+
+// Two symbols named for the PAIRS strategy's default legs.
+void Feed(Backtester& engine, int from, int to) {
+    static const std::vector<double> ko = MakeSeries(kBars, 0.0);
+    static const std::vector<double> pep = MakeSeries(kBars, 0.4);
+    for (int t = from; t < to; ++t) {
+        engine.on_market_data("KO", t, ko[t], ko[t], ko[t], ko[t]);
+        engine.on_market_data("PEP", t, pep[t], pep[t], pep[t], pep[t]);
+    }
+}
+
+void ExpectSameRun(const Backtester& actual, const Backtester& expected, const std::string& label) {
+    EXPECT_NEAR(actual.get_total_equity(), expected.get_total_equity(), 1e-6) << label;
+    EXPECT_NEAR(actual.get_max_drawdown(), expected.get_max_drawdown(), 1e-12) << label;
+    EXPECT_EQ(actual.get_trade_count(), expected.get_trade_count()) << label;
+    ASSERT_EQ(actual.get_equity_len(), expected.get_equity_len()) << label;
+    EXPECT_EQ(actual.get_closes("PEP"), expected.get_closes("PEP")) << label;
+}
+
+const std::vector<std::string> kStrategies = {"EMA", "MACD", "RSI", "BB", "OU", "PAIRS", "PAIRS_BASKET", "PCA"};
+
+} // namespace
+
+TEST(BacktesterSnapshot, CopyForkMatchesUninterruptedRun) {
+    for (const auto& strategy : kStrategies) {
+        Backtester straight(100000.0, strategy, 1.0);
+        straight.set_quiet(true);
+        Feed(straight, 0, kBars);
+
+        Backtester warm(100000.0, strategy, 1.0);
+        warm.set_quiet(true);
+        Feed(warm, 0, kForkAt);
+        Backtester fork = warm;
+        Feed(fork, kForkAt, kBars);
+
+        ExpectSameRun(fork, straight, strategy);
+        EXPECT_EQ(warm.get_equity_len(), static_cast<std::size_t>(2 * kForkAt)) << strategy << " original moved";
+    }
+}
+
+TEST(BacktesterSnapshot, RestoreMatchesUninterruptedRun) {
+    for (const auto& strategy : kStrategies) {
+        Backtester straight(100000.0, strategy, 1.0);
+        straight.set_quiet(true);
+        Feed(straight, 0, kBars);
+
+        Backtester warm(100000.0, strategy, 1.0);
+        warm.set_quiet(true);
+        Feed(warm, 0, kForkAt);
+        const std::string bytes = warm.snapshot();
+
+        Backtester resumed(1.0, "EMA", 2.0);
+        resumed.restore(bytes);
+        EXPECT_EQ(resumed.get_strategy_type(), strategy);
+        Feed(resumed, kForkAt, kBars);
+
+        ExpectSameRun(resumed, straight, strategy);
+    }
+}
+
+TEST(BacktesterSnapshot, BadSnapshotLeavesEngineUntouched) {
+    Backtester engine(100000.0, "MACD", 1.0);
+    engine.set_quiet(true);
+    Feed(engine, 0, kForkAt);
+    const std::string bytes = engine.snapshot();
+    const double equity = engine.get_total_equity();
+
+    EXPECT_THROW(engine.restore("not a snapshot"), std::invalid_argument);
+    EXPECT_THROW(engine.restore(bytes.substr(0, bytes.size() / 2)), std::invalid_argument);
+    EXPECT_THROW(engine.restore(bytes + "x"), std::invalid_argument);
+
+    EXPECT_DOUBLE_EQ(engine.get_total_equity(), equity);
+    EXPECT_EQ(engine.get_equity_len(), static_cast<std::size_t>(2 * kForkAt));
+}
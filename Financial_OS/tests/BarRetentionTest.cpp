@@ -0,0 +1,78 @@
+// tests/BarRetentionTest.cpp
+//
+// A retention window must only bound memory: as long as it covers the
+// strategy's lookback, trading has to be identical to keeping full history.
+
+#include <gtest/gtest.h>
+
+#include <cmath>
+#include <string>
+#include <vector>
+
+#include "Backtester.h"
+
+namespace {
+
+std::vector<double> MakeSeries(int n, double phase) {
+    std::vector<double> prices;
+    prices.reserve(n);
+    double price = 100.0;
+    for (int i = 0; i < n; ++i) {
+        price += 0.0005 * price + 2.0 * std::sin(i * 0.30 + phase) + 0.7 * std::cos(i * 0.11);
+        if (price < 1.0) price = 1.0;
+        prices.push_back(price);
+    }
+    return prices;
+}
+
+void Feed(Backtester& engine, const std::vector<std::string>& symbols, const std::vector<std::vector<double>>& closes) {
+    for (std::size_t t = 0; t < closes[0].size(); ++t) {
+        for (std::size_t j = 0; j < symbols.size(); ++j) {
+            const double c = closes[j][t];
+            engine.on_market_data(symbols[j], static_cast<double>(t), c, c * 1.01, c * 0.99, c);
+        }
+    }
+}
+
+}  // namespace
+
+TEST(BarRetention, BoundedStoreTradesLikeFullHistory) {
+    const int n = 2000;
+    const std::vector<std::string> symbols = {"KO", "PEP", "AAA"};
+    const std::vector<std::vector<double>> closes = {MakeSeries(n, 0.0), MakeSeries(n, 0.7), MakeSeries(n, 1.9)};
+
+    for (const char* strategy : {"EMA", "RSI", "MACD", "BB", "VOL", "OU", "PAIRS", "PCA", "VRP"}) {
+        Backtester full(100000.0, strategy, 1.0);
+        Backtester bounded(100000.0, strategy, 1.0);
+        full.set_quiet(true);
+        bounded.set_quiet(true);
+        bounded.set_bar_retention(10);
+        const std::size_t retention = bounded.get_bar_retention();
+        EXPECT_GE(retention, 10u) << strategy;
+
+        Feed(full, symbols, closes);
+        Feed(bounded, symbols, closes);
+
+        EXPECT_EQ(bounded.get_total_equity(), full.get_total_equity()) << strategy;
+        EXPECT_EQ(bounded.get_trade_count(), full.get_trade_count()) << strategy;
+        EXPECT_EQ(bounded.get_max_drawdown(), full.get_max_drawdown()) << strategy;
+        for (const auto& sym : symbols) {
+            EXPECT_EQ(bounded.get_bar_count(sym), static_cast<std::size_t>(n));
+            EXPECT_LE(bounded.get_closes(sym).size(), 2 * retention) << strategy;
+            EXPECT_EQ(bounded.get_closes(sym).back(), full.get_closes(sym).back());
+        }
+        EXPECT_LE(bounded.get_equity_len(), 2 * retention) << strategy;
+    }
+}
+
+TEST(BarRetention, RetentionNeverBelowStrategyLookback) {
+    Backtester pca(100000.0, "PCA", 1.0);
+    pca.set_bar_retention(5);
+    EXPECT_EQ(pca.get_bar_retention(), 60u);
+
+    Backtester ema(100000.0, "EMA", 1.0);
+    ema.set_bar_retention(5);
+    EXPECT_EQ(ema.get_bar_retention(), 5u);
+    ema.set_bar_retention(0);
+    EXPECT_EQ(ema.get_bar_retention(), 0u);
+}
@@ -0,0 +1,135 @@
+// tests/CointegrationTest.cpp
+//
+// The building blocks must tell a stationary AR(1) from a random walk, and the
+// funnel must keep a planted cointegrated pair while dropping a pair that is
+// merely correlated -- reporting, for each survivor, exactly what the
+// single-pair functions give on its spread.
+
+#include <gtest/gtest.h>
+
+#include <cmath>
+#include <random>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+#include "PairSelector.h"
+
+namespace {
+
+std::vector<double> Ar1(std::size_t n, double phi, double sd, std::uint64_t seed) {
+    std::mt19937_64 rng(seed);
+    std::normal_distribution<double> noise(0.0, sd);
+    std::vector<double> x(n, 0.0);
+    for (std::size_t t = 1; t < n; ++t) x[t] = phi * x[t - 1] + noise(rng);
+    return x;
+}
+
+// Columns: A and B = A^0.8 * stationary noise (cointegrated), C = A times an
+// independent walk (correlated returns, no cointegration), D and E
+// independent walks, and F with a gap.
+struct Universe {
+    std::size_t rows = 0;
+    std::vector<std::string> symbols{"A", "B", "C", "D", "E", "F"};
+    std::vector<double> prices;
+
+    [[nodiscard]] PanelView view() const { return {prices.data(), rows, symbols.size()}; }
+};
+
+Universe MakeUniverse(std::size_t rows) {
+    Universe u;
+    u.rows = rows;
+    const std::vector<double> a = Ar1(rows, 1.0, 0.01, 1);
+    const std::vector<double> spread = Ar1(rows, 0.8, 0.005, 2);
+    const std::vector<double> drift = Ar1(rows, 1.0, 0.01, 3);
+    const std::vector<double> d = Ar1(rows, 1.0, 0.01, 4);
+    const std::vector<double> e = Ar1(rows, 1.0, 0.01, 5);
+    for (std::size_t t = 0; t < rows; ++t) {
+        const double log_a = 4.0 + a[t];
+        const double gap = t == rows / 2 ? std::nan("") : 50.0;
+        u.prices.insert(u.prices.end(), {std::exp(log_a), std::exp(0.2 + 0.8 * log_a + spread[t]),
+                                         std::exp(log_a + drift[t]), std::exp(3.0 + d[t]), std::exp(3.0 + e[t]),
+                                         gap});
+    }
+    return u;
+}
+
+} // namespace
+
+TEST(Cointegration, TellsAStationarySeriesFromAWalk) {
+    const std::vector<double> ar = Ar1(2000, 0.9, 1.0, 7);
+    const std::vector<double> walk = Ar1(2000, 1.0, 1.0, 8);
+    const double critical = Analytics::EngleGrangerCriticalValue(ar.size());
+
+    EXPECT_LT(Analytics::CalculateADFStatistic(ar), critical);
+    EXPECT_GT(Analytics::CalculateADFStatistic(walk), critical);
+    EXPECT_NEAR(Analytics::CalculateHalfLife(ar), std::log(0.5) / std::log(0.9), 1.5);
+    EXPECT_TRUE(std::isinf(Analytics::CalculateHalfLife(std::vector<double>(50, 1.0))));
+    EXPECT_LT(Analytics::CalculateHurstExponent(ar), 0.4);
+    EXPECT_NEAR(Analytics::CalculateHurstExponent(walk), 0.5, 0.1);
+    EXPECT_TRUE(std::isnan(Analytics::CalculateADFStatistic({1.0, 2.0, 1.0})));
+
+    EXPECT_NEAR(Analytics::EngleGrangerCriticalValue(1000), -3.33613 - 6.1101e-3 - 6.823e-6, 1e-12);
+    EXPECT_LT(Analytics::EngleGrangerCriticalValue(1000, 0.01), Analytics::EngleGrangerCriticalValue(1000, 0.10));
+    EXPECT_THROW(Analytics::EngleGrangerCriticalValue(1000, 0.02), std::invalid_argument);
+    EXPECT_THROW(Analytics::CalculateADFStatistic(ar, -1), std::invalid_argument);
+}
+
+TEST(Cointegration, FunnelKeepsThePlantedPairOnly) {
+    const Universe u = MakeUniverse(1000);
+    CointegrationOptions options;
+    options.min_correlation = 0.3;
+    const CointegrationReport report = PairSelector::ScreenCointegration(u.view(), u.symbols, options);
+
+    EXPECT_EQ(report.skipped_symbols, 1u);
+    EXPECT_EQ(report.screened, 10u);
+    EXPECT_GE(report.correlated, 2u);  // A-B and A-C at least; the independent walks are pruned here
+    EXPECT_LT(report.correlated, report.screened);
+    EXPECT_GE(report.correlated, report.stationary);
+    EXPECT_GE(report.stationary, report.mean_reverting);
+    EXPECT_GE(report.mean_reverting, report.pairs.size());
+    ASSERT_EQ(report.pairs.size(), 1u);
+
+    const CointegratedPair& p = report.pairs[0];
+    EXPECT_EQ(p.asset_a, "A");
+    EXPECT_EQ(p.asset_b, "B");
+    std::vector<double> log_a, log_b;
+    for (std::size_t t = 0; t < u.rows; ++t) {
+        log_a.push_back(std::log(u.prices[t * 6]));
+        log_b.push_back(std::log(u.prices[t * 6 + 1]));
+    }
+    const LinearRegressionResult reg = Analytics::FitLinearRegression(log_b, log_a);
+    std::vector<double> spread;
+    for (std::size_t t = 0; t < u.rows; ++t) spread.push_back(log_a[t] - reg.alpha - reg.beta * log_b[t]);
+    EXPECT_DOUBLE_EQ(p.beta, reg.beta);
+    EXPECT_DOUBLE_EQ(p.adf_statistic, Analytics::CalculateADFStatistic(spread));
+    EXPECT_DOUBLE_EQ(p.half_life, Analytics::CalculateHalfLife(spread));
+    EXPECT_DOUBLE_EQ(p.hurst, Analytics::CalculateHurstExponent(spread));
+    EXPECT_LT(p.adf_statistic, report.critical_value);
+    EXPECT_LT(p.half_life, 10.0);
+}
+
+TEST(Cointegration, ThreadCountDoesNotChangeTheReport) {
+    const Universe u = MakeUniverse(600);
+    CointegrationOptions loose;
+    loose.min_correlation = 0.0;
+    loose.significance = 0.10;
+    const CointegrationReport one = PairSelector::ScreenCointegration(u.view(), u.symbols, loose, 1);
+    const CointegrationReport many = PairSelector::ScreenCointegration(u.view(), u.symbols, loose, 4);
+    EXPECT_EQ(one.correlated, many.correlated);
+    EXPECT_EQ(one.stationary, many.stationary);
+    ASSERT_EQ(one.pairs.size(), many.pairs.size());
+    for (std::size_t i = 0; i < one.pairs.size(); ++i) {
+        EXPECT_EQ(one.pairs[i].asset_a, many.pairs[i].asset_a);
+        EXPECT_EQ(one.pairs[i].asset_b, many.pairs[i].asset_b);
+        EXPECT_EQ(one.pairs[i].adf_statistic, many.pairs[i].adf_statistic);
+    }
+
+    CointegrationOptions bad;
+    bad.min_half_life = 10.0;
+    bad.max_half_life = 5.0;
+    EXPECT_THROW(PairSelector::ScreenCointegration(u.view(), u.symbols, bad), std::invalid_argument);
+    bad = {};
+    bad.significance = 0.2;
+    EXPECT_THROW(PairSelector::ScreenCointegration(u.view(), u.symbols, bad), std::invalid_argument);
+}
@@ -0,0 +1,116 @@
+// tests/EquitySamplingTest.cpp
+//
+// Sampled equity recording keeps the curve one point per timestamp (or per
+// interval bucket) instead of one per bar, and the decimation helpers bound
+// what a caller ships to a chart.
+
+#include <gtest/gtest.h>
+
+#include <algorithm>
+#include <cmath>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+#include "Analytics.h"
+#include "Backtester.h"
+
+namespace {
+
+std::vector<double> MakeSeries(int n, double phase) {
+    std::vector<double> prices;
+    prices.reserve(n);
+    double price = 100.0;
+    for (int i = 0; i < n; ++i) {
+        price += 0.0005 * price + 2.0 * std::sin(i * 0.30 + phase) + 0.7 * std::cos(i * 0.11);
+        if (price < 1.0) price = 1.0;
+        prices.push_back(price);
+    }
+    return prices;
+}
+
+// Runs a (n x symbols) close panel through run_panel.
+void RunPanel(Backtester& engine, const std::vector<std::string>& symbols, const std::vector<std::vector<double>>& closes) {
+    const std::size_t n = closes[0].size();
+    std::vector<double> timestamps(n), ohlc(n * symbols.size() * 4);
+    for (std::size_t t = 0; t < n; ++t) {
+        timestamps[t] = static_cast<double>(t);
+        for (std::size_t j = 0; j < symbols.size(); ++j) {
+            std::fill_n(ohlc.begin() + static_cast<std::ptrdiff_t>((t * symbols.size() + j) * 4), 4, closes[j][t]);
+        }
+    }
+    engine.run_panel(symbols, timestamps.data(), ohlc.data(), n);
+}
+
+}  // namespace
+
+TEST(EquitySampling, PerTimestampKeepsLastBarOfEachTimestamp) {
+    const int n = 800;
+    const std::vector<std::string> symbols = {"KO", "PEP", "AAA"};
+    const std::vector<std::vector<double>> closes = {MakeSeries(n, 0.0), MakeSeries(n, 0.7), MakeSeries(n, 1.9)};
+
+    Backtester every_tick(100000.0, "EMA", 1.0);
+    Backtester per_timestamp(100000.0, "EMA", 1.0);
+    for (Backtester* engine : {&every_tick, &per_timestamp}) {
+        engine->set_quiet(true);
+        engine->set_risk_params(1.0, 1e9);
+    }
+    per_timestamp.set_equity_sampling(EquitySampling::PER_TIMESTAMP);
+    RunPanel(every_tick, symbols, closes);
+    RunPanel(per_timestamp, symbols, closes);
+
+    const std::vector<double> full = every_tick.get_equity_curve();
+    const std::vector<double> sampled = per_timestamp.get_equity_curve();
+    ASSERT_EQ(full.size(), static_cast<std::size_t>(n) * symbols.size());
+    ASSERT_EQ(sampled.size(), static_cast<std::size_t>(n));
+    for (int t = 0; t < n; ++t) {
+        EXPECT_EQ(sampled[t], full[(t + 1) * symbols.size() - 1]) << "t=" << t;
+    }
+    EXPECT_EQ(per_timestamp.get_trade_count(), every_tick.get_trade_count());
+    EXPECT_EQ(per_timestamp.get_max_drawdown(), Analytics::CalculateMaxDrawdown(sampled));
+}
+
+TEST(EquitySampling, IntervalBucketsAndStreamingFlush) {
+    Backtester engine(100000.0, "EMA", 1.0);
+    engine.set_quiet(true);
+    EXPECT_THROW(engine.set_equity_sampling(EquitySampling::INTERVAL, 0.0), std::invalid_argument);
+    engine.set_equity_sampling(EquitySampling::INTERVAL, 10.0);
+
+    for (int t = 0; t < 35; ++t) engine.on_market_data("KO", t, 100.0 + t, 100.0 + t, 100.0 + t, 100.0 + t);
+    EXPECT_EQ(engine.get_equity_len(), 3u);  // [0,10) [10,20) [20,30) closed, [30,40) open
+    engine.flush_equity();
+    EXPECT_EQ(engine.get_equity_len(), 4u);
+    EXPECT_EQ(engine.get_equity_curve().back(), engine.get_total_equity());
+
+    // The open bucket counts toward the drawdown before it is recorded.
+    Backtester falling(1000.0, "EMA", 1.0);
+    falling.set_quiet(true);
+    falling.set_equity_sampling(EquitySampling::PER_TIMESTAMP);
+    falling.send_order("KO", "BUY", 5.0, 100.0, 0.0);
+    falling.on_market_data("KO", 0.0, 100.0, 100.0, 100.0, 100.0);
+    falling.on_market_data("KO", 1.0, 50.0, 50.0, 50.0, 50.0);
+    EXPECT_EQ(falling.get_equity_len(), 1u);
+    EXPECT_LT(falling.get_max_drawdown(), -0.2);
+}
+
+TEST(EquitySampling, DownsampleKeepsEndpointsAndBound) {
+    std::vector<double> series = MakeSeries(5000, 0.3);
+    series[1234] = 1e6;   // spike
+    series[4321] = -1e6;  // crash
+
+    for (auto select : {&Analytics::DownsampleLTTB, &Analytics::DownsampleMinMax}) {
+        const std::vector<std::size_t> idx = select(series, 200);
+        ASSERT_LE(idx.size(), 200u);
+        EXPECT_GT(idx.size(), 100u);
+        EXPECT_EQ(idx.front(), 0u);
+        EXPECT_EQ(idx.back(), series.size() - 1);
+        EXPECT_TRUE(std::is_sorted(idx.begin(), idx.end()));
+        EXPECT_EQ(std::adjacent_find(idx.begin(), idx.end()), idx.end());
+        EXPECT_NE(std::find(idx.begin(), idx.end(), 1234u), idx.end());
+        EXPECT_NE(std::find(idx.begin(), idx.end(), 4321u), idx.end());
+    }
+
+    const std::vector<double> short_series = {1.0, 2.0, 3.0};
+    EXPECT_EQ(Analytics::DownsampleLTTB(short_series, 10), (std::vector<std::size_t>{0, 1, 2}));
+    EXPECT_THROW(Analytics::DownsampleMinMax(series, 2), std::invalid_argument);
+}
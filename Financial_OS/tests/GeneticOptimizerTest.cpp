@@ -0,0 +1,128 @@
+// tests/GeneticOptimizerTest.cpp
+//
+// The search itself is stochastic; what must hold is that a seed pins it down,
+// that the memo really avoids re-running backtests, and that the reported best
+// is what a plain sweep of those parameters returns.
+
+#include <gtest/gtest.h>
+
+#include <cmath>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+#include "HyperOptimizer.h"
+
+namespace {
+
+struct Series {
+    std::vector<std::string> symbols{"TARGET"};
+    std::vector<double> timestamps;
+    std::vector<double> ohlc;
+
+    [[nodiscard]] SweepData data() const { return {symbols, timestamps.data(), ohlc.data(), timestamps.size()}; }
+};
+
+// Slow swings on an upward drift: MACD settings that follow them earn money.
+Series MakeSeries(int n) {
+    Series series;
+    for (int t = 0; t < n; ++t) {
+        const double c = 100.0 + 0.02 * t + 6.0 * std::sin(t * 0.04) + 0.8 * std::sin(t * 0.7);
+        series.timestamps.push_back(t);
+        series.ohlc.insert(series.ohlc.end(), {c, c, c, c});
+    }
+    return series;
+}
+
+const std::map<std::string, ParamRange> kMacdSpace = {
+    {"fast", {3, 20, true}}, {"slow", {20, 60, true}}, {"signal", {3, 15, true}}};
+
+EvolveOptions Seeded(std::uint64_t seed) {
+    EvolveOptions options;
+    options.generations = 8;
+    options.population_size = 24;
+    options.seed = seed;
+    return options;
+}
+
+} // namespace
+
+TEST(GeneticOptimizer, SeedMakesTheSearchReproducible) {
+    const Series series = MakeSeries(800);
+    const EvolveResult a = GeneticOptimizer::evolve("MACD", kMacdSpace, series.data(), {}, Seeded(11));
+    const EvolveResult b = GeneticOptimizer::evolve("MACD", kMacdSpace, series.data(), {}, Seeded(11), 1);
+    EXPECT_EQ(a.best_params, b.best_params);
+    EXPECT_EQ(a.best_history, b.best_history);
+    EXPECT_EQ(a.evaluations, b.evaluations);
+}
+
+TEST(GeneticOptimizer, MemoScoresEachParameterTupleOnce) {
+    const Series series = MakeSeries(800);
+    const EvolveOptions options = Seeded(5);
+    const EvolveResult result = GeneticOptimizer::evolve("MACD", kMacdSpace, series.data(), {}, options);
+
+    EXPECT_EQ(result.generations, options.generations);
+    EXPECT_EQ(result.stop_reason, "generations");
+    EXPECT_EQ(result.evaluations + result.cache_hits,
+              static_cast<std::size_t>(options.generations * options.population_size));
+    EXPECT_GT(result.cache_hits, 0u);  // at least the elites of every later generation
+}
+
+TEST(GeneticOptimizer, BestIsWhatASweepOfItReturns) {
+    const Series series = MakeSeries(800);
+    const EvolveResult result = GeneticOptimizer::evolve("MACD", kMacdSpace, series.data(), {}, Seeded(3));
+
+    for (const auto& [name, value] : result.best_params) {
+        EXPECT_EQ(value, std::floor(value)) << name;
+        EXPECT_GE(value, kMacdSpace.at(name).low) << name;
+        EXPECT_LE(value, kMacdSpace.at(name).high) << name;
+    }
+    const SweepResult replay = RunSweep("MACD", {result.best_params}, series.data());
+    EXPECT_DOUBLE_EQ(replay.return_pct[0], result.best_fitness);
+    EXPECT_GT(result.best_fitness, 0.0);
+    for (std::size_t g = 1; g < result.best_history.size(); ++g) {
+        EXPECT_GE(result.best_history[g], result.best_history[g - 1]);
+    }
+}
+
+TEST(GeneticOptimizer, StopsOnAPlateau) {
+    const Series series = MakeSeries(400);
+    EvolveOptions options = Seeded(2);
+    options.generations = 500;
+    options.patience = 3;
+    const EvolveResult result = GeneticOptimizer::evolve("MACD", kMacdSpace, series.data(), {}, options);
+    EXPECT_EQ(result.stop_reason, "plateau");
+    EXPECT_LT(result.generations, options.generations);
+    const auto n = result.best_history.size();
+    ASSERT_GE(n, 4u);
+    EXPECT_EQ(result.best_history[n - 1], result.best_history[n - 4]);
+}
+
+TEST(GeneticOptimizer, MacdRepairKeepsSlowAboveFast) {
+    std::map<std::string, double> params{{"fast", 30}, {"slow", 12}, {"signal", 9}};
+    GeneticOptimizer::repair_macd(params);
+    EXPECT_EQ(params.at("slow"), 35);
+    std::map<std::string, double> fast_only{{"fast", 30}};
+    GeneticOptimizer::repair_macd(fast_only);
+    EXPECT_EQ(fast_only.size(), 1u);
+
+    const Series series = MakeSeries(400);
+    EvolveOptions options = Seeded(4);
+    options.repair = GeneticOptimizer::repair_macd;
+    const EvolveResult result = GeneticOptimizer::evolve(
+        "MACD", {{"fast", {5, 50, true}}, {"slow", {2, 100, true}}, {"signal", {5, 30, true}}}, series.data(), {},
+        options);
+    EXPECT_LT(result.best_params.at("fast"), result.best_params.at("slow"));
+}
+
+TEST(GeneticOptimizer, RejectsBadSearches) {
+    const Series series = MakeSeries(100);
+    EXPECT_THROW(GeneticOptimizer::evolve("MACD", {}, series.data()), std::invalid_argument);
+    EXPECT_THROW(GeneticOptimizer::evolve("MACD", {{"fast", {9, 5, true}}}, series.data()), std::invalid_argument);
+    EXPECT_THROW(GeneticOptimizer::evolve("MACD", {{"fast", {5.2, 5.8, true}}}, series.data()), std::invalid_argument);
+    EXPECT_THROW(GeneticOptimizer::evolve("MACD", {{"nope", {1, 5, true}}}, series.data(), {}, Seeded(1)),
+                 std::invalid_argument);
+    EvolveOptions lonely = Seeded(1);
+    lonely.population_size = 1;
+    EXPECT_THROW(GeneticOptimizer::evolve("MACD", kMacdSpace, series.data(), {}, lonely), std::invalid_argument);
+}
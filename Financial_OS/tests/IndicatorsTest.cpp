@@ -0,0 +1,197 @@
+// tests/IndicatorsTest.cpp
+//
+// Batch indicators must reproduce, column by column, what the engine computes
+// bar by bar -- that is what lets screening signals stand in for trades.
+
+#include <gtest/gtest.h>
+
+#include <cmath>
+#include <limits>
+#include <stdexcept>
+#include <vector>
+
+#include "Analytics.h"
+#include "DataHandler.h"
+#include "Indicators.h"
+
+namespace {
+
+constexpr double kNaN = std::numeric_limits<double>::quiet_NaN();
+
+// Row-major (rows x cols) panel; each column its own phase.
+std::vector<double> MakePanel(std::size_t rows, std::size_t cols) {
+    std::vector<double> panel(rows * cols);
+    for (std::size_t j = 0; j < cols; ++j) {
+        double price = 50.0 + 10.0 * static_cast<double>(j);
+        for (std::size_t t = 0; t < rows; ++t) {
+            price *= 1.0 + 0.01 * std::sin(static_cast<double>(t) * 0.7 + static_cast<double>(j)) + 0.002 * std::cos(t * 0.13);
+            panel[t * cols + j] = price;
+        }
+    }
+    return panel;
+}
+
+std::vector<double> Column(const std::vector<double>& panel, std::size_t cols, std::size_t j) {
+    std::vector<double> out;
+    for (std::size_t at = j; at < panel.size(); at += cols) out.push_back(panel[at]);
+    return out;
+}
+
+} // namespace
+
+TEST(Indicators, PanelColumnsMatchSingleSeries) {
+    const std::size_t rows = 300, cols = 11;  // more than one column block
+    const std::vector<double> panel = MakePanel(rows, cols);
+    std::vector<double> rsi(panel.size());
+    Indicators::RSI({panel.data(), rows, cols}, 14, rsi.data());
+
+    for (std::size_t j = 0; j < cols; ++j) {
+        const std::vector<double> series = Column(panel, cols, j);
+        std::vector<double> single(rows);
+        Indicators::RSI({series.data(), rows, 1}, 14, single.data(), 1);
+        const std::vector<double> from_panel = Column(rsi, cols, j);
+        for (std::size_t t = 0; t < rows; ++t) {
+            if (t < 14) {
+                EXPECT_TRUE(std::isnan(from_panel[t]));
+            } else {
+                ASSERT_EQ(from_panel[t], single[t]) << "j=" << j << " t=" << t;
+                ASSERT_NEAR(single[t], Analytics::CalculateRSI({series.begin(), series.begin() + t + 1}, 14), 1e-9);
+            }
+        }
+    }
+}
+
+TEST(Indicators, EmaAndMacdFollowTheStrategyRecurrence) {
+    const std::size_t rows = 200;
+    const std::vector<double> prices = MakePanel(rows, 1);
+    std::vector<double> ema(rows), line(rows), signal(rows), hist(rows);
+    Indicators::EMA({prices.data(), rows, 1}, 10, ema.data());
+    Indicators::MACD({prices.data(), rows, 1}, 12, 26, 9, line.data(), signal.data(), hist.data());
+
+    const double alpha = 2.0 / 11.0;
+    double expected = prices[0];
+    EXPECT_EQ(ema[0], prices[0]);
+    for (std::size_t t = 1; t < rows; ++t) {
+        expected = (prices[t] - expected) * alpha + expected;
+        ASSERT_EQ(ema[t], expected);
+    }
+
+    for (std::size_t t = 0; t < 25; ++t) EXPECT_TRUE(std::isnan(line[t]) && std::isnan(signal[t]));
+    EXPECT_EQ(signal[25], line[25]);  // signal EMA seeded with the first MACD value
+    for (std::size_t t = 25; t < rows; ++t) ASSERT_EQ(hist[t], line[t] - signal[t]);
+}
+
+TEST(Indicators, BollingerAndVolatilityMatchEngineState) {
+    const std::size_t rows = 400;
+    const std::vector<double> prices = MakePanel(rows, 1);
+    std::vector<double> middle(rows), upper(rows), lower(rows), vol(rows);
+    Indicators::Bollinger({prices.data(), rows, 1}, 20, 2.0, middle.data(), upper.data(), lower.data());
+    Indicators::RollingVolatility({prices.data(), rows, 1}, static_cast<int>(DataHandler::kReturnWindow), vol.data());
+
+    DataHandler data;
+    for (std::size_t t = 0; t < rows; ++t) {
+        data.add_bar("X", prices[t], prices[t], prices[t], prices[t]);
+        if (t >= DataHandler::kReturnWindow) {
+            ASSERT_EQ(vol[t], data.log_return_stats("X")->volatility()) << "t=" << t;
+        } else {
+            EXPECT_TRUE(std::isnan(vol[t]));
+        }
+        if (t < 19) {
+            EXPECT_TRUE(std::isnan(middle[t]));
+            continue;
+        }
+        const std::vector<double> history(prices.begin(), prices.begin() + static_cast<long>(t) + 1);
+        const double sd = Analytics::CalculateStdDev(history, 20);
+        ASSERT_NEAR(upper[t] - middle[t], 2.0 * sd, 1e-6 * sd) << "t=" << t;
+        ASSERT_EQ(middle[t] - lower[t], upper[t] - middle[t]);
+    }
+}
+
+TEST(Indicators, YangZhangMatchesDirectFormula) {
+    const std::size_t rows = 120, window = 20;
+    const std::vector<double> close = MakePanel(rows, 1);
+    std::vector<double> open(rows), high(rows), low(rows), yz(rows);
+    for (std::size_t t = 0; t < rows; ++t) {
+        open[t] = t == 0 ? close[t] : close[t - 1] * (1.0 + 0.002 * std::sin(t * 1.3));
+        high[t] = std::max(open[t], close[t]) * 1.004;
+        low[t] = std::min(open[t], close[t]) * 0.995;
+    }
+    Indicators::YangZhang({open.data(), rows, 1}, {high.data(), rows, 1}, {low.data(), rows, 1},
+                          {close.data(), rows, 1}, static_cast<int>(window), yz.data());
+
+    for (std::size_t t = 0; t < rows; ++t) {
+        if (t < window) {
+            EXPECT_TRUE(std::isnan(yz[t]));
+            continue;
+        }
+        const double n = static_cast<double>(window);
+        double mo = 0.0, mc = 0.0, rs = 0.0;
+        for (std::size_t i = t + 1 - window; i <= t; ++i) {
+            mo += std::log(open[i] / close[i - 1]) / n;
+            mc += std::log(close[i] / open[i]) / n;
+            rs += (std::log(high[i] / close[i]) * std::log(high[i] / open[i])
+                   + std::log(low[i] / close[i]) * std::log(low[i] / open[i])) / n;
+        }
+        double vo = 0.0, vc = 0.0;
+        for (std::size_t i = t + 1 - window; i <= t; ++i) {
+            vo += std::pow(std::log(open[i] / close[i - 1]) - mo, 2) / (n - 1.0);
+            vc += std::pow(std::log(close[i] / open[i]) - mc, 2) / (n - 1.0);
+        }
+        const double k = 0.34 / (1.34 + (n + 1.0) / (n - 1.0));
+        ASSERT_NEAR(yz[t], std::sqrt(vo + k * vc + (1.0 - k) * rs), 1e-9) << "t=" << t;
+    }
+}
+
+TEST(Indicators, LeadingNaNsDelayTheColumnStart) {
+    const std::size_t rows = 60;
+    const std::vector<double> prices = MakePanel(rows, 1);
+    std::vector<double> late(prices);
+    for (std::size_t t = 0; t < 10; ++t) late[t] = kNaN;
+
+    std::vector<double> out(rows), shifted(rows - 10);
+    Indicators::RSI({late.data(), rows, 1}, 14, out.data());
+    Indicators::RSI({prices.data() + 10, rows - 10, 1}, 14, shifted.data());
+    for (std::size_t t = 0; t < 24; ++t) EXPECT_TRUE(std::isnan(out[t])) << "t=" << t;
+    for (std::size_t t = 24; t < rows; ++t) ASSERT_EQ(out[t], shifted[t - 10]);
+
+    EXPECT_THROW(Indicators::RSI({prices.data(), rows, 1}, 0, out.data()), std::invalid_argument);
+}
+
+TEST(Indicators, InteriorNaNsAreSkippedLikeMissingBars) {
+    const std::size_t rows = 80;
+    const std::vector<double> prices = MakePanel(rows, 1);
+    std::vector<double> gappy(prices);
+    gappy[30] = kNaN;
+    gappy[31] = kNaN;
+    gappy[55] = kNaN;
+    // The same series with the missing bars taken out, as the engine sees it.
+    std::vector<double> bars;
+    for (double p : gappy) {
+        if (!std::isnan(p)) bars.push_back(p);
+    }
+
+    std::vector<double> ema(rows), line(rows), signal(rows), hist(rows);
+    std::vector<double> ema_bars(bars.size()), line_bars(bars.size()), signal_bars(bars.size()), hist_bars(bars.size());
+    Indicators::EMA({gappy.data(), rows, 1}, 10, ema.data());
+    Indicators::EMA({bars.data(), bars.size(), 1}, 10, ema_bars.data());
+    Indicators::MACD({gappy.data(), rows, 1}, 12, 26, 9, line.data(), signal.data(), hist.data());
+    Indicators::MACD({bars.data(), bars.size(), 1}, 12, 26, 9, line_bars.data(), signal_bars.data(), hist_bars.data());
+
+    std::size_t bar = 0;
+    for (std::size_t t = 0; t < rows; ++t) {
+        if (std::isnan(gappy[t])) {
+            EXPECT_TRUE(std::isnan(ema[t]) && std::isnan(line[t])) << "t=" << t;
+            continue;
+        }
+        ASSERT_EQ(ema[t], ema_bars[bar]) << "t=" << t;
+        if (std::isnan(line_bars[bar])) {
+            EXPECT_TRUE(std::isnan(line[t])) << "t=" << t;
+        } else {
+            ASSERT_EQ(line[t], line_bars[bar]) << "t=" << t;
+            ASSERT_EQ(signal[t], signal_bars[bar]) << "t=" << t;
+        }
+        ++bar;
+    }
+    EXPECT_FALSE(std::isnan(ema[rows - 1]));
+    EXPECT_FALSE(std::isnan(line[rows - 1]));
+}
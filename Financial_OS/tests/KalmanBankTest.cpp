@@ -0,0 +1,183 @@
+// tests/KalmanBankTest.cpp
+//
+// Each pair in the bank must follow exactly the path one KalmanFilter plus a
+// RollingMoments window (the PAIRS strategy's state) takes on its prices,
+// whether the bank is stepped for all pairs, for a subset, or run over a
+// panel in parallel blocks; and the basket strategy built on it must trade
+// every pair of its basket from a single engine.
+
+#include <gtest/gtest.h>
+
+#include <cmath>
+#include <map>
+#include <stdexcept>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "Backtester.h"
+#include "KalmanBank.h"
+#include "KalmanFilter.h"
+#include "Rolling.h"
+
+namespace {
+
+// n columns: even ones independent sine-driven walks, each odd one a noisy
+// multiple of its left neighbour, so (2i, 2i+1) are natural pairs.
+std::vector<double> MakePanel(std::size_t rows, std::size_t n) {
+    std::vector<double> panel(rows * n);
+    for (std::size_t j = 0; j < n; ++j) {
+        for (std::size_t t = 0; t < rows; ++t) {
+            const std::size_t base = j - j % 2;
+            const double x = 50.0 + 0.02 * t + 5.0 * std::sin(0.03 * t + base) + 0.5 * std::sin(0.9 * t * (base + 1));
+            panel[t * n + j] = j % 2 == 0 ? x : (1.0 + 0.1 * base) * x + 3.0 + 1.5 * std::sin(0.4 * t + j);
+        }
+    }
+    return panel;
+}
+
+struct Reference {
+    std::vector<double> hedge_ratio;
+    std::vector<double> spread;
+    std::vector<double> z;
+};
+
+// What KalmanPairsStrategy computes for one pair, bar by bar.
+Reference Follow(const std::vector<double>& x, const std::vector<double>& y, std::size_t window) {
+    KalmanFilter kf;
+    RollingMoments spreads(window);
+    Reference ref;
+    for (std::size_t t = 0; t < x.size(); ++t) {
+        kf.update(x[t], y[t]);
+        const double spread = kf.get_spread(x[t], y[t]);
+        spreads.push(spread);
+        double z = std::nan("");
+        if (spreads.full() && spreads.volatility() >= 1e-9) z = (spread - spreads.mean()) / spreads.volatility();
+        ref.hedge_ratio.push_back(kf.get_hedge_ratio());
+        ref.spread.push_back(spread);
+        ref.z.push_back(z);
+    }
+    return ref;
+}
+
+void ExpectClose(double actual, double expected, const std::string& label) {
+    if (std::isnan(expected)) {
+        EXPECT_TRUE(std::isnan(actual)) << label;
+    } else {
+        EXPECT_NEAR(actual, expected, 1e-7 * (1.0 + std::abs(expected))) << label;
+    }
+}
+
+} // namespace
+
+TEST(KalmanBank, EveryPairFollowsItsOwnFilter) {
+    const std::size_t rows = 400, n = 6, window = 20;
+    const std::vector<double> panel = MakePanel(rows, n);
+    KalmanBank bank(n / 2, window);
+    std::vector<std::vector<double>> xs(n / 2), ys(n / 2);
+    for (std::size_t t = 0; t < rows; ++t) {
+        std::vector<double> x, y;
+        for (std::size_t k = 0; k < n / 2; ++k) {
+            x.push_back(panel[t * n + 2 * k]);
+            y.push_back(panel[t * n + 2 * k + 1]);
+            xs[k].push_back(x.back());
+            ys[k].push_back(y.back());
+        }
+        bank.update(x.data(), y.data());
+    }
+    // Re-run with a subset step: pair 1 only on even rows.
+    KalmanBank sparse(n / 2, window);
+    std::vector<double> x1, y1;
+    for (std::size_t t = 0; t < rows; t += 2) {
+        const std::size_t pair = 1;
+        sparse.update(&pair, 1, &xs[1][t], &ys[1][t]);
+        x1.push_back(xs[1][t]);
+        y1.push_back(ys[1][t]);
+    }
+
+    for (std::size_t k = 0; k < n / 2; ++k) {
+        const Reference ref = Follow(xs[k], ys[k], window);
+        ExpectClose(bank.hedge_ratio(k), ref.hedge_ratio.back(), "hedge " + std::to_string(k));
+        ExpectClose(bank.spread(k), ref.spread.back(), "spread " + std::to_string(k));
+        ExpectClose(bank.z_score(k), ref.z.back(), "z " + std::to_string(k));
+    }
+    const Reference ref1 = Follow(x1, y1, window);
+    ExpectClose(sparse.hedge_ratio(1), ref1.hedge_ratio.back(), "sparse hedge");
+    ExpectClose(sparse.z_score(1), ref1.z.back(), "sparse z");
+    EXPECT_EQ(sparse.hedge_ratio(0), 0.0);  // never stepped
+}
+
+TEST(KalmanBank, PanelRunMatchesPerPairFiltersAcrossBlocks) {
+    // 150 pairs span three blocks; every pair is (column a, column b).
+    const std::size_t rows = 120, n = 20, window = 15;
+    std::vector<double> panel = MakePanel(rows, n);
+    panel[50 * n + 3] = std::nan("");  // pair (2, 3) skips row 50
+    std::vector<std::pair<std::size_t, std::size_t>> pairs;
+    for (std::size_t a = 0; a < n && pairs.size() < 150; ++a) {
+        for (std::size_t b = 0; b < n && pairs.size() < 150; ++b) {
+            if (a != b) pairs.emplace_back(a, b);
+        }
+    }
+    const std::size_t p = pairs.size();
+    std::vector<double> hedge(rows * p), intercept(rows * p), spread(rows * p), z(rows * p);
+    KalmanBank::Run({panel.data(), rows, n}, pairs, window, 1e-4, 1e-3, hedge.data(), intercept.data(),
+                    spread.data(), z.data());
+    std::vector<double> hedge1(rows * p), intercept1(rows * p), spread1(rows * p), z1(rows * p);
+    KalmanBank::Run({panel.data(), rows, n}, pairs, window, 1e-4, 1e-3, hedge1.data(), intercept1.data(),
+                    spread1.data(), z1.data(), 1);
+    EXPECT_EQ(hedge, hedge1);
+
+    for (const std::size_t k : {std::size_t{0}, std::size_t{100}, std::size_t{149}}) {  // clear of column 3
+        std::vector<double> x, y;
+        for (std::size_t t = 0; t < rows; ++t) {
+            x.push_back(panel[t * n + pairs[k].first]);
+            y.push_back(panel[t * n + pairs[k].second]);
+        }
+        const Reference ref = Follow(x, y, window);
+        for (std::size_t t = 0; t < rows; t += 17) {
+            ExpectClose(hedge[t * p + k], ref.hedge_ratio[t], "hedge");
+            ExpectClose(z[t * p + k], ref.z[t], "z");
+        }
+    }
+
+    // The gap: no step, NaN spread, state carried over.
+    std::size_t gap = 0;
+    while (pairs[gap] != std::make_pair(std::size_t{2}, std::size_t{3})) ++gap;
+    EXPECT_TRUE(std::isnan(spread[50 * p + gap]));
+    EXPECT_TRUE(std::isnan(z[50 * p + gap]));
+    EXPECT_EQ(hedge[50 * p + gap], hedge[49 * p + gap]);
+
+    EXPECT_THROW(KalmanBank::Run({panel.data(), rows, n}, {{0, n}}, window, 1e-4, 1e-3, hedge.data(),
+                                 intercept.data(), spread.data(), z.data()),
+                 std::invalid_argument);
+    EXPECT_THROW(KalmanBank::Run({panel.data(), rows, n}, {}, window, 1e-4, 1e-3, hedge.data(), intercept.data(),
+                                 spread.data(), z.data()),
+                 std::invalid_argument);
+}
+
+TEST(KalmanBank, BasketStrategyTradesEveryPairFromOneEngine) {
+    const std::size_t rows = 600, n = 6;
+    const std::vector<double> panel = MakePanel(rows, n);
+    std::vector<std::string> symbols{"A0", "B0", "A1", "B1", "A2", "B2"};
+    std::vector<double> ohlc;
+    for (double price : panel) ohlc.insert(ohlc.end(), 4, price);
+    std::vector<double> timestamps(rows);
+    for (std::size_t t = 0; t < rows; ++t) timestamps[t] = static_cast<double>(t);
+
+    Backtester engine(100000.0, "PAIRS_BASKET", 1.0);
+    engine.set_quiet(true);
+    engine.set_pairs_basket({{"A0", "B0"}, {"A1", "B1"}, {"A2", "B2"}});
+    engine.set_parameters({{"window", 20}, {"threshold", 1.0}});
+    EXPECT_EQ(engine.get_parameters(), (std::map<std::string, double>{{"window", 20.0}, {"threshold", 1.0}}));
+    engine.run_panel(symbols, timestamps.data(), ohlc.data(), rows);
+
+    const TradeLedger& ledger = engine.get_trade_ledger();
+    std::map<SymbolId, int> fills;
+    for (const SymbolId id : ledger.symbol_ids()) ++fills[id];
+    EXPECT_EQ(fills.size(), symbols.size());  // every leg of every pair traded
+
+    EXPECT_THROW(engine.set_pairs_basket({{"A0", "A0"}}), std::invalid_argument);
+    EXPECT_THROW(engine.set_pairs_basket({}), std::invalid_argument);
+    Backtester single(100000.0, "PAIRS", 1.0);
+    EXPECT_THROW(single.set_pairs_basket({{"A0", "B0"}}), std::invalid_argument);
+}
@@ -0,0 +1,85 @@
+// tests/OptimizerTest.cpp
+//
+// The Monte Carlo search draws its portfolios in blocks, one counter-based
+// stream per block: a seed must give the same answer whatever the thread
+// count, and enough draws must land next to the long-only tangency
+// portfolio when there is one.
+
+#include <gtest/gtest.h>
+
+#include <cmath>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+#include "Optimizer.h"
+
+namespace {
+
+// Assets with positive drifts and nearly uncorrelated swings, so the
+// tangency portfolio is long-only.
+Optimizer MakeOptimizer(int n_assets, int n_periods) {
+    Optimizer opt;
+    for (int a = 0; a < n_assets; ++a) {
+        std::vector<double> returns;
+        for (int t = 0; t < n_periods; ++t) {
+            const double drift = 0.0004 + 0.0002 * (a % 3);
+            const double amplitude = 0.008 + 0.002 * (a % 4);
+            returns.push_back(drift + amplitude * std::sin((0.37 + 0.61 * a) * t + a));
+        }
+        opt.add_asset("ASSET" + std::to_string(a), returns);
+    }
+    return opt;
+}
+
+} // namespace
+
+TEST(Optimizer, SeedFixesTheSearchWhateverTheThreadCount) {
+    Optimizer opt = MakeOptimizer(12, 300);
+    const OptimizationResult serial = opt.optimize_sharpe_ratio(5000, 0.02, 1, 42);
+    const OptimizationResult parallel = opt.optimize_sharpe_ratio(5000, 0.02, 0, 42);
+    EXPECT_EQ(serial.optimal_weights, parallel.optimal_weights);
+    EXPECT_EQ(serial.sharpe_ratio, parallel.sharpe_ratio);
+
+    const OptimizationResult other = opt.optimize_sharpe_ratio(5000, 0.02, 0, 43);
+    EXPECT_NE(serial.optimal_weights, other.optimal_weights);
+}
+
+TEST(Optimizer, ReportsTheMetricsOfItsWeights) {
+    Optimizer opt = MakeOptimizer(8, 300);
+    const OptimizationResult result = opt.optimize_sharpe_ratio(3000, 0.01, 0, 7);
+    ASSERT_EQ(result.optimal_weights.size(), 8u);
+
+    double sum = 0.0;
+    for (double w : result.optimal_weights) {
+        EXPECT_GT(w, 0.0);
+        sum += w;
+    }
+    EXPECT_NEAR(sum, 1.0, 1e-12);
+
+    const auto cov = opt.calculate_covariance_matrix();
+    double variance = 0.0;
+    for (std::size_t i = 0; i < 8; ++i) {
+        for (std::size_t j = 0; j < 8; ++j) {
+            variance += result.optimal_weights[i] * result.optimal_weights[j] * cov[i][j];
+        }
+    }
+    EXPECT_NEAR(result.portfolio_volatility, std::sqrt(variance * 252.0), 1e-12);
+    EXPECT_NEAR(result.sharpe_ratio, (result.portfolio_return - 0.01) / result.portfolio_volatility, 1e-12);
+}
+
+TEST(Optimizer, SearchFindsTheLongOnlyTangencyPortfolio) {
+    Optimizer opt = MakeOptimizer(3, 500);
+    const OptimizationResult analytic = opt.optimize_max_sharpe_analytic(0.0);
+    for (double w : analytic.optimal_weights) ASSERT_GT(w, 0.0);
+
+    const OptimizationResult mc = opt.optimize_sharpe_ratio(50000, 0.0, 0, 1);
+    EXPECT_LE(mc.sharpe_ratio, analytic.sharpe_ratio + 1e-6);
+    EXPECT_NEAR(mc.sharpe_ratio, analytic.sharpe_ratio, 1e-3 * analytic.sharpe_ratio);
+    for (std::size_t i = 0; i < 3; ++i) EXPECT_NEAR(mc.optimal_weights[i], analytic.optimal_weights[i], 0.02);
+}
+
+TEST(Optimizer, RejectsAnEmptySearch) {
+    Optimizer opt = MakeOptimizer(3, 50);
+    EXPECT_THROW(opt.optimize_sharpe_ratio(0, 0.0), std::invalid_argument);
+}
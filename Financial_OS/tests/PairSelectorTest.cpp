@@ -0,0 +1,134 @@
+// tests/PairSelectorTest.cpp
+//
+// The GEMM screen must pick the same pairs, in the same order, as scoring every
+// pair with Analytics::CalculateCorrelation -- across tile boundaries (more
+// than 256 symbols), in float, and from a panel as well as from a map.
+
+#include <gtest/gtest.h>
+
+#include <algorithm>
+#include <cmath>
+#include <map>
+#include <string>
+#include <tuple>
+#include <vector>
+
+#include "PairSelector.h"
+
+namespace {
+
+// n symbols of `rows` prices driven by three shared sine "factors" with
+// symbol-specific loadings and phases, so correlations are varied and distinct.
+std::vector<double> MakePanel(std::size_t rows, std::size_t n) {
+    std::vector<double> panel(rows * n);
+    for (std::size_t j = 0; j < n; ++j) {
+        double price = 100.0;
+        for (std::size_t t = 0; t < rows; ++t) {
+            const double r = 0.004 * std::sin(0.7 * t + 0.1 * j) * std::cos(0.013 * j * j)
+                           + 0.003 * std::sin(1.3 * t) * std::sin(0.37 * j)
+                           + 0.002 * std::sin(0.011 * t * (j % 17 + 1) + j);
+            price *= std::exp(r);
+            panel[t * n + j] = price;
+        }
+    }
+    return panel;
+}
+
+std::string Name(std::size_t j) { return "S" + std::to_string(1000 + j); }  // sorts like j
+
+struct Expected {
+    std::string a;
+    std::string b;
+    double corr;
+};
+
+std::vector<Expected> BruteForce(const std::map<std::string, std::vector<double>>& data, std::size_t k) {
+    std::vector<std::pair<std::string, std::vector<double>>> returns;
+    for (const auto& [symbol, prices] : data) returns.emplace_back(symbol, Analytics::CalculateLogReturns(prices));
+    std::vector<Expected> all;
+    for (std::size_t i = 0; i < returns.size(); ++i) {
+        for (std::size_t j = i + 1; j < returns.size(); ++j) {
+            all.push_back({returns[i].first, returns[j].first,
+                           Analytics::CalculateCorrelation(returns[i].second, returns[j].second)});
+        }
+    }
+    std::stable_sort(all.begin(), all.end(),
+                     [](const Expected& x, const Expected& y) { return std::abs(x.corr) > std::abs(y.corr); });
+    all.resize(k);
+    return all;
+}
+
+} // namespace
+
+TEST(PairSelector, TopPairsMatchScoringEveryPair) {
+    const std::size_t rows = 80;
+    const std::size_t n = 300;
+    const std::vector<double> panel = MakePanel(rows, n);
+    std::map<std::string, std::vector<double>> data;
+    std::vector<std::string> symbols;
+    for (std::size_t j = 0; j < n; ++j) {
+        symbols.push_back(Name(j));
+        auto& series = data[symbols.back()];
+        for (std::size_t t = 0; t < rows; ++t) series.push_back(panel[t * n + j]);
+    }
+
+    const auto expected = BruteForce(data, 12);
+    const auto from_map = PairSelector::FindTopPairs(data, 12);
+    const auto from_panel = PairSelector::FindTopPairs({panel.data(), rows, n}, symbols, 12);
+    const auto in_float = PairSelector::FindTopPairs(data, 12, true);
+    ASSERT_EQ(from_map.size(), 12u);
+    ASSERT_EQ(from_panel.size(), 12u);
+    ASSERT_EQ(in_float.size(), 12u);
+    for (std::size_t k = 0; k < expected.size(); ++k) {
+        EXPECT_EQ(from_map[k].asset_a, expected[k].a) << k;
+        EXPECT_EQ(from_map[k].asset_b, expected[k].b) << k;
+        EXPECT_NEAR(from_map[k].correlation, expected[k].corr, 1e-12);
+        EXPECT_EQ(from_panel[k].asset_a, from_map[k].asset_a);
+        EXPECT_EQ(from_panel[k].asset_b, from_map[k].asset_b);
+        EXPECT_DOUBLE_EQ(from_panel[k].beta, from_map[k].beta);
+        EXPECT_NEAR(in_float[k].correlation, expected[k].corr, 1e-5);
+    }
+}
+
+TEST(PairSelector, CorrelationMatrixMatchesPairwiseCorrelation) {
+    const std::size_t rows = 60;
+    const std::size_t n = 270;
+    const std::vector<double> panel = MakePanel(rows, n);
+    std::vector<std::vector<double>> returns(n);
+    for (std::size_t j = 0; j < n; ++j) {
+        std::vector<double> prices;
+        for (std::size_t t = 0; t < rows; ++t) prices.push_back(panel[t * n + j]);
+        returns[j] = Analytics::CalculateLogReturns(prices);
+    }
+
+    std::vector<double> matrix(n * n);
+    PairSelector::CorrelationMatrix({panel.data(), rows, n}, matrix.data());
+    for (std::size_t i = 0; i < n; i += 7) {
+        for (std::size_t j = 0; j < n; j += 5) {
+            const double expected = i == j ? 1.0 : Analytics::CalculateCorrelation(returns[i], returns[j]);
+            EXPECT_NEAR(matrix[i * n + j], expected, 1e-12) << i << "," << j;
+        }
+    }
+}
+
+TEST(PairSelector, UnequalLengthsAndFlatSeriesCorrelateZero) {
+    std::map<std::string, std::vector<double>> data;
+    for (int t = 0; t < 40; ++t) {
+        data["A"].push_back(100.0 + std::sin(t));
+        data["B"].push_back(50.0 + 0.5 * std::sin(t) + 0.01 * t);
+        data["FLAT"].push_back(7.0);
+    }
+    for (int t = 0; t < 50; ++t) data["LONG"].push_back(10.0 + std::sin(t));
+    data["TINY"] = {1.0, 2.0, 3.0};  // under 30 prices: skipped
+
+    const auto pairs = PairSelector::FindTopPairs(data, 10);
+    ASSERT_EQ(pairs.size(), 6u);  // 4 usable symbols
+    EXPECT_EQ(pairs[0].asset_a, "A");
+    EXPECT_EQ(pairs[0].asset_b, "B");
+    EXPECT_GT(pairs[0].correlation, 0.9);
+    for (std::size_t k = 1; k < pairs.size(); ++k) {
+        EXPECT_EQ(pairs[k].correlation, 0.0) << pairs[k].asset_a << "-" << pairs[k].asset_b;
+        EXPECT_NE(pairs[k].asset_a, "TINY");
+    }
+    EXPECT_TRUE(PairSelector::FindTopPairs(data, 0).empty());
+}
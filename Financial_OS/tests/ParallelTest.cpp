@@ -0,0 +1,38 @@
+// tests/ParallelTest.cpp
+//
+// ParallelFor is the primitive under every batched entry point: a throw in
+// one call must reach the caller, and only after every other call is done.
+
+#include <gtest/gtest.h>
+
+#include <atomic>
+#include <stdexcept>
+#include <vector>
+
+#include "Parallel.h"
+
+TEST(ParallelFor, RunsEveryIndexOnce) {
+    for (unsigned int threads : {1u, 0u}) {
+        std::vector<int> hits(1000, 0);
+        ParallelFor(hits.size(), [&](std::size_t i) { ++hits[i]; }, threads);
+        for (int h : hits) ASSERT_EQ(h, 1);
+    }
+}
+
+TEST(ParallelFor, RethrowsAfterEveryCallHasFinished) {
+    for (unsigned int threads : {1u, 0u}) {
+        std::atomic<int> running{0};
+        std::atomic<int> finished{0};
+        EXPECT_THROW(ParallelFor(200, [&](std::size_t i) {
+            ++running;
+            if (i == 3) {
+                --running;
+                throw std::runtime_error("boom");
+            }
+            ++finished;
+            --running;
+        }, threads), std::runtime_error);
+        EXPECT_EQ(running.load(), 0);
+        EXPECT_GT(finished.load(), 0);
+    }
+}
@@ -0,0 +1,68 @@
+// tests/PortfolioTest.cpp
+//
+// total_equity() is kept incrementally from mark/fill deltas; it has to track
+// the full recompute (cash + sum of holding * last price) at every step.
+
+#include <gtest/gtest.h>
+
+#include <cmath>
+#include <limits>
+#include <random>
+#include <vector>
+
+#include "Portfolio.h"
+
+namespace {
+
+double FullEquity(const Portfolio& portfolio) {
+    return portfolio.cash() + portfolio.full_market_value();
+}
+
+}  // namespace
+
+TEST(Portfolio, IncrementalEquityTracksFullRecompute) {
+    constexpr int kSymbols = 40;
+    constexpr int kSteps = 50000;
+    std::mt19937 rng(7);
+    std::uniform_int_distribution<int> pick(0, kSymbols - 1);
+    std::uniform_real_distribution<double> unit(0.0, 1.0);
+    std::normal_distribution<double> shock(0.0, 0.01);
+
+    Portfolio portfolio(1e6);
+    std::vector<double> price(kSymbols, 100.0);
+    for (int step = 0; step < kSteps; ++step) {
+        const SymbolId id = pick(rng);
+        const auto i = static_cast<std::size_t>(id);
+        price[i] *= std::exp(shock(rng));
+        portfolio.mark(id, price[i]);
+        if (unit(rng) < 0.2) {
+            const Side side = unit(rng) < 0.5 ? Side::BUY : Side::SELL;
+            // Fill away from the mark, so fills and marks are valued differently.
+            portfolio.execute(id, "S", side, 1.0 + 10.0 * unit(rng), price[i] * (0.99 + 0.02 * unit(rng)), step);
+        }
+        const double full = FullEquity(portfolio);
+        ASSERT_NEAR(portfolio.total_equity(), full, 1e-9 * std::abs(full)) << "step " << step;
+    }
+}
+
+TEST(Portfolio, FillOnUnmarkedSymbolCountsFromFirstMark) {
+    Portfolio portfolio(1000.0);
+    portfolio.execute(0, "AAPL", Side::BUY, 2.0, 100.0, 0.0);
+    EXPECT_DOUBLE_EQ(portfolio.total_equity(), portfolio.cash());
+    portfolio.mark(0, 110.0);
+    EXPECT_DOUBLE_EQ(portfolio.total_equity(), portfolio.cash() + 220.0);
+}
+
+TEST(Portfolio, NonFiniteMarkClearsWhenRemarked) {
+    Portfolio portfolio(1000.0);
+    portfolio.mark(0, 100.0);
+    portfolio.mark(1, 50.0);
+    portfolio.execute(0, "AAPL", Side::BUY, 1.0, 100.0, 0.0);
+    portfolio.execute(1, "MSFT", Side::BUY, 2.0, 50.0, 0.0);
+
+    portfolio.mark(1, std::numeric_limits<double>::quiet_NaN());
+    EXPECT_TRUE(std::isnan(portfolio.total_equity()));
+    portfolio.mark(1, 60.0);
+    EXPECT_DOUBLE_EQ(portfolio.total_equity(), FullEquity(portfolio));
+    EXPECT_DOUBLE_EQ(portfolio.total_equity(), portfolio.cash() + 100.0 + 120.0);
+}
@@ -0,0 +1,117 @@
+// tests/RegimeDetectorTest.cpp
+//
+// StreamingRegimeDetector must reproduce DetectRegime's features exactly and
+// its labels almost everywhere (warm-started k-means may settle elsewhere).
+
+#include <gtest/gtest.h>
+
+#include <cmath>
+#include <map>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+#include "RegimeDetector.h"
+
+namespace {
+
+// Alternating up, flat and down stretches so all three regimes show up.
+std::vector<double> MakeRegimeSeries(int n) {
+    std::vector<double> prices;
+    double price = 100.0;
+    for (int i = 0; i < n; ++i) {
+        const double phase = std::sin(i * 0.01);
+        price *= 1.0 + 0.004 * phase + 0.012 * std::sin(i * 1.7) * (1.2 - phase);
+        prices.push_back(price);
+    }
+    return prices;
+}
+
+} // namespace
+
+TEST(StreamingRegimeDetector, MatchesBatchDetector) {
+    const std::vector<double> prices = MakeRegimeSeries(1500);
+    StreamingRegimeDetector streaming(20, 252, 1);
+
+    int compared = 0;
+    int agreed = 0;
+    for (std::size_t n = 1; n <= prices.size(); ++n) {
+        streaming.update(prices[n - 1]);
+        const RegimeResult live = streaming.classify();
+        const std::vector<double> history(prices.begin(), prices.begin() + static_cast<long>(n));
+        const RegimeResult batch = RegimeDetector::DetectRegime(history, 20);
+
+        ASSERT_EQ(live.state_id == -1, batch.state_id == -1) << "n=" << n;
+        if (batch.state_id == -1) continue;
+        ASSERT_NEAR(live.current_volatility, batch.current_volatility, 1e-9) << "n=" << n;
+        ASSERT_NEAR(live.current_trend, batch.current_trend, 1e-12) << "n=" << n;
+        ++compared;
+        if (live.state_id == batch.state_id) ++agreed;
+    }
+
+    ASSERT_GT(compared, 1000);
+    EXPECT_GE(static_cast<double>(agreed) / compared, 0.95) << agreed << "/" << compared;
+}
+
+TEST(StreamingRegimeDetector, ReclusterCadenceKeepsLabelsClose) {
+    const std::vector<double> prices = MakeRegimeSeries(1500);
+    StreamingRegimeDetector every_bar(20, 252, 1);
+    StreamingRegimeDetector every_10(20, 252, 10);
+
+    int compared = 0;
+    int agreed = 0;
+    for (double p : prices) {
+        every_bar.update(p);
+        every_10.update(p);
+        const RegimeResult a = every_bar.classify();
+        const RegimeResult b = every_10.classify();
+        if (a.state_id == -1) continue;
+        ++compared;
+        if (a.state_id == b.state_id) ++agreed;
+    }
+    EXPECT_GE(static_cast<double>(agreed) / compared, 0.9) << agreed << "/" << compared;
+}
+
+TEST(RegimeDetector, LabelSeriesMatchesStreamingDetector) {
+    const std::vector<double> prices = MakeRegimeSeries(800);
+    const RegimeSeries labels = RegimeDetector::LabelSeries(prices, 20, 252, 5);
+    ASSERT_EQ(labels.state_id.size(), prices.size());
+    ASSERT_EQ(labels.volatility.size(), prices.size());
+    ASSERT_EQ(labels.trend.size(), prices.size());
+
+    StreamingRegimeDetector detector(20, 252, 5);
+    for (std::size_t i = 0; i < prices.size(); ++i) {
+        detector.update(prices[i]);
+        const RegimeResult r = detector.classify();
+        EXPECT_EQ(labels.state_id[i], r.state_id) << "i=" << i;
+        EXPECT_EQ(labels.volatility[i], r.current_volatility) << "i=" << i;
+        EXPECT_EQ(labels.trend[i], r.current_trend) << "i=" << i;
+    }
+    EXPECT_EQ(labels.state_id[38], -1);
+    EXPECT_NE(labels.state_id[39], -1);
+}
+
+TEST(RegimeDetector, LabelUniverseMatchesPerSymbolLabels) {
+    std::map<std::string, std::vector<double>> universe;
+    for (int s = 0; s < 12; ++s) {
+        std::vector<double> prices = MakeRegimeSeries(300 + 25 * s);
+        for (double& p : prices) p *= 1.0 + 0.1 * s;
+        universe["SYM" + std::to_string(s)] = std::move(prices);
+    }
+    universe["SHORT"] = {100.0, 101.0};
+
+    const auto pooled = RegimeDetector::LabelUniverse(universe, 20, 252, 1, 0);
+    const auto serial = RegimeDetector::LabelUniverse(universe, 20, 252, 1, 1);
+    ASSERT_EQ(pooled.size(), universe.size());
+    for (const auto& [symbol, prices] : universe) {
+        const RegimeSeries expected = RegimeDetector::LabelSeries(prices, 20, 252, 1);
+        for (const auto* got : {&pooled.at(symbol), &serial.at(symbol)}) {
+            EXPECT_EQ(got->state_id, expected.state_id) << symbol;
+            EXPECT_EQ(got->volatility, expected.volatility) << symbol;
+            EXPECT_EQ(got->trend, expected.trend) << symbol;
+        }
+    }
+
+    EXPECT_THROW(RegimeDetector::LabelUniverse(universe, 20, 10, 1), std::invalid_argument);
+    EXPECT_THROW(RegimeDetector::LabelSeries({1.0, 2.0}, 20, 252, 0), std::invalid_argument);
+}
@@ -0,0 +1,66 @@
+// tests/SharedSeriesTest.cpp
+//
+// The Python getters hand out SharedSeries buffers without copying, so an
+// exported buffer must never be reallocated or rewritten by later appends.
+
+#include <gtest/gtest.h>
+
+#include <algorithm>
+#include <memory>
+#include <vector>
+
+#include "SharedSeries.h"
+
+TEST(SharedSeries, ExportedBufferSurvivesGrowth) {
+    SharedSeries series;
+    for (int i = 0; i < 5; ++i) series.push_back(i);
+
+    auto exported = series.share();
+    const double* first = exported->data();
+    const std::size_t len = exported->size();
+
+    for (int i = 5; i < 10000; ++i) series.push_back(i);
+
+    EXPECT_EQ(exported->data(), first);
+    for (std::size_t i = 0; i < len; ++i) EXPECT_DOUBLE_EQ(first[i], static_cast<double>(i));
+    ASSERT_EQ(series.size(), 10000u);
+    EXPECT_DOUBLE_EQ(series.values().back(), 9999.0);
+}
+
+TEST(SharedSeries, CopiesDoNotShareStorage) {
+    SharedSeries a;
+    a.push_back(1.0);
+    SharedSeries b = a;
+    b.push_back(2.0);
+
+    EXPECT_EQ(a.size(), 1u);
+    EXPECT_EQ(b.size(), 2u);
+    EXPECT_NE(a.share().get(), b.share().get());
+}
+
+TEST(SharedSeries, RetentionKeepsBoundedTail) {
+    SharedSeries series;
+    series.set_retention(100);
+    std::shared_ptr<const std::vector<double>> exported;
+    const double* exported_data = nullptr;
+    for (int i = 0; i < 10000; ++i) {
+        series.push_back(i);
+        if (i == 150) {
+            exported = series.share();
+            exported_data = exported->data();
+        }
+        ASSERT_LE(series.size(), 200u);
+        ASSERT_GE(series.size(), std::min<std::size_t>(i + 1, 100));
+        ASSERT_DOUBLE_EQ(series.values().back(), static_cast<double>(i));
+    }
+
+    EXPECT_EQ(series.total(), 10000u);
+    const auto& tail = series.values();
+    for (std::size_t k = 0; k < tail.size(); ++k) {
+        EXPECT_DOUBLE_EQ(tail[k], static_cast<double>(10000 - tail.size() + k));
+    }
+    // The (data, length) view taken at i == 150 is neither moved nor rewritten
+    // by the compactions that followed.
+    ASSERT_EQ(exported->data(), exported_data);
+    for (int k = 0; k <= 150; ++k) EXPECT_DOUBLE_EQ(exported_data[k], static_cast<double>(k));
+}
@@ -0,0 +1,120 @@
+// tests/StreamingPCATest.cpp
+//
+// The streaming engine must reproduce CalculateSignals on every window it
+// slides over -- for a universe of a few hundred names, and whether a row was
+// handled by the warm-started iteration or a full refactor -- and recover
+// once a bad return has left the window.
+
+#include <gtest/gtest.h>
+
+#include <cmath>
+#include <cstdio>
+#include <map>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+#include "PCAArbitrage.h"
+
+namespace {
+
+// A market factor with per-name betas, a sector factor on every third name
+// and idiosyncratic noise, all deterministic.
+std::vector<double> MakePanel(std::size_t rows, std::size_t n) {
+    std::vector<double> panel(rows * n);
+    std::vector<double> level(n, 100.0);
+    for (std::size_t t = 0; t < rows; ++t) {
+        const double market = 0.01 * std::sin(1.3 * t) * std::cos(0.17 * t);
+        const double sector = 0.004 * std::sin(2.9 * t + 1.0);
+        for (std::size_t j = 0; j < n; ++j) {
+            const double beta = 0.5 + 0.2 * static_cast<double>(j % 7);
+            const double noise = 0.006 * std::sin(0.7 * t * (j % 13 + 1) + 0.37 * j);
+            level[j] *= std::exp(beta * market + (j % 3 == 0 ? sector : 0.0) + noise);
+            panel[t * n + j] = level[j];
+        }
+    }
+    return panel;
+}
+
+// CalculateSignals on the `window` prices ending at row t, by column.
+std::vector<double> Batch(const std::vector<double>& panel, std::size_t n, std::size_t t, std::size_t window) {
+    std::map<std::string, std::vector<double>> prices;
+    char name[16];
+    for (std::size_t j = 0; j < n; ++j) {
+        std::snprintf(name, sizeof(name), "S%04zu", j);
+        auto& series = prices[name];
+        for (std::size_t i = t + 1 - window; i <= t; ++i) series.push_back(panel[i * n + j]);
+    }
+    std::vector<double> z;
+    for (const auto& [symbol, value] : PCAArbitrage::CalculateSignals(prices, 1).z_scores) z.push_back(value);
+    return z;
+}
+
+} // namespace
+
+TEST(StreamingPCA, RollingSignalsMatchAFullRebuildOnEveryWindow) {
+    const std::size_t n = 300;
+    const std::size_t rows = 220;
+    const int window = 120;
+    const std::vector<double> panel = MakePanel(rows, n);
+    std::vector<double> z(rows * n);
+    PCAArbitrage::RollingSignals({panel.data(), rows, n}, window, z.data(), 1, 40);
+
+    for (std::size_t j = 0; j < n; ++j) EXPECT_TRUE(std::isnan(z[(window - 2) * n + j]));
+    for (std::size_t t = window - 1; t < rows; t += 7) {
+        const std::vector<double> expected = Batch(panel, n, t, window);
+        ASSERT_EQ(expected.size(), n);
+        for (std::size_t j = 0; j < n; ++j) ASSERT_NEAR(z[t * n + j], expected[j], 1e-7) << "row " << t << " col " << j;
+    }
+}
+
+TEST(StreamingPCA, WarmStartsBetweenRefactors) {
+    const std::size_t n = 40;
+    const std::size_t window = 59;
+    const std::vector<double> panel = MakePanel(200, n);
+    StreamingPCA pca(n, window, 1, 25);
+    std::vector<double> row(n);
+    std::size_t signals = 0;
+    for (std::size_t t = 1; t < 200; ++t) {
+        for (std::size_t j = 0; j < n; ++j) row[j] = std::log(panel[t * n + j] / panel[(t - 1) * n + j]);
+        pca.push(row.data());
+        if (!pca.ready()) continue;
+        ++signals;
+        const std::vector<double> expected = Batch(panel, n, t, window + 1);
+        for (std::size_t j = 0; j < n; ++j) ASSERT_NEAR(pca.z_scores()[j], expected[j], 1e-7);
+    }
+    EXPECT_EQ(signals, 200 - window);
+    // The first fill and one every 25 rows, plus any row the warm start
+    // could not settle; most rows must come from the warm start.
+    EXPECT_GE(pca.refactors(), 1 + (signals - 1) / 25);
+    EXPECT_LT(pca.refactors(), signals / 4);
+    ASSERT_EQ(pca.explained_variance().size(), 1u);
+    EXPECT_GT(pca.explained_variance()[0], 0.0);
+    EXPECT_LT(pca.explained_variance()[0], 1.0);
+}
+
+TEST(StreamingPCA, RecoversOnceABadReturnLeavesTheWindow) {
+    const std::size_t n = 12;
+    const std::size_t window = 40;
+    std::vector<double> panel = MakePanel(150, n);
+    panel[50 * n + 3] = std::nan("");
+    std::vector<double> z(150 * n);
+    PCAArbitrage::RollingSignals({panel.data(), 150, n}, static_cast<int>(window), z.data());
+
+    // Returns 50 and 51 are NaN; the first clean window ends at row 51 + window - 1.
+    const std::size_t clean = 51 + window - 1;
+    for (std::size_t t = clean; t < 150; ++t) {
+        const std::vector<double> expected = Batch(panel, n, t, window);
+        for (std::size_t j = 0; j < n; ++j) ASSERT_NEAR(z[t * n + j], expected[j], 1e-7) << "row " << t;
+    }
+}
+
+TEST(StreamingPCA, RejectsBadShapes) {
+    EXPECT_THROW(StreamingPCA(0, 10), std::invalid_argument);
+    EXPECT_THROW(StreamingPCA(5, 1), std::invalid_argument);
+    EXPECT_THROW(StreamingPCA(5, 10, 0), std::invalid_argument);
+    EXPECT_THROW(StreamingPCA(5, 10, 1, 0), std::invalid_argument);
+    std::vector<double> panel = MakePanel(10, 3);
+    std::vector<double> z(30);
+    EXPECT_THROW(PCAArbitrage::RollingSignals({panel.data(), 10, 3}, 2, z.data()), std::invalid_argument);
+}
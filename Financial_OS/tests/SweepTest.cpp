@@ -0,0 +1,220 @@
+// tests/SweepTest.cpp
+//
+// A sweep is only a faster way to run many engines: every row must equal the
+// engine a caller would have configured by hand and replayed on the panel.
+// Successive halving only stops some of those engines early, so the rows it
+// carries to the end must equal the sweep's.
+
+#include <gtest/gtest.h>
+
+#include <algorithm>
+#include <cmath>
+#include <map>
+#include <numeric>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+#include "Backtester.h"
+#include "Sweep.h"
+
+namespace {
+
+struct Panel {
+    std::vector<std::string> symbols;
+    std::vector<double> timestamps;
+    std::vector<double> ohlc;
+
+    [[nodiscard]] SweepData data() const { return {symbols, timestamps.data(), ohlc.data(), timestamps.size()}; }
+};
+
+Panel MakePanel(int n) {
+    Panel panel;
+    panel.symbols = {"KO", "PEP"};
+    double ko = 50.0;
+    double pep = 100.0;
+    for (int t = 0; t < n; ++t) {
+        ko += 0.6 * std::sin(t * 0.21) + 0.2 * std::cos(t * 0.05);
+        pep = 2.0 * ko + 3.0 * std::sin(t * 0.4);
+        panel.timestamps.push_back(t);
+        for (double c : {ko, pep}) panel.ohlc.insert(panel.ohlc.end(), {c, c, c, c});
+    }
+    return panel;
+}
+
+// A profitable, stationary spread: the configuration that leads on a prefix
+// is also the one that wins on the whole history.
+Panel MakeMeanRevertingPanel(int n) {
+    Panel panel;
+    panel.symbols = {"KO", "PEP"};
+    for (int t = 0; t < n; ++t) {
+        const double ko = 50.0 + 4.0 * std::sin(t * 0.013) + 0.01 * t;
+        const double pep = 2.0 * ko + 10.0 + 1.2 * std::sin(t * 0.25) + 0.5 * std::sin(t * 2.3);
+        panel.timestamps.push_back(t);
+        for (double c : {ko, pep}) panel.ohlc.insert(panel.ohlc.end(), {c, c, c, c});
+    }
+    return panel;
+}
+
+std::vector<std::map<std::string, double>> PairsGrid() {
+    return ExpandGrid({{"window", {10, 15, 20, 25, 30, 35, 40, 45, 50, 55, 60}},
+                       {"threshold", {0.5, 0.75, 1.0, 1.25, 1.5, 2.0}}});
+}
+
+SweepOptions PairsOptions() {
+    SweepOptions options;
+    options.max_drawdown_limit = 0.2;
+    return options;
+}
+
+} // namespace
+
+TEST(Sweep, ExpandGridIsACartesianProductLastNameFastest) {
+    const auto configs = ExpandGrid({{"fast", {5, 8}}, {"slow", {20, 30, 40}}});
+    ASSERT_EQ(configs.size(), 6u);
+    EXPECT_EQ(configs[0].at("fast"), 5);
+    EXPECT_EQ(configs[0].at("slow"), 20);
+    EXPECT_EQ(configs[1].at("slow"), 30);
+    EXPECT_EQ(configs[3].at("fast"), 8);
+    EXPECT_THROW(ExpandGrid({{"fast", {}}}), std::invalid_argument);
+}
+
+TEST(Sweep, RowsMatchHandConfiguredEngines) {
+    const Panel panel = MakePanel(400);
+    const auto configs = ExpandGrid({{"window", {10, 20, 40}}, {"threshold", {1.0, 2.0}}});
+    SweepOptions options;
+    options.max_drawdown_limit = 0.2;
+
+    const SweepResult pooled = RunSweep("PAIRS", configs, panel.data(), options);
+    const SweepResult serial = RunSweep("PAIRS", configs, panel.data(), options, 1);
+    ASSERT_EQ(pooled.parameter_names, (std::vector<std::string>{"threshold", "window"}));
+
+    for (std::size_t i = 0; i < configs.size(); ++i) {
+        Backtester engine(options.initial_capital, "PAIRS", options.leverage);
+        engine.set_quiet(true);
+        engine.set_risk_params(options.max_drawdown_limit, options.var_limit);
+        engine.set_equity_sampling(EquitySampling::PER_TIMESTAMP);
+        engine.set_pairs_parameters(static_cast<int>(configs[i].at("window")), configs[i].at("threshold"));
+        engine.run_panel(panel.symbols, panel.timestamps.data(), panel.ohlc.data(), panel.timestamps.size());
+
+        EXPECT_EQ(pooled.final_equity[i], engine.get_total_equity()) << "config " << i;
+        EXPECT_EQ(pooled.max_drawdown[i], engine.get_max_drawdown()) << "config " << i;
+        EXPECT_EQ(pooled.trades[i], static_cast<std::int64_t>(engine.get_trade_count())) << "config " << i;
+        EXPECT_EQ(pooled.parameters[1][i], configs[i].at("window"));
+        EXPECT_EQ(serial.final_equity[i], pooled.final_equity[i]);
+        EXPECT_EQ(serial.sharpe[i], pooled.sharpe[i]);
+    }
+}
+
+TEST(Sweep, ParametersAreSettableByName) {
+    Backtester engine(100000.0, "MACD", 1.0);
+    engine.set_parameters({{"slow", 40}});
+    const auto params = engine.get_parameters();
+    EXPECT_EQ(params.at("fast"), 12);
+    EXPECT_EQ(params.at("slow"), 40);
+    EXPECT_EQ(params.at("signal"), 9);
+
+    engine.set_parameter("signal", 5);
+    EXPECT_EQ(engine.get_parameters().at("signal"), 5);
+    EXPECT_THROW(engine.set_parameter("window", 5), std::invalid_argument);
+    EXPECT_THROW(engine.set_parameter("fast", 5.5), std::invalid_argument);
+
+    Backtester vol(100000.0, "VOL", 1.0);
+    vol.set_parameters({{"k", 0.8}});
+    EXPECT_EQ(vol.get_parameters().at("k"), 0.8);
+
+    const Panel panel = MakePanel(10);
+    EXPECT_THROW(RunSweep("NOPE", {{}}, panel.data()), std::invalid_argument);
+    EXPECT_THROW(RunSweep("EMA", {{{"period", 3}}}, panel.data()), std::invalid_argument);
+}
+
+TEST(Sweep, RejectsMacdAndPairsPeriodsBelowTheMinimum) {
+    const Panel panel = MakePanel(50);
+    for (const char* name : {"fast", "slow", "signal"}) {
+        for (double period : {0.0, -1.0}) {
+            EXPECT_THROW(RunSweep("MACD", {{{name, period}}}, panel.data()), std::invalid_argument)
+                << name << "=" << period;
+        }
+    }
+    const Panel pairs = MakeMeanRevertingPanel(50);
+    for (double window : {1.0, 0.0, -3.0}) {
+        EXPECT_THROW(RunSweep("PAIRS", {{{"window", window}}}, pairs.data(), PairsOptions()), std::invalid_argument)
+            << "window=" << window;
+    }
+    EXPECT_NO_THROW(RunSweep("PAIRS", {{{"window", 2}}}, pairs.data(), PairsOptions()));
+
+    Backtester engine(100000.0, "MACD", 1.0);
+    EXPECT_THROW(engine.set_macd_parameters(0, 26, 9), std::invalid_argument);
+    Backtester basket(100000.0, "PAIRS_BASKET", 1.0);
+    EXPECT_THROW(basket.set_pairs_parameters(0, 2.0), std::invalid_argument);
+}
+
+TEST(Sweep, SuccessiveHalvingFindsTheSweepWinnerOnAFractionOfTheBars) {
+    const Panel panel = MakeMeanRevertingPanel(1200);
+    const auto configs = PairsGrid();
+    const SweepResult full = RunSweep("PAIRS", configs, panel.data(), PairsOptions());
+    const HalvingResult halving = RunSuccessiveHalving("PAIRS", configs, panel.data(), PairsOptions());
+
+    const auto best = static_cast<std::size_t>(
+        std::max_element(full.return_pct.begin(), full.return_pct.end()) - full.return_pct.begin());
+    ASSERT_EQ(halving.table.return_pct.size(), configs.size());
+    EXPECT_EQ(halving.table.parameters[1][0], configs[best].at("window"));
+    EXPECT_EQ(halving.table.parameters[0][0], configs[best].at("threshold"));
+    EXPECT_EQ(halving.table.return_pct[0], full.return_pct[best]);
+
+    EXPECT_EQ(halving.full_bars, configs.size() * 1200);
+    EXPECT_EQ(halving.total_bars, std::accumulate(halving.bars.begin(), halving.bars.end(), std::size_t{0}));
+    EXPECT_LT(halving.total_bars * 5, halving.full_bars);
+    for (std::size_t i = 1; i < halving.bars.size(); ++i) EXPECT_LE(halving.bars[i], halving.bars[i - 1]);
+}
+
+TEST(Sweep, HalvingSurvivorsResumeToTheFullRunExactly) {
+    const Panel panel = MakeMeanRevertingPanel(900);
+    const auto configs = PairsGrid();
+    HalvingOptions options;
+    options.eta = 2.0;
+    options.min_bars = 100;
+    const HalvingResult halving = RunSuccessiveHalving("PAIRS", configs, panel.data(), PairsOptions(), options);
+    const SweepResult full = RunSweep("PAIRS", configs, panel.data(), PairsOptions());
+
+    std::size_t finalists = 0;
+    for (std::size_t row = 0; row < halving.bars.size() && halving.bars[row] == 900; ++row, ++finalists) {
+        std::size_t i = 0;
+        while (configs[i].at("window") != halving.table.parameters[1][row] ||
+               configs[i].at("threshold") != halving.table.parameters[0][row]) {
+            ++i;
+        }
+        EXPECT_EQ(halving.table.final_equity[row], full.final_equity[i]);
+        EXPECT_EQ(halving.table.max_drawdown[row], full.max_drawdown[i]);
+        EXPECT_EQ(halving.table.sharpe[row], full.sharpe[i]);
+        EXPECT_EQ(halving.table.trades[row], full.trades[i]);
+        EXPECT_EQ(halving.rung[row], 4);  // 100, 200, 400, 800, 900 bars
+    }
+    EXPECT_GE(finalists, 1u);
+    EXPECT_LE(finalists, 4u);
+}
+
+TEST(Sweep, HyperbandIsSeededAndSharesOneLeaderboard) {
+    const Panel panel = MakeMeanRevertingPanel(600);
+    const auto pool = PairsGrid();
+    HalvingOptions options;
+    options.seed = 9;
+    const HalvingResult a = RunHyperband("PAIRS", pool, panel.data(), PairsOptions(), options);
+    const HalvingResult b = RunHyperband("PAIRS", pool, panel.data(), PairsOptions(), options, 1);
+
+    EXPECT_EQ(a.table.parameters, b.table.parameters);
+    EXPECT_EQ(a.table.final_equity, b.table.final_equity);
+    EXPECT_EQ(a.bracket, b.bracket);
+    // 66 configurations halve to one in 3 rungs: brackets 3 (27 from 23
+    // bars), 2 (12 from 67), 1 (6 from 200), 0 (4 full runs).
+    EXPECT_EQ(a.bars.size(), 27u + 12u + 6u + 4u);
+    EXPECT_EQ(a.full_bars, pool.size() * 600);
+    EXPECT_EQ(*std::max_element(a.bracket.begin(), a.bracket.end()), 3);
+    EXPECT_EQ(a.bars.front(), 600u);
+    EXPECT_LT(a.total_bars, a.full_bars);
+
+    HalvingOptions flat;
+    flat.eta = 1.0;
+    EXPECT_THROW(RunHyperband("PAIRS", pool, panel.data(), PairsOptions(), flat), std::invalid_argument);
+    EXPECT_THROW(RunSuccessiveHalving("PAIRS", pool, panel.data(), PairsOptions(), flat), std::invalid_argument);
+}
@@ -0,0 +1,87 @@
+// tests/SymbolTableTest.cpp
+//
+// Symbols are interned to dense ids once; the id-keyed engine entry points
+// must behave exactly like the string ones they replace on the hot path.
+
+#include <gtest/gtest.h>
+
+#include <cmath>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+#include "Backtester.h"
+#include "SymbolTable.h"
+
+namespace {
+
+std::vector<double> MakeSeries(int n, double phase) {
+    std::vector<double> prices;
+    prices.reserve(n);
+    double price = 100.0;
+    for (int i = 0; i < n; ++i) {
+        price += 0.0005 * price + 2.0 * std::sin(i * 0.30 + phase) + 0.7 * std::cos(i * 0.11);
+        if (price < 1.0) price = 1.0;
+        prices.push_back(price);
+    }
+    return prices;
+}
+
+}  // namespace
+
+TEST(SymbolTable, InternsDenseIdsInRegistrationOrder) {
+    SymbolTable table;
+    EXPECT_EQ(table.intern("KO"), 0);
+    EXPECT_EQ(table.intern("PEP"), 1);
+    EXPECT_EQ(table.intern("KO"), 0);
+    EXPECT_EQ(table.size(), 2u);
+    EXPECT_EQ(table.name(1), "PEP");
+    EXPECT_EQ(table.find("MSFT"), kNoSymbol);
+    EXPECT_THROW((void)table.at("MSFT"), std::out_of_range);
+}
+
+TEST(SymbolTable, IdPathTradesLikeStringPath) {
+    const int n = 600;
+    const std::vector<std::string> symbols = {"KO", "PEP", "AAA"};
+    const std::vector<std::vector<double>> closes = {MakeSeries(n, 0.0), MakeSeries(n, 0.7), MakeSeries(n, 1.9)};
+
+    for (const char* strategy : {"EMA", "MACD", "RSI", "PAIRS", "PCA"}) {
+        Backtester by_name(100000.0, strategy, 1.0);
+        Backtester by_id(100000.0, strategy, 1.0);
+        by_name.set_quiet(true);
+        by_id.set_quiet(true);
+
+        std::vector<SymbolId> ids;
+        for (const auto& sym : symbols) ids.push_back(by_id.register_symbol(sym));
+
+        for (int t = 0; t < n; ++t) {
+            for (std::size_t j = 0; j < symbols.size(); ++j) {
+                const double c = closes[j][t];
+                by_name.on_market_data(symbols[j], t, c, c * 1.01, c * 0.99, c);
+                by_id.on_market_data(ids[j], t, c, c * 1.01, c * 0.99, c);
+            }
+        }
+
+        EXPECT_EQ(by_id.get_total_equity(), by_name.get_total_equity()) << strategy;
+        EXPECT_EQ(by_id.get_trade_count(), by_name.get_trade_count()) << strategy;
+        for (std::size_t j = 0; j < symbols.size(); ++j) {
+            EXPECT_EQ(by_id.get_holdings(ids[j]), by_name.get_holdings(symbols[j])) << strategy;
+        }
+    }
+}
+
+TEST(SymbolTable, IdsSurviveSnapshotRestore) {
+    Backtester engine(100000.0, "EMA", 1.0);
+    engine.set_quiet(true);
+    const SymbolId ko = engine.register_symbol("KO");
+    const SymbolId pep = engine.register_symbol("PEP");
+    engine.on_market_data(pep, 0.0, 50.0, 50.0, 50.0, 50.0);
+
+    Backtester restored(1.0, "EMA", 1.0);
+    restored.restore(engine.snapshot());
+    EXPECT_EQ(restored.register_symbol("KO"), ko);
+    EXPECT_EQ(restored.register_symbol("PEP"), pep);
+    EXPECT_EQ(restored.symbol_name(pep), "PEP");
+    EXPECT_EQ(restored.get_bar_count(pep), 1u);
+    EXPECT_EQ(restored.get_bar_count(ko), 0u);
+}
@@ -0,0 +1,39 @@
+// tests/TradeLedgerTest.cpp
+//
+// The Portfolio keeps its fills column-wise; get_trade_history() rebuilds the
+// old row structs from those columns, so both views must agree.
+
+#include <gtest/gtest.h>
+
+#include "Portfolio.h"
+
+TEST(TradeLedger, DictionaryEncodesSymbolsAndSides) {
+    Portfolio portfolio(10000.0);
+    portfolio.execute(0, "AAPL", Side::BUY, 10.0, 100.0, 1.0);
+    portfolio.execute(1, "MSFT", Side::SELL, 5.0, 200.0, 2.0);
+    portfolio.execute(0, "AAPL", Side::SELL, 4.0, 110.0, 3.0);
+    portfolio.execute(0, "AAPL", Side::BUY, 0.0, 110.0, 4.0);  // zero quantity is not a fill
+
+    const TradeLedger& ledger = portfolio.trades();
+    ASSERT_EQ(ledger.size(), 3u);
+    EXPECT_EQ(ledger.symbols(), (std::vector<std::string>{"AAPL", "MSFT"}));
+    EXPECT_EQ(ledger.symbol_ids(), (std::vector<std::int32_t>{0, 1, 0}));
+    EXPECT_EQ(ledger.sides(), (std::vector<std::int8_t>{1, -1, -1}));
+    EXPECT_DOUBLE_EQ(ledger.commissions()[1], 5.0 * 200.0 * 0.0001);
+    EXPECT_DOUBLE_EQ(portfolio.holding(0), 6.0);
+}
+
+TEST(TradeLedger, RowsMatchColumns) {
+    Portfolio portfolio(10000.0);
+    portfolio.execute(0, "AAPL", Side::BUY, 10.0, 100.0, 1.0);
+    portfolio.execute(1, "MSFT", Side::SELL, 5.0, 200.0, 2.0);
+
+    const std::vector<Trade> rows = portfolio.trades().rows();
+    ASSERT_EQ(rows.size(), 2u);
+    EXPECT_EQ(rows[1].id, 1);
+    EXPECT_EQ(rows[1].symbol, "MSFT");
+    EXPECT_EQ(rows[1].side, "SELL");
+    EXPECT_DOUBLE_EQ(rows[1].quantity, 5.0);
+    EXPECT_DOUBLE_EQ(rows[1].price, 200.0);
+    EXPECT_DOUBLE_EQ(rows[1].timestamp, 2.0);
+}
@@ -0,0 +1,138 @@
+// tests/VectorBacktestTest.cpp
+//
+// The vector fast path is only useful for screening if it trades exactly like
+// the event engine: every column is pinned to a fresh Backtester fed the same
+// closes, on the characterization series and with the risk stop on and off.
+
+#include <gtest/gtest.h>
+
+#include <cmath>
+#include <limits>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+#include "Backtester.h"
+#include "VectorBacktest.h"
+
+namespace {
+
+// The characterization series, with a phase so columns differ.
+std::vector<double> MakeSeries(int n, double phase) {
+    std::vector<double> prices;
+    prices.reserve(n);
+    double price = 100.0;
+    for (int i = 0; i < n; ++i) {
+        const double drift = 0.0005 * price;
+        const double wiggle = 2.0 * std::sin(i * 0.30 + phase) + 0.7 * std::cos(i * 0.11);
+        price += drift + wiggle;
+        if (price < 1.0) price = 1.0;
+        prices.push_back(price);
+    }
+    return prices;
+}
+
+struct Case {
+    std::string strategy;
+    std::map<std::string, double> params;
+};
+
+void Configure(Backtester& engine, const Case& c) {
+    const auto& p = c.params;
+    if (c.strategy == "MACD" && !p.empty()) {
+        engine.set_macd_parameters(static_cast<int>(p.at("fast")), static_cast<int>(p.at("slow")),
+                                   static_cast<int>(p.at("signal")));
+    } else if (c.strategy == "RSI" && !p.empty()) {
+        engine.set_rsi_parameters(static_cast<int>(p.at("period")), p.at("buy_thresh"), p.at("sell_thresh"));
+    } else if (c.strategy == "BB" && !p.empty()) {
+        engine.set_bollinger_parameters(static_cast<int>(p.at("period")), p.at("std_dev_mult"));
+    }
+}
+
+void ExpectParity(const Case& c, bool risk_limits) {
+    const int n = 600;
+    const std::size_t cols = 4;
+    std::vector<std::vector<double>> series;
+    for (std::size_t j = 0; j < cols; ++j) series.push_back(MakeSeries(n, 0.9 * static_cast<double>(j)));
+    std::vector<double> panel(n * cols);
+    for (int t = 0; t < n; ++t) {
+        for (std::size_t j = 0; j < cols; ++j) panel[t * cols + j] = series[j][t];
+    }
+
+    VectorBacktestConfig config;
+    config.strategy = c.strategy;
+    config.params = c.params;
+    if (!risk_limits) {
+        config.max_drawdown_limit = 1.0;
+        config.var_limit = 1e9;
+    }
+    const VectorBacktestResult fast = RunVectorBacktest({panel.data(), static_cast<std::size_t>(n), cols}, config);
+
+    for (std::size_t j = 0; j < cols; ++j) {
+        Backtester engine(config.initial_capital, c.strategy, config.leverage);
+        engine.set_quiet(true);
+        engine.set_risk_params(config.max_drawdown_limit, config.var_limit);
+        Configure(engine, c);
+        for (int t = 0; t < n; ++t) {
+            const double close = series[j][t];
+            engine.on_market_data("X", t, close, close, close, close);
+            const std::size_t at = t * cols + j;
+            ASSERT_EQ(fast.position[at], engine.get_holdings("X")) << c.strategy << " col " << j << " t=" << t;
+            ASSERT_NEAR(fast.equity[at], engine.get_total_equity(), 1e-9 * config.initial_capital);
+        }
+        EXPECT_EQ(fast.trades[j], static_cast<std::int64_t>(engine.get_trade_count())) << c.strategy << " col " << j;
+        EXPECT_NEAR(fast.max_drawdown[j], engine.get_max_drawdown(), 1e-12) << c.strategy << " col " << j;
+        EXPECT_NEAR(fast.final_equity[j], engine.get_total_equity(), 1e-9 * config.initial_capital);
+    }
+}
+
+const std::vector<Case>& Cases() {
+    static const std::vector<Case> cases = {
+        {"EMA", {}},
+        {"MACD", {}},
+        {"MACD", {{"fast", 5}, {"slow", 35}, {"signal", 5}}},
+        {"RSI", {}},
+        {"RSI", {{"period", 7}, {"buy_thresh", 40}, {"sell_thresh", 60}}},
+        {"BB", {}},
+        {"BB", {{"period", 10}, {"std_dev_mult", 1.5}}},
+    };
+    return cases;
+}
+
+} // namespace
+
+TEST(VectorBacktest, MatchesEngineWithRiskStop) {
+    for (const Case& c : Cases()) ExpectParity(c, true);
+}
+
+TEST(VectorBacktest, MatchesEngineWithoutRiskStop) {
+    for (const Case& c : Cases()) ExpectParity(c, false);
+}
+
+TEST(VectorBacktest, NaNClosesAreSkippedBars) {
+    const std::vector<double> closes = MakeSeries(200, 0.0);
+    std::vector<double> gappy = closes;
+    gappy.insert(gappy.begin() + 100, std::numeric_limits<double>::quiet_NaN());
+    gappy.insert(gappy.begin(), std::numeric_limits<double>::quiet_NaN());
+
+    VectorBacktestConfig config;
+    config.strategy = "RSI";
+    const VectorBacktestResult a = RunVectorBacktest({closes.data(), closes.size(), 1}, config);
+    const VectorBacktestResult b = RunVectorBacktest({gappy.data(), gappy.size(), 1}, config);
+    EXPECT_EQ(b.equity.front(), config.initial_capital);
+    EXPECT_EQ(b.equity[101], b.equity[100]);
+    EXPECT_EQ(a.final_equity, b.final_equity);
+    EXPECT_EQ(a.trades, b.trades);
+}
+
+TEST(VectorBacktest, RejectsUnknownStrategiesAndParameters) {
+    const std::vector<double> closes = MakeSeries(10, 0.0);
+    VectorBacktestConfig config;
+    config.strategy = "PAIRS";
+    EXPECT_THROW(RunVectorBacktest({closes.data(), closes.size(), 1}, config), std::invalid_argument);
+    config.strategy = "EMA";
+    config.params = {{"period", 5}};
+    EXPECT_THROW(RunVectorBacktest({closes.data(), closes.size(), 1}, config), std::invalid_argument);
+    config.params = {{"short_window", 2.5}};
+    EXPECT_THROW(RunVectorBacktest({closes.data(), closes.size(), 1}, config), std::invalid_argument);
+}
@@ -1,3 +1,5 @@
+import sys
+import numpy as np
 import requests
 import yfinance as yf
 import pandas as pd
@@ -17,31 +19,39 @@ def fetch_data(symbol, start, end):
         print(f"  [Error] Failed to download {symbol}: {e}")
         return None
 
-def run_universe_mining():
+def synthetic_universe(n, days=252, seed=7):
+    # n random walks driven by a few shared "sector" factors, so some pairs
+    # are genuinely correlated -- a scaling run without n downloads.
+    rng = np.random.default_rng(seed)
+    factors = rng.standard_normal((days, 8))
+    loadings = rng.standard_normal((8, n))
+    returns = 0.01 * (0.3 * factors @ loadings + rng.standard_normal((days, n)))
+    closes = 100.0 * np.exp(np.cumsum(returns, axis=0))
+    return {f"SYN{j:04d}": closes[:, j].tolist() for j in range(n)}
+
+def run_universe_mining(n_synthetic=0):
+    universe = f"{n_synthetic} Synthetic Names" if n_synthetic else f"{len(TICKERS)} Tech Giants"
     print("\n=======================================================")
-    print(f" 🛰️  UNIVERSE MINING: Scanning {len(TICKERS)} Tech Giants")
+    print(f" 🛰️  UNIVERSE MINING: Scanning {universe}")
     print("=======================================================")
 
     start_date = "2023-01-01"
     end_date = "2023-12-31"
 
-    assets_payload = {}
-    valid_tickers = []
+    closes_payload = {}
 
-    for ticker in TICKERS:
-        df = fetch_data(ticker, start_date, end_date)
-        if df is not None and len(df) > 50:
-            assets_payload[ticker] = {
-                "opens": df["Open"].tolist(),
-                "highs": df["High"].tolist(),
-                "lows": df["Low"].tolist(),
-                "closes": df["Close"].tolist()
-            }
-            valid_tickers.append(ticker)
+    if n_synthetic:
+        closes_payload = synthetic_universe(n_synthetic)
+    else:
+        for ticker in TICKERS:
+            df = fetch_data(ticker, start_date, end_date)
+            if df is not None and len(df) > 50:
+                closes_payload[ticker] = df["Close"].tolist()
 
     print(f"  > Data preparation complete. Sending to C++ Engine...")
 
-    payload = {"assets": assets_payload}
+    # Closes only: the scan needs nothing else, and it keeps wide payloads small.
+    payload = {"closes": closes_payload, "top_n": 10, "single_precision": len(closes_payload) >= 1000}
 
     start_time = time.time()
     try:
@@ -77,4 +87,5 @@ def run_universe_mining():
         print(f"  [Connection Error] {e}")
 
 if __name__ == "__main__":
-    run_universe_mining()
\ No newline at end of file
+    # python universe_mining_test.py [N]  -- N > 0 scans N synthetic names instead.
+    run_universe_mining(int(sys.argv[1]) if len(sys.argv) > 1 else 0)
\ No newline at end of file